@@ -0,0 +1,32 @@
+"""Add bulk_batch_id to batch_items for the Message Batches bulk mode.
+
+Revision ID: 028
+Revises: 027
+
+Bulk mode submits every pending item of a batch as one Anthropic Message
+Batch (50% pricing, no per-item HTTP round trip). The returned message
+batch id is stored on each item so a poller — possibly after a restart —
+can fetch the results and fan them back into ``job_analyses``.
+
+Nullable, no backfill: interactive items never set it.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "028"
+down_revision: str | None = "027"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("batch_items", sa.Column("bulk_batch_id", sa.String(64), nullable=True))
+    op.create_index("idx_batch_items_bulk_batch_id", "batch_items", ["bulk_batch_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_batch_items_bulk_batch_id", table_name="batch_items")
+    op.drop_column("batch_items", "bulk_batch_id")
@@ -0,0 +1,33 @@
+"""Add tokens_cache_read to job_analyses.
+
+Revision ID: 029
+Revises: 028
+
+The CV now travels as a ``cache_control`` block of the user turn, so
+repeated analyses on the same CV read it from the Anthropic prompt cache.
+The cached share of ``tokens_input`` is stored per row to make the saving
+visible in batch / inbox flows.
+
+Server default 0: legacy rows predate the cached prefix.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "029"
+down_revision: str | None = "028"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "job_analyses",
+        sa.Column("tokens_cache_read", sa.Integer(), nullable=True, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("job_analyses", "tokens_cache_read")
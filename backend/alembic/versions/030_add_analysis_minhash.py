@@ -0,0 +1,49 @@
+"""Add MinHash fingerprints of job descriptions for near-duplicate detection.
+
+Revision ID: 030
+Revises: 029
+
+``content_hash`` only matches byte-identical CV+JD pairs. Each analysis
+now stores the MinHash signature of its JD (``src.analysis.fingerprint``)
+plus one LSH bucket per band in ``job_analysis_minhash_bands``, so the
+same posting re-pasted from another job board is found with an index
+lookup instead of a new paid call.
+
+Existing rows keep ``jd_minhash`` NULL here: the signature is not
+expressible in SQL, and the migration must not import app code that may
+change later. The background backfill started in the app lifespan
+(``dashboard.storage.fill_derived_batch``) fills them a batch at a time.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "030"
+down_revision: str | None = "029"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("job_analyses", sa.Column("jd_minhash", sa.JSON(), nullable=True))
+    op.create_table(
+        "job_analysis_minhash_bands",
+        sa.Column(
+            "analysis_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("job_analyses.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("band", sa.Integer(), primary_key=True),
+        sa.Column("bucket", sa.Integer(), nullable=False),
+    )
+    op.create_index("idx_minhash_bands_band_bucket", "job_analysis_minhash_bands", ["band", "bucket"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_minhash_bands_band_bucket", table_name="job_analysis_minhash_bands")
+    op.drop_table("job_analysis_minhash_bands")
+    op.drop_column("job_analyses", "jd_minhash")
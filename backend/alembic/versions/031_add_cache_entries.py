@@ -0,0 +1,36 @@
+"""Add cache_entries for the durable DB cache tier.
+
+Revision ID: 031
+Revises: 030
+
+``DatabaseCacheService`` keeps AI / Glassdoor cache entries in the primary
+DB: L2 behind Redis, the only tier when Redis is unavailable. Entries carry
+an absolute ``expires_at`` (indexed: reads filter on it, size-bounded
+eviction orders by it) and their byte size so the cap is a cheap SUM.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "031"
+down_revision: str | None = "030"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cache_entries",
+        sa.Column("key", sa.String(255), primary_key=True),
+        sa.Column("value", sa.Text(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_cache_entries_expires_at", "cache_entries", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_cache_entries_expires_at", table_name="cache_entries")
+    op.drop_table("cache_entries")
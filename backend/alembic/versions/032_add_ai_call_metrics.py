@@ -0,0 +1,54 @@
+"""Add ai_call_metrics for per-call Anthropic telemetry.
+
+Revision ID: 032
+Revises: 031
+
+One row per Anthropic call (analysis, cover letter, follow-up, LinkedIn,
+document scan): tokens incl. prompt-cache reads/writes, cost, SDK retries,
+governor queue wait, time to first byte and wall time. ``app_settings``
+keeps only running totals; this table feeds the p50/p95/p99 breakdown per
+operation and per source on the admin page.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "032"
+down_revision: str | None = "031"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_call_metrics",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("operation", sa.String(40), nullable=False),
+        sa.Column("source", sa.String(30), nullable=False),
+        sa.Column("model", sa.String(50), nullable=False),
+        sa.Column("status", sa.String(10), nullable=False),
+        sa.Column("tokens_input", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tokens_output", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tokens_cache_read", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tokens_cache_write", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("cost_usd", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("retries", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("hedged", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("queue_ms", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("ttfb_ms", sa.Float(), nullable=True),
+        sa.Column("wall_ms", sa.Float(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index("idx_ai_calls_created", "ai_call_metrics", ["created_at"])
+    op.create_index("idx_ai_calls_operation", "ai_call_metrics", ["operation"])
+
+
+def downgrade() -> None:
+    op.drop_table("ai_call_metrics")
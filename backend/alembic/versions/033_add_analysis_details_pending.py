@@ -0,0 +1,33 @@
+"""Add details_pending to job_analyses.
+
+Revision ID: 033
+Revises: 032
+
+The analysis call now returns only the triage payload; interview scripts
+and advice are generated the first time the detail page or
+``/interview-prep`` needs them. ``details_pending`` marks rows still
+waiting for that second call.
+
+Server default false: legacy rows were analysed with the full schema.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "033"
+down_revision: str | None = "032"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "job_analyses",
+        sa.Column("details_pending", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("job_analyses", "details_pending")
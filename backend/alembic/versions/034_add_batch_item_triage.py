@@ -0,0 +1,39 @@
+"""Add triage columns and the ``filtered`` status to batch_items.
+
+Revision ID: 034
+Revises: 033
+
+Large backlogs are pre-screened with a cheap triage call (score, career
+track, one-line reason); items below ``AI_TRIAGE_MIN_SCORE`` end up
+``filtered`` instead of paying for the full analysis. The triage outcome is
+kept on the item so the queue UI can show why it was not escalated.
+
+Nullable, no backfill: items queued before this never went through triage.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "034"
+down_revision: str | None = "033"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # ADD VALUE can't run inside the migration transaction on older
+    # Postgres versions; the autocommit block keeps it portable.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE batchitemstatus ADD VALUE IF NOT EXISTS 'filtered'")
+    op.add_column("batch_items", sa.Column("triage_score", sa.Integer(), nullable=True))
+    op.add_column("batch_items", sa.Column("triage_reason", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("batch_items", "triage_reason")
+    op.drop_column("batch_items", "triage_score")
+    # Postgres can't drop an enum value: park filtered items as skipped and
+    # leave the unused label in the type.
+    op.execute("UPDATE batch_items SET status = 'skipped' WHERE status = 'filtered'")
@@ -0,0 +1,102 @@
+"""Add compressed storage for the large text columns.
+
+Revision ID: 035
+Revises: 034
+
+``job_analyses.job_description`` / ``full_response``,
+``batch_items.job_description`` and ``inbox_items.raw_text`` get a
+``*_z`` bytea twin holding the zlib-compressed text (see
+``database.compression``). New writes go to the twin and blank the legacy
+column; existing rows are compressed by the background backfill started
+in the app lifespan, so the upgrade itself stays instant on a big table.
+
+Downgrade decompresses the twins back into the legacy columns first, a
+batch of rows at a time. The codec is frozen below (format byte 0 / 1 as
+of this revision) so the migration never depends on app code that may
+change later.
+"""
+
+import zlib
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "035"
+down_revision: str | None = "034"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_COLUMNS = (
+    ("job_analyses", "job_description"),
+    ("job_analyses", "full_response"),
+    ("batch_items", "job_description"),
+    ("inbox_items", "raw_text"),
+)
+_BATCH_SIZE = 500
+
+# Frozen copy of the format 1 dictionary of database/compression.py.
+_JD_DICTIONARY_V1 = (
+    "Unisciti al nostro team. Join our team. We offer a competitive salary and benefits package. "
+    "Offriamo contratto a tempo indeterminato, RAL commisurata all'esperienza, buoni pasto, welfare aziendale, "
+    "smart working, formazione continua, assicurazione sanitaria integrativa, orario flessibile. "
+    "Contratto a tempo determinato finalizzato all'assunzione. Full-time. Part-time. Remote. Hybrid. On-site. "
+    "Sede di lavoro: Milano, Roma, Torino, Bologna, Napoli, Firenze, Padova, Verona, Bergamo, Brescia. "
+    "Costituiscono titolo preferenziale: Nice to have: Preferred qualifications: Bonus points if you have "
+    "Conoscenza della lingua inglese. Fluent English. Ottima conoscenza di English (B2/C1). "
+    "Capacita' di lavorare in team, problem solving, autonomia, proattivita', orientamento al risultato. "
+    "Strong communication skills, ability to work independently and in a team, attention to detail. "
+    "Laurea in Informatica, Ingegneria Informatica o discipline STEM. Bachelor's degree in Computer Science "
+    "Esperienza di almeno 3 anni. At least 3 years of experience. years of professional experience with "
+    "Python, Java, JavaScript, TypeScript, Go, C#, .NET, SQL, PostgreSQL, MySQL, MongoDB, Redis, Kafka, "
+    "Docker, Kubernetes, Terraform, Ansible, Helm, AWS, Azure, Google Cloud Platform (GCP), Linux, Git, "
+    "CI/CD pipelines, GitHub Actions, GitLab CI, Jenkins, ArgoCD, Prometheus, Grafana, ELK, Datadog, "
+    "microservices, REST API, monitoring, observability, infrastructure as code, cloud-native, DevOps, SRE. "
+    "Responsabilita': Cosa farai: Il candidato ideale. Requisiti: Cosa offriamo: Chi cerchiamo: "
+    "Responsibilities: What you'll do: Requirements: What we offer: About the role: Who you are: "
+    '{"company": "", "role": "", "location": "", "work_mode": "", "salary_info": "", "score": , '
+    '"recommendation": "", "strengths": [], "gaps": [{"gap": "", "severity": "", "closable": true, '
+    '"how": ""}], "job_summary": "", "career_track": "", "track_reason": "", "benefits": [], '
+    '"experience_required": {}, "score_label": "", "potential_score": , "gap_timeline": "", '
+    '"confidence": "", "interview_scripts": [{"question": "", "suggested_answer": ""}], "advice": ""} '
+    "La ricerca e' rivolta a candidati di entrambi i sessi. The position is open to all candidates. "
+    "Ci occupiamo di soluzioni software per i nostri clienti. Siamo un'azienda in forte crescita. "
+    "Stiamo cercando un/una Software Engineer, Backend Developer, DevOps Engineer, Cloud Engineer, "
+    "Platform Engineer, Site Reliability Engineer, Data Engineer, Full Stack Developer da inserire nel team. "
+    "We are looking for a Software Engineer, Backend Developer, DevOps Engineer, Cloud Engineer to join "
+    "the team. You will design, build and maintain scalable, reliable and secure systems. "
+    "esperienza con l'esperienza di and the of to in for with on our you your we are will be "
+    "nel della delle degli dei per con che sul sulla nella una un il la le di da in e a "
+)
+_DICTIONARIES = {0: b"", 1: _JD_DICTIONARY_V1.encode()}
+
+
+def _decompress(blob: bytes) -> str:
+    blob = bytes(blob)
+    zdict = _DICTIONARIES[blob[0]]
+    decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+    return (decompressor.decompress(blob[1:]) + decompressor.flush()).decode()
+
+
+def upgrade() -> None:
+    for table, column in _COLUMNS:
+        op.add_column(table, sa.Column(f"{column}_z", sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table, column in _COLUMNS:
+        t = sa.table(table, sa.column("id"), sa.column(column, sa.Text()), sa.column(f"{column}_z", sa.LargeBinary()))
+        packed = t.c[f"{column}_z"]
+        restore = sa.update(t).where(t.c.id == sa.bindparam("row_id")).values({column: sa.bindparam("text")})
+        last = None
+        while True:
+            page = sa.select(t.c.id, packed).where(packed.isnot(None)).order_by(t.c.id).limit(_BATCH_SIZE)
+            if last is not None:
+                page = page.where(t.c.id > last)
+            rows = bind.execute(page).fetchall()
+            if not rows:
+                break
+            bind.execute(restore, [{"row_id": row_id, "text": _decompress(blob)} for row_id, blob in rows])
+            last = rows[-1][0]
+        op.drop_column(table, f"{column}_z")
@@ -0,0 +1,58 @@
+"""Add the content-addressed job description store.
+
+Revision ID: 036
+Revises: 035
+
+``jd_blobs`` holds each distinct JD once, compressed, keyed by the SHA-256
+of its text. ``job_analyses``, ``batch_items`` and ``inbox_items`` get a
+nullable ``jd_sha256`` foreign key; new writes set it and blank the legacy
+JD columns, existing rows are moved by the background backfill (same as
+035), so the upgrade itself stays instant.
+
+Downgrade copies each blob back into the row's compressed ``*_z`` column
+from 035 first: same blob format, so it is one set-based UPDATE per table
+with no decompression (and no import of app code).
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "036"
+down_revision: str | None = "035"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_COLUMNS = (
+    ("job_analyses", "job_description"),
+    ("batch_items", "job_description"),
+    ("inbox_items", "raw_text"),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jd_blobs",
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("body", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    for table, _column in _COLUMNS:
+        op.add_column(
+            table,
+            sa.Column("jd_sha256", sa.String(64), sa.ForeignKey("jd_blobs.sha256"), nullable=True),
+        )
+        op.create_index(f"ix_{table}_jd_sha256", table, ["jd_sha256"])
+
+
+def downgrade() -> None:
+    blobs = sa.table("jd_blobs", sa.column("sha256"), sa.column("body", sa.LargeBinary()))
+    for table, column in _COLUMNS:
+        t = sa.table(table, sa.column(f"{column}_z", sa.LargeBinary()), sa.column("jd_sha256"))
+        body = sa.select(blobs.c.body).where(blobs.c.sha256 == t.c.jd_sha256).scalar_subquery()
+        op.execute(sa.update(t).where(t.c.jd_sha256.isnot(None)).values({f"{column}_z": body}))
+        op.drop_index(f"ix_{table}_jd_sha256", table_name=table)
+        op.drop_column(table, "jd_sha256")
+    op.drop_table("jd_blobs")
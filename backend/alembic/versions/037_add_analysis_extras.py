@@ -0,0 +1,34 @@
+"""Persist the parsed analysis extras.
+
+Revision ID: 037
+Revises: 036
+
+``rebuild_result`` used to re-parse ``full_response`` on every detail
+view, API call and batch result to recover ``score_label``,
+``potential_score`` & co. They now live in the ``extras`` JSON column,
+filled at write time (``src.analysis.extras``).
+
+Existing rows keep ``extras`` NULL here, so the migration neither imports
+app code nor rewrites the table row by row: the background backfill started
+in the app lifespan (``dashboard.storage.fill_derived_batch``) parses their
+``full_response`` a batch at a time, and ``rebuild_result`` parses it on
+read until then.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "037"
+down_revision: str | None = "036"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("job_analyses", sa.Column("extras", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("job_analyses", "extras")
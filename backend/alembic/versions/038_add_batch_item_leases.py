@@ -0,0 +1,35 @@
+"""Add worker leases to batch_items.
+
+Revision ID: 038
+Revises: 037
+
+Workers claim queue items with ``SELECT ... FOR UPDATE SKIP LOCKED`` and
+hold them under a short lease (``lease_owner`` / ``lease_expires_at``)
+renewed by a heartbeat. A killed worker's items are reclaimed once the
+lease lapses instead of waiting for the 10-minute stale recovery.
+
+Nullable, no backfill: RUNNING rows from before this have no lease and are
+still recovered by ``cleanup_stale_running``.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "038"
+down_revision: str | None = "037"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("batch_items", sa.Column("lease_owner", sa.String(64), nullable=True))
+    op.add_column("batch_items", sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index("idx_batch_items_status_lease", "batch_items", ["status", "lease_expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_batch_items_status_lease", table_name="batch_items")
+    op.drop_column("batch_items", "lease_expires_at")
+    op.drop_column("batch_items", "lease_owner")
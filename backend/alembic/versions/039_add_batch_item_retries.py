@@ -0,0 +1,36 @@
+"""Add retry scheduling and the ``dead`` status to batch_items.
+
+Revision ID: 039
+Revises: 038
+
+Transient failures (timeouts, 429 / 5xx / 529) no longer send an item
+straight to ``error``: it goes back to ``pending`` with ``next_attempt_at``
+set by an exponential backoff with jitter, and ends in the ``dead``
+dead-letter state once ``BATCH_MAX_ATTEMPTS`` is reached. Permanent
+failures still become ``error`` at once.
+
+Nullable, no backfill: existing items are claimable as before.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "039"
+down_revision: str | None = "038"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Same as 034: ADD VALUE outside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE batchitemstatus ADD VALUE IF NOT EXISTS 'dead'")
+    op.add_column("batch_items", sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("batch_items", "next_attempt_at")
+    # Postgres can't drop an enum value: dead items fall back to error.
+    op.execute("UPDATE batch_items SET status = 'error' WHERE status = 'dead'")
@@ -0,0 +1,40 @@
+"""Add budget_reservations for concurrent-safe AI spending.
+
+Revision ID: 040
+Revises: 039
+
+``check_budget_available`` compared the spent total with the budget before
+a call and ``add_spending`` charged only after it, so concurrent workers
+(batch, inbox, WorldWild) could all pass the gate together and overshoot.
+Each AI call now reserves its estimated cost here first (under a lock on
+the ``app_settings`` row) and settles it to the actual cost afterwards.
+
+Short-lived rows, no backfill.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "040"
+down_revision: str | None = "039"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "budget_reservations",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("amount_usd", sa.Float(), nullable=False),
+        sa.Column("settled", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("idx_budget_reservations_expires", "budget_reservations", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_budget_reservations_expires", table_name="budget_reservations")
+    op.drop_table("budget_reservations")
@@ -0,0 +1,113 @@
+"""Append-only AI spend ledger with per-day, per-model rollups.
+
+Revision ID: 041
+Revises: 040
+
+``add_spending`` used to read, reset the daily counters and UPDATE the
+singleton ``app_settings`` row on every AI call: with batch, inbox and
+WorldWild workers in parallel that one row was the lock hotspot. Charges
+are now INSERTs into ``ai_spend_events``, folded incrementally into
+``ai_spend_daily`` (day × model) by ``roll_up_spending``.
+
+The ``app_settings.total_*`` counters stay as the opening balance. Today's
+legacy ``today_*`` counters move into an ``ai_spend_daily`` row (model
+``''``) and out of the opening balance, so the day is neither lost nor
+counted twice.
+"""
+
+from collections.abc import Sequence
+from datetime import date
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "041"
+down_revision: str | None = "040"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _spend_columns() -> list[sa.Column]:
+    return [
+        sa.Column("cost_usd", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("tokens_input", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tokens_output", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("analyses", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("cover_letters", sa.Integer(), nullable=False, server_default="0"),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ai_spend_events",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("spent_on", sa.Date(), nullable=False),
+        sa.Column("model", sa.String(50), nullable=False, server_default=""),
+        *_spend_columns(),
+        sa.Column("rolled_up", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("idx_ai_spend_events_rolled_up", "ai_spend_events", ["rolled_up"])
+    op.create_table(
+        "ai_spend_daily",
+        sa.Column("spent_on", sa.Date(), primary_key=True),
+        sa.Column("model", sa.String(50), primary_key=True, server_default=""),
+        *_spend_columns(),
+    )
+
+    bind = op.get_bind()
+    row = bind.execute(
+        sa.text(
+            "SELECT id, today_date, today_cost_usd, today_tokens_input, today_tokens_output, today_analyses "
+            "FROM app_settings ORDER BY id LIMIT 1"
+        )
+    ).fetchone()
+    if row is None or not row.today_date:
+        return
+    cost = float(row.today_cost_usd or 0)
+    tokens_in, tokens_out, analyses = (
+        int(v or 0) for v in (row.today_tokens_input, row.today_tokens_output, row.today_analyses)
+    )
+    if not (cost or tokens_in or tokens_out or analyses):
+        return
+    bind.execute(
+        sa.text(
+            "INSERT INTO ai_spend_daily (spent_on, model, cost_usd, tokens_input, tokens_output, analyses, cover_letters) "
+            "VALUES (:day, '', :cost, :tin, :tout, :analyses, 0)"
+        ),
+        {
+            "day": date.fromisoformat(row.today_date),
+            "cost": cost,
+            "tin": tokens_in,
+            "tout": tokens_out,
+            "analyses": analyses,
+        },
+    )
+    bind.execute(
+        sa.text(
+            "UPDATE app_settings SET total_cost_usd = total_cost_usd - :cost, "
+            "total_tokens_input = total_tokens_input - :tin, total_tokens_output = total_tokens_output - :tout, "
+            "total_analyses = total_analyses - :analyses WHERE id = :id"
+        ),
+        {"cost": cost, "tin": tokens_in, "tout": tokens_out, "analyses": analyses, "id": row.id},
+    )
+
+
+def downgrade() -> None:
+    # Fold the ledger back into the opening balance so no spend is lost.
+    op.execute(
+        "UPDATE app_settings SET "
+        "total_cost_usd = total_cost_usd + (SELECT COALESCE(SUM(cost_usd), 0) FROM ai_spend_daily) "
+        "+ (SELECT COALESCE(SUM(cost_usd), 0) FROM ai_spend_events WHERE NOT rolled_up), "
+        "total_tokens_input = total_tokens_input + (SELECT COALESCE(SUM(tokens_input), 0) FROM ai_spend_daily) "
+        "+ (SELECT COALESCE(SUM(tokens_input), 0) FROM ai_spend_events WHERE NOT rolled_up), "
+        "total_tokens_output = total_tokens_output + (SELECT COALESCE(SUM(tokens_output), 0) FROM ai_spend_daily) "
+        "+ (SELECT COALESCE(SUM(tokens_output), 0) FROM ai_spend_events WHERE NOT rolled_up), "
+        "total_analyses = total_analyses + (SELECT COALESCE(SUM(analyses), 0) FROM ai_spend_daily) "
+        "+ (SELECT COALESCE(SUM(analyses), 0) FROM ai_spend_events WHERE NOT rolled_up), "
+        "total_cover_letters = total_cover_letters + (SELECT COALESCE(SUM(cover_letters), 0) FROM ai_spend_daily) "
+        "+ (SELECT COALESCE(SUM(cover_letters), 0) FROM ai_spend_events WHERE NOT rolled_up)"
+    )
+    op.drop_table("ai_spend_daily")
+    op.drop_index("idx_ai_spend_events_rolled_up", table_name="ai_spend_events")
+    op.drop_table("ai_spend_events")
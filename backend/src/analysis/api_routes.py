@@ -8,29 +8,49 @@ Endpoint usati dal frontend SPA-light (vanilla JS + ``window.fetchJSON``):
   cover_letters/interviews (in modello via ``cascade="all, delete-orphan"``).
 - ``POST /api/v1/analyze`` — JSON alternative al form HTML, usata da
   Chrome extension + MCP server. Ritorna analysis_id + status, no redirect.
+- ``POST /api/v1/analyze/stream`` — stessa analisi in streaming SSE per la
+  pagina ``/analyze``: score/company/role/strengths arrivano appena il
+  campo del tool input è completo, poi ``done`` con il redirect.
 - ``POST /api/v1/analysis/import`` — pre-computed import dal MCP (esegue
   analisi offline e poi POSTa il risultato già fatto al server).
 """
 
+import json
 import logging
+import queue
+import threading
+from collections.abc import Iterator
 from datetime import UTC, date, datetime, timedelta
 from typing import Annotated, Any, cast
 from uuid import UUID
 
 from fastapi import APIRouter, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from ..audit.service import audit
+from ..audit.service import audit, audit_commit, audit_rollback
 from ..config import settings
 from ..cover_letter.models import CoverLetter
+from ..cv.models import CVProfile
 from ..cv.service import get_latest_cv
 from ..dashboard.service import add_spending, check_budget_available, remove_spending
 from ..dependencies import Cache, CurrentUser, DbSession, validate_uuid
-from ..integrations.anthropic_client import MODELS, content_hash
+from ..integrations.anthropic_client import MODELS, ClientDisconnectedError, cancel_on_disconnect
+from ..jd_store.service import purge_orphan_jds
 from ..rate_limit import limiter
+from .extras import extract_extras
 from .models import AnalysisSource, AnalysisStatus, JobAnalysis
 from .schemas import AnalysisImportRequest, AnalyzeRequest
-from .service import analyze_and_charge, find_existing_analysis, get_analysis_by_id, update_status
+from .service import (
+    aanalyze_and_charge,
+    analyze_and_charge,
+    find_analysis_for_jd,
+    find_existing_analysis,
+    find_near_duplicate,
+    get_analysis_by_id,
+    jd_fingerprint_columns,
+    update_status,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -72,18 +92,16 @@ def _reverse_analysis_spending(db: "DbSession", analysis: JobAnalysis, today: da
     strict no. Cast li risolve in un singolo punto invece che 12.
     """
     created = cast("datetime | None", analysis.created_at)
-    a_today = bool(created and created.date() == today)
     cover_letters = db.query(CoverLetter).filter(CoverLetter.analysis_id == analysis.id).all()
     for cl in cover_letters:
         cl_created = cast("datetime | None", cl.created_at)
-        cl_today = bool(cl_created and cl_created.date() == today)
         remove_spending(
             db,
             cast(float, cl.cost_usd) or 0.0,
             cast(int, cl.tokens_input) or 0,
             cast(int, cl.tokens_output) or 0,
             is_analysis=False,
-            created_today=cl_today,
+            spent_on=cl_created.date() if cl_created else today,
         )
     remove_spending(
         db,
@@ -91,20 +109,19 @@ def _reverse_analysis_spending(db: "DbSession", analysis: JobAnalysis, today: da
         cast(int, analysis.tokens_input) or 0,
         cast(int, analysis.tokens_output) or 0,
         is_analysis=True,
-        created_today=a_today,
+        spent_on=created.date() if created else today,
+        model=cast(str, analysis.model_used) or "",
     )
 
 
-@router.post("/analyze")
-@limiter.limit(settings.rate_limit_analyze)
-def analyze_api(
-    request: Request,
-    body: AnalyzeRequest,
-    db: DbSession,
-    user: CurrentUser,
-    cache: Cache,
-) -> JSONResponse:
-    """Run analysis via JSON API (AJAX). Returns redirect URL."""
+def _analyze_preflight(
+    request: Request, body: AnalyzeRequest, db: "DbSession", user: "CurrentUser"
+) -> CVProfile | JSONResponse:
+    """CV/size/budget/dedup checks shared by the blocking and streaming analyze.
+
+    Returns the CV when the AI call should run, or the JSON error /
+    cached-redirect response to return as-is.
+    """
     cv = get_latest_cv(db, cast(UUID, user.id))
     if not cv:
         return JSONResponse({"error": "Salva prima il tuo CV!"}, status_code=400)
@@ -119,37 +136,171 @@ def analyze_api(
     if not budget_ok:
         return JSONResponse({"error": budget_msg}, status_code=400)
 
-    ch = content_hash(cast(str, cv.raw_text), body.job_description)
     model_id = MODELS.get(body.model, MODELS["haiku"])
-    existing = find_existing_analysis(db, ch, model_id)
+    existing = find_analysis_for_jd(db, cast(str, cv.raw_text), body.job_description, model_id)
 
     if existing:
         audit(db, request, "analyze_cache", f"id={existing.id}")
         db.commit()
         return JSONResponse({"ok": True, "redirect": f"/analysis/{existing.id}", "cached": True})
 
+    near = None if body.force_new else find_near_duplicate(db, body.job_description, cast(UUID, cv.id), model_id)
+    if near:
+        # Offer, don't impose: the client asks the user and re-posts with
+        # ``force_new`` if they still want a fresh analysis.
+        analysis, score = near
+        audit(db, request, "analyze_near_dup", f"id={analysis.id}, similarity={score:.3f}")
+        db.commit()
+        return JSONResponse({"ok": True, "near_duplicate": _near_duplicate_payload(analysis, score)})
+    return cv
+
+
+def _near_duplicate_payload(analysis: JobAnalysis, score: float) -> dict[str, Any]:
+    """What the UI needs to offer reusing a near-identical earlier analysis."""
+    created_at = cast(datetime | None, analysis.created_at)
+    return {
+        "analysis_id": str(analysis.id),
+        "redirect": f"/analysis/{analysis.id}",
+        "similarity": round(score, 3),
+        "company": analysis.company or "",
+        "role": analysis.role or "",
+        "score": analysis.score or 0,
+        "created_at": created_at.isoformat() if created_at else "",
+    }
+
+
+@router.post("/analyze")
+@limiter.limit(settings.rate_limit_analyze)
+async def analyze_api(
+    request: Request,
+    body: AnalyzeRequest,
+    db: DbSession,
+    user: CurrentUser,
+    cache: Cache,
+) -> JSONResponse:
+    """Run analysis via JSON API (AJAX). Returns redirect URL.
+
+    ``async``: the Claude call is awaited on the event loop; DB work hops to
+    the thread pool (see ``aanalyze_and_charge``).
+    """
+    cv = await run_in_threadpool(_analyze_preflight, request, body, db, user)
+    if isinstance(cv, JSONResponse):
+        return cv
+
     try:
-        analysis, _result = analyze_and_charge(
+        with cancel_on_disconnect(request.is_disconnected):
+            analysis, _result = await aanalyze_and_charge(
+                db,
+                cast(str, cv.raw_text),
+                cast(UUID, cv.id),
+                body.job_description,
+                body.job_url,
+                body.model,
+                cache,
+                user_id=cast(UUID, user.id),
+                source=AnalysisSource.API.value,
+            )
+        # Read before the commit expires the row (no lazy refresh on the loop).
+        redirect = f"/analysis/{analysis.id}"
+        await run_in_threadpool(
+            audit_commit,
             db,
-            cast(str, cv.raw_text),
-            cast(UUID, cv.id),
-            body.job_description,
-            body.job_url,
-            body.model,
-            cache,
-            user_id=cast(UUID, user.id),
-            source=AnalysisSource.API.value,
+            request,
+            "analyze",
+            f"id={analysis.id}, company={analysis.company}, score={analysis.score}",
         )
-        audit(db, request, "analyze", f"id={analysis.id}, company={analysis.company}, score={analysis.score}")
-        db.commit()
+    except ClientDisconnectedError:
+        # Nobody is waiting for the page any more: nothing persisted or charged.
+        # 499 = nginx "client closed request", for the access log only.
+        await run_in_threadpool(audit_rollback, db, request, "analyze_cancelled", "client disconnected")
+        return JSONResponse({"error": "client disconnected"}, status_code=499)
     except Exception as exc:
-        db.rollback()
-        audit(db, request, "analyze_error", str(exc))
-        db.commit()
+        await run_in_threadpool(audit_rollback, db, request, "analyze_error", str(exc))
         logger.exception("AI analysis failed")
         return JSONResponse({"error": "Analisi AI non disponibile, riprova."}, status_code=500)
 
-    return JSONResponse({"ok": True, "redirect": f"/analysis/{analysis.id}"})
+    return JSONResponse({"ok": True, "redirect": redirect})
+
+
+# Tool-input fields forwarded to the browser while the analysis streams:
+# enough for a preview card, not the whole 8k-token payload twice.
+_STREAM_PREVIEW_FIELDS = frozenset(
+    {"company", "role", "location", "work_mode", "score", "score_label", "recommendation", "summary", "strengths"}
+)
+
+
+def _sse_frame(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/analyze/stream")
+@limiter.limit(settings.rate_limit_analyze)
+def analyze_stream(
+    request: Request,
+    body: AnalyzeRequest,
+    db: DbSession,
+    user: CurrentUser,
+    cache: Cache,
+) -> Response:
+    """Streaming variant of ``/analyze``: preview fields over SSE, then redirect.
+
+    Same preflight as :func:`analyze_api` (errors and cache hits come back
+    as plain JSON). Otherwise the response is ``text/event-stream``:
+    ``field`` frames (``{"name", "value"}``) as each preview field of the
+    forced tool call completes, then ``done`` (``{"redirect"}``) or
+    ``error``. The analysis runs on a worker thread that the stream joins
+    on exit, so a tab closed mid-stream still gets its row persisted and
+    the DB session is never closed under the worker.
+    """
+    cv = _analyze_preflight(request, body, db, user)
+    if isinstance(cv, JSONResponse):
+        return cv
+    frames: queue.Queue[str | None] = queue.Queue()
+
+    def _on_field(name: str, value: Any) -> None:
+        if name in _STREAM_PREVIEW_FIELDS:
+            frames.put(_sse_frame("field", {"name": name, "value": value}))
+
+    def _work() -> None:
+        try:
+            analysis, _result = analyze_and_charge(
+                db,
+                cast(str, cv.raw_text),
+                cast(UUID, cv.id),
+                body.job_description,
+                body.job_url,
+                body.model,
+                cache,
+                user_id=cast(UUID, user.id),
+                source=AnalysisSource.API.value,
+                on_field=_on_field,
+            )
+            audit(db, request, "analyze", f"id={analysis.id}, company={analysis.company}, score={analysis.score}")
+            db.commit()
+            frames.put(_sse_frame("done", {"redirect": f"/analysis/{analysis.id}"}))
+        except Exception as exc:
+            db.rollback()
+            audit(db, request, "analyze_error", str(exc))
+            db.commit()
+            logger.exception("AI analysis failed (stream)")
+            frames.put(_sse_frame("error", {"error": "Analisi AI non disponibile, riprova."}))
+        finally:
+            frames.put(None)
+
+    def _stream() -> Iterator[str]:
+        worker = threading.Thread(target=_work, name="analyze-stream", daemon=True)
+        worker.start()
+        try:
+            while (frame := frames.get()) is not None:
+                yield frame
+        finally:
+            worker.join()
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/analysis/latest")
@@ -285,6 +436,7 @@ def import_analysis(
         job_description=body.job_description,
         job_url=body.job_url,
         content_hash=body.content_hash,
+        **jd_fingerprint_columns(body.job_description),
         job_summary=body.job_summary,
         company=body.company,
         role=body.role,
@@ -299,6 +451,7 @@ def import_analysis(
         advice=body.advice,
         company_reputation=body.company_reputation,
         full_response=body.full_response,
+        extras=extract_extras(body.full_response),
         model_used=body.model_used,
         tokens_input=body.tokens_input,
         tokens_output=body.tokens_output,
@@ -308,7 +461,7 @@ def import_analysis(
     db.add(analysis)
     db.flush()
 
-    add_spending(db, body.cost_usd, body.tokens_input, body.tokens_output)
+    add_spending(db, body.cost_usd, body.tokens_input, body.tokens_output, model=body.model_used)
     audit(db, request, "import_analysis", f"id={analysis.id}, company={body.company}, score={body.score}")
     db.commit()
 
@@ -356,6 +509,8 @@ def cleanup_analyses(
     for analysis in candidates:
         _reverse_analysis_spending(db, analysis, today)
         db.delete(analysis)
+    db.flush()
+    purge_orphan_jds(db)
 
     sample_ids = [str(a.id) for a in candidates[:5]]
     audit(db, request, "cleanup", f"deleted={count}, days={days}, max_score={max_score}, sample={sample_ids}")
@@ -0,0 +1,56 @@
+"""Campi extra dell'analisi senza una colonna dedicata.
+
+``score_label``, ``potential_score``, ``gap_timeline`` & co. arrivano dal
+modello ma non hanno colonne proprie: prima venivano ripescati da
+``full_response`` a ogni lettura (strip dei fence markdown, ``json.loads``
+ritentato su sottostringhe). Ora vengono estratti una volta sola in
+scrittura e salvati nella colonna JSON ``extras``; ``rebuild_result`` li
+proietta così come sono.
+
+Le righe precedenti alla migrazione 037 vengono riempite dal backfill in
+background (``dashboard.storage.fill_derived_batch``); fino ad allora
+``rebuild_result`` ripiega sul parsing di ``full_response``.
+"""
+
+import json
+from typing import Any, cast
+
+EXTRA_KEYS = (
+    "score_label",
+    "potential_score",
+    "gap_timeline",
+    "confidence",
+    "confidence_reason",
+    "summary",
+    "application_method",
+)
+
+
+def parse_full_response(raw: str | None) -> dict[str, Any]:
+    """Parse stored full_response JSON, handling markdown wrapping."""
+    if not raw:
+        return {}
+    text = raw.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
+    try:
+        return cast(dict[str, Any], json.loads(text))
+    except (json.JSONDecodeError, TypeError):
+        start, end = text.find("{"), text.rfind("}")
+        if start != -1 and end > start:
+            try:
+                return cast(dict[str, Any], json.loads(text[start : end + 1]))
+            except (json.JSONDecodeError, TypeError):
+                pass
+    return {}
+
+
+def extract_extras(full_response: str | None, result: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Subset of :data:`EXTRA_KEYS` to persist in ``extras``.
+
+    Values in ``result`` (the validated AI output) win over the ones parsed
+    from ``full_response``; live analyses leave ``full_response`` empty.
+    """
+    parsed = parse_full_response(full_response)
+    source = {**(parsed if isinstance(parsed, dict) else {}), **(result or {})}
+    return {key: source[key] for key in EXTRA_KEYS if key in source}
@@ -0,0 +1,69 @@
+"""MinHash fingerprint of job descriptions for near-duplicate detection.
+
+``content_hash`` cattura solo coppie CV+JD identiche al byte: lo stesso
+annuncio incollato da LinkedIn e da Indeed, o con un footer diverso,
+produce un hash nuovo e una nuova analisi a pagamento. Qui il JD viene
+ridotto a shingle di 3 parole normalizzate (NFKC, casefold, niente
+punteggiatura) e a una firma MinHash di ``SIGNATURE_SIZE`` valori: la
+frazione di valori uguali fra due firme stima la similarità di Jaccard
+dei due insiemi di shingle.
+
+Per il lookup la firma è spezzata in ``BAND_COUNT`` bande da
+``BAND_ROWS`` valori (LSH): ogni banda diventa un bucket indicizzato in
+``job_analysis_minhash_bands``. Due JD con Jaccard 0.95 condividono
+almeno un bucket con probabilità ~1 - 3e-8; a Jaccard 0.5 solo nel ~6%
+dei casi, quindi i candidati da verificare restano pochi.
+"""
+
+import hashlib
+import random
+import re
+import unicodedata
+
+SIGNATURE_SIZE = 128
+BAND_COUNT = 16
+BAND_ROWS = SIGNATURE_SIZE // BAND_COUNT
+_SHINGLE_WORDS = 3
+
+# Universal hashing h_i(x) = (a_i * x + b_i) mod p over a Mersenne prime.
+# Fixed seed: signatures are persisted, so the permutations must never change.
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x4A0B)  # noqa: S311 — deterministic permutations, not crypto
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(SIGNATURE_SIZE)]
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _shingles(text: str) -> set[str]:
+    """Word 3-shingles of the normalized text — markup and spacing differences vanish."""
+    words = _WORD_RE.findall(unicodedata.normalize("NFKC", text).casefold())
+    if len(words) <= _SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + _SHINGLE_WORDS]) for i in range(len(words) - _SHINGLE_WORDS + 1)}
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def minhash(text: str) -> list[int] | None:
+    """MinHash signature of the JD. ``None`` when the text has no words."""
+    hashes = [_hash64(s) for s in _shingles(text)]
+    if not hashes:
+        return None
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_buckets(signature: list[int]) -> list[int]:
+    """One signed 32-bit bucket per LSH band (fits a plain ``INTEGER`` column)."""
+    buckets = []
+    for band in range(BAND_COUNT):
+        rows = signature[band * BAND_ROWS : (band + 1) * BAND_ROWS]
+        digest = hashlib.blake2b(",".join(map(str, rows)).encode(), digest_size=4).digest()
+        buckets.append(int.from_bytes(digest, "big", signed=True))
+    return buckets
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of two signatures (1.0 = same shingle set)."""
+    return sum(x == y for x, y in zip(a, b, strict=True)) / SIGNATURE_SIZE
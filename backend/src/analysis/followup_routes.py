@@ -1,22 +1,29 @@
-"""Follow-up email and LinkedIn message routes."""
+"""Follow-up email, LinkedIn message and outreach bundle routes.
+
+The generators are ``async def``: the Claude call runs on the
+``AsyncAnthropic`` client, DB reads/writes hop to the thread pool.
+``/outreach-bundle`` produces cover letter + email + LinkedIn message in
+a single call and saves the letter like ``/cover-letter`` does.
+"""
 
 import logging
-from datetime import UTC, datetime
-from typing import Annotated, cast
+from typing import Annotated, Any, cast
 from uuid import UUID
 
 from fastapi import APIRouter, Form, Request
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
-from ..audit.service import audit
+from ..audit.service import audit, audit_commit
 from ..config import settings
-from ..contacts.models import Contact
+from ..contacts.service import contact_summary
+from ..cover_letter.service import agenerate_outreach, persist_cover_letter
 from ..cv.service import get_latest_cv
-from ..dashboard.service import add_spending
+from ..dashboard.service import add_spending, check_budget_available
 from ..dependencies import Cache, CurrentUser, DbSession, validate_uuid
-from ..integrations.anthropic_client import generate_followup_email, generate_linkedin_message
+from ..integrations.anthropic_client import agenerate_followup_email, agenerate_linkedin_message
 from ..rate_limit import limiter
-from .service import get_analysis_by_id
+from .service import days_since_application, get_analysis_by_id
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +32,35 @@ _ANALYSIS_NOT_FOUND_MSG = "Analysis not found"
 router = APIRouter(tags=["followup"])
 
 
+def _load_context(db: "DbSession", user: "CurrentUser", analysis_id: str) -> tuple[Any, Any, JSONResponse | None]:
+    """Fetch analysis + latest CV for a draft, or the 404 to return."""
+    validate_uuid(analysis_id)
+    analysis = get_analysis_by_id(db, analysis_id, user_id=cast(UUID, user.id))
+    if not analysis:
+        return None, None, JSONResponse({"error": _ANALYSIS_NOT_FOUND_MSG}, status_code=404)
+
+    cv = get_latest_cv(db, cast(UUID, user.id))
+    if not cv:
+        return None, None, JSONResponse({"error": "CV not found"}, status_code=404)
+    return analysis, cv, None
+
+
+def _charge_and_audit(db: "DbSession", request: Request, result: dict[str, Any], action: str, detail: str) -> None:
+    add_spending(
+        db,
+        result.get("cost_usd", 0.0),
+        result.get("tokens", {}).get("input", 0),
+        result.get("tokens", {}).get("output", 0),
+        is_analysis=False,
+        model=result.get("model_used", ""),
+        reservations=result.get("budget_reservations", ()),
+    )
+    audit_commit(db, request, action, detail)
+
+
 @router.post("/followup-email")
 @limiter.limit(settings.rate_limit_analyze)
-def create_followup_email(
+async def create_followup_email(
     request: Request,
     db: DbSession,
     user: CurrentUser,
@@ -37,19 +70,14 @@ def create_followup_email(
     model: Annotated[str, Form()] = "haiku",
 ) -> JSONResponse:
     """Generate an AI-drafted follow-up email for a candidature."""
-    validate_uuid(analysis_id)
-    analysis = get_analysis_by_id(db, analysis_id, user_id=cast(UUID, user.id))
-    if not analysis:
-        return JSONResponse({"error": _ANALYSIS_NOT_FOUND_MSG}, status_code=404)
+    analysis, cv, early = await run_in_threadpool(_load_context, db, user, analysis_id)
+    if early is not None:
+        return early
 
-    cv = get_latest_cv(db, cast(UUID, user.id))
-    if not cv:
-        return JSONResponse({"error": "CV not found"}, status_code=404)
-
-    days_since = (datetime.now(UTC) - analysis.applied_at).days if analysis.applied_at else 7
+    days_since = days_since_application(analysis)
 
     try:
-        result = generate_followup_email(
+        result = await agenerate_followup_email(
             cast(str, cv.raw_text),
             cast(str, analysis.role),
             cast(str, analysis.company),
@@ -60,25 +88,23 @@ def create_followup_email(
         )
     except Exception as exc:
         logger.exception("Follow-up email generation failed")
-        audit(db, request, "followup_email_error", str(exc))
-        db.commit()
+        await run_in_threadpool(audit_commit, db, request, "followup_email_error", str(exc))
         return JSONResponse({"error": "Generazione email non disponibile, riprova."}, status_code=500)
 
-    add_spending(
+    await run_in_threadpool(
+        _charge_and_audit,
         db,
-        result.get("cost_usd", 0.0),
-        result.get("tokens", {}).get("input", 0),
-        result.get("tokens", {}).get("output", 0),
-        is_analysis=False,
+        request,
+        result,
+        "followup_email",
+        f"analysis={analysis_id}, company={analysis.company}",
     )
-    audit(db, request, "followup_email", f"analysis={analysis_id}, company={analysis.company}")
-    db.commit()
     return JSONResponse({"ok": True, **result})
 
 
 @router.post("/linkedin-message")
 @limiter.limit(settings.rate_limit_analyze)
-def create_linkedin_message(
+async def create_linkedin_message(
     request: Request,
     db: DbSession,
     user: CurrentUser,
@@ -88,27 +114,14 @@ def create_linkedin_message(
     model: Annotated[str, Form()] = "haiku",
 ) -> JSONResponse:
     """Generate an AI-drafted LinkedIn message for a candidature."""
-    validate_uuid(analysis_id)
-    analysis = get_analysis_by_id(db, analysis_id, user_id=cast(UUID, user.id))
-    if not analysis:
-        return JSONResponse({"error": _ANALYSIS_NOT_FOUND_MSG}, status_code=404)
+    analysis, cv, early = await run_in_threadpool(_load_context, db, user, analysis_id)
+    if early is not None:
+        return early
 
-    cv = get_latest_cv(db, cast(UUID, user.id))
-    if not cv:
-        return JSONResponse({"error": "CV not found"}, status_code=404)
-
-    contact = db.query(Contact).filter(Contact.analysis_id == analysis.id).first()
-    contact_info = ""
-    if contact:
-        parts = []
-        if contact.name:
-            parts.append(f"Nome: {contact.name}")
-        if contact.linkedin_url:
-            parts.append(f"LinkedIn: {contact.linkedin_url}")
-        contact_info = ", ".join(parts)
+    contact_info = await run_in_threadpool(contact_summary, db, cast(UUID, analysis.id))
 
     try:
-        result = generate_linkedin_message(
+        result = await agenerate_linkedin_message(
             cast(str, cv.raw_text),
             cast(str, analysis.role),
             cast(str, analysis.company),
@@ -119,22 +132,82 @@ def create_linkedin_message(
         )
     except Exception as exc:
         logger.exception("LinkedIn message generation failed")
-        audit(db, request, "linkedin_msg_error", str(exc))
-        db.commit()
+        await run_in_threadpool(audit_commit, db, request, "linkedin_msg_error", str(exc))
         return JSONResponse({"error": "Generazione messaggio non disponibile, riprova."}, status_code=500)
 
-    add_spending(
+    await run_in_threadpool(
+        _charge_and_audit,
         db,
-        result.get("cost_usd", 0.0),
-        result.get("tokens", {}).get("input", 0),
-        result.get("tokens", {}).get("output", 0),
-        is_analysis=False,
+        request,
+        result,
+        "linkedin_message",
+        f"analysis={analysis_id}, company={analysis.company}",
     )
-    audit(db, request, "linkedin_message", f"analysis={analysis_id}, company={analysis.company}")
-    db.commit()
     return JSONResponse({"ok": True, **result})
 
 
+def _save_outreach(
+    db: "DbSession", request: Request, analysis: Any, language: str, result: dict[str, Any], detail: str
+) -> str:
+    """Persist the bundle's cover letter (carrying the whole call's cost) and charge the ledger once."""
+    letter = {
+        **result["cover_letter"],
+        "model_used": result.get("model_used", ""),
+        "tokens": result.get("tokens", {}),
+        "cost_usd": result.get("cost_usd", 0.0),
+    }
+    cover_letter = persist_cover_letter(db, analysis, language, letter)
+    _charge_and_audit(db, request, result, "outreach_bundle", detail)
+    return str(cover_letter.id)
+
+
+@router.post("/outreach-bundle")
+@limiter.limit(settings.rate_limit_analyze)
+async def create_outreach_bundle(
+    request: Request,
+    db: DbSession,
+    user: CurrentUser,
+    cache: Cache,
+    analysis_id: Annotated[str, Form()],
+    language: Annotated[str, Form()] = "italiano",
+    model: Annotated[str, Form()] = "haiku",
+) -> JSONResponse:
+    """Cover letter + follow-up email + LinkedIn message in one AI call."""
+    analysis, cv, early = await run_in_threadpool(_load_context, db, user, analysis_id)
+    if early is not None:
+        return early
+    budget_ok, budget_msg = await run_in_threadpool(check_budget_available, db)
+    if not budget_ok:
+        return JSONResponse({"error": budget_msg}, status_code=402)
+
+    contact_info = await run_in_threadpool(contact_summary, db, cast(UUID, analysis.id))
+    try:
+        result = await agenerate_outreach(
+            analysis,
+            cast(str, cv.raw_text),
+            days_since_application(analysis),
+            contact_info,
+            language,
+            model,
+            cache,
+        )
+    except Exception as exc:
+        logger.exception("Outreach bundle generation failed")
+        await run_in_threadpool(audit_commit, db, request, "outreach_bundle_error", str(exc))
+        return JSONResponse({"error": "Generazione pacchetto non disponibile, riprova."}, status_code=500)
+
+    cover_letter_id = await run_in_threadpool(
+        _save_outreach,
+        db,
+        request,
+        analysis,
+        language,
+        result,
+        f"analysis={analysis_id}, company={analysis.company}, lang={language}",
+    )
+    return JSONResponse({"ok": True, "cover_letter_id": cover_letter_id, **result})
+
+
 @router.post("/followup-done/{analysis_id}")
 def mark_followup_done(
     request: Request,
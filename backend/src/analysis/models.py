@@ -12,13 +12,17 @@ from sqlalchemy import (
     Float,
     ForeignKey,
     Index,
+    LargeBinary,
     String,
     Text,
+    false,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..database.base import Base
+from ..database.compression import compressed_text
+from ..jd_store.models import jd_text
 
 if TYPE_CHECKING:
     from ..contacts.models import Contact
@@ -76,9 +80,19 @@ class JobAnalysis(Base):
         ForeignKey("cv_profiles.id", ondelete="CASCADE"),
         nullable=False,
     )
-    job_description: Mapped[str] = mapped_column(Text, nullable=False)
+    # The JD lives once in ``jd_blobs`` (see jd_store), full_response is
+    # zlib-compressed in ``full_response_z`` (see database.compression). The
+    # Text / ``*_z`` JD columns only hold rows written before migrations
+    # 035 / 036 until the background backfill reaches them.
+    jd_sha256: Mapped[str | None] = mapped_column(String(64), ForeignKey("jd_blobs.sha256"), nullable=True, index=True)
+    _job_description_plain: Mapped[str] = mapped_column("job_description", Text, nullable=False, default="")
+    job_description_z: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    job_description = jd_text("_job_description_plain", "job_description_z")
     job_url: Mapped[str | None] = mapped_column(String(500), default="")
     content_hash: Mapped[str | None] = mapped_column(String(64), default="", index=True)
+    # MinHash signature of job_description (see analysis.fingerprint); its LSH
+    # buckets live in job_analysis_minhash_bands for the near-duplicate lookup.
+    jd_minhash: Mapped[list[int] | None] = mapped_column(JSON, nullable=True)
 
     # Job metadata extracted by AI
     job_summary: Mapped[str | None] = mapped_column(Text, default="")
@@ -109,6 +123,9 @@ class JobAnalysis(Base):
     gaps: Mapped[list[Any] | None] = mapped_column(JSON, default=list)
     interview_scripts: Mapped[list[Any] | None] = mapped_column(JSON, default=list)
     advice: Mapped[str | None] = mapped_column(Text, default="")
+    # True until interview_scripts/advice are generated on first view
+    # (``ensure_analysis_details``); legacy and imported rows have them.
+    details_pending: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
     company_reputation: Mapped[dict[str, Any] | None] = mapped_column(JSON, default=dict)
     salary_data: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     company_news: Mapped[list[Any] | None] = mapped_column(JSON, nullable=True)
@@ -117,12 +134,19 @@ class JobAnalysis(Base):
     benefits: Mapped[list[Any] | None] = mapped_column(JSON, nullable=True)
     recruiter_info: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     experience_required: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
-    full_response: Mapped[str | None] = mapped_column(Text, default="")
+    _full_response_plain: Mapped[str | None] = mapped_column("full_response", Text, default="")
+    full_response_z: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    full_response = compressed_text("_full_response_plain", "full_response_z", nullable=True)
+    # score_label, potential_score, ... (analysis.extras.EXTRA_KEYS) parsed once at
+    # write time: rebuild_result projects them without touching full_response.
+    extras: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
 
     # Cost tracking
     model_used: Mapped[str | None] = mapped_column(String(50), default="")
     tokens_input: Mapped[int | None] = mapped_column(default=0)
     tokens_output: Mapped[int | None] = mapped_column(default=0)
+    # Subset of tokens_input served from the Anthropic prompt cache (CV prefix).
+    tokens_cache_read: Mapped[int | None] = mapped_column(default=0)
     cost_usd: Mapped[float | None] = mapped_column(Float, default=0.0)
 
     # Timestamps
@@ -148,6 +172,10 @@ class JobAnalysis(Base):
         cascade=_CASCADE_ALL_DELETE_ORPHAN,
         order_by="Interview.round_number",
     )
+    minhash_bands: Mapped[list["JobAnalysisMinHashBand"]] = relationship(
+        back_populates="analysis",
+        cascade=_CASCADE_ALL_DELETE_ORPHAN,
+    )
 
     @property
     def interview(self) -> "Interview | None":
@@ -169,6 +197,28 @@ class JobAnalysis(Base):
     )
 
 
+class JobAnalysisMinHashBand(Base):
+    """One LSH bucket of a ``JobAnalysis.jd_minhash`` signature.
+
+    Near-duplicate lookup = rows sharing any ``(band, bucket)`` with the
+    new JD, verified on the full signature afterwards.
+    """
+
+    __tablename__ = "job_analysis_minhash_bands"
+
+    analysis_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("job_analyses.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    band: Mapped[int] = mapped_column(primary_key=True)
+    bucket: Mapped[int] = mapped_column(nullable=False)
+
+    analysis: Mapped["JobAnalysis"] = relationship(back_populates="minhash_bands")
+
+    __table_args__ = (Index("idx_minhash_bands_band_bucket", "band", "bucket"),)
+
+
 class AppSettings(Base):
     """Singleton row for app-wide settings and running totals."""
 
@@ -177,14 +227,15 @@ class AppSettings(Base):
     id: Mapped[int] = mapped_column(primary_key=True, default=1)
     anthropic_budget: Mapped[float | None] = mapped_column(Float, default=0.0)
 
-    # Running totals (updated on each insert/delete)
+    # Opening balance: spend recorded before the ai_spend_events ledger
+    # (migration 041). No longer updated; see dashboard.service.add_spending.
     total_cost_usd: Mapped[float | None] = mapped_column(Float, default=0.0)
     total_tokens_input: Mapped[int | None] = mapped_column(default=0)
     total_tokens_output: Mapped[int | None] = mapped_column(default=0)
     total_analyses: Mapped[int | None] = mapped_column(default=0)
     total_cover_letters: Mapped[int | None] = mapped_column(default=0)
 
-    # Daily counters (auto-reset on date change)
+    # Legacy daily counters, superseded by the ai_spend_daily rollup.
     today_date: Mapped[str | None] = mapped_column(String(10), default="")
     today_cost_usd: Mapped[float | None] = mapped_column(Float, default=0.0)
     today_tokens_input: Mapped[int | None] = mapped_column(default=0)
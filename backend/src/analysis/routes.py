@@ -1,13 +1,16 @@
 """Analysis HTML routes — SSR Jinja2 per ``/analyze``, ``/analysis/{id}``.
 
 Form ``/analyze`` accetta il job description + URL e instrada verso
-``analyze_and_charge``: URL dedup (stesso URL già visto → mostra
+``aanalyze_and_charge``: URL dedup (stesso URL già visto → mostra
 cached), content_hash dedup (testo equivalente → riusa analisi), budget
 gate (rifiuta se Anthropic budget exhausted), audit log.
 
 ``/analysis/{id}`` mostra il detail con risultati AI, contacts,
 cover_letters ordinate newest-first, interview rounds, status transition
-buttons. Le route API (PATCH status, DELETE) vivono in ``api_routes.py``.
+buttons; ``/analysis/{id}/details`` e' il frammento consiglio + domande di
+colloquio, generati alla prima apertura della sezione (la pagina non
+aspetta mai Claude). Le route API (PATCH status, DELETE) vivono in
+``api_routes.py``.
 """
 
 from datetime import datetime
@@ -16,20 +19,24 @@ from uuid import UUID
 
 from fastapi import APIRouter, Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from starlette.concurrency import run_in_threadpool
 
-from ..audit.service import audit
+from ..audit.service import audit, audit_commit, audit_rollback
 from ..config import settings
+from ..cv.models import CVProfile
 from ..cv.service import get_latest_cv
 from ..dashboard.service import check_budget_available
 from ..dependencies import Cache, CurrentUser, DbSession
-from ..integrations.anthropic_client import MODELS, content_hash
+from ..integrations.anthropic_client import MODELS, ClientDisconnectedError, cancel_on_disconnect
 from ..rate_limit import limiter
-from .models import AnalysisSource
+from .models import AnalysisSource, AnalysisStatus, JobAnalysis
 from .service import (
-    analyze_and_charge,
+    aanalyze_and_charge,
+    aensure_analysis_details,
+    find_analysis_for_jd,
     find_by_company,
     find_by_url,
-    find_existing_analysis,
+    find_near_duplicate,
     get_analysis_by_id,
     rebuild_result,
 )
@@ -39,32 +46,34 @@ router = APIRouter(tags=["analysis"])
 _ANALYZE_PATH = "/analyze"
 
 
-@router.post(_ANALYZE_PATH, response_class=HTMLResponse)
-@limiter.limit(settings.rate_limit_analyze)
-def analyze(
+def _analyze_form_preflight(
     request: Request,
-    db: DbSession,
-    user: CurrentUser,
-    cache: Cache,
-    job_description: Annotated[str, Form()],
-    job_url: Annotated[str, Form()] = "",
-    model: Annotated[str, Form()] = "haiku",
-) -> Response:
-    """Submit a job description for AI analysis against the user's CV."""
+    db: "DbSession",
+    user: "CurrentUser",
+    job_description: str,
+    job_url: str,
+    model: str,
+    force_new: bool = False,
+) -> tuple[CVProfile | None, Response | None]:
+    """CV/size/budget/dedup checks of the ``/analyze`` form.
+
+    Returns ``(cv, None)`` when the AI call should run, otherwise
+    ``(None, redirect)`` with the flash message already set.
+    """
     cv = get_latest_cv(db, cast(UUID, user.id))
 
     if not cv:
         request.session["flash_error"] = "Salva prima il tuo CV!"
-        return RedirectResponse(url=_ANALYZE_PATH, status_code=303)
+        return None, RedirectResponse(url=_ANALYZE_PATH, status_code=303)
 
     if len(job_description) > settings.max_job_desc_size:
         request.session["flash_error"] = f"Descrizione troppo lunga (max {settings.max_job_desc_size} caratteri)"
-        return RedirectResponse(url=_ANALYZE_PATH, status_code=303)
+        return None, RedirectResponse(url=_ANALYZE_PATH, status_code=303)
 
     budget_ok, budget_msg = check_budget_available(db)
     if not budget_ok:
         request.session["flash_error"] = budget_msg
-        return RedirectResponse(url=_ANALYZE_PATH, status_code=303)
+        return None, RedirectResponse(url=_ANALYZE_PATH, status_code=303)
 
     # URL dedup: same job posting pasted again (even with different JD text).
     if job_url:
@@ -74,57 +83,151 @@ def analyze(
             request.session["flash_message"] = (
                 f"URL già analizzato il {cast(datetime, existing_url.created_at).strftime('%d/%m/%Y %H:%M')} - mostro il risultato salvato"
             )
-            return RedirectResponse(url=f"/analysis/{existing_url.id}", status_code=303)
+            return None, RedirectResponse(url=f"/analysis/{existing_url.id}", status_code=303)
 
-    ch = content_hash(cast(str, cv.raw_text), job_description)
     model_id = MODELS.get(model, MODELS["haiku"])
-    existing = find_existing_analysis(db, ch, model_id)
+    existing = find_analysis_for_jd(db, cast(str, cv.raw_text), job_description, model_id)
 
     if existing:
         audit(db, request, "analyze_cache", f"id={existing.id}")
         request.session["flash_message"] = (
             f"Analisi gia' eseguita il {cast(datetime, existing.created_at).strftime('%d/%m/%Y %H:%M')} - mostro il risultato salvato"
         )
-        return RedirectResponse(url=f"/analysis/{existing.id}", status_code=303)
+        return None, RedirectResponse(url=f"/analysis/{existing.id}", status_code=303)
+
+    near = None if force_new else find_near_duplicate(db, job_description, cast(UUID, cv.id), model_id)
+    if near:
+        similar, score = near
+        audit(db, request, "analyze_near_dup", f"id={similar.id}, similarity={score:.3f}")
+        request.session["flash_message"] = (
+            f"Annuncio simile al {score:.0%} gia' analizzato il "
+            f"{cast(datetime, similar.created_at).strftime('%d/%m/%Y %H:%M')} - mostro il risultato salvato"
+        )
+        return None, RedirectResponse(url=f"/analysis/{similar.id}", status_code=303)
+    return cv, None
+
+
+@router.post(_ANALYZE_PATH, response_class=HTMLResponse)
+@limiter.limit(settings.rate_limit_analyze)
+async def analyze(
+    request: Request,
+    db: DbSession,
+    user: CurrentUser,
+    cache: Cache,
+    job_description: Annotated[str, Form()],
+    job_url: Annotated[str, Form()] = "",
+    model: Annotated[str, Form()] = "haiku",
+    force_new: Annotated[bool, Form()] = False,
+) -> Response:
+    """Submit a job description for AI analysis against the user's CV."""
+    cv, early = await run_in_threadpool(
+        _analyze_form_preflight, request, db, user, job_description, job_url, model, force_new
+    )
+    if early is not None:
+        return early
+    cv = cast(CVProfile, cv)
 
     try:
-        analysis, _result = analyze_and_charge(
+        with cancel_on_disconnect(request.is_disconnected):
+            analysis, _result = await aanalyze_and_charge(
+                db,
+                cast(str, cv.raw_text),
+                cast(UUID, cv.id),
+                job_description,
+                job_url,
+                model,
+                cache,
+                user_id=cast(UUID, user.id),
+                source=AnalysisSource.COWORK.value,  # HTML form from /analyze = cowork paste flow
+            )
+        # Read before the commit expires the row (no lazy refresh on the loop).
+        redirect = f"/analysis/{analysis.id}"
+        await run_in_threadpool(
+            audit_commit,
             db,
-            cast(str, cv.raw_text),
-            cast(UUID, cv.id),
-            job_description,
-            job_url,
-            model,
-            cache,
-            user_id=cast(UUID, user.id),
-            source=AnalysisSource.COWORK.value,  # HTML form from /analyze = cowork paste flow
+            request,
+            "analyze",
+            f"id={analysis.id}, company={analysis.company}, score={analysis.score}",
         )
-        audit(db, request, "analyze", f"id={analysis.id}, company={analysis.company}, score={analysis.score}")
-        db.commit()
+    except ClientDisconnectedError:
+        # Nobody is waiting for the page any more: nothing persisted or charged.
+        # 499 = nginx "client closed request", for the access log only.
+        await run_in_threadpool(audit_rollback, db, request, "analyze_cancelled", "client disconnected")
+        return Response(status_code=499)
     except Exception as exc:
-        db.rollback()
-        audit(db, request, "analyze_error", str(exc))
-        db.commit()
+        await run_in_threadpool(audit_rollback, db, request, "analyze_error", str(exc))
         request.session["flash_error"] = "Analisi AI fallita, riprova più tardi."
         return RedirectResponse(url=_ANALYZE_PATH, status_code=303)
 
-    return RedirectResponse(url=f"/analysis/{analysis.id}", status_code=303)
+    return RedirectResponse(url=redirect, status_code=303)
+
+
+def _details_wanted(db: "DbSession", analysis: JobAnalysis) -> bool:
+    """Whether opening the details section should generate them.
+
+    Not for rejected rows (nobody prepares an interview for them) nor once
+    the budget is spent.
+    """
+    if not analysis.details_pending or analysis.status == AnalysisStatus.REJECTED.value:
+        return False
+    budget_ok, _msg = check_budget_available(db)
+    return budget_ok
 
 
 @router.get("/analysis/{analysis_id}", response_class=HTMLResponse)
-def view_analysis(
+async def view_analysis(
     request: Request,
     analysis_id: str,
     db: DbSession,
     user: CurrentUser,
 ) -> Response:
-    """Render the detail page for a single analysis."""
-    from ..contacts.service import get_contacts_for_analysis
-    from ..interview.service import get_interview_by_analysis
+    """Render the detail page for a single analysis.
 
-    analysis = get_analysis_by_id(db, analysis_id, user_id=cast(UUID, user.id))
+    Never waits on Claude: rows still lacking advice and interview scripts
+    get a placeholder section, filled by ``analysis_details`` when the user
+    opens it.
+    """
+    analysis = await run_in_threadpool(get_analysis_by_id, db, analysis_id, cast(UUID, user.id))
     if not analysis:
         return RedirectResponse(url="/history", status_code=303)
+    return cast(Response, await run_in_threadpool(_render_analysis_detail, request, db, user, analysis))
+
+
+@router.get("/analysis/{analysis_id}/details", response_class=HTMLResponse)
+async def analysis_details(
+    request: Request,
+    analysis_id: str,
+    db: DbSession,
+    user: CurrentUser,
+    cache: Cache,
+) -> Response:
+    """HTML fragment with advice + interview scripts of an analysis.
+
+    Fetched client-side when the user opens the section; the first request
+    on a pending row generates them (see ``ensure_analysis_details``).
+    """
+    user_id = cast(UUID, user.id)
+    analysis = await run_in_threadpool(get_analysis_by_id, db, analysis_id, user_id)
+    if not analysis:
+        return HTMLResponse(status_code=404)
+
+    if await run_in_threadpool(_details_wanted, db, analysis) and await aensure_analysis_details(
+        db, analysis, cache, user_id=user_id
+    ):
+        await run_in_threadpool(db.commit)
+    return cast(Response, await run_in_threadpool(_render_analysis_details, request, analysis))
+
+
+def _render_analysis_details(request: Request, analysis: JobAnalysis) -> Response:
+    templates = request.app.state.templates
+    return templates.TemplateResponse(  # type: ignore[no-any-return]
+        request, "partials/analysis_details.html", {"current": analysis}
+    )
+
+
+def _render_analysis_detail(request: Request, db: "DbSession", user: "CurrentUser", analysis: JobAnalysis) -> Response:
+    from ..contacts.service import get_contacts_for_analysis
+    from ..interview.service import get_interview_by_analysis
 
     result = rebuild_result(analysis)
     interview = get_interview_by_analysis(db, cast(UUID, analysis.id))
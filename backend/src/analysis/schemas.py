@@ -19,6 +19,8 @@ class AnalyzeRequest(BaseModel):
     job_description: str = Field(..., min_length=50, max_length=50_000)
     job_url: str = Field("", max_length=500)
     model: ModelChoice = ModelChoice.HAIKU
+    # Skip the near-duplicate reuse offer and always run a fresh analysis.
+    force_new: bool = False
 
 
 class AnalysisImportRequest(BaseModel):
@@ -8,26 +8,47 @@ batch worker, MCP import) altrimenti duplicherebbe:
 - ``analyze_and_charge()`` aggiunge l'aggiornamento atomico del ledger
   costi (``dashboard.service.add_spending``) per non far divergere il
   totale speso dai costi reali delle call AI;
-- helper di lookup/transition (``find_by_url``, ``update_status``,
-  ``rebuild_result``, ``count_pending_analyses``) usati da pagine e
-  notification center.
+- ``ensure_analysis_details()`` genera al primo bisogno (pagina di
+  dettaglio, ``/interview-prep``) le sezioni lunghe che la prima call non
+  chiede più: interview_scripts e advice;
+- helper di lookup/transition (``find_by_url``, ``find_near_duplicate``,
+  ``update_status``, ``rebuild_result``, ``count_pending_analyses``) usati
+  da pagine e notification center.
 
 Out of scope: budget gate, dedup pre-call (URL/content_hash), session
 commit/rollback, audit logging — restano responsabilità del caller.
 """
 
-import json
+import logging
 from datetime import UTC, datetime, timedelta
 from typing import Any, cast
 from uuid import UUID
 
-from sqlalchemy import func
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import Session
-
-from ..integrations.anthropic_client import analyze_job
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..integrations.anthropic_client import (
+    MODELS,
+    FieldCallback,
+    aanalyze_job,
+    agenerate_analysis_details,
+    analyze_job,
+    content_hash,
+    generate_analysis_details,
+)
 from ..integrations.cache import CacheService
 from ..integrations.glassdoor import fetch_glassdoor_rating
-from .models import AnalysisSource, AnalysisStatus, JobAnalysis
+from ..jd_store.service import jd_seen, legacy_analyses_pending
+from .extras import extract_extras
+from .fingerprint import band_buckets, minhash, similarity
+from .models import AnalysisSource, AnalysisStatus, JobAnalysis, JobAnalysisMinHashBand
+
+logger = logging.getLogger(__name__)
+
+# Cap on rows sharing an LSH bucket that get their signature compared.
+_NEAR_DUP_MAX_CANDIDATES = 50
 
 
 def count_pending_analyses(db: Session) -> int:
@@ -41,6 +62,19 @@ def count_pending_analyses(db: Session) -> int:
     return db.query(func.count(JobAnalysis.id)).filter(JobAnalysis.status == AnalysisStatus.PENDING.value).scalar() or 0
 
 
+def find_analysis_for_jd(db: Session, cv_text: str, job_description: str, model_id: str) -> JobAnalysis | None:
+    """Exact dedup (same CV + JD + model) for a new JD.
+
+    A JD never stored before can't have an analysis: that common case costs
+    one primary-key probe on ``jd_blobs`` instead of the hash lookup. Until
+    the backfill has moved every pre-036 analysis into ``jd_blobs`` an
+    unseen JD may still match a legacy row, so the hash lookup runs anyway.
+    """
+    if not jd_seen(db, job_description) and not legacy_analyses_pending(db):
+        return None
+    return find_existing_analysis(db, content_hash(cv_text, job_description), model_id)
+
+
 def find_existing_analysis(db: Session, hash_value: str, model_id: str) -> JobAnalysis | None:
     """Find an existing analysis with the same content hash and model."""
     return (
@@ -54,6 +88,61 @@ def find_existing_analysis(db: Session, hash_value: str, model_id: str) -> JobAn
     )
 
 
+def jd_fingerprint_columns(job_description: str) -> dict[str, Any]:
+    """``JobAnalysis`` kwargs for the MinHash signature + LSH buckets of a JD."""
+    signature = minhash(job_description)
+    if signature is None:
+        return {"jd_minhash": None}
+    return {
+        "jd_minhash": signature,
+        "minhash_bands": [
+            JobAnalysisMinHashBand(band=band, bucket=bucket) for band, bucket in enumerate(band_buckets(signature))
+        ],
+    }
+
+
+def find_near_duplicate(
+    db: Session, job_description: str, cv_id: UUID, model_id: str
+) -> tuple[JobAnalysis, float] | None:
+    """Find the most similar earlier analysis of a near-identical JD (same CV and model).
+
+    Complements :func:`find_existing_analysis`: the same posting pasted
+    from another job board, or with a different footer, has a new
+    ``content_hash`` but almost the same shingle set. Returns
+    ``(analysis, similarity)`` when the estimated Jaccard similarity
+    reaches ``settings.near_duplicate_similarity``; ties go to the most
+    recent row.
+    """
+    threshold = settings.near_duplicate_similarity
+    signature = minhash(job_description)
+    if threshold <= 0 or signature is None:
+        return None
+    bucket_match = or_(
+        *(
+            and_(JobAnalysisMinHashBand.band == band, JobAnalysisMinHashBand.bucket == bucket)
+            for band, bucket in enumerate(band_buckets(signature))
+        )
+    )
+    candidate_ids = select(JobAnalysisMinHashBand.analysis_id).where(bucket_match)
+    candidates = (
+        db.query(JobAnalysis)
+        .filter(
+            JobAnalysis.id.in_(candidate_ids),
+            JobAnalysis.cv_id == cv_id,
+            JobAnalysis.model_used == model_id,
+        )
+        .order_by(JobAnalysis.created_at.desc())
+        .limit(_NEAR_DUP_MAX_CANDIDATES)
+        .all()
+    )
+    best: tuple[JobAnalysis, float] | None = None
+    for candidate in candidates:
+        score = similarity(signature, cast(list[int], candidate.jd_minhash))
+        if score >= threshold and (best is None or score > best[1]):
+            best = (candidate, score)
+    return best
+
+
 def find_by_url(db: Session, job_url: str) -> JobAnalysis | None:
     """Return the most recent analysis for this exact URL, if any."""
     if not job_url:
@@ -81,6 +170,7 @@ def run_analysis(
     cache: CacheService | None = None,
     user_id: UUID | None = None,
     source: str = AnalysisSource.MANUAL.value,
+    on_field: FieldCallback | None = None,
 ) -> tuple[JobAnalysis, dict[str, Any]]:
     """Run a new analysis and persist it.
 
@@ -88,8 +178,31 @@ def run_analysis(
     pass an explicit value from :class:`AnalysisSource` so the backlog
     notification center can split "N da valutare" cards per ingestion
     channel (extension / cowork / mcp / api).
+
+    ``on_field`` receives the tool-input fields while the AI call streams
+    (used by ``POST /api/v1/analyze/stream``).
+    """
+    result = analyze_job(cv_text, job_description, model, cache, db=db, user_id=user_id, on_field=on_field)
+    analysis = persist_analysis(db, cv_id, job_description, job_url, result, cache, source)
+    return analysis, result
+
+
+def persist_analysis(
+    db: Session,
+    cv_id: UUID,
+    job_description: str,
+    job_url: str,
+    result: dict[str, Any],
+    cache: CacheService | None = None,
+    source: str = AnalysisSource.MANUAL.value,
+) -> JobAnalysis:
+    """Enrich an ``analyze_job``-shaped result and insert the ``JobAnalysis`` row.
+
+    Split out of :func:`run_analysis` so paths that obtain the AI payload
+    some other way (the batch bulk mode via Message Batches) persist rows
+    exactly like the interactive flow: Glassdoor merge, same column
+    mapping, same SSE nudge.
     """
-    result = analyze_job(cv_text, job_description, model, cache, db=db, user_id=user_id)
     _merge_glassdoor(result, db, cache)
     # Salary and news are fetched on-demand from the UI (not auto) to save
     # RapidAPI quota — 400 responses for Italian locations and strange titles
@@ -98,6 +211,7 @@ def run_analysis(
     analysis = JobAnalysis(
         cv_id=cv_id,
         job_description=job_description,
+        **jd_fingerprint_columns(job_description),
         job_url=job_url,
         content_hash=result.get("content_hash", ""),
         job_summary=result.get("job_summary", ""),
@@ -112,6 +226,7 @@ def run_analysis(
         gaps=result.get("gaps", []),
         interview_scripts=result.get("interview_scripts", []),
         advice=result.get("advice", ""),
+        details_pending=bool(result.get("details_pending")),
         company_reputation=result.get("company_reputation", {}),
         salary_data=result.get("salary_data") or None,
         company_news=result.get("company_news") or None,
@@ -122,9 +237,11 @@ def run_analysis(
         recruiter_info=result.get("recruiter_info") or None,
         experience_required=result.get("experience_required") or None,
         full_response=result.get("full_response", ""),
+        extras=extract_extras(result.get("full_response"), result),
         model_used=result.get("model_used", ""),
         tokens_input=result.get("tokens", {}).get("input", 0),
         tokens_output=result.get("tokens", {}).get("output", 0),
+        tokens_cache_read=result.get("tokens", {}).get("cache_read", 0),
         cost_usd=result.get("cost_usd", 0.0),
         source=source,
     )
@@ -135,7 +252,7 @@ def run_analysis(
     from ..notification_center.sse import broadcast_sync
 
     broadcast_sync("analysis:new")
-    return analysis, result
+    return analysis
 
 
 def analyze_and_charge(
@@ -148,6 +265,7 @@ def analyze_and_charge(
     cache: "CacheService | None" = None,
     user_id: UUID | None = None,
     source: str = AnalysisSource.MANUAL.value,
+    on_field: FieldCallback | None = None,
 ) -> tuple[JobAnalysis, dict[str, Any]]:
     """Run a new analysis and update the spending ledger atomically.
 
@@ -173,7 +291,41 @@ def analyze_and_charge(
         cache,
         user_id=user_id,
         source=source,
+        on_field=on_field,
     )
+    _charge(db, result)
+    return analysis, result
+
+
+async def aanalyze_and_charge(
+    db: Session,
+    cv_text: str,
+    cv_id: UUID,
+    job_description: str,
+    job_url: str,
+    model: str,
+    cache: "CacheService | None" = None,
+    user_id: UUID | None = None,
+    source: str = AnalysisSource.MANUAL.value,
+) -> tuple[JobAnalysis, dict[str, Any]]:
+    """Async :func:`analyze_and_charge` per le route ``async def``.
+
+    La call Claude gira sull'``AsyncAnthropic`` client (event loop, nessun
+    thread occupato per 10–30 s); insert + ledger restano sync e vanno sul
+    thread pool in un unico passaggio breve.
+    """
+    result = await aanalyze_job(cv_text, job_description, model, cache, db=db, user_id=user_id)
+
+    def _persist_and_charge() -> JobAnalysis:
+        analysis = persist_analysis(db, cv_id, job_description, job_url, result, cache, source)
+        _charge(db, result)
+        return analysis
+
+    return await run_in_threadpool(_persist_and_charge), result
+
+
+def _charge(db: Session, result: dict[str, Any]) -> None:
+    """Propaga costo e token di un risultato AI nel ledger spese."""
     from ..dashboard.service import add_spending
 
     add_spending(
@@ -181,19 +333,79 @@ def analyze_and_charge(
         float(result.get("cost_usd", 0.0) or 0),
         int(result.get("tokens", {}).get("input", 0) or 0),
         int(result.get("tokens", {}).get("output", 0) or 0),
+        model=result.get("model_used", ""),
+        reservations=result.get("budget_reservations", ()),
     )
-    return analysis, result
 
 
-_REBUILD_EXTRA_KEYS = (
-    "score_label",
-    "potential_score",
-    "gap_timeline",
-    "confidence",
-    "confidence_reason",
-    "summary",
-    "application_method",
-)
+def _details_request(analysis: JobAnalysis) -> tuple[str, str, dict[str, Any], str]:
+    """``(cv_text, job_description, triage_data, model)`` for the details call."""
+    model_key = next((key for key, model_id in MODELS.items() if model_id == analysis.model_used), "haiku")
+    return (
+        cast(str, analysis.cv.raw_text) or "",
+        cast(str, analysis.job_description) or "",
+        rebuild_result(analysis),
+        model_key,
+    )
+
+
+def _apply_details(db: Session, analysis: JobAnalysis, details: dict[str, Any]) -> None:
+    """Store the generated sections, add their cost to the row and the ledger."""
+    tokens = details.get("tokens", {})
+    analysis.interview_scripts = details.get("interview_scripts", [])
+    analysis.advice = details.get("advice", "")
+    analysis.details_pending = False
+    analysis.tokens_input = (analysis.tokens_input or 0) + tokens.get("input", 0)
+    analysis.tokens_output = (analysis.tokens_output or 0) + tokens.get("output", 0)
+    analysis.tokens_cache_read = (analysis.tokens_cache_read or 0) + tokens.get("cache_read", 0)
+    analysis.cost_usd = round((analysis.cost_usd or 0.0) + details.get("cost_usd", 0.0), 6)
+    _charge(db, details)
+    db.flush()
+
+
+def ensure_analysis_details(
+    db: Session,
+    analysis: JobAnalysis,
+    cache: CacheService | None = None,
+    user_id: UUID | None = None,
+) -> bool:
+    """Generate interview_scripts + advice if the row still lacks them.
+
+    Returns True when the row changed (caller commits). A failed AI call
+    leaves the row pending — the page renders without the sections and
+    the next view retries.
+    """
+    if not analysis.details_pending:
+        return False
+    cv_text, job_description, triage, model = _details_request(analysis)
+    try:
+        details = generate_analysis_details(cv_text, job_description, triage, model, cache, db=db, user_id=user_id)
+    except Exception:
+        logger.warning("Analysis details generation failed for %s", analysis.id, exc_info=True)
+        return False
+    _apply_details(db, analysis, details)
+    return True
+
+
+async def aensure_analysis_details(
+    db: Session,
+    analysis: JobAnalysis,
+    cache: CacheService | None = None,
+    user_id: UUID | None = None,
+) -> bool:
+    """Async :func:`ensure_analysis_details`: the Claude wait stays on the event loop."""
+    if not analysis.details_pending:
+        return False
+    cv_text, job_description, triage, model = await run_in_threadpool(_details_request, analysis)
+    try:
+        details = await agenerate_analysis_details(
+            cv_text, job_description, triage, model, cache, db=db, user_id=user_id
+        )
+    except Exception:
+        logger.warning("Analysis details generation failed for %s", analysis.id, exc_info=True)
+        return False
+    await run_in_threadpool(_apply_details, db, analysis, details)
+    return True
 
 
 def _tokens_payload(analysis: JobAnalysis) -> dict[str, int]:
@@ -209,6 +421,7 @@ def _tokens_payload(analysis: JobAnalysis) -> dict[str, int]:
         "input": tokens_input,
         "output": tokens_output,
         "total": tokens_input + tokens_output,
+        "cache_read": cast(int, analysis.tokens_cache_read) or 0,
     }
 
 
@@ -250,6 +463,7 @@ def _base_result(analysis: JobAnalysis, from_cache: bool) -> dict[str, Any]:
         "job_summary": analysis.job_summary,
         **_ai_fields_payload(analysis),
         "summary": "",
+        "details_pending": bool(analysis.details_pending),
         "model_used": analysis.model_used,
         "tokens": _tokens_payload(analysis),
         "cost_usd": analysis.cost_usd or 0.0,
@@ -260,10 +474,11 @@ def _base_result(analysis: JobAnalysis, from_cache: bool) -> dict[str, Any]:
 def rebuild_result(analysis: JobAnalysis, from_cache: bool = False) -> dict[str, Any]:
     """Rebuild the full result dict from a stored analysis row."""
     result = _base_result(analysis, from_cache)
-    full = _parse_full_response(cast(str, analysis.full_response))
-    for key in _REBUILD_EXTRA_KEYS:
-        if key in full:
-            result[key] = full[key]
+    if analysis.extras is None:
+        # Written before 037 and not reached by the backfill yet.
+        result.update(extract_extras(analysis.full_response))
+    else:
+        result.update(analysis.extras)
     return result
 
 
@@ -281,6 +496,11 @@ def update_status(db: Session, analysis: JobAnalysis, new_status: AnalysisStatus
     broadcast_sync("analysis:status")
 
 
+def days_since_application(analysis: JobAnalysis) -> int:
+    """Days since the user applied; 7 when the application date is unknown."""
+    return (datetime.now(UTC) - analysis.applied_at).days if analysis.applied_at else 7
+
+
 def get_analysis_by_id(db: Session, analysis_id: str, user_id: UUID | None = None) -> JobAnalysis | None:
     """Fetch a single analysis by UUID, optionally scoped to the user that owns the CV.
 
@@ -405,22 +625,3 @@ def _merge_glassdoor(result: dict[str, Any], db: Session, cache: CacheService |
     count_fmt = f"{review_count:,}".replace(",", ".") if review_count else "n/d"
     rep["note"] = f"Fonte: Glassdoor ({count_fmt} recensioni)"
     result["company_reputation"] = rep
-
-
-def _parse_full_response(raw: str) -> dict[str, Any]:
-    """Parse stored full_response JSON, handling markdown wrapping."""
-    if not raw:
-        return {}
-    text = raw.strip()
-    if text.startswith("```"):
-        text = text.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
-    try:
-        return cast(dict[str, Any], json.loads(text))
-    except (json.JSONDecodeError, TypeError):
-        start, end = text.find("{"), text.rfind("}")
-        if start != -1 and end > start:
-            try:
-                return cast(dict[str, Any], json.loads(text[start : end + 1]))
-            except (json.JSONDecodeError, TypeError):
-                pass
-    return {}
@@ -47,6 +47,22 @@ def audit(db: Session, request: Request, action: str, detail: str = "", user_id:
     )
 
 
+def audit_commit(db: Session, request: Request, action: str, detail: str = "") -> None:
+    """:func:`audit` + ``db.commit()`` in one call.
+
+    For ``async def`` routes, which hand sync DB work to the thread pool:
+    one hop instead of two.
+    """
+    audit(db, request, action, detail)
+    db.commit()
+
+
+def audit_rollback(db: Session, request: Request, action: str, detail: str = "") -> None:
+    """Roll back the failed unit of work, then record ``action`` and commit."""
+    db.rollback()
+    audit_commit(db, request, action, detail)
+
+
 def dual_audit(
     primary_db: Session,
     secondary_db: Session,
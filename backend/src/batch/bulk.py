@@ -0,0 +1,248 @@
+"""Batch bulk mode — drain the queue through the Anthropic Message Batches API.
+
+For large backlogs (WorldWild promotions, re-analysis after a prompt bump)
+one HTTP call per item is the bottleneck. Bulk mode instead:
+
+1. ``submit_bulk`` sends every PENDING item of a batch as one message batch,
+   using exactly the interactive request (``build_analysis_request``: same
+   prompts, same ``submit_analysis`` tool schema), and marks the items
+   RUNNING with the returned ``bulk_batch_id``;
+2. ``collect_bulk`` polls the message batch and, once it has ended, fans
+   each result back into a ``JobAnalysis`` row via ``persist_analysis`` and
+   records the item through the usual ``_record_success`` /
+   ``_record_failure`` helpers.
+
+Message batches are billed at 50% of the interactive price but may take
+minutes to hours, so bulk items are excluded from ``cleanup_stale_running``
+and ``run_bulk`` resumes any batch still open from a previous process.
+"""
+
+import logging
+import time
+import uuid as uuid_mod
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any, cast
+from uuid import UUID
+
+import anthropic
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from ..analysis.service import persist_analysis
+from ..cv.service import get_latest_cv
+from ..integrations.anthropic_client import build_analysis_request, get_client, parse_batch_analysis
+from ..integrations.cache import CacheService
+from .models import BatchItem, BatchItemStatus
+from .service import _mark_items_error, _record_failure, _record_success, _release_lease, _try_skip_dedup
+
+logger = logging.getLogger(__name__)
+
+# Anthropic processes most message batches within minutes; polling faster
+# than this only burns requests against the RPM limit.
+_BULK_POLL_INTERVAL_SECONDS = 30
+
+# Message batches expire after 24h on Anthropic's side — stop polling then.
+_BULK_MAX_WAIT_SECONDS = 24 * 3600
+
+# Lease held by a bulk submit on the items it claimed, covering dedup and
+# the ``messages.batches.create`` call. There is no heartbeat: it has to
+# outlast a slow submit, else workers would reclaim the items mid-call.
+_BULK_SUBMIT_LEASE_SECONDS = 600
+
+
+def open_bulk_batches(db: Session) -> list[str]:
+    """Return the message batch ids that still have RUNNING items."""
+    rows = (
+        db.query(BatchItem.bulk_batch_id)
+        .filter(BatchItem.status == BatchItemStatus.RUNNING, BatchItem.bulk_batch_id.isnot(None))
+        .distinct()
+        .all()
+    )
+    return [cast(str, r[0]) for r in rows]
+
+
+def _claim_for_bulk(db: Session, batch_id: str) -> list[BatchItem]:
+    """Atomically move the due PENDING items of ``batch_id`` to RUNNING under a bulk lease. Commits.
+
+    Same conditional UPDATE as ``claim_next_item``, for the whole batch at
+    once; the items the UPDATE won are the ones carrying the lease owner.
+    """
+    now = datetime.now(UTC)
+    owner = f"bulk:{uuid_mod.uuid4().hex[:12]}"
+    db.execute(
+        update(BatchItem)
+        .where(
+            BatchItem.batch_id == batch_id,
+            BatchItem.status == BatchItemStatus.PENDING,
+            or_(BatchItem.next_attempt_at.is_(None), BatchItem.next_attempt_at <= now),
+        )
+        .values(
+            status=BatchItemStatus.RUNNING,
+            lease_owner=owner,
+            lease_expires_at=now + timedelta(seconds=_BULK_SUBMIT_LEASE_SECONDS),
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return db.query(BatchItem).filter(BatchItem.lease_owner == owner).populate_existing().all()
+
+
+def submit_bulk(
+    db: Session,
+    batch_id: str,
+    user_id: UUID,
+    client: anthropic.Anthropic | None = None,
+) -> str | None:
+    """Submit all PENDING items of ``batch_id`` as one message batch.
+
+    The items are claimed first (:func:`_claim_for_bulk`), so standing
+    workers can't pick them up while the submit is in flight; if the
+    submit fails they go back to PENDING. Dedup runs next, exactly like
+    the interactive worker: items whose content hash already has an
+    analysis become SKIPPED and are not sent. Returns the message batch
+    id, or None when nothing was left to submit.
+    """
+    items = _claim_for_bulk(db, batch_id)
+    if not items:
+        return None
+
+    cv = get_latest_cv(db, user_id)
+    if not cv:
+        _mark_items_error(db, items, "No CV found")
+        return None
+
+    to_submit = [item for item in items if not _try_skip_dedup(db, item, (cast(str, item.content_hash) or "")[:8])]
+    if not to_submit:
+        return None
+
+    requests = [
+        {
+            "custom_id": str(item.id),
+            "params": build_analysis_request(
+                cast(str, cv.raw_text),
+                cast(str, item.job_description),
+                cast(str, item.model) or "haiku",
+                db=db,
+                user_id=user_id,
+            ),
+        }
+        for item in to_submit
+    ]
+    try:
+        message_batch = (client or get_client()).messages.batches.create(requests=requests)  # type: ignore[arg-type]
+    except Exception:
+        db.rollback()
+        for item in to_submit:
+            item.status = BatchItemStatus.PENDING
+            _release_lease(item)
+        db.commit()
+        raise
+
+    for item in to_submit:
+        item.bulk_batch_id = message_batch.id  # type: ignore[assignment]
+        _release_lease(item)
+    db.commit()
+    logger.info("bulk submitted message_batch=%s batch=%s items=%d", message_batch.id, batch_id, len(to_submit))
+    return cast(str, message_batch.id)
+
+
+def _apply_result(db: Session, item: BatchItem, entry: Any, cache: CacheService | None, started_at: float) -> None:
+    """Persist one message batch entry onto its BatchItem."""
+    ch_short = (cast(str, item.content_hash) or "")[:8]
+    result_type = getattr(entry.result, "type", "unknown")
+    try:
+        if result_type != "succeeded":
+            error = getattr(entry.result, "error", None)
+            raise RuntimeError(f"bulk_{result_type}: {error}" if error else f"bulk_{result_type}")
+        result = parse_batch_analysis(entry.result.message, cast(str, item.content_hash))
+        analysis = persist_analysis(
+            db,
+            cast(UUID, item.cv_id),
+            cast(str, item.job_description),
+            cast(str, item.job_url) or "",
+            result,
+            cache,
+            cast(str, item.source) or "manual",
+        )
+        _record_success(db, item, analysis, result, ch_short, started_at)
+    except Exception as exc:
+        _record_failure(db, item, exc, ch_short, started_at)
+
+
+def collect_bulk(
+    db: Session,
+    message_batch_id: str,
+    cache: CacheService | None = None,
+    client: anthropic.Anthropic | None = None,
+) -> bool:
+    """Fan the results of an ended message batch back into the queue.
+
+    Returns False while the message batch is still processing. Items that
+    the results stream does not mention (should not happen) are marked
+    ERROR so the batch never hangs in RUNNING.
+    """
+    client = client or get_client()
+    message_batch = client.messages.batches.retrieve(message_batch_id)
+    if message_batch.processing_status != "ended":
+        return False
+
+    started_at = time.monotonic()
+    items = {
+        str(item.id): item
+        for item in db.query(BatchItem)
+        .filter(BatchItem.bulk_batch_id == message_batch_id, BatchItem.status == BatchItemStatus.RUNNING)
+        .all()
+    }
+    for entry in client.messages.batches.results(message_batch_id):
+        item = items.pop(entry.custom_id, None)
+        if item is None:
+            continue
+        _apply_result(db, item, entry, cache, started_at)
+
+    if items:
+        _mark_items_error(db, list(items.values()), "bulk_result_missing")
+    logger.info("bulk collected message_batch=%s", message_batch_id)
+    return True
+
+
+def run_bulk(
+    db: Session,
+    user_id: UUID,
+    batch_id: str | None = None,
+    cache: CacheService | None = None,
+    client: anthropic.Anthropic | None = None,
+    poll_interval: float = _BULK_POLL_INTERVAL_SECONDS,
+    sleep: Callable[[float], None] = time.sleep,
+) -> None:
+    """Submit ``batch_id`` (if given) and poll every open message batch to completion.
+
+    Runs as a background task. Message batches left open by a previous
+    process (deploy, crash) are resumed too, since their ids live on the
+    RUNNING items.
+    """
+    client = client or get_client()
+    pending = open_bulk_batches(db)
+    if batch_id:
+        submitted = submit_bulk(db, batch_id, user_id, client)
+        if submitted and submitted not in pending:
+            pending.append(submitted)
+
+    waited = 0.0
+    while pending:
+        for message_batch_id in list(pending):
+            try:
+                if collect_bulk(db, message_batch_id, cache, client):
+                    pending.remove(message_batch_id)
+            except Exception:
+                # Transient API/DB failure: keep the id and retry next tick.
+                db.rollback()
+                logger.exception("bulk poll failed message_batch=%s", message_batch_id)
+        if not pending:
+            break
+        if waited >= _BULK_MAX_WAIT_SECONDS:
+            logger.warning("bulk polling gave up after %ds on %s", int(waited), pending)
+            break
+        sleep(poll_interval)
+        waited += poll_interval
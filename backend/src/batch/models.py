@@ -4,12 +4,13 @@ import enum
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, ForeignKey, Index, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, LargeBinary, String, Text
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..database.base import Base
+from ..jd_store.models import jd_text
 
 
 class BatchItemStatus(enum.StrEnum):
@@ -19,7 +20,9 @@ class BatchItemStatus(enum.StrEnum):
     RUNNING = "running"
     DONE = "done"
     SKIPPED = "skipped"  # dedup: already analyzed
-    ERROR = "error"
+    FILTERED = "filtered"  # triage score below threshold: no full analysis
+    ERROR = "error"  # permanent failure: retrying would fail the same way
+    DEAD = "dead"  # dead letter: transient failures until retries ran out
 
 
 class BatchItem(Base):
@@ -35,8 +38,12 @@ class BatchItem(Base):
         nullable=False,
     )
 
-    # Job data (option B: full JD stored for retry)
-    job_description: Mapped[str] = mapped_column(Text, nullable=False)
+    # Job data (option B: full JD stored for retry), in the shared JD blob
+    # store like ``JobAnalysis.job_description``.
+    jd_sha256: Mapped[str | None] = mapped_column(String(64), ForeignKey("jd_blobs.sha256"), nullable=True, index=True)
+    _job_description_plain: Mapped[str] = mapped_column("job_description", Text, nullable=False, default="")
+    job_description_z: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    job_description = jd_text("_job_description_plain", "job_description_z")
     job_url: Mapped[str | None] = mapped_column(String(500), default="")
     content_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     model: Mapped[str | None] = mapped_column(String(20), default="haiku")
@@ -57,6 +64,14 @@ class BatchItem(Base):
     )
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     attempt_count: Mapped[int | None] = mapped_column(default=0)
+    # Earliest time a PENDING item may be claimed again after a transient
+    # failure (exponential backoff with jitter). NULL = claimable now.
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Triage pass (large backlogs only, see ``settings.ai_triage_min_score``):
+    # the pre-screen score and its one-line reason. NULL when not triaged.
+    triage_score: Mapped[int | None] = mapped_column(nullable=True)
+    triage_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Preview (for status display without re-reading JD)
     preview: Mapped[str | None] = mapped_column(String(100), default="")
@@ -68,6 +83,19 @@ class BatchItem(Base):
     # filter by source missed the rows.
     source: Mapped[str] = mapped_column(String(20), default="manual", nullable=False)
 
+    # Anthropic Message Batches id when the item runs in bulk mode. Set
+    # while the item is RUNNING inside a submitted message batch, so the
+    # poller can fan results back in (and stale-recovery leaves it alone:
+    # a message batch may legitimately take hours).
+    bulk_batch_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+    # Worker lease (``service.claim_next_item``): the worker that claimed the
+    # RUNNING item and until when. The worker's heartbeat keeps pushing
+    # ``lease_expires_at`` forward; once it lapses (worker killed) any other
+    # worker may reclaim the item.
+    lease_owner: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
     # Timestamps
     created_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(UTC))
     updated_at: Mapped[datetime | None] = mapped_column(
@@ -81,4 +109,6 @@ class BatchItem(Base):
         Index("idx_batch_items_content_hash_model", "content_hash", "model"),
         Index("idx_batch_items_cv_id", "cv_id"),
         Index("idx_batch_items_analysis_id", "analysis_id"),
+        Index("idx_batch_items_bulk_batch_id", "bulk_batch_id"),
+        Index("idx_batch_items_status_lease", "status", "lease_expires_at"),
     )
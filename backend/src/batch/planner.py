@@ -0,0 +1,195 @@
+"""Batch planner — cost and ETA of a pending batch, and the budget guard of its run.
+
+``plan_batch`` prices the PENDING items of a batch before ``/batch/run``
+starts them, so the UI can show what the run will cost and how long it
+will take and ask for confirmation:
+
+- input tokens come from the item's JD and the CV, estimated exactly like
+  the RPM/TPM throttle does (system prompt + CV excerpt + full JD);
+- output tokens and per-call latency come from the successful ``analysis``
+  calls of the last week in ``ai_call_metrics`` (per model), with a
+  conservative default while there is no history;
+- the wall time spreads the calls over the batch workers.
+
+While the batch runs, :func:`choose_item_model` is asked before every
+analysis. When the projected spend of the item plus the rest of the queue
+no longer fits the remaining budget, the ``downgrade`` policy moves a
+Sonnet item to Haiku, and an item that doesn't fit even then raises
+``BudgetExceededError``: the worker puts it back in the queue and stops,
+instead of the budget gate failing the tail of the run one item at a time.
+
+Estimates are expected costs, not the upper bound the per-call budget
+reservation holds; triage (when enabled) can only lower them.
+"""
+
+import math
+from collections.abc import Callable
+from typing import Any, cast
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..dashboard.service import BudgetExceededError, remaining_budget
+from ..integrations.anthropic_client import MODELS, PRICING
+from ..integrations.token_bucket import estimate_tokens
+from ..metrics.service import get_ai_call_profile
+from ..prompts import ANALYSIS_SYSTEM_PROMPT
+from .models import BatchItem, BatchItemStatus
+
+BUDGET_POLICIES = frozenset({"stop", "downgrade"})
+
+# ``ai_call_metrics.operation`` of the full analysis call.
+_ANALYSIS_OPERATION = "analysis"
+# CV characters sent with each analysis (same cut as the throttle estimate).
+_CV_PROMPT_CHARS = 12000
+# Until a model has analysis history: a typical full analysis writes ~2.5k
+# tokens; latencies from the Render logs (Haiku 5-10 s, Sonnet 15-25 s).
+_DEFAULT_OUTPUT_TOKENS = 2500
+_DEFAULT_LATENCY_MS = {"haiku": 10_000.0, "sonnet": 25_000.0}
+
+_CostFn = Callable[[str], float]
+
+
+def item_input_tokens(cv_text: str, job_description: str) -> int:
+    """Estimated prompt tokens of the analysis call for one JD."""
+    return estimate_tokens(ANALYSIS_SYSTEM_PROMPT, (cv_text or "")[:_CV_PROMPT_CHARS], job_description or "")
+
+
+def _model_alias(item: BatchItem) -> str:
+    alias = cast(str, item.model) or "haiku"
+    return alias if alias in MODELS else "haiku"
+
+
+def _model_profiles(db: Session) -> dict[str, dict[str, Any]]:
+    """Per model alias: mean output tokens and p50 latency of recent analyses, or the defaults."""
+    profiles = {}
+    for alias, model_id in MODELS.items():
+        history = get_ai_call_profile(db, _ANALYSIS_OPERATION, model_id)
+        if history["calls"]:
+            profiles[alias] = history
+        else:
+            profiles[alias] = {
+                "calls": 0,
+                "output_tokens": float(_DEFAULT_OUTPUT_TOKENS),
+                "p50_ms": _DEFAULT_LATENCY_MS.get(alias, _DEFAULT_LATENCY_MS["sonnet"]),
+            }
+    return profiles
+
+
+def _cost_fn(input_tokens: int, profiles: dict[str, dict[str, Any]]) -> _CostFn:
+    """Expected USD cost of one analysis of ``input_tokens`` prompt tokens, per model alias."""
+
+    def cost(alias: str) -> float:
+        pricing = PRICING[MODELS[alias]]
+        output_tokens = float(profiles[alias]["output_tokens"])
+        return (input_tokens * pricing["input"] + output_tokens * pricing["output"]) / 1_000_000
+
+    return cost
+
+
+def _choose(alias: str, cost: _CostFn, rest: float, left: float | None, policy: str) -> str | None:
+    """Model to run an item on given the projected ``rest`` of the queue, or None when it doesn't fit."""
+    if left is None or cost(alias) + rest <= left:
+        return alias
+    if policy == "downgrade" and alias != "haiku" and cost("haiku") <= left:
+        return "haiku"
+    if cost(alias) <= left:
+        return alias
+    return None
+
+
+def _resolve_policy(policy: str | None) -> str:
+    return policy if policy in BUDGET_POLICIES else settings.batch_budget_policy
+
+
+def _pending_items(db: Session, batch_id: str) -> list[BatchItem]:
+    return (
+        db.query(BatchItem)
+        .filter(BatchItem.batch_id == batch_id, BatchItem.status == BatchItemStatus.PENDING)
+        .order_by(BatchItem.created_at.asc())
+        .all()
+    )
+
+
+def plan_batch(
+    db: Session,
+    batch_id: str,
+    cv_text: str,
+    policy: str | None = None,
+    workers: int | None = None,
+) -> dict[str, Any]:
+    """Estimate cost and wall time of the PENDING items of ``batch_id``.
+
+    Items are walked in claim order with the same decisions the run will
+    take (:func:`choose_item_model`): ``downgraded`` items move to Haiku,
+    ``deferred`` ones don't fit the remaining budget and would stay
+    pending. ``fits`` is True when the run goes through as queued.
+    """
+    policy = _resolve_policy(policy)
+    items = _pending_items(db, batch_id)
+    profiles = _model_profiles(db)
+    budget = remaining_budget(db)
+    left = budget
+
+    costs = [_cost_fn(item_input_tokens(cv_text, cast(str, item.job_description)), profiles) for item in items]
+    queued = [cost(_model_alias(item)) for item, cost in zip(items, costs, strict=True)]
+    by_model: dict[str, dict[str, Any]] = {}
+    total_cost = total_ms = 0.0
+    downgraded = deferred = 0
+    for index, (item, cost) in enumerate(zip(items, costs, strict=True)):
+        alias = _model_alias(item)
+        chosen = _choose(alias, cost, sum(queued[index + 1 :]), left, policy)
+        if chosen is None:
+            deferred += 1
+            continue
+        downgraded += chosen != alias
+        spent = cost(chosen)
+        if left is not None:
+            left -= spent
+        total_cost += spent
+        total_ms += profiles[chosen]["p50_ms"]
+        group = by_model.setdefault(chosen, {"items": 0, "cost_usd": 0.0})
+        group["items"] += 1
+        group["cost_usd"] += spent
+
+    planned = len(items) - deferred
+    workers = max(1, min(workers or settings.batch_workers, planned or 1))
+    return {
+        "batch_id": batch_id,
+        "items": len(items),
+        "planned": planned,
+        "downgraded": downgraded,
+        "deferred": deferred,
+        "fits": downgraded == 0 and deferred == 0,
+        "budget_policy": policy,
+        "remaining_budget_usd": round(budget, 4) if budget is not None else None,
+        "estimated_cost_usd": round(total_cost, 4),
+        "estimated_seconds": math.ceil(total_ms / workers / 1000),
+        "workers": workers,
+        "by_model": {alias: {**g, "cost_usd": round(g["cost_usd"], 4)} for alias, g in by_model.items()},
+        "history_calls": {alias: p["calls"] for alias, p in profiles.items()},
+    }
+
+
+def choose_item_model(db: Session, item: BatchItem, cv_text: str, policy: str | None = None) -> str:
+    """Model alias to analyze a claimed item with, given the budget left for the rest of its batch.
+
+    Raises ``BudgetExceededError`` when the item doesn't fit the remaining
+    budget even on the model ``policy`` allows. Calls in flight on other
+    workers are already out of the remaining budget (their reservations).
+    """
+    alias = _model_alias(item)
+    left = remaining_budget(db)
+    if left is None:
+        return alias
+    profiles = _model_profiles(db)
+    rest = sum(
+        _cost_fn(item_input_tokens(cv_text, cast(str, other.job_description)), profiles)(_model_alias(other))
+        for other in _pending_items(db, cast(str, item.batch_id))
+        if other.id != item.id
+    )
+    cost = _cost_fn(item_input_tokens(cv_text, cast(str, item.job_description)), profiles)
+    chosen = _choose(alias, cost, rest, left, _resolve_policy(policy))
+    if chosen is None:
+        raise BudgetExceededError(f"Budget insufficiente: stimati ${cost(alias):.4f}, restano ${max(left, 0.0):.4f}")
+    return chosen
@@ -6,9 +6,20 @@ Endpoint principali:
   Dedup pre-insert via ``content_hash + model``.
 - ``GET /api/v1/batch/status`` — counts per status (PENDING/RUNNING/DONE/
   SKIPPED/ERROR), usato dal widget dashboard per progress bar.
-- ``POST /api/v1/batch/run`` — tick di processing: pesca un ``BatchItem``
-  PENDING via atomic UPDATE (race-safe), esegue analyze_and_charge, marca
-  DONE/ERROR. Chiamato da SSE worker + cron.
+- ``GET /api/v1/batch/plan`` — stima costo e durata del batch PENDING
+  (dimensione JD e CV, modello, latenza storica da ``ai_call_metrics``)
+  e cosa succede se non sta nel budget residuo: la UI la mostra per
+  conferma prima di ``/run``.
+- ``POST /api/v1/batch/run`` — tick di processing: i worker reclamano i
+  ``BatchItem`` PENDING con lease (``SKIP LOCKED`` + UPDATE condizionale,
+  race-safe), eseguono analyze_and_charge, marcano DONE/ERROR. Chiamato da
+  SSE worker + cron; in alternativa un worker separato
+  (``scripts/batch_worker.py``) drena la stessa coda.
+- ``POST /api/v1/batch/run-bulk`` — variante offline: sottomette i PENDING
+  come un unico Anthropic Message Batch (prezzo -50%) e fa polling fino
+  alla fine, riprendendo anche i message batch rimasti aperti.
+- ``POST /api/v1/batch/requeue-dead`` — rimette in coda gli item in
+  dead letter (errori transitori con retry esauriti).
 - ``POST /api/v1/batch/item/{id}/status`` — admin/MCP per forzare uno
   stato manualmente (debugging recovery).
 """
@@ -30,8 +41,18 @@ from ..database import SessionLocal
 from ..dependencies import Cache, CurrentUser, DbSession, validate_uuid
 from ..integrations.anthropic_client import MODELS
 from ..rate_limit import limiter
+from .bulk import open_bulk_batches, run_bulk
 from .models import BatchItem, BatchItemStatus
-from .service import add_to_queue, batch_results, clear_completed, get_batch_status, get_pending_batch_id, run_batch
+from .planner import BUDGET_POLICIES, plan_batch
+from .service import (
+    add_to_queue,
+    batch_results,
+    clear_completed,
+    get_batch_status,
+    get_pending_batch_id,
+    requeue_dead,
+    run_batch,
+)
 
 router = APIRouter(prefix="/batch", tags=["batch"])
 
@@ -106,6 +127,32 @@ def batch_add(
     return JSONResponse({"ok": True, "batch_id": batch_id, "count": count, "skipped": skipped})
 
 
+def _budget_policy_error(on_budget: str) -> JSONResponse | None:
+    if on_budget in BUDGET_POLICIES:
+        return None
+    return JSONResponse({"error": f"on_budget non valido (consentiti: {sorted(BUDGET_POLICIES)})"}, status_code=400)
+
+
+@router.get("/plan")
+@limiter.limit(settings.rate_limit_default)
+def batch_plan(
+    request: Request,
+    user: CurrentUser,
+    db: DbSession,
+    on_budget: str = settings.batch_budget_policy,
+) -> JSONResponse:
+    """Estimate cost and wall time of the pending batch, for the UI to confirm before ``/run``."""
+    if (error := _budget_policy_error(on_budget)) is not None:
+        return error
+    batch_id = get_pending_batch_id(db)
+    if not batch_id:
+        return JSONResponse({"error": "No pending batch"}, status_code=400)
+    cv = get_latest_cv(db, cast(UUID, user.id))
+    if not cv:
+        return JSONResponse({"error": "Nessun CV trovato. Carica un CV prima di usare il batch."}, status_code=400)
+    return JSONResponse(plan_batch(db, batch_id, cast(str, cv.raw_text), on_budget))
+
+
 @router.post("/run")
 @limiter.limit(settings.rate_limit_analyze)
 def batch_run(
@@ -114,8 +161,15 @@ def batch_run(
     user: CurrentUser,
     cache: Cache,
     db: DbSession,
+    on_budget: Annotated[str, Form()] = settings.batch_budget_policy,
 ) -> JSONResponse:
-    """Start processing the pending batch queue in the background."""
+    """Start processing the pending batch queue in the background.
+
+    ``on_budget`` is the policy confirmed on the plan (``stop`` /
+    ``downgrade``); the response carries the plan the run starts from.
+    """
+    if (error := _budget_policy_error(on_budget)) is not None:
+        return error
     batch_id = get_pending_batch_id(db)
     if not batch_id:
         return JSONResponse({"error": "No pending batch"}, status_code=400)
@@ -124,17 +178,59 @@ def batch_run(
     if not budget_ok:
         return JSONResponse({"error": budget_msg}, status_code=400)
 
+    cv = get_latest_cv(db, cast(UUID, user.id))
+    plan = plan_batch(db, batch_id, cast(str, cv.raw_text), on_budget) if cv else None
+
     def _run_in_background() -> None:
         bg_db = SessionLocal()
         try:
-            run_batch(batch_id, bg_db, cast(UUID, user.id), cache)
+            run_batch(
+                batch_id, bg_db, cast(UUID, user.id), cache, session_factory=SessionLocal, budget_policy=on_budget
+            )
         finally:
             bg_db.close()
 
     background_tasks.add_task(_run_in_background)
-    audit(db, request, "batch_run", f"batch={batch_id}")
+    audit(db, request, "batch_run", f"batch={batch_id}, on_budget={on_budget}")
     db.commit()
-    return JSONResponse({"ok": True, "batch_id": batch_id})
+    return JSONResponse({"ok": True, "batch_id": batch_id, "plan": plan})
+
+
+@router.post("/run-bulk")
+@limiter.limit(settings.rate_limit_analyze)
+def batch_run_bulk(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    user: CurrentUser,
+    cache: Cache,
+    db: DbSession,
+) -> JSONResponse:
+    """Submit the pending queue as one Message Batch and poll it in the background.
+
+    Also resumes message batches left open by a previous process, so the
+    route is safe to call again after a deploy with nothing pending.
+    """
+    batch_id = get_pending_batch_id(db)
+    open_ids = open_bulk_batches(db)
+    if not batch_id and not open_ids:
+        return JSONResponse({"error": "No pending batch"}, status_code=400)
+
+    if batch_id:
+        budget_ok, budget_msg = check_budget_available(db)
+        if not budget_ok:
+            return JSONResponse({"error": budget_msg}, status_code=400)
+
+    def _run_in_background() -> None:
+        bg_db = SessionLocal()
+        try:
+            run_bulk(bg_db, cast(UUID, user.id), batch_id, cache)
+        finally:
+            bg_db.close()
+
+    background_tasks.add_task(_run_in_background)
+    audit(db, request, "batch_run_bulk", f"batch={batch_id}, resumed={len(open_ids)}")
+    db.commit()
+    return JSONResponse({"ok": True, "batch_id": batch_id, "resumed": open_ids})
 
 
 @router.get("/status")
@@ -160,6 +256,8 @@ def _serialize_batch_result(analysis: Any, full: dict[str, Any], is_dedup: bool)
         "job_url": analysis.job_url,
         "model_used": analysis.model_used,
         "cost_usd": analysis.cost_usd or 0.0,
+        "tokens_input": analysis.tokens_input or 0,
+        "tokens_cache_read": analysis.tokens_cache_read or 0,
         "analyzed_at": analysis.created_at.isoformat() if analysis.created_at else "",
         "status": str(analysis.status),
         "is_duplicate": is_dedup,
@@ -232,6 +330,25 @@ def batch_clear(
     return JSONResponse({"ok": True, "deleted": deleted})
 
 
+@router.post("/requeue-dead")
+@limiter.limit(settings.rate_limit_analyze)
+def batch_requeue_dead(
+    request: Request,
+    user: CurrentUser,
+    db: DbSession,
+    batch_id: str | None = None,
+) -> JSONResponse:
+    """Move dead-lettered items back to pending with a fresh retry budget.
+
+    Dead items exhausted their retries on transient errors (timeouts,
+    429/529); call this once the outage is over, then ``/batch/run``.
+    """
+    requeued = requeue_dead(db, batch_id=batch_id)
+    audit(db, request, "batch_requeue_dead", f"batch={batch_id}, requeued={requeued}")
+    db.commit()
+    return JSONResponse({"ok": True, "requeued": requeued})
+
+
 @router.get("/pending-items")
 def pending_items(
     user: CurrentUser,
@@ -303,6 +420,10 @@ def update_item_status(
 
     item.status = status_enum
     item.attempt_count = (item.attempt_count or 0) + 1
+    # A manual status wins over any worker lease: the item is no longer
+    # reclaimable and cleanup_stale_running covers a manual RUNNING.
+    item.lease_owner = None
+    item.lease_expires_at = None
 
     if analysis_id:
         validated_aid = validate_uuid(analysis_id)
@@ -1,27 +1,55 @@
 """Batch analysis service.
 
-Manages a persistent queue of job descriptions to analyze sequentially.
-State is stored in PostgreSQL via the BatchItem model.
+Manages a persistent queue of job descriptions analyzed by a small pool
+of concurrent workers. State is stored in PostgreSQL via the BatchItem
+model; pacing against Anthropic limits comes from the shared RPM/TPM
+token buckets in ``integrations.token_bucket``.
+
+Workers claim one item at a time (:func:`claim_next_item`, ``FOR UPDATE
+SKIP LOCKED``) under a short lease renewed by a heartbeat, so several
+threads, processes or a separate worker dyno (``scripts/batch_worker.py``)
+can drain the same queue, and the items of a killed worker are reclaimed
+as soon as their lease lapses.
 """
 
+import contextvars
 import logging
+import os
+import random
+import socket
+import threading
 import time
 import uuid as uuid_mod
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, wait
 from concurrent.futures import TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
 from typing import Any, cast
 from uuid import UUID
 
-from sqlalchemy import func
+import anthropic
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
-from ..analysis.service import find_existing_analysis, run_analysis
+from ..analysis.service import find_analysis_for_jd, find_existing_analysis, find_near_duplicate, run_analysis
+from ..config import settings
+from ..cv.models import CVProfile
 from ..cv.service import get_latest_cv
-from ..dashboard.service import add_spending
-from ..integrations.anthropic_client import MODELS, content_hash
+from ..dashboard.service import BudgetExceededError, add_spending, check_budget_available, get_or_create_settings
+from ..integrations.anthropic_client import (
+    MODELS,
+    PRIORITY_BATCH,
+    call_deadline,
+    call_priority,
+    content_hash,
+    triage_job,
+)
 from ..integrations.cache import CacheService
+from ..integrations.token_bucket import get_throttle
 from .models import BatchItem, BatchItemStatus
+from .planner import choose_item_model, item_input_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -29,11 +57,22 @@ logger = logging.getLogger(__name__)
 # Haiku typically responds in 3-5s. On Render (no CPU throttle)
 # allow up to 90s for slow API responses before skipping.
 _BATCH_ITEM_TIMEOUT = 90
-
-# Any item stuck in RUNNING longer than this is considered orphaned
-# (e.g. the worker died mid-batch on deploy/SIGTERM).
+# After the timeout, how long to wait for the analysis thread to unwind.
+# The call runs under the same deadline (``call_deadline``), so the SDK has
+# already dropped the request and this is only the tail of the thread.
+_BATCH_CANCEL_GRACE_SECONDS = 5.0
+
+# Any lease-less item stuck in RUNNING longer than this is considered
+# orphaned (e.g. set RUNNING by the MCP workflow, or by a release without
+# leases, and never finished).
 _STALE_RUNNING_THRESHOLD_MINUTES = 10
 
+# Claim attempts per call when another worker wins the race on the candidate.
+_CLAIM_ATTEMPTS = 5
+
+# HTTP statuses worth a retry besides 5xx (529 overloaded included).
+_RETRYABLE_STATUS = frozenset({408, 409, 429})
+
 
 def add_to_queue(
     db: Session,
@@ -46,7 +85,9 @@ def add_to_queue(
 ) -> tuple[str, int, int]:
     """Add a job to the pending batch queue.
 
-    Before inserting, checks for existing analysis (dedup).
+    Before inserting, checks for existing analysis (dedup): same
+    ``content_hash``, or a near-duplicate JD on the same CV (MinHash
+    signature + LSH buckets, see ``analysis.find_near_duplicate``).
     Returns (batch_id, total_count, skipped_count).
 
     ``source`` flows through the queue → ``_execute_analysis`` →
@@ -67,8 +108,13 @@ def add_to_queue(
     ch = content_hash(cv_text, job_description)
     model_id = MODELS.get(model, MODELS["haiku"])
 
-    # Check if analysis already exists
-    existing = find_existing_analysis(db, ch, model_id)
+    # Check if analysis already exists (exact, then near-duplicate JD)
+    existing = find_analysis_for_jd(db, cv_text, job_description, model_id)
+    if existing is None:
+        near = find_near_duplicate(db, job_description, cv_id, model_id)
+        if near:
+            existing = near[0]
+            logger.info("batch_item near-duplicate of %s similarity=%.3f", existing.id, near[1])
 
     preview = job_description[:80] + "..." if len(job_description) > 80 else job_description
 
@@ -134,6 +180,10 @@ def _item_dict(item: BatchItem, status_key: str) -> dict[str, Any]:
         "preview": _item_preview(item),
         "analysis_id": str(item.analysis_id) if item.analysis_id else None,
         "error_message": item.error_message,
+        "triage_score": item.triage_score,
+        "triage_reason": item.triage_reason,
+        "attempt_count": item.attempt_count or 0,
+        "next_attempt_at": item.next_attempt_at.isoformat() if item.next_attempt_at else None,
     }
 
 
@@ -143,7 +193,7 @@ def _overall_status(counts: dict[str, int], total: int) -> str:
         return "running"
     if counts.get("pending", 0) > 0:
         return "pending"
-    if counts.get("error", 0) > 0 and counts.get("done", 0) == 0:
+    if counts.get("error", 0) + counts.get("dead", 0) > 0 and counts.get("done", 0) == 0:
         return "error"
     if total > 0:
         return "done"
@@ -194,11 +244,13 @@ def clear_completed(db: Session, batch_id: str | None = None) -> int:
 
 
 def cleanup_stale_running(db: Session, threshold_minutes: int = _STALE_RUNNING_THRESHOLD_MINUTES) -> int:
-    """Mark any item stuck in RUNNING longer than threshold as ERROR.
+    """Mark any lease-less item stuck in RUNNING longer than threshold as ERROR.
 
-    Called on app startup to recover from crashes/deploys that killed a
-    batch worker mid-loop. Without this, items stay RUNNING forever and
-    `get_batch_status` reports the batch as still active.
+    Called on app startup. Items claimed by a worker carry a lease and are
+    reclaimed by :func:`claim_next_item` once it lapses; this only covers
+    RUNNING rows nobody leased (MCP status updates, rows from before the
+    leases). Without it they stay RUNNING forever and `get_batch_status`
+    reports the batch as still active.
 
     Returns the number of items recovered.
     """
@@ -208,6 +260,10 @@ def cleanup_stale_running(db: Session, threshold_minutes: int = _STALE_RUNNING_T
         .filter(
             BatchItem.status == BatchItemStatus.RUNNING,
             BatchItem.updated_at < threshold,
+            BatchItem.lease_owner.is_(None),
+            # Bulk items wait on an Anthropic message batch that can take
+            # hours; the bulk poller owns their lifecycle.
+            BatchItem.bulk_batch_id.is_(None),
         )
         .all()
     )
@@ -224,11 +280,144 @@ def cleanup_stale_running(db: Session, threshold_minutes: int = _STALE_RUNNING_T
     return len(stale)
 
 
+def new_worker_id() -> str:
+    """Lease owner id: host, pid and a random suffix, unique across dynos and threads."""
+    return f"{socket.gethostname()[:32]}:{os.getpid()}:{uuid_mod.uuid4().hex[:8]}"
+
+
+def _claimable(now: datetime) -> Any:
+    """PENDING items due for a (re)try, plus RUNNING ones whose worker let the lease lapse."""
+    return or_(
+        and_(
+            BatchItem.status == BatchItemStatus.PENDING,
+            or_(BatchItem.next_attempt_at.is_(None), BatchItem.next_attempt_at <= now),
+        ),
+        and_(
+            BatchItem.status == BatchItemStatus.RUNNING,
+            BatchItem.lease_expires_at < now,
+            BatchItem.bulk_batch_id.is_(None),
+        ),
+    )
+
+
+def claim_next_item(db: Session, worker_id: str, batch_id: str | None = None) -> BatchItem | None:
+    """Claim the oldest claimable item for ``worker_id``, or None when the queue is empty.
+
+    The candidate is picked with ``FOR UPDATE SKIP LOCKED`` so concurrent
+    workers lock different rows instead of queueing on the same one; the
+    claim itself is a conditional UPDATE, which keeps it race-safe where
+    row locks don't exist (SQLite). Commits.
+
+    Reclaiming an expired lease counts as an attempt: an item that kills
+    or hangs every worker picking it up is dead-lettered after
+    ``batch_max_attempts`` instead of being reclaimed forever.
+    """
+    for _ in range(_CLAIM_ATTEMPTS):
+        now = datetime.now(UTC)
+        candidate = select(BatchItem.id).where(_claimable(now))
+        if batch_id:
+            candidate = candidate.where(BatchItem.batch_id == batch_id)
+        item_id = db.scalar(candidate.order_by(BatchItem.created_at.asc()).limit(1).with_for_update(skip_locked=True))
+        if item_id is None:
+            db.commit()
+            return None
+        claimed = db.execute(
+            update(BatchItem)
+            .where(BatchItem.id == item_id, _claimable(now))
+            .values(
+                status=BatchItemStatus.RUNNING,
+                attempt_count=case(
+                    (BatchItem.status == BatchItemStatus.RUNNING, func.coalesce(BatchItem.attempt_count, 0) + 1),
+                    else_=BatchItem.attempt_count,
+                ),
+                lease_owner=worker_id,
+                lease_expires_at=now + timedelta(seconds=settings.batch_lease_seconds),
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if getattr(claimed, "rowcount", 0) != 1:
+            continue
+        item = db.get(BatchItem, item_id, populate_existing=True)
+        if item is not None and (item.attempt_count or 0) >= settings.batch_max_attempts:
+            item.status = BatchItemStatus.DEAD
+            item.error_message = "lease_expired: worker lost the item on every attempt"
+            _release_lease(item)
+            db.commit()
+            logger.warning("batch_item dead after lost leases id=%s attempts=%d", item.id, item.attempt_count)
+            continue
+        return item
+    return None
+
+
+def renew_lease(db: Session, item_id: UUID, worker_id: str) -> bool:
+    """Push the lease of an item still owned by ``worker_id`` forward. False when it was lost."""
+    now = datetime.now(UTC)
+    renewed = db.execute(
+        update(BatchItem)
+        .where(
+            BatchItem.id == item_id,
+            BatchItem.lease_owner == worker_id,
+            BatchItem.status == BatchItemStatus.RUNNING,
+        )
+        .values(lease_expires_at=now + timedelta(seconds=settings.batch_lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return getattr(renewed, "rowcount", 0) == 1
+
+
+def _release_lease(item: BatchItem) -> None:
+    item.lease_owner = None
+    item.lease_expires_at = None
+
+
+@contextmanager
+def _lease_heartbeat(
+    session_factory: Callable[[], Session] | None,
+    item_id: UUID,
+    worker_id: str,
+) -> Iterator[None]:
+    """Renew the item's lease every ``batch_heartbeat_seconds`` while the body runs.
+
+    The heartbeat thread uses its own session: the worker's one is busy
+    inside the analysis call. Without a session factory (sequential
+    fallback) there is no heartbeat and the lease only lasts
+    ``batch_lease_seconds``.
+    """
+    if session_factory is None:
+        yield
+        return
+    stop = threading.Event()
+
+    def _beat() -> None:
+        while not stop.wait(settings.batch_heartbeat_seconds):
+            db = session_factory()
+            try:
+                if not renew_lease(db, item_id, worker_id):
+                    logger.warning("batch lease lost item=%s worker=%s", item_id, worker_id)
+                    return
+            except Exception:
+                logger.warning("batch heartbeat failed item=%s", item_id, exc_info=True)
+            finally:
+                db.close()
+
+    beat = threading.Thread(target=_beat, name="batch-heartbeat", daemon=True)
+    beat.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        beat.join()
+
+
 def _mark_items_error(db: Session, items: list[BatchItem], message: str) -> None:
     """Mark a group of batch items as ERROR with the given message."""
     for item in items:
         item.status = BatchItemStatus.ERROR  # type: ignore[assignment]
         item.error_message = message  # type: ignore[assignment]
+        _release_lease(item)
     db.commit()
 
 
@@ -243,6 +432,7 @@ def _try_skip_dedup(db: Session, item: BatchItem, ch_short: str) -> bool:
     # SKIPPED means "we reused an earlier one".
     item.status = BatchItemStatus.SKIPPED  # type: ignore[assignment]
     item.analysis_id = existing.id
+    _release_lease(item)
     db.commit()
     logger.info("batch_item skipped (dedup) hash=%s preview=%r", ch_short, item.preview)
     return True
@@ -256,8 +446,20 @@ def _execute_analysis(
     cache: CacheService | None,
     user_id: UUID,
 ) -> tuple[Any, dict[str, Any]]:
-    """Run the analysis under a hard timeout. Raises TimeoutError on stall."""
+    """Run the analysis under a hard timeout. Raises TimeoutError on stall.
+
+    The call runs in a copy of the caller's context so the governor
+    priority set by ``_process_one_item`` follows it into the executor,
+    together with a ``call_deadline`` of ``_BATCH_ITEM_TIMEOUT``: the
+    Anthropic request is aborted at the deadline rather than left running
+    (and billing) in an orphaned thread. On timeout we wait a short grace
+    for that thread to unwind, so the executor slot is free and ``db`` is
+    no longer in use when the caller records the failure.
+    """
+    with call_deadline(_BATCH_ITEM_TIMEOUT):
+        context = contextvars.copy_context()
     future = executor.submit(
+        context.run,
         run_analysis,
         db,
         cast(str, cv.raw_text),
@@ -272,10 +474,78 @@ def _execute_analysis(
     try:
         return future.result(timeout=_BATCH_ITEM_TIMEOUT)
     except FuturesTimeoutError:
-        future.cancel()
+        if not future.cancel():
+            wait([future], timeout=_BATCH_CANCEL_GRACE_SECONDS)
         raise TimeoutError(f"Analysis timed out after {_BATCH_ITEM_TIMEOUT}s") from None
 
 
+def _throttle_item(item: BatchItem, cv: Any) -> float:
+    """Block until the shared RPM/TPM buckets admit this item's API call.
+
+    The estimate mirrors what ``analyze_job`` sends (system prompt + CV
+    excerpt + full JD). Returns seconds spent waiting, for the log line.
+    """
+    estimated = item_input_tokens(cast(str, cv.raw_text), cast(str, item.job_description))
+    return get_throttle().acquire(estimated)
+
+
+def _triage_enabled(backlog: int) -> bool:
+    """Pre-screen only backlogs big enough for the extra call to pay off."""
+    return settings.ai_triage_min_score > 0 and backlog >= settings.ai_triage_min_backlog
+
+
+def _try_filter_triage(
+    db: Session,
+    item: BatchItem,
+    cv: Any,
+    cache: CacheService | None,
+    user_id: UUID,
+    ch_short: str,
+) -> bool:
+    """Run the cheap triage call; mark the item FILTERED when it scores too low.
+
+    Returns True when the item is filtered (no full analysis). The triage
+    cost goes to the ledger either way.
+    """
+    _throttle_item(item, cv)
+    with call_priority(PRIORITY_BATCH):
+        triage = triage_job(
+            cast(str, cv.raw_text),
+            cast(str, item.job_description),
+            cast(str, item.model) or "haiku",
+            cache,
+            db=db,
+            user_id=user_id,
+        )
+    tokens = triage.get("tokens", {}) or {}
+    add_spending(
+        db,
+        triage.get("cost_usd", 0.0),
+        tokens.get("input", 0),
+        tokens.get("output", 0),
+        is_analysis=False,
+        model=triage.get("model_used", ""),
+        reservations=triage.get("budget_reservations", ()),
+    )
+    item.triage_score = triage["score"]
+    item.triage_reason = triage["reason"]
+    filtered = bool(triage["score"] < settings.ai_triage_min_score)
+    if filtered:
+        item.status = BatchItemStatus.FILTERED
+        item.attempt_count = (item.attempt_count or 0) + 1
+        _release_lease(item)
+    db.commit()
+    logger.info(
+        "batch_item triage hash=%s score=%d filtered=%s cost_usd=%.6f preview=%r",
+        ch_short,
+        triage["score"],
+        filtered,
+        float(triage.get("cost_usd", 0.0)),
+        item.preview,
+    )
+    return filtered
+
+
 def _record_success(
     db: Session,
     item: BatchItem,
@@ -290,43 +560,144 @@ def _record_success(
         result.get("cost_usd", 0.0),
         result.get("tokens", {}).get("input", 0),
         result.get("tokens", {}).get("output", 0),
+        model=result.get("model_used", ""),
+        reservations=result.get("budget_reservations", ()),
     )
     item.status = BatchItemStatus.DONE
     item.analysis_id = analysis.id
     item.attempt_count = (item.attempt_count or 0) + 1
+    _release_lease(item)
     db.commit()
 
     duration_ms = int((time.monotonic() - started_at) * 1000)
     tokens = result.get("tokens", {}) or {}
     logger.info(
-        "batch_item done hash=%s duration_ms=%d cost_usd=%.6f tokens_in=%d tokens_out=%d model=%s preview=%r",
+        "batch_item done hash=%s duration_ms=%d cost_usd=%.6f tokens_in=%d tokens_out=%d cache_read=%d "
+        "model=%s preview=%r",
         ch_short,
         duration_ms,
         float(result.get("cost_usd", 0.0)),
         int(tokens.get("input", 0)),
         int(tokens.get("output", 0)),
+        int(tokens.get("cache_read", 0)),
         cast(str, item.model) or "haiku",
         item.preview,
     )
 
 
+def is_retryable(exc: BaseException) -> bool:
+    """True for transient failures: timeouts, dropped connections, 429 / 5xx / 529, DB hiccups.
+
+    Everything else (bad request, auth, validation, unexpected tool output)
+    would fail the same way on every attempt and must not burn more tokens.
+    """
+    # APITimeoutError is an APIConnectionError.
+    if isinstance(exc, TimeoutError | anthropic.APIConnectionError | OperationalError):
+        return True
+    if isinstance(exc, anthropic.APIStatusError):
+        return exc.status_code in _RETRYABLE_STATUS or exc.status_code >= 500
+    return False
+
+
+def retry_delay(attempt: int) -> float:
+    """Seconds before retry number ``attempt`` (1-based): doubling backoff, capped, with equal jitter."""
+    delay = min(settings.batch_retry_max_seconds, settings.batch_retry_base_seconds * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)  # noqa: S311 — jitter, not crypto
+
+
 def _record_failure(db: Session, item: BatchItem, exc: Exception, ch_short: str, started_at: float) -> None:
-    """Rollback the in-flight transaction and mark the item ERROR."""
+    """Rollback the in-flight transaction, then schedule a retry or fail the item.
+
+    Transient failures go back to PENDING with ``next_attempt_at`` set by
+    :func:`retry_delay` until ``batch_max_attempts``, then DEAD; permanent
+    ones become ERROR right away.
+    """
     db.rollback()
-    item.status = BatchItemStatus.ERROR
     item.error_message = str(exc)
     item.attempt_count = (item.attempt_count or 0) + 1
+    _release_lease(item)
+    if not is_retryable(exc):
+        item.status = BatchItemStatus.ERROR
+        outcome = "error"
+    elif item.attempt_count >= settings.batch_max_attempts:
+        item.status = BatchItemStatus.DEAD
+        outcome = "dead"
+    else:
+        item.status = BatchItemStatus.PENDING
+        item.next_attempt_at = datetime.now(UTC) + timedelta(seconds=retry_delay(item.attempt_count))
+        # A failed bulk entry is retried like any other item: the next run
+        # may be interactive, so it must not keep the old message batch id.
+        item.bulk_batch_id = None
+        outcome = "retry"
     db.commit()
     duration_ms = int((time.monotonic() - started_at) * 1000)
     logger.warning(
-        "batch_item error hash=%s duration_ms=%d preview=%r — %s",
+        "batch_item %s hash=%s attempt=%d duration_ms=%d preview=%r — %s",
+        outcome,
         ch_short,
+        item.attempt_count,
         duration_ms,
         item.preview,
         exc,
     )
 
 
+def _next_retry_in(db: Session, batch_id: str) -> float | None:
+    """Seconds until the batch's earliest scheduled retry; None when nothing is left to claim."""
+    pending = (
+        db.query(func.count(BatchItem.id), func.min(BatchItem.next_attempt_at))
+        .filter(BatchItem.batch_id == batch_id, BatchItem.status == BatchItemStatus.PENDING)
+        .one()
+    )
+    db.commit()
+    count, due = pending
+    if not count:
+        return None
+    if due is None:
+        return 0.0
+    earliest = cast(datetime, due)
+    if earliest.tzinfo is None:  # SQLite drops the offset
+        earliest = earliest.replace(tzinfo=UTC)
+    return max(0.0, (earliest - datetime.now(UTC)).total_seconds())
+
+
+def _claim_in_batch(db: Session, worker_id: str, batch_id: str) -> BatchItem | None:
+    """Claim the next item of ``batch_id``, sleeping through scheduled retries; None once drained."""
+    while (item := claim_next_item(db, worker_id, batch_id)) is None:
+        wait = _next_retry_in(db, batch_id)
+        if wait is None:
+            return None
+        time.sleep(wait)
+    return item
+
+
+def _defer_for_budget(db: Session, item: BatchItem, exc: BudgetExceededError, ch_short: str) -> None:
+    """Put an item whose call the budget reservation refused back in the queue.
+
+    Nothing was sent to Anthropic, so no attempt is counted: the item runs
+    once the budget is raised.
+    """
+    db.rollback()
+    item.status = BatchItemStatus.PENDING
+    item.error_message = str(exc)
+    _release_lease(item)
+    db.commit()
+    logger.warning("batch_item deferred hash=%s preview=%r — %s", ch_short, item.preview, exc)
+
+
+def requeue_dead(db: Session, batch_id: str | None = None) -> int:
+    """Put dead-lettered items back in the queue with a fresh retry budget. The caller commits."""
+    q = db.query(BatchItem).filter(BatchItem.status == BatchItemStatus.DEAD)
+    if batch_id:
+        q = q.filter(BatchItem.batch_id == batch_id)
+    items = q.all()
+    for item in items:
+        item.status = BatchItemStatus.PENDING
+        item.attempt_count = 0
+        item.next_attempt_at = None
+    return len(items)
+
+
 def _process_one_item(
     executor: ThreadPoolExecutor,
     db: Session,
@@ -334,27 +705,132 @@ def _process_one_item(
     cv: Any,
     cache: CacheService | None,
     user_id: UUID,
-) -> None:
-    """Run a single batch item end-to-end (dedup → execute → record)."""
-    item.status = BatchItemStatus.RUNNING
-    db.commit()
-
+    triage: bool = False,
+    budget_policy: str | None = None,
+) -> bool:
+    """Run a claimed batch item end-to-end (dedup → triage → budget → execute → record).
+
+    Before the analysis the planner checks the projected spend of the
+    rest of the batch against the remaining budget and may move the item
+    to Haiku (``budget_policy``, see :func:`planner.choose_item_model`).
+    Returns False when the budget couldn't cover the item's call: the item
+    is back in the queue and the worker should stop claiming.
+    """
     started_at = time.monotonic()
     ch_short = (cast(str, item.content_hash) or "")[:8]
 
     try:
         if _try_skip_dedup(db, item, ch_short):
-            return
-        analysis, result = _execute_analysis(executor, db, item, cv, cache, user_id)
+            return True
+        if triage and _try_filter_triage(db, item, cv, cache, user_id, ch_short):
+            return True
+        model = choose_item_model(db, item, cast(str, cv.raw_text), budget_policy)
+        if model != item.model:
+            logger.info("batch_item downgraded hash=%s model=%s->%s for budget", ch_short, item.model, model)
+            item.model = model
+        # Shared RPM/TPM pacing replaces the old fixed sleep(4) after each
+        # success: workers wait only when the org budget is actually spent.
+        waited = _throttle_item(item, cv)
+        if waited > 0:
+            logger.info("batch_item throttled hash=%s waited_ms=%d", ch_short, int(waited * 1000))
+        # Batch work queues behind interactive and inbox calls in the governor.
+        with call_priority(PRIORITY_BATCH):
+            analysis, result = _execute_analysis(executor, db, item, cv, cache, user_id)
         _record_success(db, item, analysis, result, ch_short, started_at)
-        # Throttle between API calls to respect Anthropic rate limits.
-        time.sleep(4)
+    except BudgetExceededError as exc:
+        _defer_for_budget(db, item, exc, ch_short)
+        return False
     except Exception as exc:
         _record_failure(db, item, exc, ch_short, started_at)
+    return True
 
 
-def run_batch(batch_id: str, db: Session, user_id: UUID, cache: CacheService | None = None) -> None:
-    """Process all pending items in a batch (runs as background task)."""
+def _run_claimed(
+    db: Session,
+    executor: ThreadPoolExecutor,
+    item: BatchItem,
+    worker_id: str,
+    cache: CacheService | None,
+    triage: bool,
+    session_factory: Callable[[], Session] | None,
+    cv_id: UUID | None = None,
+    user_id: UUID | None = None,
+    budget_policy: str | None = None,
+) -> bool:
+    """Process a claimed item under its lease heartbeat.
+
+    ``cv_id`` / ``user_id`` / ``budget_policy`` come from ``run_batch``
+    (the user's latest CV, the policy picked for the run); standalone
+    workers fall back to the CV the item was queued with and the
+    configured policy.
+    Returns False once the budget is spent (see :func:`_process_one_item`).
+    """
+    cv = db.get(CVProfile, cv_id or item.cv_id)
+    if not cv:
+        _mark_items_error(db, [item], "No CV found")
+        return True
+    with _lease_heartbeat(session_factory, cast(UUID, item.id), worker_id):
+        return _process_one_item(
+            executor, db, item, cv, cache, user_id or cast(UUID, cv.user_id), triage, budget_policy
+        )
+
+
+def _drain_batch(
+    session_factory: Callable[[], Session],
+    executor: ThreadPoolExecutor,
+    batch_id: str,
+    cv_id: UUID,
+    cache: CacheService | None,
+    user_id: UUID,
+    triage: bool = False,
+    budget_policy: str | None = None,
+) -> None:
+    """Worker thread of ``run_batch``: claim and process items of one batch until none is left.
+
+    SQLAlchemy sessions are not thread-safe, so each worker works on its
+    own session and re-loads the CV by id.
+    """
+    db = session_factory()
+    worker_id = new_worker_id()
+    try:
+        while (item := _claim_in_batch(db, worker_id, batch_id)) is not None:
+            if not _run_claimed(
+                db, executor, item, worker_id, cache, triage, session_factory, cv_id, user_id, budget_policy
+            ):
+                break
+    except Exception:
+        # _process_one_item records per-item failures itself; reaching this
+        # means the session or the claim broke. Log and let the other
+        # workers carry on — the lease lapses and the item is reclaimed.
+        logger.exception("batch worker crashed batch=%s worker=%s", batch_id, worker_id)
+    finally:
+        db.close()
+
+
+def run_batch(
+    batch_id: str,
+    db: Session,
+    user_id: UUID,
+    cache: CacheService | None = None,
+    session_factory: Callable[[], Session] | None = None,
+    max_workers: int | None = None,
+    budget_policy: str | None = None,
+) -> None:
+    """Process all pending items in a batch (runs as background task).
+
+    With ``session_factory`` and more than one worker (``settings.batch_workers``
+    by default) items are claimed by concurrent workers, each on its own
+    session. Without a factory the batch falls back to a sequential claim
+    loop on ``db``.
+
+    Backlogs of at least ``settings.ai_triage_min_backlog`` items get the
+    triage pre-screen first (when ``ai_triage_min_score`` is set): only
+    items scoring above the threshold pay for the full analysis.
+
+    ``budget_policy`` (``stop`` / ``downgrade``, default
+    ``settings.batch_budget_policy``) decides what happens to the items
+    whose projected spend no longer fits the budget (see ``planner``).
+    """
     items = (
         db.query(BatchItem).filter(BatchItem.batch_id == batch_id, BatchItem.status == BatchItemStatus.PENDING).all()
     )
@@ -366,12 +842,94 @@ def run_batch(batch_id: str, db: Session, user_id: UUID, cache: CacheService | N
         _mark_items_error(db, items, "No CV found")
         return
 
-    # One ThreadPoolExecutor for the whole batch instead of one per item.
+    workers = max(1, min(max_workers or settings.batch_workers, len(items)))
+    triage = _triage_enabled(len(items))
+    cv_id = cast(UUID, cv.id)
+
+    # One analysis executor for the whole batch instead of one per item.
     # The previous "with" inside the loop paid thread-lifecycle overhead
     # on every iteration — relevant on Render free tier (512MB shared vCPU).
-    with ThreadPoolExecutor(max_workers=1) as executor:
-        for item in items:
-            _process_one_item(executor, db, item, cv, cache, user_id)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-analysis") as executor:
+        if workers == 1 or session_factory is None:
+            worker_id = new_worker_id()
+            while (item := _claim_in_batch(db, worker_id, batch_id)) is not None:
+                if not _run_claimed(
+                    db, executor, item, worker_id, cache, triage, session_factory, cv_id, user_id, budget_policy
+                ):
+                    break
+            return
+
+        # add_spending lazily creates the app_settings singleton; doing it
+        # here first avoids N workers racing on the same INSERT.
+        get_or_create_settings(db)
+        db.commit()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-worker") as pool:
+            futures = [
+                pool.submit(
+                    _drain_batch, session_factory, executor, batch_id, cv_id, cache, user_id, triage, budget_policy
+                )
+                for _ in range(workers)
+            ]
+            for future in futures:
+                future.result()
+
+
+def _batch_size(db: Session, batch_id: str) -> int:
+    return db.query(func.count(BatchItem.id)).filter(BatchItem.batch_id == batch_id).scalar() or 0
+
+
+def _serve_queue(
+    session_factory: Callable[[], Session],
+    executor: ThreadPoolExecutor,
+    cache: CacheService | None,
+    stop: threading.Event,
+) -> None:
+    """Standalone worker thread: claim items of any batch until ``stop`` is set."""
+    worker_id = new_worker_id()
+    while not stop.is_set():
+        idle = True
+        db = session_factory()
+        try:
+            budget_ok, _msg = check_budget_available(db)
+            item = claim_next_item(db, worker_id) if budget_ok else None
+            if item is not None:
+                triage = _triage_enabled(_batch_size(db, cast(str, item.batch_id)))
+                idle = not _run_claimed(db, executor, item, worker_id, cache, triage, session_factory)
+        except Exception:
+            logger.exception("batch worker loop error worker=%s", worker_id)
+        finally:
+            db.close()
+        if idle:
+            # Empty queue, budget exhausted or DB error: back off before polling again.
+            stop.wait(settings.batch_worker_poll_seconds)
+
+
+def run_worker(
+    session_factory: Callable[[], Session],
+    stop: threading.Event,
+    cache: CacheService | None = None,
+    workers: int | None = None,
+) -> None:
+    """Drain the queue continuously with ``workers`` claim loops until ``stop`` is set.
+
+    Entry point of the standalone worker process (``scripts/batch_worker.py``):
+    it needs no request context, each item runs against the CV it was
+    queued with. Several processes can run side by side.
+    """
+    workers = max(1, workers or settings.batch_workers)
+    db = session_factory()
+    try:
+        get_or_create_settings(db)
+        db.commit()
+    finally:
+        db.close()
+    with (
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-analysis") as executor,
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-worker") as pool,
+    ):
+        futures = [pool.submit(_serve_queue, session_factory, executor, cache, stop) for _ in range(workers)]
+        for future in futures:
+            future.result()
 
 
 def batch_results(db: Session, batch_id: str) -> list[BatchItem]:
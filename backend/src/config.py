@@ -84,7 +84,20 @@ class Settings(BaseSettings):
     # Production deploys (Render, Docker, CI) override via DATABASE_URL env var.
     database_url: str = "sqlite:///./dev.db"
     anthropic_api_key: str = ""
+    # Override for the Anthropic API host (e.g. a local fake for offline
+    # testing of the Message Batches bulk mode). Empty = SDK default.
+    anthropic_base_url: str = ""
     redis_url: str = "redis://redis:6379/0"
+    # Durable cache tier in the primary DB (``cache_entries``): L2 behind
+    # Redis, sole tier when Redis is down/unset. Bounded in bytes because
+    # the Neon free tier caps the whole DB.
+    db_cache_enabled: bool = True
+    db_cache_max_bytes: int = 20_000_000
+    # In-process L1 LRU in front of Redis / DB. 32 MB of cached values is
+    # ~6% of the 512 MB Render instance; 0 disables. TTL is capped because
+    # this tier can't be invalidated from other processes.
+    memory_cache_max_bytes: int = 32_000_000
+    memory_cache_max_ttl: int = 300
     rapidapi_key: str = ""
 
     # Authentication
@@ -141,11 +154,81 @@ class Settings(BaseSettings):
     # in PR #5 once we have ~50 manual samples.
     promote_score_threshold: int = 50
 
+    # Near-duplicate JD reuse: a new JD whose estimated Jaccard similarity
+    # (MinHash over word 3-shingles) with an existing analysis on the same
+    # CV + model reaches this value reuses it instead of paying for a fresh
+    # call. 0 disables.
+    near_duplicate_similarity: float = 0.95
+
+    # Triage pass for large backlogs: a batch run with at least
+    # ``ai_triage_min_backlog`` pending items, and every WorldWild promotion,
+    # first asks for score + track only (``triage_job``) and escalates to the
+    # full analysis just the items scoring at least ``ai_triage_min_score``.
+    # 0 disables.
+    ai_triage_min_score: int = 0
+    ai_triage_min_backlog: int = 10
+
+    # Prompt compaction (integrations.compaction): JD boilerplate stripped,
+    # CV ranked by section against the JD under a token budget instead of
+    # cut at a fixed length. Off = the old blind truncation.
+    ai_compaction_enabled: bool = True
+
+    # Rows per column compressed by each step of the startup backfill of
+    # the legacy text columns (migration 035). 0 disables the backfill.
+    text_compression_batch_size: int = 200
+    # The before/after storage report (dashboard.storage) scans every text
+    # column; get_db_usage serves it from an in-process cache this long.
+    text_storage_cache_seconds: float = 900.0
+
     # Input limits
     max_cv_size: int = 100_000  # ~100KB chars
     max_job_desc_size: int = 50_000  # ~50KB chars
     max_batch_size: int = 10  # Hard limit: max items per batch (free tier constraint)
 
+    # Batch concurrency + shared Anthropic pacing. Defaults match the
+    # Anthropic Tier 1 org limits for Haiku (50 RPM / 50k input TPM); raise
+    # them via env once the org tier is bumped.
+    batch_workers: int = 3
+    # Batch item leases: a claimed item stays owned for ``batch_lease_seconds``
+    # and its worker renews the lease every ``batch_heartbeat_seconds``; a
+    # killed worker's items are reclaimed once the lease lapses. Standalone
+    # workers (scripts/batch_worker.py) poll an empty queue every
+    # ``batch_worker_poll_seconds``.
+    batch_lease_seconds: int = 30
+    batch_heartbeat_seconds: int = 10
+    batch_worker_poll_seconds: float = 5.0
+    # Transient batch failures (timeouts, connection drops, 429 / 5xx / 529)
+    # go back to pending after an exponential backoff with jitter starting
+    # at ``batch_retry_base_seconds`` and capped at ``batch_retry_max_seconds``;
+    # after ``batch_max_attempts`` attempts the item is dead-lettered.
+    # Permanent errors fail at once.
+    batch_max_attempts: int = 4
+    batch_retry_base_seconds: float = 30.0
+    batch_retry_max_seconds: float = 600.0
+    # Budget reservations: every AI call holds its estimated cost (prompt
+    # + max_tokens) against ANTHROPIC budget while in flight, then its
+    # actual cost until the caller's add_spending deletes the row, for at
+    # most ``budget_reservation_ttl_seconds`` (a crashed worker's hold lapses).
+    budget_reservation_ttl_seconds: int = 600
+    # Every ``spend_rollup_interval_seconds`` the app folds new
+    # ai_spend_events into the ai_spend_daily rollups (own committed
+    # session). Readers add the events not folded yet. 0 disables.
+    spend_rollup_interval_seconds: float = 60.0
+    # What a batch run does when the projected spend of its remaining items
+    # exceeds the remaining budget (batch.planner): ``downgrade`` moves
+    # Sonnet items to Haiku while that fits, ``stop`` leaves the items that
+    # don't fit pending. /batch/run may override it per run.
+    batch_budget_policy: str = "downgrade"
+    anthropic_requests_per_minute: int = 50
+    anthropic_tokens_per_minute: int = 50_000
+    # Upper bound for the adaptive governor in ``anthropic_client``: it
+    # shrinks below this on 429s / low header headroom and grows back.
+    anthropic_max_concurrency: int = 4
+    # Hedged interactive calls: if an async AI call at interactive priority
+    # hasn't finished after this many seconds (~ observed p95), a second
+    # identical attempt is fired and the first to finish wins. 0 disables.
+    ai_hedge_after_seconds: float = 0.0
+
     # CORS
     cors_allowed_origins: str = "http://localhost,http://localhost:80"
     cors_allow_credentials: bool = True
@@ -62,6 +62,19 @@ def get_contacts_for_analysis(db: Session, analysis_id: str) -> list[Contact]:
     return db.query(Contact).filter(Contact.analysis_id == uid).order_by(Contact.created_at.desc()).all()
 
 
+def contact_summary(db: Session, analysis_id: UUID) -> str:
+    """One-line "Nome: ..., LinkedIn: ..." of the analysis' first contact, for outreach prompts."""
+    contact = db.query(Contact).filter(Contact.analysis_id == analysis_id).first()
+    if not contact:
+        return ""
+    parts = []
+    if contact.name:
+        parts.append(f"Nome: {contact.name}")
+    if contact.linkedin_url:
+        parts.append(f"LinkedIn: {contact.linkedin_url}")
+    return ", ".join(parts)
+
+
 def search_all_contacts(db: Session, query: str, limit: int = 20) -> list[Contact]:
     """Search all contacts by name, company, or email (case-insensitive)."""
     pattern = f"%{query}%"
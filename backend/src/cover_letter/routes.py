@@ -12,21 +12,22 @@ Endpoint:
 """
 
 import logging
-from typing import Annotated, cast
+from typing import Annotated, Any, cast
 from urllib.parse import quote
 from uuid import UUID
 
 from fastapi import APIRouter, Form, Request
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
+from starlette.concurrency import run_in_threadpool
 
 from ..analysis.service import get_analysis_by_id
-from ..audit.service import audit
+from ..audit.service import audit_commit, audit_rollback
 from ..config import settings
 from ..cv.service import get_latest_cv
 from ..dashboard.service import add_spending, check_budget_available
 from ..dependencies import Cache, CurrentUser, DbSession, validate_uuid
 from ..rate_limit import limiter
-from .service import build_docx, create_cover_letter, get_cover_letter_by_id
+from .service import agenerate_cover_letters, build_docx, get_cover_letter_by_id, persist_cover_letter
 
 logger = logging.getLogger(__name__)
 
@@ -35,13 +36,52 @@ router = APIRouter(tags=["cover_letter"])
 
 # Languages must match the <option value="..."> in analysis_detail.html.
 # "ita_eng" is a special bilingual code: generates BOTH italiano + english
-# in the same request (2 sequential AI calls, 2 CoverLetter rows persisted).
+# in the same request (2 concurrent AI calls, 2 CoverLetter rows persisted).
 ALLOWED_LANGUAGES = {"italiano", "english", "francais", "deutsch", "espanol", "ita_eng"}
 
 
+def _cover_letter_preflight(
+    request: Request, db: "DbSession", user: "CurrentUser", analysis_id: str
+) -> tuple[Any, Any, str, Response | None]:
+    """Analysis/CV/budget checks; returns ``(analysis, cv, safe_id, None)`` or the redirect."""
+    safe_id = str(validate_uuid(analysis_id))
+    analysis = get_analysis_by_id(db, safe_id)
+    if not analysis:
+        request.session["flash_error"] = "Analisi non trovata"
+        return None, None, safe_id, RedirectResponse(url="/history", status_code=303)
+
+    cv = get_latest_cv(db, cast(UUID, user.id))
+    if not cv:
+        request.session["flash_error"] = "CV non trovato"
+        return None, None, safe_id, RedirectResponse(url=f"/analysis/{safe_id}", status_code=303)
+
+    budget_ok, budget_msg = check_budget_available(db)
+    if not budget_ok:
+        request.session["flash_error"] = budget_msg
+        return None, None, safe_id, RedirectResponse(url=f"/analysis/{safe_id}", status_code=303)
+    return analysis, cv, safe_id, None
+
+
+def _save_cover_letters(
+    request: Request, db: "DbSession", analysis: Any, results: list[tuple[str, dict[str, Any]]], detail: str
+) -> None:
+    for lang, result in results:
+        persist_cover_letter(db, analysis, lang, result)
+        add_spending(
+            db,
+            result.get("cost_usd", 0.0),
+            result.get("tokens", {}).get("input", 0),
+            result.get("tokens", {}).get("output", 0),
+            is_analysis=False,
+            model=result.get("model_used", ""),
+            reservations=result.get("budget_reservations", ()),
+        )
+    audit_commit(db, request, "cover_letter", detail)
+
+
 @router.post("/cover-letter", response_class=HTMLResponse)
 @limiter.limit(settings.rate_limit_analyze)
-def generate_cover_letter_route(
+async def generate_cover_letter_route(
     request: Request,
     db: DbSession,
     user: CurrentUser,
@@ -54,47 +94,30 @@ def generate_cover_letter_route(
     if language not in ALLOWED_LANGUAGES:
         language = "italiano"
 
-    safe_id = str(validate_uuid(analysis_id))
-    analysis = get_analysis_by_id(db, safe_id)
-    if not analysis:
-        request.session["flash_error"] = "Analisi non trovata"
-        return RedirectResponse(url="/history", status_code=303)
-
-    cv = get_latest_cv(db, cast(UUID, user.id))
-    if not cv:
-        request.session["flash_error"] = "CV non trovato"
-        return RedirectResponse(url=f"/analysis/{safe_id}", status_code=303)
-
-    budget_ok, budget_msg = check_budget_available(db)
-    if not budget_ok:
-        request.session["flash_error"] = budget_msg
-        return RedirectResponse(url=f"/analysis/{safe_id}", status_code=303)
+    analysis, cv, safe_id, early = await run_in_threadpool(_cover_letter_preflight, request, db, user, analysis_id)
+    if early is not None:
+        return early
 
-    # Bilingual mode: 2 sequential generations (italiano + english)
+    # Bilingual mode: 2 generations (italiano + english), run concurrently
     languages_to_generate = ["italiano", "english"] if language == "ita_eng" else [language]
 
-    generated = []
     try:
-        for lang in languages_to_generate:
-            _, result = create_cover_letter(db, analysis, cast(str, cv.raw_text), lang, model, cache)
-            add_spending(
-                db,
-                result.get("cost_usd", 0.0),
-                result.get("tokens", {}).get("input", 0),
-                result.get("tokens", {}).get("output", 0),
-                is_analysis=False,
-            )
-            generated.append(lang)
-        audit(db, request, "cover_letter", f"analysis={safe_id}, lang={language}, generated={generated}")
-        db.commit()
+        results = await agenerate_cover_letters(analysis, cast(str, cv.raw_text), languages_to_generate, model, cache)
+        await run_in_threadpool(
+            _save_cover_letters,
+            request,
+            db,
+            analysis,
+            list(zip(languages_to_generate, results, strict=True)),
+            f"analysis={safe_id}, lang={language}, generated={languages_to_generate}",
+        )
     except Exception as exc:
-        db.rollback()
-        audit(db, request, "cover_letter_error", str(exc))
-        db.commit()
+        await run_in_threadpool(audit_rollback, db, request, "cover_letter_error", str(exc))
         logger.exception("Cover letter generation failed")
         request.session["flash_error"] = "Generazione cover letter fallita, riprova."
         return RedirectResponse(url=f"/analysis/{safe_id}", status_code=303)
 
+    generated = languages_to_generate
     flash_lang = " + ".join(generated) if len(generated) > 1 else generated[0]
     request.session["flash_message"] = f"Cover letter generata! ({flash_lang})"
     return RedirectResponse(url=f"/analysis/{safe_id}", status_code=303)
@@ -9,6 +9,7 @@ analisi (history utile quando l'utente rigenera dopo feedback).
 Out of scope: budget gate, dedup pre-call — gestiti dal caller route.
 """
 
+import asyncio
 import io
 import re
 from datetime import UTC, datetime
@@ -19,23 +20,75 @@ from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.shared import Cm, Pt
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from ..analysis.models import JobAnalysis
-from ..integrations.anthropic_client import generate_cover_letter
+from ..integrations.anthropic_client import agenerate_cover_letter, agenerate_outreach_bundle
 from ..integrations.cache import CacheService
 from .models import CoverLetter
 
 
-def create_cover_letter(
-    db: Session,
+async def agenerate_cover_letters(
     analysis: JobAnalysis,
     cv_text: str,
+    languages: list[str],
+    model: str = "haiku",
+    cache: CacheService | None = None,
+) -> list[dict[str, Any]]:
+    """Genera in parallelo una cover letter per lingua (async client).
+
+    Solo la parte AI: il bilingue ``ita_eng`` non paga più due attese in
+    serie. La persistenza resta al caller via :func:`persist_cover_letter`,
+    in sequenza sulla stessa Session.
+    """
+    job_description, data = await run_in_threadpool(_prompt_inputs, analysis)
+    return list(
+        await asyncio.gather(
+            *(agenerate_cover_letter(cv_text, job_description, data, lang, model, cache) for lang in languages)
+        )
+    )
+
+
+async def agenerate_outreach(
+    analysis: JobAnalysis,
+    cv_text: str,
+    days_since: int,
+    contact_info: str,
     language: str,
     model: str = "haiku",
     cache: CacheService | None = None,
-) -> tuple[CoverLetter, dict[str, Any]]:
-    """Generate and persist a cover letter for an analysis."""
-    analysis_data = {
+) -> dict[str, Any]:
+    """Cover letter + follow-up email + messaggio LinkedIn in una sola chiamata.
+
+    La cover letter va persistita dal caller (:func:`persist_cover_letter`
+    con il costo dell'intera chiamata); email e messaggio restano nella
+    cache sotto le chiavi delle generazioni singole, così i bottoni
+    "Email" / "LinkedIn" della pagina li servono senza nuova chiamata.
+    """
+    job_description, data = await run_in_threadpool(_prompt_inputs, analysis)
+    return await agenerate_outreach_bundle(
+        cv_text,
+        job_description,
+        data,
+        days_since,
+        contact_info,
+        language,
+        model,
+        cache,
+    )
+
+
+def _prompt_inputs(analysis: JobAnalysis) -> tuple[str, dict[str, Any]]:
+    """JD + analysis fields for the prompt, read in the threadpool.
+
+    ``job_description`` loads its ``JDBlob`` (and expired attributes
+    refresh) with a blocking query: never read it on the event loop.
+    """
+    return cast(str, analysis.job_description), _analysis_data(analysis)
+
+
+def _analysis_data(analysis: JobAnalysis) -> dict[str, Any]:
+    return {
         "role": analysis.role,
         "company": analysis.company,
         "score": analysis.score,
@@ -43,8 +96,9 @@ def create_cover_letter(
         "gaps": analysis.gaps or [],
     }
 
-    result = generate_cover_letter(cv_text, cast(str, analysis.job_description), analysis_data, language, model, cache)
 
+def persist_cover_letter(db: Session, analysis: JobAnalysis, language: str, result: dict[str, Any]) -> CoverLetter:
+    """Insert the ``CoverLetter`` row for a generation result."""
     cl = CoverLetter(
         analysis_id=analysis.id,
         language=language,
@@ -57,7 +111,7 @@ def create_cover_letter(
     )
     db.add(cl)
     db.flush()
-    return cl, result
+    return cl
 
 
 def get_cover_letter_by_id(db: Session, cover_letter_id: str) -> CoverLetter | None:
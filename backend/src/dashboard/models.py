@@ -0,0 +1,79 @@
+"""Ledger spese AI: eventi append-only, rollup giornalieri e prenotazioni."""
+
+from datetime import UTC, date, datetime
+
+from sqlalchemy import Date, DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database.base import Base
+
+
+class BudgetReservation(Base):
+    """Cost held against ``app_settings.anthropic_budget`` while a call is in flight.
+
+    Created with the estimated cost (prompt + ``max_tokens``) before the
+    request, settled to the actual cost when the response arrives and
+    deleted by the caller's ``add_spending`` together with the spend event.
+    Rows nobody charged expire at ``expires_at``; expired rows are ignored
+    and pruned by the next reservation.
+    """
+
+    __tablename__ = "budget_reservations"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    amount_usd: Mapped[float] = mapped_column(nullable=False)
+    settled: Mapped[bool] = mapped_column(nullable=False, default=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("idx_budget_reservations_expires", "expires_at"),)
+
+
+class AISpendEvent(Base):
+    """One charge (or, with negative amounts, one reversal) of AI spend.
+
+    Writers only ever INSERT here, so concurrent workers never contend on
+    a shared row. The payload is immutable; ``rolled_up`` flips once
+    ``roll_up_spending`` has folded the event into ``ai_spend_daily``.
+    """
+
+    __tablename__ = "ai_spend_events"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    spent_on: Mapped[date] = mapped_column(Date, nullable=False)
+    model: Mapped[str] = mapped_column(String(50), nullable=False, default="")
+    cost_usd: Mapped[float] = mapped_column(nullable=False, default=0.0)
+    tokens_input: Mapped[int] = mapped_column(nullable=False, default=0)
+    tokens_output: Mapped[int] = mapped_column(nullable=False, default=0)
+    analyses: Mapped[int] = mapped_column(nullable=False, default=0)
+    cover_letters: Mapped[int] = mapped_column(nullable=False, default=0)
+    rolled_up: Mapped[bool] = mapped_column(nullable=False, default=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+    )
+
+    __table_args__ = (Index("idx_ai_spend_events_rolled_up", "rolled_up"),)
+
+
+class AISpendDaily(Base):
+    """Per-day, per-model totals of the rolled-up ``ai_spend_events``.
+
+    ``model`` is empty for charges recorded without one (legacy counters
+    carried over by migration 041, imports).
+    """
+
+    __tablename__ = "ai_spend_daily"
+
+    spent_on: Mapped[date] = mapped_column(Date, primary_key=True)
+    model: Mapped[str] = mapped_column(String(50), primary_key=True, default="")
+    cost_usd: Mapped[float] = mapped_column(nullable=False, default=0.0)
+    tokens_input: Mapped[int] = mapped_column(nullable=False, default=0)
+    tokens_output: Mapped[int] = mapped_column(nullable=False, default=0)
+    analyses: Mapped[int] = mapped_column(nullable=False, default=0)
+    cover_letters: Mapped[int] = mapped_column(nullable=False, default=0)
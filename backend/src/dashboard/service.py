@@ -1,12 +1,20 @@
 """Dashboard service — ledger spese AI + alert proattivi + DB usage.
 
 Centralizza:
-- ``add_spending()`` atomico per il ledger di costi/tokens su ``app_settings``
-  (running totals + today counters auto-reset on date change) — chiamato
-  dopo ogni Anthropic call così la UI Settings rispecchia il consumo reale;
+- ``add_spending()`` / ``remove_spending()`` per il ledger di costi/tokens:
+  una riga append-only in ``ai_spend_events`` per addebito o storno
+  (nessun UPDATE su una riga condivisa) — chiamato dopo ogni Anthropic call
+  così la UI Settings rispecchia il consumo reale; ``roll_up_spending()``
+  piega gli eventi nei rollup ``ai_spend_daily`` (giorno × modello);
 - ``check_budget_available()`` + ``get_spending()`` per il budget gate
   pre-analisi (``ANTHROPIC_BUDGET`` env) — ritorna ``(ok, msg)`` con
   granularità "speso vs budget" per UX honest;
+- ``reserve_budget()`` / ``settle_reservation()`` / ``release_reservation()``:
+  il client AI prenota il costo stimato prima di ogni chiamata e lo
+  sostituisce col costo reale dopo, così worker concorrenti (batch, inbox,
+  WorldWild) non passano il gate tutti insieme sforando il budget; la
+  prenotazione chiusa sparisce nella stessa transazione dell'addebito
+  (``add_spending(..., reservations=...)``);
 - ``get_followup_alerts()`` che surfacizza analisi candidato senza
   interview pianificata da N giorni — usato dal widget dashboard;
 - ``get_db_usage()`` con stima percentuale verso il 500MB cap di Neon
@@ -16,10 +24,12 @@ Out of scope: rendering HTML (route layer), chiamate AI vere
 (``integrations/anthropic_client``).
 """
 
+from collections.abc import Sequence
 from datetime import UTC, date, datetime, timedelta
 from typing import Any
 
-from sqlalchemy import Numeric, func, update
+from sqlalchemy import delete, func, literal, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from ..analysis.models import AnalysisStatus, AppSettings, JobAnalysis
@@ -27,6 +37,12 @@ from ..audit.models import AuditLog
 from ..batch.models import BatchItem
 from ..config import settings as app_settings
 from ..cover_letter.models import CoverLetter
+from .models import AISpendDaily, AISpendEvent, BudgetReservation
+from .storage import text_storage_usage
+
+
+class BudgetExceededError(Exception):
+    """The budget can't cover the estimated cost of the next AI call."""
 
 
 def get_or_create_settings(db: Session) -> AppSettings:
@@ -39,59 +55,184 @@ def get_or_create_settings(db: Session) -> AppSettings:
     return s
 
 
-def _check_today_reset(s: AppSettings) -> None:
-    """Reset daily counters if the date has changed."""
-    today = date.today().isoformat()
-    if (s.today_date or "") != today:
-        s.today_date = today  # type: ignore[assignment]
-        s.today_cost_usd = 0.0  # type: ignore[assignment]
-        s.today_tokens_input = 0  # type: ignore[assignment]
-        s.today_tokens_output = 0  # type: ignore[assignment]
-        s.today_analyses = 0  # type: ignore[assignment]
+_SPEND_FIELDS = ("cost_usd", "tokens_input", "tokens_output", "analyses", "cover_letters")
+# Events folded into the daily rollups per roll_up_spending() call.
+_ROLL_UP_BATCH = 1000
 
 
-def check_budget_available(db: Session) -> tuple[bool, str]:
-    """Check if budget allows further spending. Returns (ok, message)."""
+def _spend_totals(db: Session, spent_on: date | None = None) -> dict[str, float]:
+    """Spend rolled up in ``ai_spend_daily`` plus the events not folded yet.
+
+    All-time totals also include the ``app_settings.total_*`` opening
+    balance (spend recorded before the event ledger, migration 041). One
+    statement, so a concurrent ``roll_up_spending`` can't make an event
+    count twice or not at all.
+    """
+    daily = select(*(getattr(AISpendDaily, f).label(f) for f in _SPEND_FIELDS))
+    pending = select(*(getattr(AISpendEvent, f).label(f) for f in _SPEND_FIELDS)).where(
+        AISpendEvent.rolled_up.is_(False)
+    )
+    if spent_on is not None:
+        parts = [daily.where(AISpendDaily.spent_on == spent_on), pending.where(AISpendEvent.spent_on == spent_on)]
+    else:
+        opening = select(
+            func.coalesce(AppSettings.total_cost_usd, 0.0).label("cost_usd"),
+            func.coalesce(AppSettings.total_tokens_input, 0).label("tokens_input"),
+            func.coalesce(AppSettings.total_tokens_output, 0).label("tokens_output"),
+            func.coalesce(AppSettings.total_analyses, 0).label("analyses"),
+            func.coalesce(AppSettings.total_cover_letters, 0).label("cover_letters"),
+        )
+        parts = [daily, pending, opening]
+    rows = union_all(*parts).subquery()
+    sums = db.execute(select(*(func.coalesce(func.sum(rows.c[f]), literal(0)) for f in _SPEND_FIELDS))).one()
+    return {f: max(float(v or 0), 0.0) for f, v in zip(_SPEND_FIELDS, sums, strict=True)}
+
+
+def _reserved_usd(db: Session, now: datetime) -> float:
+    """Cost held by reservations that haven't expired yet."""
+    held = db.query(func.sum(BudgetReservation.amount_usd)).filter(BudgetReservation.expires_at > now).scalar()
+    return float(held or 0)
+
+
+def remaining_budget(db: Session) -> float | None:
+    """USD left in the budget after spend and in-flight reservations; None when no budget is set."""
     s = get_or_create_settings(db)
     budget = float(s.anthropic_budget or 0)
     if budget <= 0:
+        return None
+    return budget - _spend_totals(db)["cost_usd"] - _reserved_usd(db, datetime.now(UTC))
+
+
+def check_budget_available(db: Session) -> tuple[bool, str]:
+    """Check if budget allows further spending. Returns (ok, message).
+
+    Calls already in flight count through their reservations.
+    """
+    remaining = remaining_budget(db)
+    if remaining is None:
         return True, ""  # No budget set = no limit
-    total_cost = float(s.total_cost_usd or 0)
-    remaining = budget - total_cost
     if remaining <= 0:
+        s = get_or_create_settings(db)
+        budget = float(s.anthropic_budget or 0)
+        total_cost = _spend_totals(db)["cost_usd"]
         return False, f"Budget esaurito! Speso ${total_cost:.4f} su ${budget:.2f}"
     return True, ""
 
 
-def add_spending(db: Session, cost: float, tokens_in: int, tokens_out: int, is_analysis: bool = True) -> None:
-    """Update running totals after an insert.
+# Transaction-scoped advisory lock taken by ``reserve_budget``: only the
+# reservations serialize on it, not every reader/writer of ``app_settings``.
+_BUDGET_LOCK_KEY = 0x6A0B0D6E
+
 
-    Atomic SQL UPDATE con espressione server-side per evitare race condition
-    su BG task concorrenti (cowork batch + Chrome ext finiscono insieme,
-    read-modify-write classico perdeva increment). Il pre-check resetta
-    ``today_*`` a mezzanotte; poi un singolo UPDATE atomic propaga tutti gli
-    increment in una sola query.
+def _lock_budget(db: Session) -> None:
+    """Serialize budget checks until the transaction ends (PostgreSQL; SQLite serializes writers itself)."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_advisory_xact_lock(_BUDGET_LOCK_KEY)))
+
+
+def reserve_budget(db: Session, amount: float) -> int | None:
+    """Hold ``amount`` USD of budget for a call about to start; the caller commits.
+
+    Spent + held + ``amount`` is checked against the budget under an
+    advisory lock (:func:`_lock_budget`) held until the caller's commit,
+    so concurrent reservations serialize instead of all passing the same
+    stale check. Returns the reservation id, or None when no budget is
+    set. Raises :class:`BudgetExceededError` when the call doesn't fit.
     """
-    s = get_or_create_settings(db)
-    _check_today_reset(s)
+    s = db.query(AppSettings).first()
+    if s is None or float(s.anthropic_budget or 0) <= 0:
+        return None
+    _lock_budget(db)
+    now = datetime.now(UTC)
+    db.execute(
+        delete(BudgetReservation).where(BudgetReservation.expires_at <= now),
+        execution_options={"synchronize_session": False},
+    )
+    budget = float(s.anthropic_budget or 0)
+    committed = _spend_totals(db)["cost_usd"] + _reserved_usd(db, now)
+    if committed + amount > budget:
+        raise BudgetExceededError(
+            f"Budget insufficiente: stimati ${amount:.4f}, impegnati ${committed:.4f} su ${budget:.2f}"
+        )
+    reservation = BudgetReservation(
+        amount_usd=round(amount, 6),
+        expires_at=now + timedelta(seconds=app_settings.budget_reservation_ttl_seconds),
+    )
+    db.add(reservation)
     db.flush()
-    cost_rounded = round(cost, 6)
-    values: dict[str, Any] = {
-        "total_cost_usd": func.round((AppSettings.total_cost_usd + cost_rounded).cast(Numeric), 6),
-        "total_tokens_input": AppSettings.total_tokens_input + tokens_in,
-        "total_tokens_output": AppSettings.total_tokens_output + tokens_out,
-        "today_cost_usd": func.round((AppSettings.today_cost_usd + cost_rounded).cast(Numeric), 6),
-        "today_tokens_input": AppSettings.today_tokens_input + tokens_in,
-        "today_tokens_output": AppSettings.today_tokens_output + tokens_out,
-    }
-    if is_analysis:
-        values["total_analyses"] = AppSettings.total_analyses + 1
-        values["today_analyses"] = AppSettings.today_analyses + 1
-    else:
-        values["total_cover_letters"] = AppSettings.total_cover_letters + 1
-    db.execute(update(AppSettings).where(AppSettings.id == s.id).values(**values))
+    return reservation.id
+
+
+def settle_reservation(db: Session, reservation_id: int, actual: float) -> None:
+    """Swap the estimate for the call's actual cost; the caller commits.
+
+    The settled row keeps holding that cost until the caller's
+    ``add_spending(..., reservations=...)`` deletes it in the transaction
+    that records the spend event, so the cost is counted exactly once at
+    any time. A caller that never charges leaves it to lapse at its
+    original ``expires_at``.
+    """
+    db.execute(
+        update(BudgetReservation)
+        .where(BudgetReservation.id == reservation_id)
+        .values(amount_usd=round(actual, 6), settled=True)
+    )
+
+
+def release_reservation(db: Session, reservation_id: int) -> None:
+    """Drop a reservation whose call never produced a billable response; the caller commits."""
+    db.execute(delete(BudgetReservation).where(BudgetReservation.id == reservation_id))
+
+
+def _record_spend(
+    db: Session,
+    spent_on: date,
+    model: str,
+    cost: float,
+    tokens_in: int,
+    tokens_out: int,
+    is_analysis: bool,
+    sign: int,
+) -> None:
+    db.add(
+        AISpendEvent(
+            spent_on=spent_on,
+            model=(model or "")[:50],
+            cost_usd=sign * round(cost, 6),
+            tokens_input=sign * tokens_in,
+            tokens_output=sign * tokens_out,
+            analyses=sign if is_analysis else 0,
+            cover_letters=0 if is_analysis else sign,
+        )
+    )
     db.flush()
-    db.refresh(s)
+
+
+def add_spending(
+    db: Session,
+    cost: float,
+    tokens_in: int,
+    tokens_out: int,
+    is_analysis: bool = True,
+    model: str = "",
+    reservations: Sequence[int] = (),
+) -> None:
+    """Record one AI charge in the ledger; the caller commits.
+
+    Un solo INSERT in ``ai_spend_events``: prima ogni chiamata faceva
+    read + reset giornaliero + UPDATE sulla riga singleton ``app_settings``,
+    che con batch, inbox e WorldWild in parallelo diventava il punto di
+    contesa. ``model`` alimenta il rollup per modello. ``reservations``
+    (``result["budget_reservations"]``) sono le prenotazioni chiuse dalla
+    chiamata: vengono cancellate nella stessa transazione dell'evento,
+    così il costo non è mai contato due volte né mai assente.
+    """
+    _record_spend(db, date.today(), model, cost, tokens_in, tokens_out, is_analysis, 1)
+    if reservations:
+        db.execute(
+            delete(BudgetReservation).where(BudgetReservation.id.in_(list(reservations))),
+            execution_options={"synchronize_session": False},
+        )
 
 
 def remove_spending(
@@ -100,33 +241,71 @@ def remove_spending(
     tokens_in: int,
     tokens_out: int,
     is_analysis: bool = True,
-    created_today: bool = False,
+    spent_on: date | None = None,
+    model: str = "",
 ) -> None:
-    """Update running totals after a delete."""
-    s = get_or_create_settings(db)
-    _check_today_reset(s)
-    s.total_cost_usd = round(max(float(s.total_cost_usd or 0) - cost, 0), 6)  # type: ignore[arg-type]
-    s.total_tokens_input = max(int(s.total_tokens_input or 0) - tokens_in, 0)  # type: ignore[arg-type]
-    s.total_tokens_output = max(int(s.total_tokens_output or 0) - tokens_out, 0)  # type: ignore[arg-type]
-    if is_analysis:
-        s.total_analyses = max(int(s.total_analyses or 0) - 1, 0)  # type: ignore[arg-type]
-    else:
-        s.total_cover_letters = max(int(s.total_cover_letters or 0) - 1, 0)  # type: ignore[arg-type]
-    if created_today:
-        s.today_cost_usd = round(max(float(s.today_cost_usd or 0) - cost, 0), 6)  # type: ignore[arg-type]
-        s.today_tokens_input = max(int(s.today_tokens_input or 0) - tokens_in, 0)  # type: ignore[arg-type]
-        s.today_tokens_output = max(int(s.today_tokens_output or 0) - tokens_out, 0)  # type: ignore[arg-type]
-        if is_analysis:
-            s.today_analyses = max(int(s.today_analyses or 0) - 1, 0)  # type: ignore[arg-type]
+    """Record the reversal of a charge (after a delete); the caller commits.
+
+    The negative event is dated ``spent_on``, the day of the original
+    charge (default today), so only that day's counters go down.
+    """
+    _record_spend(db, spent_on or date.today(), model, cost, tokens_in, tokens_out, is_analysis, -1)
+
+
+def roll_up_spending(db: Session) -> int:
+    """Fold pending ``ai_spend_events`` into ``ai_spend_daily``; the caller commits.
+
+    Incremental: each event is added to its (day, model) row once and then
+    flagged. Called every ``spend_rollup_interval_seconds`` by the lifespan
+    task on its own committed session. Events are locked with ``SKIP LOCKED``, so concurrent
+    roll-ups split the work instead of waiting on each other. Returns the
+    number of events folded.
+    """
+    events = db.scalars(
+        select(AISpendEvent)
+        .where(AISpendEvent.rolled_up.is_(False))
+        .order_by(AISpendEvent.id)
+        .limit(_ROLL_UP_BATCH)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not events:
+        return 0
+    groups: dict[tuple[date, str], dict[str, float]] = {}
+    for event in events:
+        sums = groups.setdefault((event.spent_on, event.model), dict.fromkeys(_SPEND_FIELDS, 0))
+        for field in _SPEND_FIELDS:
+            sums[field] += getattr(event, field)
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    table = AISpendDaily.__table__
+    for (spent_on, model), sums in groups.items():
+        sums["cost_usd"] = round(sums["cost_usd"], 6)
+        insert = dialect.insert(table).values(spent_on=spent_on, model=model, **sums)
+        db.execute(
+            insert.on_conflict_do_update(
+                index_elements=["spent_on", "model"],
+                set_={field: table.c[field] + insert.excluded[field] for field in _SPEND_FIELDS},
+            )
+        )
+    db.execute(
+        update(AISpendEvent)
+        .where(AISpendEvent.id.in_([event.id for event in events]))
+        .values(rolled_up=True)
+        .execution_options(synchronize_session=False)
+    )
+    return len(events)
 
 
 def get_spending(db: Session) -> dict[str, Any]:
-    """Get current spending totals."""
+    """Get current spending totals, events not rolled up yet included.
+
+    Read-only: the rollup runs in the lifespan task (``main._roll_up_spending``),
+    which commits; the GET paths calling this never do.
+    """
     s = get_or_create_settings(db)
-    _check_today_reset(s)
-    db.flush()
     budget = float(s.anthropic_budget or 0)
-    total_cost = float(s.total_cost_usd or 0)
+    totals = _spend_totals(db)
+    today = _spend_totals(db, date.today())
+    total_cost = totals["cost_usd"]
     remaining = round(budget - total_cost, 4) if budget > 0 else None
 
     # Count candidatures whose applied_at transition happened today.
@@ -145,13 +324,13 @@ def get_spending(db: Session) -> dict[str, Any]:
         "budget": round(budget, 2),
         "total_cost_usd": round(total_cost, 4),
         "remaining": remaining,
-        "total_analyses": int(s.total_analyses or 0),
-        "total_tokens_input": int(s.total_tokens_input or 0),
-        "total_tokens_output": int(s.total_tokens_output or 0),
-        "today_cost_usd": round(float(s.today_cost_usd or 0), 4),
-        "today_analyses": int(s.today_analyses or 0),
-        "today_tokens_input": int(s.today_tokens_input or 0),
-        "today_tokens_output": int(s.today_tokens_output or 0),
+        "total_analyses": int(totals["analyses"]),
+        "total_tokens_input": int(totals["tokens_input"]),
+        "total_tokens_output": int(totals["tokens_output"]),
+        "today_cost_usd": round(today["cost_usd"], 4),
+        "today_analyses": int(today["analyses"]),
+        "today_tokens_input": int(today["tokens_input"]),
+        "today_tokens_output": int(today["tokens_output"]),
         "today_applied": int(today_applied),
     }
 
@@ -273,7 +452,7 @@ def get_top_candidates(db: Session, limit: int = 10) -> list[dict[str, Any]]:
 
 
 def get_db_usage(db: Session) -> dict[str, Any]:
-    """Return DB row counts and estimated size (mirrors /api/v1/db-usage)."""
+    """Return DB row counts, estimated size and compressed text storage (mirrors /api/v1/db-usage)."""
     analyses_count = db.query(func.count(JobAnalysis.id)).scalar() or 0
     batch_items_count = db.query(func.count(BatchItem.id)).scalar() or 0
     audit_logs_count = db.query(func.count(AuditLog.id)).scalar() or 0
@@ -286,15 +465,17 @@ def get_db_usage(db: Session) -> dict[str, Any]:
         "batch_items_count": batch_items_count,
         "audit_logs_count": audit_logs_count,
         "estimated_size_mb": estimated_size_mb,
+        "text_storage": text_storage_usage(db),
     }
 
 
 def seed_spending_totals(db: Session) -> None:
-    """Calculate initial totals from existing data if app_settings is empty."""
+    """Calculate the opening balance from existing data if the ledger is empty."""
     s = get_or_create_settings(db)
     existing = db.query(func.count(JobAnalysis.id)).scalar() or 0
+    has_ledger = db.query(AISpendEvent.id).first() is not None or db.query(AISpendDaily.spent_on).first() is not None
 
-    if (s.total_analyses or 0) == 0 and existing > 0:
+    if (s.total_analyses or 0) == 0 and existing > 0 and not has_ledger:
         a = db.query(
             func.coalesce(func.sum(JobAnalysis.cost_usd), 0.0),
             func.coalesce(func.sum(JobAnalysis.tokens_input), 0),
@@ -313,5 +494,4 @@ def seed_spending_totals(db: Session) -> None:
             s.total_tokens_output = int(a[2]) + int(cl[2])  # type: ignore[assignment]
             s.total_analyses = int(a[3])  # type: ignore[assignment]
             s.total_cover_letters = int(cl[3])  # type: ignore[assignment]
-            s.today_date = date.today().isoformat()  # type: ignore[assignment]
         db.flush()
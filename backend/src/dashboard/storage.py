@@ -0,0 +1,187 @@
+"""Compressed text storage: background backfill and size report.
+
+Rows written before migrations 035 / 036 keep their text in the legacy
+columns until :func:`compress_legacy_batch` rewrites them through the
+hybrid attributes: ``full_response`` into its compressed column (see
+``database.compression``), the JD columns into the shared blob store (see
+``jd_store``). The lifespan runs it in small batches in the background,
+together with :func:`fill_derived_batch` for the columns derived from that
+text on pre-existing analyses (MinHash signature of migration 030, parsed
+extras of 037);
+:func:`text_storage_usage` feeds ``get_db_usage`` with the before/after
+numbers.
+
+The report sums and decompresses every text column (~15 full scans), and
+``get_db_usage`` runs on each settings page and dashboard snapshot: it is
+cached in-process for ``settings.text_storage_cache_seconds``.
+"""
+
+import logging
+import time
+from typing import Any
+
+from sqlalchemy import JSON, and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from ..analysis.extras import extract_extras
+from ..analysis.fingerprint import band_buckets, minhash
+from ..analysis.models import JobAnalysis, JobAnalysisMinHashBand
+from ..batch.models import BatchItem
+from ..config import settings
+from ..database.compression import decompress_text
+from ..inbox.models import InboxItem
+from ..jd_store.models import JDBlob
+
+logger = logging.getLogger(__name__)
+
+# (model, hybrid attribute, legacy Text attribute, compressed attribute)
+COMPRESSED_COLUMNS: list[tuple[Any, str, str, str]] = [
+    (JobAnalysis, "full_response", "_full_response_plain", "full_response_z"),
+]
+# JD columns backed by jd_blobs; same layout, legacy compressed column included.
+JD_COLUMNS: list[tuple[Any, str, str, str]] = [
+    (JobAnalysis, "job_description", "_job_description_plain", "job_description_z"),
+    (BatchItem, "job_description", "_job_description_plain", "job_description_z"),
+    (InboxItem, "raw_text", "_raw_text_plain", "raw_text_z"),
+]
+_TABLES = ("job_analyses", "batch_items", "inbox_items", "jd_blobs")
+# Rows decompressed to estimate the raw size of the already compressed ones.
+_RATIO_SAMPLE = 20
+_MB = 1024 * 1024
+
+_cache: dict[str, Any] = {"value": None, "expires_at": 0.0}
+
+
+def _legacy_filter(model: Any, plain: str, packed: str, *, blob: bool) -> Any:
+    """Rows still using the legacy layout of a column."""
+    if blob:
+        return and_(model.jd_sha256.is_(None), or_(getattr(model, packed).isnot(None), getattr(model, plain) != ""))
+    return and_(getattr(model, packed).is_(None), getattr(model, plain) != "")
+
+
+def _legacy_targets() -> list[tuple[Any, str, Any]]:
+    return [
+        (model, attr, _legacy_filter(model, plain, packed, blob=False))
+        for model, attr, plain, packed in COMPRESSED_COLUMNS
+    ] + [(model, attr, _legacy_filter(model, plain, packed, blob=True)) for model, attr, plain, packed in JD_COLUMNS]
+
+
+def compress_legacy_batch(db: Session, batch_size: int) -> int:
+    """Rewrite up to ``batch_size`` legacy rows per column; returns how many were rewritten.
+
+    ``SKIP LOCKED`` lets several workers run the backfill side by side
+    without waiting on each other. The caller commits.
+    """
+    done = 0
+    for model, attr, legacy in _legacy_targets():
+        rows = db.query(model).filter(legacy).limit(batch_size).with_for_update(skip_locked=True).all()
+        for row in rows:
+            # The getter reads the legacy layout, the setter writes the new one.
+            setattr(row, attr, getattr(row, attr))
+        done += len(rows)
+    return done
+
+
+def fill_derived_batch(db: Session, batch_size: int) -> int:
+    """Fill the columns derived from the text of analyses written before migrations 030 / 037.
+
+    Up to ``batch_size`` rows each for the JD MinHash and the parsed
+    ``extras``. Only SQL NULL is selected: a JD without words stores JSON
+    ``null`` and isn't picked again. The caller commits.
+    """
+    done = 0
+    for row in _derived_pending(db, JobAnalysis.jd_minhash, batch_size):
+        signature = minhash(row.job_description or "")
+        if signature is None:
+            row.jd_minhash = JSON.NULL  # type: ignore[assignment]
+        else:
+            row.jd_minhash = signature  # type: ignore[assignment]
+            row.minhash_bands = [
+                JobAnalysisMinHashBand(band=band, bucket=bucket) for band, bucket in enumerate(band_buckets(signature))
+            ]
+        done += 1
+    for row in _derived_pending(db, JobAnalysis.extras, batch_size):
+        row.extras = extract_extras(row.full_response)  # type: ignore[assignment]
+        done += 1
+    return done
+
+
+def _derived_pending(db: Session, column: Any, batch_size: int) -> list[JobAnalysis]:
+    return db.query(JobAnalysis).filter(column.is_(None)).limit(batch_size).with_for_update(skip_locked=True).all()
+
+
+def _sum_length(db: Session, column: Any) -> int:
+    return int(db.query(func.coalesce(func.sum(func.length(column)), 0)).scalar() or 0)
+
+
+def _raw_ratio(db: Session, column: Any) -> float:
+    """Raw / stored size on a sample of compressed values (1.0 when there are none)."""
+    blobs = db.scalars(select(column).where(column.isnot(None)).limit(_RATIO_SAMPLE))
+    stored = raw = 0
+    for blob in blobs:
+        stored += len(blob)
+        raw += len(decompress_text(blob).encode())
+    return raw / stored if stored else 1.0
+
+
+def _table_sizes_mb(db: Session) -> dict[str, float] | None:
+    """On-disk size of the text tables (with TOAST and indexes); None off Postgres."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    return {
+        table: round(int(db.execute(select(func.pg_total_relation_size(table))).scalar() or 0) / _MB, 2)
+        for table in _TABLES
+    }
+
+
+def text_storage_usage(db: Session, *, force: bool = False) -> dict[str, Any]:
+    """Before/after size of the compressed text columns and of the JD blob store.
+
+    ``before_mb`` estimates the same data stored as plain text in every
+    row (compressed values scaled by the ratio measured on a sample, each
+    blob counted once per referencing row), ``after_mb`` is what is stored
+    now; ``pending_rows`` still wait for the backfill. Served from the
+    in-process cache unless expired or ``force=True``.
+    """
+    now = time.monotonic()
+    cached = _cache["value"]
+    if not force and cached is not None and now < _cache["expires_at"]:
+        return dict(cached)
+    fresh = _measure_text_storage(db)
+    _cache["value"] = fresh
+    _cache["expires_at"] = now + settings.text_storage_cache_seconds
+    return dict(fresh)
+
+
+def invalidate_cache() -> None:
+    """Drop the cached report so the next call measures again. Exposed for tests."""
+    _cache["value"] = None
+    _cache["expires_at"] = 0.0
+
+
+def _measure_text_storage(db: Session) -> dict[str, Any]:
+    before = after = 0.0
+    pending = 0
+    for model, _attr, plain, packed in COMPRESSED_COLUMNS + JD_COLUMNS:
+        legacy = _sum_length(db, getattr(model, plain))
+        stored = _sum_length(db, getattr(model, packed))
+        before += legacy + stored * _raw_ratio(db, getattr(model, packed))
+        after += legacy + stored
+    for model, _attr, legacy_filter in _legacy_targets():
+        pending += db.query(func.count()).select_from(model).filter(legacy_filter).scalar() or 0
+    for model, *_ in JD_COLUMNS:
+        before += int(
+            db.query(func.coalesce(func.sum(JDBlob.size), 0))
+            .select_from(model)
+            .join(JDBlob, JDBlob.sha256 == model.jd_sha256)
+            .scalar()
+            or 0
+        )
+    after += _sum_length(db, JDBlob.body)
+    return {
+        "before_mb": round(before / _MB, 2),
+        "after_mb": round(after / _MB, 2),
+        "pending_rows": pending,
+        "jd_blobs": db.query(func.count(JDBlob.sha256)).scalar() or 0,
+        "table_sizes_mb": _table_sizes_mb(db),
+    }
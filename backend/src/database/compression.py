@@ -0,0 +1,149 @@
+"""Transparent compression for large text columns.
+
+Job descriptions, raw inbox pastes and the analysis ``full_response`` are
+the bulk of the database, and the same JD often sits in three tables of a
+1 GB free-tier Postgres. Postgres TOAST only compresses values above ~2 KB
+and without any shared context, so the typical 1-4 KB JD is stored almost
+verbatim.
+
+Each compressed column pairs the legacy ``Text`` column (kept for rows not
+yet migrated, ``""`` once compressed) with a ``LargeBinary`` ``*_z``
+column. :func:`compressed_text` exposes the pair as a single hybrid
+attribute under the old name, so callers keep reading and writing
+``analysis.job_description`` as a ``str``.
+
+Blob format: one format byte, then a zlib stream. Format ``1`` uses a
+preset dictionary of recurring JD / analysis phrases (zlib's ``zdict``, the
+stdlib counterpart of a zstd trained dictionary). A new dictionary gets a
+new format byte; old blobs stay readable as long as their dictionary is
+kept in ``_DICTIONARIES``.
+"""
+
+import zlib
+from typing import Any
+
+from sqlalchemy import and_, not_, or_
+from sqlalchemy.ext.hybrid import Comparator, hybrid_property
+from sqlalchemy.sql import operators
+
+_LEVEL = 9
+
+# Frequent strings of Italian / English job ads and of the analysis JSON.
+# zlib favours matches near the end of the dictionary: the most common
+# strings go last.
+_JD_DICTIONARY_V1 = (
+    "Unisciti al nostro team. Join our team. We offer a competitive salary and benefits package. "
+    "Offriamo contratto a tempo indeterminato, RAL commisurata all'esperienza, buoni pasto, welfare aziendale, "
+    "smart working, formazione continua, assicurazione sanitaria integrativa, orario flessibile. "
+    "Contratto a tempo determinato finalizzato all'assunzione. Full-time. Part-time. Remote. Hybrid. On-site. "
+    "Sede di lavoro: Milano, Roma, Torino, Bologna, Napoli, Firenze, Padova, Verona, Bergamo, Brescia. "
+    "Costituiscono titolo preferenziale: Nice to have: Preferred qualifications: Bonus points if you have "
+    "Conoscenza della lingua inglese. Fluent English. Ottima conoscenza di English (B2/C1). "
+    "Capacita' di lavorare in team, problem solving, autonomia, proattivita', orientamento al risultato. "
+    "Strong communication skills, ability to work independently and in a team, attention to detail. "
+    "Laurea in Informatica, Ingegneria Informatica o discipline STEM. Bachelor's degree in Computer Science "
+    "Esperienza di almeno 3 anni. At least 3 years of experience. years of professional experience with "
+    "Python, Java, JavaScript, TypeScript, Go, C#, .NET, SQL, PostgreSQL, MySQL, MongoDB, Redis, Kafka, "
+    "Docker, Kubernetes, Terraform, Ansible, Helm, AWS, Azure, Google Cloud Platform (GCP), Linux, Git, "
+    "CI/CD pipelines, GitHub Actions, GitLab CI, Jenkins, ArgoCD, Prometheus, Grafana, ELK, Datadog, "
+    "microservices, REST API, monitoring, observability, infrastructure as code, cloud-native, DevOps, SRE. "
+    "Responsabilita': Cosa farai: Il candidato ideale. Requisiti: Cosa offriamo: Chi cerchiamo: "
+    "Responsibilities: What you'll do: Requirements: What we offer: About the role: Who you are: "
+    '{"company": "", "role": "", "location": "", "work_mode": "", "salary_info": "", "score": , '
+    '"recommendation": "", "strengths": [], "gaps": [{"gap": "", "severity": "", "closable": true, '
+    '"how": ""}], "job_summary": "", "career_track": "", "track_reason": "", "benefits": [], '
+    '"experience_required": {}, "score_label": "", "potential_score": , "gap_timeline": "", '
+    '"confidence": "", "interview_scripts": [{"question": "", "suggested_answer": ""}], "advice": ""} '
+    "La ricerca e' rivolta a candidati di entrambi i sessi. The position is open to all candidates. "
+    "Ci occupiamo di soluzioni software per i nostri clienti. Siamo un'azienda in forte crescita. "
+    "Stiamo cercando un/una Software Engineer, Backend Developer, DevOps Engineer, Cloud Engineer, "
+    "Platform Engineer, Site Reliability Engineer, Data Engineer, Full Stack Developer da inserire nel team. "
+    "We are looking for a Software Engineer, Backend Developer, DevOps Engineer, Cloud Engineer to join "
+    "the team. You will design, build and maintain scalable, reliable and secure systems. "
+    "esperienza con l'esperienza di and the of to in for with on our you your we are will be "
+    "nel della delle degli dei per con che sul sulla nella una un il la le di da in e a "
+)
+_DICTIONARIES: dict[int, bytes] = {
+    0: b"",
+    1: _JD_DICTIONARY_V1.encode(),
+}
+_CURRENT_FORMAT = 1
+
+
+def compress_text(value: str) -> bytes:
+    """Compress ``value`` with the current format (deterministic for a given zlib build)."""
+    zdict = _DICTIONARIES[_CURRENT_FORMAT]
+    compressor = zlib.compressobj(_LEVEL, zdict=zdict) if zdict else zlib.compressobj(_LEVEL)
+    return bytes([_CURRENT_FORMAT]) + compressor.compress(value.encode()) + compressor.flush()
+
+
+def decompress_text(blob: bytes) -> str:
+    """Inverse of :func:`compress_text`; accepts every format still in ``_DICTIONARIES``."""
+    blob = bytes(blob)  # psycopg2 hands bytea back as memoryview
+    fmt = blob[0]
+    if fmt not in _DICTIONARIES:
+        raise ValueError(f"Unknown compressed text format {fmt}")
+    zdict = _DICTIONARIES[fmt]
+    decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+    return (decompressor.decompress(blob[1:]) + decompressor.flush()).decode()
+
+
+class _CompressedComparator(Comparator[str]):
+    """SQL side of a compressed attribute: only ``==`` / ``!=`` are supported.
+
+    Equality works because compression is deterministic: the literal is
+    compressed and matched against the blob, or matched against the legacy
+    column for rows not migrated yet.
+    """
+
+    def __init__(self, plain: Any, packed: Any) -> None:
+        super().__init__(packed)
+        self._plain = plain
+        self._packed = packed
+
+    def operate(self, op: Any, *other: Any, **kwargs: Any) -> Any:
+        if op is operators.eq:
+            (value,) = other
+            if not value:
+                return and_(self._packed.is_(None), self._plain == value)
+            return or_(self._packed == compress_text(value), self._plain == value)
+        if op is operators.ne:
+            return not_(self.operate(operators.eq, *other))
+        raise NotImplementedError(f"Compressed text columns only support == and != (got {op.__name__})")
+
+    def reverse_operate(self, op: Any, other: Any, **kwargs: Any) -> Any:
+        return self.operate(op, other)
+
+
+def compressed_text(plain: str, packed: str, *, nullable: bool = False) -> "hybrid_property[Any]":
+    """Hybrid ``str`` attribute stored compressed in ``packed``.
+
+    ``plain`` is the mapped legacy ``Text`` attribute: read as fallback
+    while ``packed`` is NULL, blanked (``""``) when a value is written.
+    Empty values are not compressed. ``nullable`` lets ``None`` round-trip
+    (``full_response``); otherwise it is stored as ``""``.
+    """
+
+    def fget(self: Any) -> str | None:
+        blob = getattr(self, packed)
+        if blob is not None:
+            return decompress_text(blob)
+        value: str | None = getattr(self, plain)
+        return value
+
+    def fset(self: Any, value: str | None) -> None:
+        if value:
+            setattr(self, packed, compress_text(value))
+            setattr(self, plain, "")
+            return
+        setattr(self, packed, None)
+        setattr(self, plain, value if value is not None or nullable else "")
+
+    attr: hybrid_property[Any] = hybrid_property(fget, fset)
+
+    # ``comparator`` returns a copy of the hybrid with the SQL side attached.
+    @attr.comparator
+    def compared(cls: Any) -> _CompressedComparator:
+        return _CompressedComparator(getattr(cls, plain), getattr(cls, packed))
+
+    return compared
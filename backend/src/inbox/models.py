@@ -8,6 +8,7 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Index,
+    LargeBinary,
     String,
     Text,
 )
@@ -15,6 +16,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..database.base import Base
+from ..jd_store.models import jd_text
 
 
 class InboxStatus(enum.StrEnum):
@@ -61,7 +63,12 @@ class InboxItem(Base):
     # ``source`` and ``status`` stay as ``String(20)`` (not SQLEnum) so the
     # enum can evolve without an Alembic migration on a single-user app.
     source: Mapped[str] = mapped_column(String(20), default=InboxSource.MANUAL.value, nullable=False)
-    raw_text: Mapped[str] = mapped_column(Text, nullable=False)
+    # Stored in the shared JD blob store (see jd_store); ``jd_sha256`` equals
+    # ``content_hash`` for every item written after migration 036.
+    jd_sha256: Mapped[str | None] = mapped_column(String(64), ForeignKey("jd_blobs.sha256"), nullable=True, index=True)
+    _raw_text_plain: Mapped[str] = mapped_column("raw_text", Text, nullable=False, default="")
+    raw_text_z: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    raw_text = jd_text("_raw_text_plain", "raw_text_z")
     content_hash: Mapped[str] = mapped_column(String(64), default="", nullable=False, index=True)
     status: Mapped[str] = mapped_column(
         String(20),
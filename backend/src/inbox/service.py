@@ -8,7 +8,9 @@ malicious page paste and the DB/LLM.
 from __future__ import annotations
 
 import hashlib
+import logging
 import re
+import time
 import unicodedata
 from datetime import UTC, datetime, timedelta
 from typing import Any, cast
@@ -20,12 +22,20 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from ..analysis.models import AnalysisSource, JobAnalysis
-from ..analysis.service import analyze_and_charge, find_by_url, find_existing_analysis
+from ..analysis.service import (
+    analyze_and_charge,
+    find_analysis_for_jd,
+    find_by_url,
+    find_existing_analysis,
+    find_near_duplicate,
+)
 from ..cv.service import get_latest_cv
-from ..integrations.anthropic_client import MODELS
+from ..integrations.anthropic_client import MODELS, PRIORITY_BACKGROUND, call_priority
 from ..integrations.cache import CacheService
 from .models import InboxItem, InboxStatus
 
+logger = logging.getLogger(__name__)
+
 # Whitelist of allowed host suffixes for source_url. Entries match the
 # rightmost dot-segments so subdomains resolve cleanly (e.g., it.indeed.com
 # matches "indeed.com").
@@ -175,8 +185,9 @@ def ingest(
 ) -> tuple[InboxItem, bool]:
     """Persist a new inbox item after validation.
 
-    Returns (item, is_dedup). ``is_dedup=True`` when the content_hash already
-    has an existing analysis — the item is marked SKIPPED and linked to it.
+    Returns (item, is_dedup). ``is_dedup=True`` when the content_hash (or a
+    near-duplicate JD, see ``find_near_duplicate``) already has an existing
+    analysis — the item is marked SKIPPED and linked to it.
     """
     if not is_allowed_host(source_url):
         raise InboxValidationError("source_url host not in allowlist")
@@ -191,7 +202,17 @@ def ingest(
     hash_value = content_hash(sanitized)
 
     # Dedup: if we already analyzed this exact content with Haiku, reuse it
+    # (JD never seen -> a single jd_blobs probe); same for a near-identical
+    # JD (other job board, different footer) already analyzed against the
+    # current CV.
     existing = find_existing_analysis(db, hash_value, MODELS["haiku"])
+    if existing is None:
+        cv = get_latest_cv(db, user_id)
+        if cv:
+            existing = find_analysis_for_jd(db, cv.raw_text, sanitized, MODELS["haiku"])
+        if existing is None and cv:
+            near = find_near_duplicate(db, sanitized, cast(UUID, cv.id), MODELS["haiku"])
+            existing = near[0] if near else None
     if existing:
         item = InboxItem(
             user_id=user_id,
@@ -276,25 +297,38 @@ def process_pending(
     item.status = InboxStatus.PROCESSING.value  # type: ignore[assignment]
     db.commit()
 
+    started_at = time.monotonic()
     try:
         # Helper centralizzato: AI call + ledger sync. Indispensabile qui
         # per non ripetere il bug storico in cui il flow extension non
         # propagava il costo (today_cost_usd a zero con 20 analisi reali).
-        analysis, _result = analyze_and_charge(
-            db,
-            cast(str, cv.raw_text),
-            cast(UUID, cv.id),
-            cast(str, item.raw_text),
-            cast(str, item.source_url),
-            model,
-            cache,
-            user_id=user_id,
-            source=AnalysisSource.EXTENSION.value,
-        )
+        # Background priority: a concurrent /analyze from the UI goes first.
+        with call_priority(PRIORITY_BACKGROUND, source="inbox"):
+            analysis, result = analyze_and_charge(
+                db,
+                cast(str, cv.raw_text),
+                cast(UUID, cv.id),
+                cast(str, item.raw_text),
+                cast(str, item.source_url),
+                model,
+                cache,
+                user_id=user_id,
+                source=AnalysisSource.EXTENSION.value,
+            )
         item.analysis_id = cast(UUID, analysis.id)  # type: ignore[assignment]
         item.status = InboxStatus.DONE.value  # type: ignore[assignment]
         item.processed_at = datetime.now(UTC)  # type: ignore[assignment]
         db.commit()
+        tokens = result.get("tokens", {}) or {}
+        logger.info(
+            "inbox_item done id=%s duration_ms=%d cost_usd=%.6f tokens_in=%d cache_read=%d from_cache=%s",
+            inbox_id,
+            int((time.monotonic() - started_at) * 1000),
+            float(result.get("cost_usd", 0.0)),
+            int(tokens.get("input", 0)),
+            int(tokens.get("cache_read", 0)),
+            bool(result.get("from_cache")),
+        )
     except Exception as exc:  # noqa: BLE001 — log the error into the item itself
         db.rollback()
         item = db.query(InboxItem).filter(InboxItem.id == inbox_id).first()
@@ -316,4 +350,6 @@ def serialize(item: InboxItem, analysis: JobAnalysis | None = None) -> dict[str,
         "created_at": item.created_at.isoformat() if item.created_at else "",
         "error_message": item.error_message or "",
         "analysis_score": int(analysis.score or 0) if analysis else None,
+        "analysis_cost_usd": float(analysis.cost_usd or 0.0) if analysis else None,
+        "analysis_cache_read_tokens": int(analysis.tokens_cache_read or 0) if analysis else None,
     }
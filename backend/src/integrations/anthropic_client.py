@@ -9,37 +9,68 @@ This replaces the previous text-based pipeline (7 fragile JSON parsing
 strategies + AI self-repair on parse failure) with a single, schema-driven call.
 """
 
+import asyncio
+import copy
 import hashlib
+import heapq
+import itertools
+import json
 import logging
-from typing import TYPE_CHECKING, Any, cast
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Generator, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar, copy_context
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, NamedTuple, cast
 
 import anthropic
+import httpx
 from pydantic import BaseModel
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
 
 from ..config import settings
+from ..database import SessionLocal
+from ..metrics.service import record_ai_call
 from ..preferences import get_preference
 from ..prompts import (
+    ANALYSIS_DETAILS_USER_PROMPT,
     ANALYSIS_PROMPT_VERSION,
     ANALYSIS_SYSTEM_PROMPT,
     ANALYSIS_USER_PROMPT,
     COVER_LETTER_PROMPT_VERSION,
     COVER_LETTER_SYSTEM_PROMPT,
     COVER_LETTER_USER_PROMPT,
+    CV_BLOCK,
+    CV_EXCERPT_BLOCK,
     FOLLOWUP_EMAIL_SYSTEM_PROMPT,
     FOLLOWUP_EMAIL_USER_PROMPT,
     LINKEDIN_MESSAGE_SYSTEM_PROMPT,
     LINKEDIN_MESSAGE_USER_PROMPT,
+    OUTREACH_BUNDLE_SYSTEM_PROMPT,
+    OUTREACH_BUNDLE_USER_PROMPT,
+    TRIAGE_USER_PROMPT,
 )
 from .cache import CacheService
+from .compaction import compact_cv, compact_job_description
+from .token_bucket import _CHARS_PER_TOKEN, estimate_tokens
 from .validation import (
+    ANALYSIS_DETAIL_FIELDS,
     AnalysisAIResponse,
+    AnalysisDetailsAIResponse,
     CoverLetterAIResponse,
     FollowupEmailAIResponse,
     LinkedInMessageAIResponse,
+    TriageAIResponse,
     validate_analysis,
+    validate_analysis_details,
     validate_cover_letter,
     validate_followup_email,
     validate_linkedin_message,
+    validate_outreach_bundle,
+    validate_triage,
 )
 
 if TYPE_CHECKING:
@@ -61,27 +92,384 @@ PRICING = {
 
 CACHE_TTL = 86400  # 24 hours
 
+# ── Rate governor ──────────────────────────────────────────────────────
+
+# Caller priorities (lower = served first). Interactive routes default to
+# PRIORITY_INTERACTIVE; background flows opt down via ``call_priority``.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10  # inbox worker, WorldWild send_to_pulse
+PRIORITY_BATCH = 20  # batch queue workers
+
+_priority: ContextVar[int] = ContextVar("anthropic_call_priority", default=PRIORITY_INTERACTIVE)
+# Caller label for the per-call telemetry; defaults to the priority's name.
+_source: ContextVar[str | None] = ContextVar("anthropic_call_source", default=None)
+_PRIORITY_SOURCES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background", PRIORITY_BATCH: "batch"}
+# Absolute ``time.monotonic()`` deadline for the enclosed AI calls, set by
+# ``call_deadline``; None = only the client's own 120 s timeout.
+_deadline: ContextVar[float | None] = ContextVar("anthropic_call_deadline", default=None)
+# Probe of the HTTP client behind an interactive call (Starlette's
+# ``request.is_disconnected``), set by ``cancel_on_disconnect``.
+_disconnect_probe: ContextVar[Callable[[], Awaitable[bool]] | None] = ContextVar(
+    "anthropic_disconnect_probe", default=None
+)
+
+# Fallback pause when a 429/529 carries no retry-after header.
+_DEFAULT_BACKOFF_SECONDS = 5.0
+# Re-check interval for async waiters (they can't sleep on the Condition).
+_ASYNC_POLL_SECONDS = 0.05
+# Never honor a pause longer than this (misparsed header, clock skew).
+_MAX_BACKOFF_SECONDS = 60.0
+# Below this fraction of remaining requests/tokens the governor shrinks
+# concurrency; above _GROW_HEADROOM it grows back one slot at a time.
+_SHRINK_HEADROOM = 0.1
+_GROW_HEADROOM = 0.5
+# How often an async call under ``cancel_on_disconnect`` checks the client.
+_DISCONNECT_POLL_SECONDS = 0.5
+
+
+class ClientDisconnectedError(Exception):
+    """The HTTP client went away mid-call; the Anthropic request was cancelled."""
+
+
+@contextmanager
+def call_priority(priority: int, source: str | None = None) -> Iterator[None]:
+    """Run the enclosed AI calls at ``priority`` (context-local).
+
+    ``source`` labels them in ``ai_call_metrics`` (e.g. ``"inbox"``);
+    without it the priority name is used.
+    """
+    token = _priority.set(priority)
+    source_token = _source.set(source)
+    try:
+        yield
+    finally:
+        _source.reset(source_token)
+        _priority.reset(token)
+
+
+@contextmanager
+def call_deadline(seconds: float) -> Iterator[None]:
+    """Abort the enclosed AI calls once ``seconds`` have elapsed (context-local).
+
+    The remaining time is handed to the SDK as the request timeout, with
+    no SDK retries, so the HTTP request itself is dropped at the deadline
+    instead of running on in an abandoned thread. Nested blocks keep the
+    tighter deadline.
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def cancel_on_disconnect(is_disconnected: Callable[[], Awaitable[bool]]) -> Iterator[None]:
+    """Cancel the enclosed async AI calls when ``is_disconnected()`` turns true.
+
+    Only the wait for Claude is cancelled (the HTTP request is closed, the
+    governor slot released) and surfaces as :class:`ClientDisconnectedError`;
+    the DB work around it is never interrupted mid-flight.
+    """
+    token = _disconnect_probe.set(is_disconnected)
+    try:
+        yield
+    finally:
+        _disconnect_probe.reset(token)
+
+
+def _remaining_time() -> float | None:
+    """Seconds left before the ``call_deadline``; TimeoutError once it has passed."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("AI call deadline exceeded")
+    return remaining
+
+
+def _call_source() -> str:
+    priority = _priority.get()
+    return _source.get() or _PRIORITY_SOURCES.get(priority, f"priority_{priority}")
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> float | None:
+    raw = headers.get(name)
+    if raw is None:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+def _seconds_until(headers: Mapping[str, str], name: str) -> float | None:
+    """Parse an RFC 3339 reset header into seconds from now."""
+    raw = headers.get(name)
+    if not raw:
+        return None
+    try:
+        reset_at = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return max(0.0, (reset_at - datetime.now(UTC)).total_seconds())
+
+
+class AnthropicGovernor:
+    """Process-wide admission control for every Anthropic call.
+
+    - **Priority queue**: callers wait in ``(priority, arrival)`` order, so an
+      interactive ``/analyze`` overtakes queued batch/inbox work.
+    - **Adaptive concurrency (AIMD)**: a 429/529 halves the slot limit and
+      pauses new admissions for ``retry-after``; low ``anthropic-ratelimit-*-
+      remaining`` headroom shrinks it by one; ample headroom grows it by one
+      up to ``max_concurrency``.
+
+    Headers are fed in by an httpx response hook on the shared client, so
+    the SDK's own retries are observed too.
+    """
+
+    def __init__(self, max_concurrency: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = self.max_concurrency
+        self.in_flight = 0
+        self.throttled = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._clock = clock
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _try_admit(self, entry: tuple[int, int]) -> float | None:
+        """Admit ``entry`` if it is first in line and a slot is free (lock held).
+
+        Returns ``None`` when admitted, else how long the pause still lasts
+        (0.0 = not paused, just no free slot / not first in line).
+        """
+        now = self._clock()
+        if self._waiters[0] == entry and self.in_flight < self.limit and now >= self._paused_until:
+            heapq.heappop(self._waiters)
+            self.in_flight += 1
+            # Let the next waiter re-check: there may be more free slots.
+            self._cond.notify_all()
+            return None
+        return max(0.0, self._paused_until - now)
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """Block until this caller is first in line and a slot is free."""
+        entry = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            while (paused := self._try_admit(entry)) is not None:
+                self._cond.wait(paused or None)
+
+    async def aacquire(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """Async :meth:`acquire`: same queue, but waits on the event loop.
+
+        Async waiters can't block on the Condition, so they re-check every
+        ``_ASYNC_POLL_SECONDS`` (or when the pause ends). Cancelled waiters
+        leave the queue so they never hold up the callers behind them.
+        """
+        entry = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+        try:
+            while True:
+                with self._cond:
+                    paused = self._try_admit(entry)
+                if paused is None:
+                    return
+                await asyncio.sleep(paused or _ASYNC_POLL_SECONDS)
+        except BaseException:
+            with self._cond:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+            raise
+
+    def has_idle_slot(self) -> bool:
+        """True when a new call would be admitted right away (free slot, no queue, no pause)."""
+        with self._cond:
+            return not self._waiters and self.in_flight < self.limit and self._clock() >= self._paused_until
+
+    def record_hedge(self, won: bool) -> None:
+        """Count a fired hedge and whether it beat the primary attempt."""
+        with self._cond:
+            self.hedges += 1
+            self.hedge_wins += int(won)
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: int | None = None) -> Iterator[None]:
+        """Hold one concurrency slot for the enclosed call."""
+        self.acquire(_priority.get() if priority is None else priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self, priority: int | None = None) -> AsyncIterator[None]:
+        """Async :meth:`slot` for calls made with the ``AsyncAnthropic`` client."""
+        await self.aacquire(_priority.get() if priority is None else priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapt limit/pause from one Anthropic response."""
+        retry_after = _header_float(headers, "retry-after")
+        with self._cond:
+            if status_code in (429, 529):
+                self.throttled += 1
+                self.limit = max(1, self.limit // 2)
+                backoff = retry_after if retry_after is not None else _DEFAULT_BACKOFF_SECONDS
+                self._pause(min(backoff, _MAX_BACKOFF_SECONDS))
+                logger.info("anthropic throttled status=%d limit=%d pause_s=%.1f", status_code, self.limit, backoff)
+                return
+            if status_code >= 400:
+                return
+
+            headroom = self._headroom(headers)
+            if headroom is None:
+                return
+            if headroom <= 0:
+                wait = _seconds_until(headers, "anthropic-ratelimit-requests-reset")
+                self._pause(min(wait if wait is not None else _DEFAULT_BACKOFF_SECONDS, _MAX_BACKOFF_SECONDS))
+            if headroom < _SHRINK_HEADROOM:
+                self.limit = max(1, self.limit - 1)
+            elif headroom > _GROW_HEADROOM and self.limit < self.max_concurrency:
+                self.limit += 1
+                self._cond.notify_all()
+
+    def _pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    @staticmethod
+    def _headroom(headers: Mapping[str, str]) -> float | None:
+        """Smallest remaining/limit ratio across the advertised rate limits."""
+        ratios = []
+        for kind in ("requests", "input-tokens", "output-tokens", "tokens"):
+            remaining = _header_float(headers, f"anthropic-ratelimit-{kind}-remaining")
+            limit = _header_float(headers, f"anthropic-ratelimit-{kind}-limit")
+            if remaining is not None and limit:
+                ratios.append(remaining / limit)
+        return min(ratios) if ratios else None
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "throttled": self.throttled,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "paused_for_s": round(max(0.0, self._paused_until - self._clock()), 1),
+            }
+
+
+_governor: AnthropicGovernor | None = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> AnthropicGovernor:
+    """Get or create the process-wide rate governor."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = AnthropicGovernor(settings.anthropic_max_concurrency)
+        return _governor
+
+
+def _observe_response(response: httpx.Response) -> None:
+    """httpx response hook: feed rate-limit headers to the governor and the call telemetry."""
+    get_governor().observe(response.status_code, response.headers)
+    telemetry = _telemetry.get()
+    if telemetry is not None:
+        telemetry.observe_response()
+
+
 _client: anthropic.Anthropic | None = None
 
 
 def get_client() -> anthropic.Anthropic:
-    """Get or create the singleton Anthropic client."""
+    """Get or create the singleton Anthropic client.
+
+    Every response (including the SDK's internal retries) passes through
+    ``_observe_response`` so the governor sees 429s and header headroom.
+    """
     global _client
     if _client is None:
         _client = anthropic.Anthropic(
             api_key=settings.anthropic_api_key,
+            # Empty → SDK default (api.anthropic.com). Pointing it at a local
+            # fake lets the bulk/batches flow be exercised end-to-end offline.
+            base_url=settings.anthropic_base_url or None,
             timeout=120.0,
             max_retries=3,
+            http_client=anthropic.DefaultHttpxClient(event_hooks={"response": [_observe_response]}),
         )
     return _client
 
 
+async def _aobserve_response(response: httpx.Response) -> None:
+    """Async twin of ``_observe_response`` (httpx.AsyncClient hooks must be coroutines)."""
+    _observe_response(response)
+
+
+_async_client: anthropic.AsyncAnthropic | None = None
+
+
+def get_async_client() -> anthropic.AsyncAnthropic:
+    """Get or create the singleton ``AsyncAnthropic`` client.
+
+    Used by the ``async def`` routes (analysis, cover letter, follow-up,
+    LinkedIn, document scan): the 10–30 s wait for Claude happens on the
+    event loop instead of pinning an anyio worker thread that page renders
+    also need. Same settings and governor hook as :func:`get_client`.
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = anthropic.AsyncAnthropic(
+            api_key=settings.anthropic_api_key,
+            base_url=settings.anthropic_base_url or None,
+            timeout=120.0,
+            max_retries=3,
+            http_client=anthropic.DefaultAsyncHttpxClient(event_hooks={"response": [_aobserve_response]}),
+        )
+    return _async_client
+
+
 def content_hash(cv_text: str, job_description: str) -> str:
     """SHA-256 hash of CV + job description for duplicate detection."""
     content = f"{cv_text}:{job_description}"
     return hashlib.sha256(content.encode()).hexdigest()
 
 
+def _cache_tokens(usage: Any) -> tuple[int, int]:
+    """Prompt-cache (read, write) token counts of ``usage``, 0 when absent.
+
+    ``isinstance`` check because MagicMock auto-generates attributes
+    instead of returning the getattr default.
+    """
+    _cr = getattr(usage, "cache_read_input_tokens", 0)
+    _cc = getattr(usage, "cache_creation_input_tokens", 0)
+    return (_cr if isinstance(_cr, int) else 0, _cc if isinstance(_cc, int) else 0)
+
+
 def _calculate_cost(usage: anthropic.types.Usage, model_id: str) -> float:
     """Calculate USD cost from token usage and model pricing.
 
@@ -90,17 +478,11 @@ def _calculate_cost(usage: anthropic.types.Usage, model_id: str) -> float:
     """
     pricing = PRICING.get(model_id, PRICING["claude-haiku-4-5-20251001"])
     base_input_rate = pricing["input"]
+    cache_read, cache_create = _cache_tokens(usage)
 
-    # Cached tokens from usage (0 if not present).
-    # Use isinstance check because MagicMock auto-generates attributes
-    # instead of returning the getattr default.
-    _cr = getattr(usage, "cache_read_input_tokens", 0)
-    cache_read = _cr if isinstance(_cr, int) else 0
-    _cc = getattr(usage, "cache_creation_input_tokens", 0)
-    cache_create = _cc if isinstance(_cc, int) else 0
-
-    # Non-cached input tokens (input_tokens includes all input)
-    regular_input = usage.input_tokens - cache_read - cache_create
+    # The API reports cache reads and writes apart: input_tokens is only
+    # the uncached part of the prompt (the tail after the last breakpoint).
+    regular_input = usage.input_tokens
 
     input_cost = (regular_input / 1_000_000) * base_input_rate
     cache_read_cost = (cache_read / 1_000_000) * base_input_rate * 0.1
@@ -117,6 +499,259 @@ def _calculate_cost(usage: anthropic.types.Usage, model_id: str) -> float:
     return round(input_cost + cache_read_cost + cache_create_cost + output_cost, 6)
 
 
+def _usage_tokens(usage: Any) -> dict[str, int]:
+    """Token counters for ``result["tokens"]``, prompt-cache reads/writes included.
+
+    ``input`` is the whole prompt: the API's ``input_tokens`` (uncached
+    tail) plus the tokens read from and written to the cache, which it
+    reports apart.
+    """
+    cache_read, cache_write = _cache_tokens(usage)
+    prompt = usage.input_tokens + cache_read + cache_write
+    return {
+        "input": prompt,
+        "output": usage.output_tokens,
+        "total": prompt + usage.output_tokens,
+        "cache_read": cache_read,
+        "cache_write": cache_write,
+    }
+
+
+# ── Per-call telemetry ─────────────────────────────────────────────────
+
+
+class _CallTelemetry:
+    """Timings and usage of one tracked Anthropic call (one ``ai_call_metrics`` row).
+
+    The httpx hook counts responses (each SDK retry is one more) and stamps
+    the first one; the caller stamps the governor admission and the usage.
+    """
+
+    def __init__(self, operation: str, model_id: str) -> None:
+        self.operation = operation
+        self.model_id = model_id
+        self.source = _call_source()
+        self.status = "ok"
+        self.usage: Any = None
+        self.attempts = 1
+        self.responses = 0
+        self.started = time.monotonic()
+        self.admitted: float | None = None
+        self.first_response: float | None = None
+
+    def admit(self) -> None:
+        if self.admitted is None:
+            self.admitted = time.monotonic()
+
+    def observe_response(self) -> None:
+        self.responses += 1
+        if self.first_response is None:
+            self.first_response = time.monotonic()
+
+    def row(self) -> dict[str, Any]:
+        now = time.monotonic()
+        admitted = self.admitted if self.admitted is not None else now
+        tokens = _usage_tokens(self.usage) if self.usage is not None else {}
+        return {
+            "operation": self.operation,
+            "source": self.source[:30],
+            "model": self.model_id,
+            "status": self.status,
+            "tokens_input": tokens.get("input", 0),
+            "tokens_output": tokens.get("output", 0),
+            "tokens_cache_read": tokens.get("cache_read", 0),
+            "tokens_cache_write": tokens.get("cache_write", 0),
+            "cost_usd": _calculate_cost(self.usage, self.model_id) if self.usage is not None else 0.0,
+            "retries": max(0, self.responses - self.attempts),
+            "hedged": self.attempts > 1,
+            "queue_ms": round((admitted - self.started) * 1000, 1),
+            "ttfb_ms": round((self.first_response - admitted) * 1000, 1) if self.first_response else None,
+            "wall_ms": round((now - self.started) * 1000, 1),
+        }
+
+
+_telemetry: ContextVar[_CallTelemetry | None] = ContextVar("anthropic_call_telemetry", default=None)
+
+
+def _telemetry_row(telemetry: _CallTelemetry, exc: BaseException | None) -> dict[str, Any] | None:
+    if exc is not None:
+        telemetry.status = "cancelled" if isinstance(exc, asyncio.CancelledError) else "error"
+    try:
+        return telemetry.row()
+    except Exception:  # noqa: BLE001 — odd usage objects (test doubles) must not break the call
+        logger.debug("Unrecordable AI call telemetry for %s", telemetry.operation, exc_info=True)
+        return None
+
+
+@contextmanager
+def _tracked_call(operation: str, model_id: str) -> Iterator[_CallTelemetry]:
+    """Record the enclosed call in ``ai_call_metrics`` (sync callers)."""
+    telemetry = _CallTelemetry(operation, model_id)
+    token = _telemetry.set(telemetry)
+    exc: BaseException | None = None
+    try:
+        yield telemetry
+    except BaseException as e:
+        exc = e
+        raise
+    finally:
+        _telemetry.reset(token)
+        if (row := _telemetry_row(telemetry, exc)) is not None:
+            record_ai_call(**row)
+
+
+@asynccontextmanager
+async def _atracked_call(operation: str, model_id: str) -> AsyncIterator[_CallTelemetry]:
+    """Async :func:`_tracked_call`: the insert runs on the thread pool."""
+    telemetry = _CallTelemetry(operation, model_id)
+    token = _telemetry.set(telemetry)
+    exc: BaseException | None = None
+    try:
+        yield telemetry
+    except BaseException as e:
+        exc = e
+        raise
+    finally:
+        _telemetry.reset(token)
+        if (row := _telemetry_row(telemetry, exc)) is not None:
+            await run_in_threadpool(record_ai_call, **row)
+
+
+# ── Budget reservations ────────────────────────────────────────────────
+
+
+def _estimate_cost(params: dict[str, Any]) -> float:
+    """Upper bound of a request's cost: the prompt at the cache-write rate plus all of ``max_tokens``."""
+    pricing = PRICING.get(params["model"], PRICING["claude-haiku-4-5-20251001"])
+    prompt = json.dumps([params["system"], params["messages"], params["tools"]], ensure_ascii=False)
+    input_cost = estimate_tokens(prompt) / 1_000_000 * pricing["input"] * 1.25
+    return float(input_cost + params["max_tokens"] / 1_000_000 * pricing["output"])
+
+
+def _reserve_budget(params: dict[str, Any]) -> int | None:
+    """Reserve the call's estimated cost on an own session (``dashboard.service.reserve_budget``).
+
+    Raises ``BudgetExceededError`` when it doesn't fit. A ledger that can't
+    be reached doesn't block the call: the callers' ``check_budget_available``
+    gate still ran before it.
+    """
+    from ..dashboard.service import reserve_budget
+
+    try:
+        db = SessionLocal()
+        try:
+            reservation_id = reserve_budget(db, _estimate_cost(params))
+            db.commit()
+            return reservation_id
+        finally:
+            db.close()
+    except SQLAlchemyError:
+        logger.warning("budget reservation unavailable, call proceeds unreserved", exc_info=True)
+        return None
+
+
+class _BudgetHold:
+    """Budget reservations of one tracked call: the first attempt's, plus the hedge's when one fires."""
+
+    def __init__(self, params: dict[str, Any]) -> None:
+        self.params = params
+        self.reservations: list[int] = []
+
+    def reserve(self) -> None:
+        """Reserve one more attempt; raises ``BudgetExceededError`` when it doesn't fit."""
+        if (reservation_id := _reserve_budget(self.params)) is not None:
+            self.reservations.append(reservation_id)
+
+    def reserve_hedge(self) -> bool:
+        """Reserve the hedge attempt; False (no hedge) when the budget can't cover it."""
+        from ..dashboard.service import BudgetExceededError
+
+        try:
+            self.reserve()
+        except BudgetExceededError:
+            logger.info("anthropic hedge skipped: budget can't cover a second attempt")
+            return False
+        return True
+
+
+# Reservations settled by the calls of the operation ``_run_steps`` /
+# ``_arun_steps`` is driving. The driver hands them to the caller as
+# ``result["budget_reservations"]`` and ``add_spending`` deletes them in
+# the transaction that records the spend. A mutable list, so appends from
+# the thread pool (which runs on a copy of the context) reach the driver.
+_settled_reservations: ContextVar[list[int] | None] = ContextVar("anthropic_settled_reservations", default=None)
+
+
+@contextmanager
+def _collect_settled() -> Iterator[list[int]]:
+    """Collect the reservations settled by the calls made inside the block."""
+    settled: list[int] = []
+    token = _settled_reservations.set(settled)
+    try:
+        yield settled
+    finally:
+        _settled_reservations.reset(token)
+
+
+def _settle_budget(hold: _BudgetHold, telemetry: _CallTelemetry) -> None:
+    """Settle the call's reservations to the actual cost, or release them when no response came back.
+
+    ``telemetry.usage`` already sums every attempt of a hedged call: the
+    first reservation is settled to that cost, the hedge's is released.
+    Outside :func:`_collect_settled` nobody would charge against the
+    settled row, so it is released too.
+    """
+    if not hold.reservations:
+        return
+    from ..dashboard.service import release_reservation, settle_reservation
+
+    first, *extra = hold.reservations
+    collector = _settled_reservations.get()
+    try:
+        db = SessionLocal()
+        try:
+            if telemetry.usage is None or collector is None:
+                release_reservation(db, first)
+            else:
+                settle_reservation(db, first, _calculate_cost(telemetry.usage, telemetry.model_id))
+            for reservation_id in extra:
+                release_reservation(db, reservation_id)
+            db.commit()
+        finally:
+            db.close()
+        if telemetry.usage is not None and collector is not None:
+            collector.append(first)
+    except SQLAlchemyError:
+        # The reservations lapse on their own after budget_reservation_ttl_seconds.
+        logger.warning("budget reservations %s not settled", hold.reservations, exc_info=True)
+
+
+@contextmanager
+def _budget_hold(params: dict[str, Any], telemetry: _CallTelemetry) -> Iterator[_BudgetHold]:
+    """Hold the estimated cost of ``params`` for the enclosed call, settle on exit."""
+    hold = _BudgetHold(params)
+    hold.reserve()
+    try:
+        yield hold
+    finally:
+        _settle_budget(hold, telemetry)
+
+
+@asynccontextmanager
+async def _abudget_hold(params: dict[str, Any], telemetry: _CallTelemetry) -> AsyncIterator[_BudgetHold]:
+    """Async :func:`_budget_hold`: reservation and settlement run on the thread pool."""
+    hold = _BudgetHold(params)
+    await run_in_threadpool(hold.reserve)
+    try:
+        yield hold
+    finally:
+        await run_in_threadpool(_settle_budget, hold, telemetry)
+
+
+def _tool_operation(tool_name: str) -> str:
+    return tool_name.removeprefix("submit_")
+
+
 # ── Tool-use plumbing ──────────────────────────────────────────────────
 
 
@@ -132,77 +767,852 @@ def _schema_from_model(model_cls: type[BaseModel]) -> dict[str, Any]:
     return schema
 
 
+def _without_fields(schema: dict[str, Any], fields: tuple[str, ...]) -> dict[str, Any]:
+    """Copy of ``schema`` without ``fields`` (properties and ``required``)."""
+    schema = copy.deepcopy(schema)
+    for name in fields:
+        schema.get("properties", {}).pop(name, None)
+    if "required" in schema:
+        schema["required"] = [name for name in schema["required"] if name not in fields]
+    return schema
+
+
 # Pre-compute schemas at import time — they never change at runtime.
-_ANALYSIS_SCHEMA = _schema_from_model(AnalysisAIResponse)
+# The analysis call asks only for the triage payload: the long-form
+# sections are generated on demand (``_ANALYSIS_DETAILS_SCHEMA``).
+_ANALYSIS_SCHEMA = _without_fields(_schema_from_model(AnalysisAIResponse), ANALYSIS_DETAIL_FIELDS)
+_ANALYSIS_DETAILS_SCHEMA = _schema_from_model(AnalysisDetailsAIResponse)
 _COVER_LETTER_SCHEMA = _schema_from_model(CoverLetterAIResponse)
 _FOLLOWUP_SCHEMA = _schema_from_model(FollowupEmailAIResponse)
 _LINKEDIN_SCHEMA = _schema_from_model(LinkedInMessageAIResponse)
+_TRIAGE_SCHEMA = _schema_from_model(TriageAIResponse)
+# The outreach bundle nests the standalone follow-up / LinkedIn schemas next
+# to the cover letter fields, so each part validates exactly as on its own.
+_OUTREACH_BUNDLE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        **_COVER_LETTER_SCHEMA["properties"],
+        "followup_email": _FOLLOWUP_SCHEMA,
+        "linkedin_message": _LINKEDIN_SCHEMA,
+    },
+    "required": ["cover_letter", "subject_lines", "followup_email", "linkedin_message"],
+}
 
 
-def _call_api_with_tool(
+# A user turn is either a plain string or a list of content blocks (the
+# latter when part of it is marked for prompt caching).
+UserContent = str | list[dict[str, Any]]
+
+
+def _cached_user_content(cached_prefix: str, prompt: str) -> list[dict[str, Any]]:
+    """User turn split in two blocks: a cached per-CV prefix, then the per-call prompt.
+
+    The ``cache_control`` breakpoint on the first block caches tools + system
+    + CV together, so repeated calls on the same CV (batch, inbox, the
+    outreach trio) read that whole prefix at 10% of the input price.
+    """
+    return [
+        {"type": "text", "text": cached_prefix, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": prompt},
+    ]
+
+
+def _tool_request_params(
     system_prompt: str,
-    user_prompt: str,
+    user_prompt: UserContent,
     model_id: str,
     max_tokens: int,
     tool_name: str,
     tool_description: str,
     input_schema: dict[str, Any],
-) -> tuple[dict[str, Any], anthropic.types.Usage]:
-    """Call Claude forcing a single tool invocation — schema-validated JSON output.
+) -> dict[str, Any]:
+    """Build the ``messages.create`` kwargs for a forced single-tool call.
 
-    Returns (parsed_input, usage). The parsed_input is the dict Claude passed
-    to the forced tool; Anthropic's SDK already parses it from JSON, so there's
-    zero local parsing. If no ``tool_use`` block is returned (should never
-    happen with forced tool_choice), raises RuntimeError.
+    Shared by the interactive path (``_call_api_with_tool``) and the Message
+    Batches bulk path, so both send byte-identical requests (same prompt
+    cache prefix, same schema).
     """
-    client = get_client()
-    message = client.messages.create(
-        model=model_id,
-        max_tokens=max_tokens,
-        system=[
+    return {
+        "model": model_id,
+        "max_tokens": max_tokens,
+        "system": [
             {
                 "type": "text",
                 "text": system_prompt,
                 "cache_control": {"type": "ephemeral"},
             }
         ],
-        messages=[{"role": "user", "content": user_prompt}],
-        tools=[
+        "messages": [{"role": "user", "content": user_prompt}],
+        "tools": [
             {
                 "name": tool_name,
                 "description": tool_description,
                 "input_schema": input_schema,
             }
         ],
-        tool_choice={"type": "tool", "name": tool_name},
-    )
+        "tool_choice": {"type": "tool", "name": tool_name},
+    }
+
 
-    for block in message.content:
+def _extract_tool_input(content: Any, tool_name: str) -> dict[str, Any]:
+    """Return the input dict of the first ``tool_use`` block in ``content``.
+
+    Raises RuntimeError when no ``tool_use`` block is present (should never
+    happen with forced tool_choice).
+    """
+    for block in content:
         if getattr(block, "type", None) != "tool_use":
             continue
         tool_input = getattr(block, "input", None)
         # SDK parses tool input from JSON to dict automatically.
         if isinstance(tool_input, dict):
-            return cast(dict[str, Any], tool_input), message.usage
+            return cast(dict[str, Any], tool_input)
 
     raise RuntimeError(
-        f"Expected tool_use block for {tool_name!r} but got content types: "
-        f"{[getattr(b, 'type', '?') for b in message.content]}"
+        f"Expected tool_use block for {tool_name!r} but got content types: {[getattr(b, 'type', '?') for b in content]}"
+    )
+
+
+# Callback for streamed tool input: (top-level field name, parsed value).
+FieldCallback = Callable[[str, Any], None]
+
+
+class PartialJSONFields:
+    """Incremental scanner over a streamed top-level JSON object.
+
+    Fed the ``input_json`` deltas of a forced tool call, it reports each
+    top-level field as soon as its value is syntactically complete — the
+    closing ``,``/``}`` at depth 1 — so ``score`` or ``company`` reach the
+    browser long before the 8k-token payload ends. Each character is
+    scanned once; only completed values go through ``json.loads``.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = True
+        self._key_start: int | None = None
+        self._key: str | None = None
+        self._value_start: int | None = None
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """Append ``chunk``; return the fields completed by it, in order."""
+        self._text += chunk
+        completed: list[tuple[str, Any]] = []
+        text = self._text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key_start is not None:
+                        self._key = json.loads(text[self._key_start : i + 1])
+                        self._key_start = None
+                continue
+            if ch.isspace():
+                continue
+            if self._depth == 1 and not self._expect_key and self._value_start is None and ch not in ",}":
+                self._value_start = i
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_start = i
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 1:
+                    self._complete(text, i, completed)
+                self._depth -= 1
+            elif self._depth == 1 and ch == ":":
+                self._expect_key = False
+            elif self._depth == 1 and ch == ",":
+                self._complete(text, i, completed)
+        self._pos = len(text)
+        return completed
+
+    def _complete(self, text: str, end: int, out: list[tuple[str, Any]]) -> None:
+        if self._key is not None and self._value_start is not None:
+            try:
+                out.append((self._key, json.loads(text[self._value_start : end])))
+            except ValueError:
+                logger.debug("Unparseable streamed value for field %r", self._key)
+        self._key = None
+        self._value_start = None
+        self._expect_key = True
+
+
+def _drain_stream(stream: Any, on_field: FieldCallback | None) -> Any:
+    """Consume a ``messages.stream``, reporting tool input fields as they complete."""
+    if on_field is not None:
+        fields = PartialJSONFields()
+        for event in stream:
+            if event.type != "input_json":
+                continue
+            for name, value in fields.feed(event.partial_json):
+                on_field(name, value)
+    return stream.get_final_message()
+
+
+def _stream_tool_message(client: anthropic.Anthropic, params: dict[str, Any], on_field: FieldCallback) -> Any:
+    """Run ``params`` through ``messages.stream``, reporting fields as they complete."""
+    with client.messages.stream(**params) as stream:
+        return _drain_stream(stream, on_field)
+
+
+def _governed_client(client: anthropic.Anthropic) -> anthropic.Anthropic:
+    """Admit the tracked call and apply the ``call_deadline`` timeout (slot held by the caller)."""
+    if (telemetry := _telemetry.get()) is not None:
+        telemetry.admit()
+    if (remaining := _remaining_time()) is not None:
+        return client.with_options(timeout=remaining, max_retries=0)
+    return client
+
+
+def _attempt(client: anthropic.Anthropic, params: dict[str, Any], on_field: FieldCallback | None) -> Any:
+    """One governed request (sync :func:`_aattempt`)."""
+    with get_governor().slot():
+        client = _governed_client(client)
+        if on_field is None:
+            return client.messages.create(**params)
+        return _stream_tool_message(client, params, on_field)
+
+
+class _AttemptCancelledError(Exception):
+    """A sync hedged attempt stopped because the other one already won."""
+
+
+class _StreamedAttempt:
+    """One attempt of a sync hedged call, run on its own thread.
+
+    A thread can't be cancelled, so the attempt always streams:
+    :meth:`cancel` closes its response, which stops the generation server
+    side and makes the reading thread fail fast.
+    """
+
+    def __init__(self, client: anthropic.Anthropic, params: dict[str, Any], on_field: FieldCallback | None) -> None:
+        self._client = client
+        self._params = params
+        self._on_field = on_field
+        self._lock = threading.Lock()
+        self._stream: Any = None
+        self.cancelled = False
+
+    def run(self) -> Any:
+        with get_governor().slot():
+            client = _governed_client(self._client)
+            with client.messages.stream(**self._params) as stream:
+                with self._lock:
+                    if self.cancelled:
+                        raise _AttemptCancelledError
+                    self._stream = stream
+                return _drain_stream(stream, self._on_field)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            stream = self._stream
+        if stream is not None:
+            stream.close()
+
+
+def _hedged_message(
+    client: anthropic.Anthropic,
+    params: dict[str, Any],
+    on_field: FieldCallback | None,
+    hedge_after: float,
+    hold: _BudgetHold,
+) -> tuple[Any, Any]:
+    """Sync :func:`_ahedged_message`: each attempt runs on a worker thread.
+
+    Same rules: the hedge fires after ``hedge_after`` seconds only into an
+    idle governor slot and when the budget covers a second attempt; the
+    loser is cancelled by closing its stream.
+    """
+    governor = get_governor()
+    started = time.monotonic()
+    primary = _StreamedAttempt(client, params, on_field)
+    attempts: dict[Future[Any], _StreamedAttempt] = {}
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="anthropic-hedge")
+    try:
+        first = executor.submit(copy_context().run, primary.run)
+        attempts[first] = primary
+        done, _pending = wait({first}, timeout=hedge_after)
+        if done or not governor.has_idle_slot() or not hold.reserve_hedge():
+            message = first.result()
+            return message, message.usage
+
+        hedge = _StreamedAttempt(client, params, None)
+        second = executor.submit(copy_context().run, hedge.run)
+        attempts[second] = hedge
+        if (telemetry := _telemetry.get()) is not None:
+            telemetry.attempts = 2
+        pending: set[Future[Any]] = {first, second}
+        winner: Future[Any] | None = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((f for f in done if f.exception() is None), None)
+    finally:
+        for future, attempt in attempts.items():
+            if not future.done():
+                attempt.cancel()
+        # A loser still waiting for its response headers ends on its own thread.
+        executor.shutdown(wait=False)
+
+    elapsed = time.monotonic() - started
+    for future, name in ((first, "primary"), (second, "hedge")):
+        outcome = "won" if future is winner else "cancelled" if attempts[future].cancelled else "failed"
+        logger.info("anthropic hedge attempt=%s outcome=%s elapsed_s=%.1f", name, outcome, elapsed)
+    if winner is None:
+        governor.record_hedge(won=False)
+        raise cast(BaseException, first.exception())
+    governor.record_hedge(won=winner is second)
+
+    loser = second if winner is first else first
+    loser_usage = None
+    if not attempts[loser].cancelled:
+        # Finished before the winner was picked; a failed one was rejected by the API, nothing billed.
+        loser_usage = loser.result().usage if loser.exception() is None else _HedgedUsage(0, 0, 0, 0)
+    message = winner.result()
+    return message, _hedged_usage(message.usage, loser_usage)
+
+
+def _call_api_with_tool(
+    system_prompt: str,
+    user_prompt: UserContent,
+    model_id: str,
+    max_tokens: int,
+    tool_name: str,
+    tool_description: str,
+    input_schema: dict[str, Any],
+    on_field: FieldCallback | None = None,
+) -> tuple[dict[str, Any], anthropic.types.Usage]:
+    """Call Claude forcing a single tool invocation — schema-validated JSON output.
+
+    Returns (parsed_input, usage). The parsed_input is the dict Claude passed
+    to the forced tool; Anthropic's SDK already parses it from JSON, so there's
+    zero local parsing. If no ``tool_use`` block is returned (should never
+    happen with forced tool_choice), raises RuntimeError.
+
+    With ``on_field`` the call is streamed and the callback receives each
+    top-level field of the tool input as soon as it is complete; the return
+    value is the same as the blocking call. Interactive calls are hedged
+    like the async ones (see :func:`_hedged_message`).
+    """
+    client = get_client()
+    params = _tool_request_params(
+        system_prompt, user_prompt, model_id, max_tokens, tool_name, tool_description, input_schema
+    )
+    hedge_after = settings.ai_hedge_after_seconds
+    with _tracked_call(_tool_operation(tool_name), model_id) as telemetry, _budget_hold(params, telemetry) as hold:
+        if hedge_after > 0 and _priority.get() == PRIORITY_INTERACTIVE:
+            message, usage = _hedged_message(client, params, on_field, hedge_after, hold)
+        else:
+            message = _attempt(client, params, on_field)
+            usage = message.usage
+        telemetry.usage = usage
+    return _extract_tool_input(message.content, tool_name), usage
+
+
+async def _astream_tool_message(
+    client: anthropic.AsyncAnthropic, params: dict[str, Any], on_field: FieldCallback
+) -> Any:
+    """Async :func:`_stream_tool_message`."""
+    fields = PartialJSONFields()
+    async with client.messages.stream(**params) as stream:
+        async for event in stream:
+            if event.type != "input_json":
+                continue
+            for name, value in fields.feed(event.partial_json):
+                on_field(name, value)
+        return await stream.get_final_message()
+
+
+async def _aattempt(client: anthropic.AsyncAnthropic, params: dict[str, Any], on_field: FieldCallback | None) -> Any:
+    """One governed request: a slot, then a blocking or streamed ``messages`` call.
+
+    Under a ``call_deadline`` the request is cancelled (and its connection
+    closed) when the deadline passes, streaming included; under
+    ``cancel_on_disconnect`` as soon as the client goes away.
+    """
+    async with get_governor().aslot():
+        if (telemetry := _telemetry.get()) is not None:
+            telemetry.admit()
+        remaining = _remaining_time()
+        if remaining is not None:
+            client = client.with_options(timeout=remaining, max_retries=0)
+        request = _arequest(client, params, on_field)
+        if remaining is not None:
+            request = asyncio.wait_for(request, remaining)
+        return await _aunless_disconnected(request)
+
+
+async def _arequest(client: anthropic.AsyncAnthropic, params: dict[str, Any], on_field: FieldCallback | None) -> Any:
+    if on_field is None:
+        return await client.messages.create(**params)
+    return await _astream_tool_message(client, params, on_field)
+
+
+async def _aunless_disconnected(request: Awaitable[Any]) -> Any:
+    """Await ``request``, cancelling it if the ``cancel_on_disconnect`` probe fires."""
+    is_disconnected = _disconnect_probe.get()
+    if is_disconnected is None:
+        return await request
+    task = asyncio.ensure_future(request)
+    try:
+        while True:
+            done, _pending = await asyncio.wait({task}, timeout=_DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await is_disconnected():
+                raise ClientDisconnectedError("client disconnected, AI call cancelled")
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+class _HedgedUsage(NamedTuple):
+    """Usage of a hedged call: the winner plus what the losing attempt was billed."""
+
+    input_tokens: int
+    output_tokens: int
+    cache_read_input_tokens: int
+    cache_creation_input_tokens: int
+
+
+def _hedged_usage(winner: Any, loser: Any | None) -> _HedgedUsage:
+    """Sum both attempts' usage so ``cost_usd`` and the ledger include the hedge.
+
+    A cancelled loser has no usage of its own: it is charged the winner's
+    input side (same request, same prompt) and no output — a conservative
+    estimate, since Anthropic may bill the prompt of an aborted request.
+    """
+    win = _usage_tokens(winner)
+    lose = _usage_tokens(loser) if loser is not None else {**win, "output": 0}
+    uncached = sum(t["input"] - t["cache_read"] - t["cache_write"] for t in (win, lose))
+    return _HedgedUsage(
+        input_tokens=uncached,
+        output_tokens=win["output"] + lose["output"],
+        cache_read_input_tokens=win["cache_read"] + lose["cache_read"],
+        cache_creation_input_tokens=win["cache_write"] + lose["cache_write"],
+    )
+
+
+async def _ahedged_message(
+    client: anthropic.AsyncAnthropic,
+    params: dict[str, Any],
+    on_field: FieldCallback | None,
+    hedge_after: float,
+    hold: _BudgetHold,
+) -> tuple[Any, Any]:
+    """Run ``params`` with a hedge: ``(message, usage)``.
+
+    If the primary attempt is still running after ``hedge_after`` seconds,
+    the governor has an idle slot (no hedging into a queue or a 429 pause)
+    and ``hold`` can reserve the budget of a second attempt, a second
+    identical attempt is fired without streaming. The first attempt
+    to succeed wins, the other is cancelled; if one fails the other still
+    gets its chance. Both attempts are logged and their cost summed.
+    """
+    governor = get_governor()
+    started = time.monotonic()
+    primary = asyncio.create_task(_aattempt(client, params, on_field))
+    try:
+        done, _pending = await asyncio.wait({primary}, timeout=hedge_after)
+    except BaseException:
+        primary.cancel()
+        raise
+    if done or not governor.has_idle_slot() or not await run_in_threadpool(hold.reserve_hedge):
+        message = await primary
+        return message, message.usage
+
+    hedge = asyncio.create_task(_aattempt(client, params, None))
+    if (telemetry := _telemetry.get()) is not None:
+        telemetry.attempts = 2
+    names = {primary: "primary", hedge: "hedge"}
+    pending: set[asyncio.Task[Any]] = {primary, hedge}
+    winner: asyncio.Task[Any] | None = None
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((t for t in done if t.exception() is None), None)
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    elapsed = time.monotonic() - started
+    for task, name in names.items():
+        outcome = "won" if task is winner else "cancelled" if task.cancelled() else "failed"
+        logger.info("anthropic hedge attempt=%s outcome=%s elapsed_s=%.1f", name, outcome, elapsed)
+    if winner is None:
+        governor.record_hedge(won=False)
+        raise cast(BaseException, primary.exception())
+    governor.record_hedge(won=winner is hedge)
+
+    loser = hedge if winner is primary else primary
+    loser_usage = None
+    if not loser.cancelled() and loser.exception() is None:
+        loser_usage = loser.result().usage
+    elif not loser.cancelled():
+        # Failed attempt: the API rejected it, nothing billed.
+        loser_usage = _HedgedUsage(0, 0, 0, 0)
+    message = winner.result()
+    return message, _hedged_usage(message.usage, loser_usage)
+
+
+async def _acall_api_with_tool(
+    system_prompt: str,
+    user_prompt: UserContent,
+    model_id: str,
+    max_tokens: int,
+    tool_name: str,
+    tool_description: str,
+    input_schema: dict[str, Any],
+    on_field: FieldCallback | None = None,
+) -> tuple[dict[str, Any], anthropic.types.Usage]:
+    """Async :func:`_call_api_with_tool` on the ``AsyncAnthropic`` client.
+
+    Interactive calls are hedged when ``ai_hedge_after_seconds`` is set
+    (see :func:`_ahedged_message`); background/batch priorities never are.
+    """
+    client = get_async_client()
+    params = _tool_request_params(
+        system_prompt, user_prompt, model_id, max_tokens, tool_name, tool_description, input_schema
     )
+    hedge_after = settings.ai_hedge_after_seconds
+    async with (
+        _atracked_call(_tool_operation(tool_name), model_id) as telemetry,
+        _abudget_hold(params, telemetry) as hold,
+    ):
+        if hedge_after > 0 and _priority.get() == PRIORITY_INTERACTIVE:
+            message, usage = await _ahedged_message(client, params, on_field, hedge_after, hold)
+        else:
+            message = await _aattempt(client, params, on_field)
+            usage = message.usage
+        telemetry.usage = usage
+    return _extract_tool_input(message.content, tool_name), usage
+
+
+class _ToolCall(NamedTuple):
+    """One forced-tool request yielded by an operation's step generator."""
+
+    system_prompt: str
+    user_prompt: UserContent
+    model_id: str
+    max_tokens: int
+    tool_name: str
+    tool_description: str
+    input_schema: dict[str, Any]
+    on_field: FieldCallback | None = None
+
+
+class _Coalesce(NamedTuple):
+    """Yielded after a cache miss: "join the in-flight call for ``key``, if any"."""
+
+    key: str
+
+
+# Each AI operation is written once as a generator: it yields the
+# ``_ToolCall``s it needs, receives ``(tool_input, usage)`` back and
+# returns the final result. ``_run_steps`` drives it with the sync client
+# (threads, batch worker), ``_arun_steps`` with the async one (routes).
+# A ``_Coalesce`` marker lets the driver short-circuit the operation with
+# the result of an identical call already running; it gets no reply (the
+# driver resumes it with ``next()``), so the send type stays the call's.
+_ToolSteps = Generator[_ToolCall | _Coalesce, tuple[dict[str, Any], Any], dict[str, Any]]
+
+# How long a coalesced caller waits for the leader before calling on its own.
+# Covers the governor queue + a Sonnet fallback pass on top of the 120 s timeout.
+_COALESCE_WAIT_SECONDS = 300.0
+
+
+class _InFlightCalls:
+    """Single-flight registry: at most one AI call per cache key at a time.
+
+    The extension, a batch and a manual ``/analyze`` submitting the same JD
+    together all miss the cache; the first becomes the leader and calls
+    Claude, the others wait on its ``Future`` (threads and event loop
+    alike) and reuse the result. If the leader fails or is too slow, the
+    followers resume their own call — coalescing never turns into an error.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future[dict[str, Any]]] = {}
+
+    def join(self, key: str) -> tuple[bool, Future[dict[str, Any]]]:
+        """``(True, future)`` for the new leader, ``(False, future)`` for a follower."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return False, future
+            future = Future()
+            self._calls[key] = future
+            return True, future
+
+    def finish(self, key: str, future: Future[dict[str, Any]], result: dict[str, Any]) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+        # Snapshot before the leader's caller mutates its result (Glassdoor merge, persistence).
+        future.set_result(copy.deepcopy(result))
+
+    def fail(self, key: str, future: Future[dict[str, Any]], exc: BaseException) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+        future.set_exception(exc)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+_in_flight = _InFlightCalls()
+
+
+def _coalesced_result(shared: dict[str, Any]) -> dict[str, Any]:
+    """A follower's copy of the leader's result: no tokens, cost or reservations of its own."""
+    result = copy.deepcopy(shared)
+    result.pop("budget_reservations", None)
+    result["from_cache"] = True
+    result["coalesced"] = True
+    result["cost_usd"] = 0.0
+    result["tokens"] = dict.fromkeys(result.get("tokens") or {"input": 0, "output": 0, "total": 0}, 0)
+    return result
+
+
+def _follow(future: Future[dict[str, Any]]) -> dict[str, Any] | None:
+    """Wait for the leader; ``None`` when it failed or timed out (caller calls itself)."""
+    try:
+        return _coalesced_result(future.result(timeout=_COALESCE_WAIT_SECONDS))
+    except Exception:  # noqa: BLE001 — any leader failure means "do it yourself"
+        return None
+
+
+async def _afollow(future: Future[dict[str, Any]]) -> dict[str, Any] | None:
+    """Async :func:`_follow`. ``shield`` keeps a cancelled follower from cancelling the shared future."""
+    try:
+        shared = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), _COALESCE_WAIT_SECONDS)
+    except Exception:  # noqa: BLE001
+        return None
+    return _coalesced_result(shared)
+
+
+def _run_steps(steps: _ToolSteps) -> dict[str, Any]:
+    reply: tuple[dict[str, Any], Any] | None = None
+    flight: tuple[str, Future[dict[str, Any]]] | None = None
+    with _collect_settled() as settled:
+        try:
+            while True:
+                done, value = _advance(steps, reply)
+                if done:
+                    break
+                reply = None
+                if isinstance(value, _Coalesce):
+                    leader, future = _in_flight.join(value.key)
+                    if leader:
+                        flight = (value.key, future)
+                    elif (shared := _follow(future)) is not None:
+                        steps.close()
+                        return shared
+                    continue
+                reply = _call_api_with_tool(**value._asdict())
+        except BaseException as exc:
+            if flight:
+                _in_flight.fail(*flight, exc)
+            raise
+    if settled:
+        value["budget_reservations"] = settled
+    if flight:
+        _in_flight.finish(*flight, value)
+    return cast(dict[str, Any], value)
+
+
+def _advance(steps: _ToolSteps, reply: tuple[dict[str, Any], Any] | None) -> tuple[bool, Any]:
+    """Run one step; ``(True, result)`` when done, ``(False, call)`` otherwise.
+
+    ``reply`` is None for the first step and after a ``_Coalesce`` marker.
+
+    StopIteration can't cross ``await`` (PEP 479), hence the flag.
+    """
+    try:
+        return False, next(steps) if reply is None else steps.send(reply)
+    except StopIteration as stop:
+        return True, stop.value
+
+
+async def _arun_steps(steps: _ToolSteps) -> dict[str, Any]:
+    """Drive ``steps`` with the async client.
+
+    The code between two calls (cache lookups, preference reads, validation)
+    is synchronous and may touch the DB, so it runs on the thread pool in
+    short bursts; only the long Claude wait stays on the event loop.
+    """
+    reply: tuple[dict[str, Any], Any] | None = None
+    flight: tuple[str, Future[dict[str, Any]]] | None = None
+    with _collect_settled() as settled:
+        try:
+            while True:
+                done, value = await run_in_threadpool(_advance, steps, reply)
+                if done:
+                    break
+                reply = None
+                if isinstance(value, _Coalesce):
+                    leader, future = _in_flight.join(value.key)
+                    if leader:
+                        flight = (value.key, future)
+                    elif (shared := await _afollow(future)) is not None:
+                        steps.close()
+                        return shared
+                    continue
+                reply = await _acall_api_with_tool(**value._asdict())
+        except BaseException as exc:
+            if flight:
+                _in_flight.fail(*flight, exc)
+            raise
+    if settled:
+        value["budget_reservations"] = settled
+    if flight:
+        _in_flight.finish(*flight, value)
+    return cast(dict[str, Any], value)
 
 
 # ── Public AI operations ───────────────────────────────────────────────
 
+ANALYSIS_TOOL_NAME = "submit_analysis"
+_ANALYSIS_TOOL_DESCRIPTION = "Emit the CV-vs-job triage analysis payload."
+_ANALYSIS_MAX_TOKENS = 8192
+ANALYSIS_DETAILS_TOOL_NAME = "submit_analysis_details"
+_ANALYSIS_DETAILS_TOOL_DESCRIPTION = "Emit the interview scripts and the advice for an already scored analysis."
+_ANALYSIS_DETAILS_MAX_TOKENS = 4096
+TRIAGE_TOOL_NAME = "submit_triage"
+_TRIAGE_TOOL_DESCRIPTION = "Emit a quick CV-vs-job pre-screen: score, career track, one-line reason."
+# Three short fields: a low cap keeps a runaway reply from costing more
+# than the triage saves.
+_TRIAGE_MAX_TOKENS = 200
 
-def analyze_job(
+# Message Batches API bills every token at 50% of the interactive price.
+BATCH_API_DISCOUNT = 0.5
+
+
+def _analysis_system_prompt(db: "Session | None", user_id: "UUID | None") -> tuple[str, str]:
+    """Return (system_prompt, profile_snippet) for an analysis call.
+
+    Injects the user profile snippet (learned from past decisions) into the
+    system prompt. The snippet is returned too because its hash is part of
+    the cache key, so profile changes invalidate cached analyses.
+    """
+    profile_snippet = ""
+    if db is not None and user_id is not None:
+        try:
+            from ..analytics_page.service import get_user_profile_snippet
+
+            profile_snippet = get_user_profile_snippet(db, user_id)
+        except Exception:  # noqa: S110 — profile injection is best-effort
+            pass
+
+    if not profile_snippet:
+        return ANALYSIS_SYSTEM_PROMPT, ""
+    system_prompt = (
+        f"{ANALYSIS_SYSTEM_PROMPT}\n\n"
+        f"### PATTERN STORICI DELL'UTENTE (aggiornati automaticamente da /analytics)\n"
+        f"{profile_snippet}\n"
+        f"Usa questi pattern come contesto aggiuntivo, non come regola assoluta — l'utente evolve."
+    )
+    return system_prompt, profile_snippet
+
+
+# CV budgets in estimated tokens for each prompt family (the old blind cuts
+# were 12000 / 8000 / 1500 chars).
+_CV_TOKENS_ANALYSIS = 3000
+_CV_TOKENS_LETTER = 2000
+_CV_TOKENS_EXCERPT = 375
+
+
+def _prompt_cv(cv_text: str, query: str, max_tokens: int) -> str:
+    """CV text for a prompt: compacted around ``query`` (see :mod:`.compaction`)."""
+    if not settings.ai_compaction_enabled:
+        return cv_text[: max_tokens * _CHARS_PER_TOKEN]
+    return compact_cv(cv_text, query, max_tokens)
+
+
+def _prompt_jd(job_description: str) -> str:
+    """JD text for a prompt, without boilerplate when compaction is on."""
+    if not settings.ai_compaction_enabled:
+        return job_description
+    return compact_job_description(job_description)
+
+
+def _analysis_user_prompt(cv_text: str, job_description: str) -> list[dict[str, Any]]:
+    """Format the analysis user turn: cached CV excerpt block + full JD."""
+    return _cached_user_content(
+        CV_BLOCK.format(cv_text=_prompt_cv(cv_text, job_description, _CV_TOKENS_ANALYSIS)),
+        ANALYSIS_USER_PROMPT.format(job_description=_prompt_jd(job_description)),
+    )
+
+
+def build_analysis_request(
     cv_text: str,
     job_description: str,
     model: str = "haiku",
-    cache: CacheService | None = None,
     db: "Session | None" = None,
     user_id: "UUID | None" = None,
 ) -> dict[str, Any]:
-    """Analyze CV-to-job compatibility.
+    """Return the ``messages.create`` params of an analysis, without sending it.
+
+    Used by the batch bulk mode to submit many analyses in a single
+    Message Batches request with exactly the interactive prompt and schema.
+    """
+    model_id = MODELS.get(model, MODELS["haiku"])
+    system_prompt, _ = _analysis_system_prompt(db, user_id)
+    return _tool_request_params(
+        system_prompt,
+        _analysis_user_prompt(cv_text, job_description),
+        model_id,
+        _ANALYSIS_MAX_TOKENS,
+        ANALYSIS_TOOL_NAME,
+        _ANALYSIS_TOOL_DESCRIPTION,
+        _ANALYSIS_SCHEMA,
+    )
+
+
+def parse_batch_analysis(message: Any, content_hash_value: str) -> dict[str, Any]:
+    """Turn a succeeded Message Batches result into an ``analyze_job``-shaped dict.
+
+    Cost is computed at the batch discount. There is no Sonnet fallback in
+    bulk mode: a second pass would defeat the purpose of the offline queue.
+    """
+    model_id = cast(str, message.model)
+    result = validate_analysis(_extract_tool_input(message.content, ANALYSIS_TOOL_NAME))
+    usage = message.usage
+    result["model_used"] = model_id
+    result["fallback_used"] = False
+    result["full_response"] = ""
+    result["from_cache"] = False
+    result["content_hash"] = content_hash_value
+    result["details_pending"] = True
+    result["tokens"] = _usage_tokens(usage)
+    result["cost_usd"] = round(_calculate_cost(usage, model_id) * BATCH_API_DISCOUNT, 6)
+    return result
+
+
+def _analyze_job_steps(
+    cv_text: str,
+    job_description: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+    db: "Session | None" = None,
+    user_id: "UUID | None" = None,
+    on_field: FieldCallback | None = None,
+) -> _ToolSteps:
+    """Analysis steps: CV-to-job compatibility.
 
     When the persisted preference `ai_sonnet_fallback_on_low_confidence` is
     True and the first pass on Haiku returns confidence=="bassa", a second
@@ -212,21 +1622,15 @@ def analyze_job(
 
     `db` is optional — if omitted (e.g. from a cached/background context with
     no session), the fallback is disabled (safe default, no crash).
+
+    `on_field` streams the first pass (see ``_call_api_with_tool``). Cache
+    hits and the Sonnet fallback pass don't stream: the caller still gets
+    the final result as return value.
     """
     model_id = MODELS.get(model, MODELS["haiku"])
     ch = content_hash(cv_text, job_description)
 
-    # Inject user profile snippet (learned from past decisions) into the system prompt.
-    # The snippet version is included in the cache key so profile changes invalidate cache.
-    profile_snippet = ""
-    if db is not None and user_id is not None:
-        try:
-            from ..analytics_page.service import get_user_profile_snippet
-
-            profile_snippet = get_user_profile_snippet(db, user_id)
-        except Exception:  # noqa: S110 — profile injection is best-effort
-            pass
-
+    system_prompt, profile_snippet = _analysis_system_prompt(db, user_id)
     profile_hash = content_hash(profile_snippet, "") if profile_snippet else "none"
     cache_key = f"analysis:{ANALYSIS_PROMPT_VERSION}:{model}:{profile_hash[:8]}:{ch[:16]}"
 
@@ -236,31 +1640,23 @@ def analyze_job(
             cached["from_cache"] = True
             cached["content_hash"] = ch
             return cached
+    yield _Coalesce(cache_key)
 
-    system_prompt = ANALYSIS_SYSTEM_PROMPT
-    if profile_snippet:
-        system_prompt = (
-            f"{ANALYSIS_SYSTEM_PROMPT}\n\n"
-            f"### PATTERN STORICI DELL'UTENTE (aggiornati automaticamente da /analytics)\n"
-            f"{profile_snippet}\n"
-            f"Usa questi pattern come contesto aggiuntivo, non come regola assoluta — l'utente evolve."
-        )
-
-    user_prompt = ANALYSIS_USER_PROMPT.format(cv_text=cv_text[:12000], job_description=job_description)
-    result, usage = _call_api_with_tool(
+    user_prompt = _analysis_user_prompt(cv_text, job_description)
+    result, usage = yield _ToolCall(
         system_prompt,
         user_prompt,
         model_id,
-        8192,
-        tool_name="submit_analysis",
-        tool_description="Emit the complete CV-vs-job analysis payload.",
+        _ANALYSIS_MAX_TOKENS,
+        tool_name=ANALYSIS_TOOL_NAME,
+        tool_description=_ANALYSIS_TOOL_DESCRIPTION,
         input_schema=_ANALYSIS_SCHEMA,
+        on_field=on_field,
     )
 
     result = validate_analysis(result)
 
-    tokens_in = usage.input_tokens
-    tokens_out = usage.output_tokens
+    tokens = _usage_tokens(usage)
     cost = _calculate_cost(usage, model_id)
     used_model_id = model_id
     fallback_used = False
@@ -276,20 +1672,20 @@ def analyze_job(
             model_id,
             result.get("confidence_reason", ""),
         )
-        sonnet_result, sonnet_usage = _call_api_with_tool(
+        sonnet_result, sonnet_usage = yield _ToolCall(
             system_prompt,
             user_prompt,
             sonnet_id,
-            8192,
-            tool_name="submit_analysis",
-            tool_description="Emit the complete CV-vs-job analysis payload.",
+            _ANALYSIS_MAX_TOKENS,
+            tool_name=ANALYSIS_TOOL_NAME,
+            tool_description=_ANALYSIS_TOOL_DESCRIPTION,
             input_schema=_ANALYSIS_SCHEMA,
         )
         sonnet_result = validate_analysis(sonnet_result)
         # Sonnet result wins; tokens/cost are cumulative across both passes.
         result = sonnet_result
-        tokens_in += sonnet_usage.input_tokens
-        tokens_out += sonnet_usage.output_tokens
+        for key, value in _usage_tokens(sonnet_usage).items():
+            tokens[key] += value
         cost += _calculate_cost(sonnet_usage, sonnet_id)
         used_model_id = sonnet_id
         fallback_used = True
@@ -299,11 +1695,9 @@ def analyze_job(
     result["full_response"] = ""  # Don't cache full response in Redis
     result["from_cache"] = False
     result["content_hash"] = ch
-    result["tokens"] = {
-        "input": tokens_in,
-        "output": tokens_out,
-        "total": tokens_in + tokens_out,
-    }
+    # interview_scripts / advice come later, from _analysis_details_steps.
+    result["details_pending"] = True
+    result["tokens"] = tokens
     result["cost_usd"] = cost
 
     if cache:
@@ -313,74 +1707,212 @@ def analyze_job(
     return result
 
 
-def generate_cover_letter(
+def _triage_job_steps(
     cv_text: str,
     job_description: str,
-    analysis_data: dict[str, Any],
-    language: str,
     model: str = "haiku",
     cache: CacheService | None = None,
-) -> dict[str, Any]:
-    """Generate a cover letter based on CV, job description, and analysis."""
+    db: "Session | None" = None,
+    user_id: "UUID | None" = None,
+) -> _ToolSteps:
+    """Triage steps: score + career track + one-line reason, nothing else.
+
+    Same system prompt and cached CV block as the full analysis, so on a
+    backlog the prefix is a prompt-cache read and the call costs little
+    more than the JD plus a few dozen output tokens.
+    """
     model_id = MODELS.get(model, MODELS["haiku"])
+    ch = content_hash(cv_text, job_description)
+    system_prompt, profile_snippet = _analysis_system_prompt(db, user_id)
+    profile_hash = content_hash(profile_snippet, "") if profile_snippet else "none"
+    cache_key = f"triage:{ANALYSIS_PROMPT_VERSION}:{model}:{profile_hash[:8]}:{ch[:16]}"
 
     if cache:
-        ch = content_hash(cv_text, job_description)
-        cl_content = f"cl:{COVER_LETTER_PROMPT_VERSION}:{model}:{ch[:16]}:{language}"
-        cache_key = f"coverletter:{hashlib.sha256(cl_content.encode()).hexdigest()[:16]}"
         cached = cache.get_json(cache_key)
         if cached:
             cached["from_cache"] = True
             return cached
-    else:
-        cache_key = None
-
-    strengths_text = ", ".join(
-        s if isinstance(s, str) else s.get("skill", str(s)) for s in analysis_data.get("strengths", [])[:5]
-    )
-    gaps_list = analysis_data.get("gaps", [])
-    gaps_text = ", ".join(g.get("gap", g) if isinstance(g, dict) else str(g) for g in gaps_list[:5])
-
-    user_prompt = COVER_LETTER_USER_PROMPT.format(
-        cv_text=cv_text[:8000],
-        job_description=job_description,
-        role=analysis_data.get("role", ""),
-        company=analysis_data.get("company", ""),
-        score=analysis_data.get("score", 0),
-        strengths=strengths_text,
-        gaps=gaps_text,
-        language=language,
-    )
+    yield _Coalesce(cache_key)
 
-    result, usage = _call_api_with_tool(
-        COVER_LETTER_SYSTEM_PROMPT,
-        user_prompt,
+    result, usage = yield _ToolCall(
+        system_prompt,
+        _cached_user_content(
+            CV_BLOCK.format(cv_text=_prompt_cv(cv_text, job_description, _CV_TOKENS_ANALYSIS)),
+            TRIAGE_USER_PROMPT.format(job_description=_prompt_jd(job_description)),
+        ),
         model_id,
-        2048,
-        tool_name="submit_cover_letter",
-        tool_description="Emit the cover letter and subject line options.",
-        input_schema=_COVER_LETTER_SCHEMA,
+        _TRIAGE_MAX_TOKENS,
+        tool_name=TRIAGE_TOOL_NAME,
+        tool_description=_TRIAGE_TOOL_DESCRIPTION,
+        input_schema=_TRIAGE_SCHEMA,
     )
 
-    result = validate_cover_letter(result)
-
+    result = validate_triage(result)
     result["model_used"] = model_id
     result["from_cache"] = False
-    result["tokens"] = {
-        "input": usage.input_tokens,
-        "output": usage.output_tokens,
-        "total": usage.input_tokens + usage.output_tokens,
-    }
+    result["tokens"] = _usage_tokens(usage)
     result["cost_usd"] = _calculate_cost(usage, model_id)
 
-    if cache and cache_key:
+    if cache:
         cache_data = {k: v for k, v in result.items() if k != "from_cache"}
         cache.set_json(cache_key, cache_data, CACHE_TTL)
 
     return result
 
 
-def generate_followup_email(
+def _details_list(items: list[Any], key: str) -> str:
+    """Compact one-line rendering of strengths/gaps for the details prompt."""
+    labels = [str(item.get(key, "")) if isinstance(item, dict) else str(item) for item in items or []]
+    return "; ".join(label for label in labels if label) or "nessuno"
+
+
+def _analysis_details_steps(
+    cv_text: str,
+    job_description: str,
+    analysis_data: dict[str, Any],
+    model: str = "haiku",
+    cache: CacheService | None = None,
+    db: "Session | None" = None,
+    user_id: "UUID | None" = None,
+) -> _ToolSteps:
+    """On-demand analysis sections: interview scripts and advice.
+
+    Same system prompt and cached CV block as the triage call (so both are
+    prompt-cache reads), plus the triage outcome so the advice agrees with
+    the score the user already saw.
+    """
+    model_id = MODELS.get(model, MODELS["haiku"])
+    ch = content_hash(cv_text, job_description)
+    system_prompt, profile_snippet = _analysis_system_prompt(db, user_id)
+    profile_hash = content_hash(profile_snippet, "") if profile_snippet else "none"
+    cache_key = f"analysis_details:{ANALYSIS_PROMPT_VERSION}:{model}:{profile_hash[:8]}:{ch[:16]}"
+
+    if cache:
+        cached = cache.get_json(cache_key)
+        if cached:
+            cached["from_cache"] = True
+            return cached
+    yield _Coalesce(cache_key)
+
+    prompt = ANALYSIS_DETAILS_USER_PROMPT.format(
+        job_description=_prompt_jd(job_description),
+        role=analysis_data.get("role", ""),
+        company=analysis_data.get("company", ""),
+        score=analysis_data.get("score", 0),
+        recommendation=analysis_data.get("recommendation", ""),
+        career_track=analysis_data.get("career_track", ""),
+        strengths=_details_list(analysis_data.get("strengths", []), "skill"),
+        gaps=_details_list(analysis_data.get("gaps", []), "gap"),
+    )
+    result, usage = yield _ToolCall(
+        system_prompt,
+        _cached_user_content(
+            CV_BLOCK.format(cv_text=_prompt_cv(cv_text, job_description, _CV_TOKENS_ANALYSIS)), prompt
+        ),
+        model_id,
+        _ANALYSIS_DETAILS_MAX_TOKENS,
+        tool_name=ANALYSIS_DETAILS_TOOL_NAME,
+        tool_description=_ANALYSIS_DETAILS_TOOL_DESCRIPTION,
+        input_schema=_ANALYSIS_DETAILS_SCHEMA,
+    )
+
+    result = validate_analysis_details(result)
+    result["model_used"] = model_id
+    result["from_cache"] = False
+    result["tokens"] = _usage_tokens(usage)
+    result["cost_usd"] = _calculate_cost(usage, model_id)
+
+    if cache:
+        cache_data = {k: v for k, v in result.items() if k != "from_cache"}
+        cache.set_json(cache_key, cache_data, CACHE_TTL)
+
+    return result
+
+
+def _cover_letter_cache_key(cv_text: str, job_description: str, language: str, model: str) -> str:
+    ch = content_hash(cv_text, job_description)
+    cl_content = f"cl:{COVER_LETTER_PROMPT_VERSION}:{model}:{ch[:16]}:{language}"
+    return f"coverletter:{hashlib.sha256(cl_content.encode()).hexdigest()[:16]}"
+
+
+def _followup_cache_key(role: str, company: str, days_since: int, language: str, model: str) -> str:
+    raw = f"followup:{model}:{role}:{company}:{days_since}:{language}"
+    return f"followup:{hashlib.sha256(raw.encode()).hexdigest()[:16]}"
+
+
+def _linkedin_cache_key(role: str, company: str, contact_info: str, language: str, model: str) -> str:
+    raw = f"linkedin:{model}:{role}:{company}:{contact_info}:{language}"
+    return f"linkedin:{hashlib.sha256(raw.encode()).hexdigest()[:16]}"
+
+
+def _letter_highlights(analysis_data: dict[str, Any]) -> tuple[str, str]:
+    """Top five strengths and gaps as comma-separated text for outreach prompts."""
+    strengths_text = ", ".join(
+        s if isinstance(s, str) else s.get("skill", str(s)) for s in analysis_data.get("strengths", [])[:5]
+    )
+    gaps_list = analysis_data.get("gaps", [])
+    gaps_text = ", ".join(g.get("gap", g) if isinstance(g, dict) else str(g) for g in gaps_list[:5])
+    return strengths_text, gaps_text
+
+
+def _cover_letter_steps(
+    cv_text: str,
+    job_description: str,
+    analysis_data: dict[str, Any],
+    language: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+) -> _ToolSteps:
+    """Cover-letter steps: cache lookup, one forced-tool call, validation."""
+    model_id = MODELS.get(model, MODELS["haiku"])
+
+    cache_key = _cover_letter_cache_key(cv_text, job_description, language, model)
+    if cache:
+        cached = cache.get_json(cache_key)
+        if cached:
+            cached["from_cache"] = True
+            return cached
+    yield _Coalesce(cache_key)
+
+    strengths_text, gaps_text = _letter_highlights(analysis_data)
+    prompt = COVER_LETTER_USER_PROMPT.format(
+        job_description=_prompt_jd(job_description),
+        role=analysis_data.get("role", ""),
+        company=analysis_data.get("company", ""),
+        score=analysis_data.get("score", 0),
+        strengths=strengths_text,
+        gaps=gaps_text,
+        language=language,
+    )
+    user_prompt = _cached_user_content(
+        CV_BLOCK.format(cv_text=_prompt_cv(cv_text, job_description, _CV_TOKENS_LETTER)), prompt
+    )
+
+    result, usage = yield _ToolCall(
+        COVER_LETTER_SYSTEM_PROMPT,
+        user_prompt,
+        model_id,
+        2048,
+        tool_name="submit_cover_letter",
+        tool_description="Emit the cover letter and subject line options.",
+        input_schema=_COVER_LETTER_SCHEMA,
+    )
+
+    result = validate_cover_letter(result)
+
+    result["model_used"] = model_id
+    result["from_cache"] = False
+    result["tokens"] = _usage_tokens(usage)
+    result["cost_usd"] = _calculate_cost(usage, model_id)
+
+    if cache:
+        cache_data = {k: v for k, v in result.items() if k != "from_cache"}
+        cache.set_json(cache_key, cache_data, CACHE_TTL)
+
+    return result
+
+
+def _followup_email_steps(
     cv_text: str,
     role: str,
     company: str,
@@ -388,31 +1920,29 @@ def generate_followup_email(
     language: str,
     model: str = "haiku",
     cache: CacheService | None = None,
-) -> dict[str, Any]:
-    """Generate a follow-up email after application."""
+) -> _ToolSteps:
+    """Follow-up email steps: cache lookup, one forced-tool call, validation."""
     model_id = MODELS.get(model, MODELS["haiku"])
 
+    cache_key = _followup_cache_key(role, company, days_since, language, model)
     if cache:
-        raw = f"followup:{model}:{role}:{company}:{days_since}:{language}"
-        cache_key = f"followup:{hashlib.sha256(raw.encode()).hexdigest()[:16]}"
         cached = cache.get_json(cache_key)
         if cached:
             cached["from_cache"] = True
             return cached
-    else:
-        cache_key = None
+    yield _Coalesce(cache_key)
 
-    cv_summary = cv_text[:1500]
-
-    user_prompt = FOLLOWUP_EMAIL_USER_PROMPT.format(
-        cv_summary=cv_summary,
+    prompt = FOLLOWUP_EMAIL_USER_PROMPT.format(
         role=role,
         company=company,
         days_since_application=days_since,
         language=language,
     )
+    user_prompt = _cached_user_content(
+        CV_EXCERPT_BLOCK.format(cv_summary=_prompt_cv(cv_text, f"{role} {company}", _CV_TOKENS_EXCERPT)), prompt
+    )
 
-    result, usage = _call_api_with_tool(
+    result, usage = yield _ToolCall(
         FOLLOWUP_EMAIL_SYSTEM_PROMPT,
         user_prompt,
         model_id,
@@ -426,21 +1956,17 @@ def generate_followup_email(
 
     result["model_used"] = model_id
     result["from_cache"] = False
-    result["tokens"] = {
-        "input": usage.input_tokens,
-        "output": usage.output_tokens,
-        "total": usage.input_tokens + usage.output_tokens,
-    }
+    result["tokens"] = _usage_tokens(usage)
     result["cost_usd"] = _calculate_cost(usage, model_id)
 
-    if cache and cache_key:
+    if cache:
         cache_data = {k: v for k, v in result.items() if k != "from_cache"}
         cache.set_json(cache_key, cache_data, CACHE_TTL)
 
     return result
 
 
-def generate_linkedin_message(
+def _linkedin_message_steps(
     cv_text: str,
     role: str,
     company: str,
@@ -448,13 +1974,12 @@ def generate_linkedin_message(
     language: str,
     model: str = "haiku",
     cache: CacheService | None = None,
-) -> dict[str, Any]:
-    """Generate a LinkedIn connection message."""
+) -> _ToolSteps:
+    """LinkedIn message steps: cache lookup, one forced-tool call, validation."""
     model_id = MODELS.get(model, MODELS["haiku"])
 
     if cache:
-        raw = f"linkedin:{model}:{role}:{company}:{contact_info}:{language}"
-        cache_key = f"linkedin:{hashlib.sha256(raw.encode()).hexdigest()[:16]}"
+        cache_key = _linkedin_cache_key(role, company, contact_info, language, model)
         cached = cache.get_json(cache_key)
         if cached:
             cached["from_cache"] = True
@@ -462,17 +1987,17 @@ def generate_linkedin_message(
     else:
         cache_key = None
 
-    cv_summary = cv_text[:1500]
-
-    user_prompt = LINKEDIN_MESSAGE_USER_PROMPT.format(
-        cv_summary=cv_summary,
+    prompt = LINKEDIN_MESSAGE_USER_PROMPT.format(
         role=role,
         company=company,
         contact_info=contact_info or "Not available",
         language=language,
     )
+    user_prompt = _cached_user_content(
+        CV_EXCERPT_BLOCK.format(cv_summary=_prompt_cv(cv_text, f"{role} {company}", _CV_TOKENS_EXCERPT)), prompt
+    )
 
-    result, usage = _call_api_with_tool(
+    result, usage = yield _ToolCall(
         LINKEDIN_MESSAGE_SYSTEM_PROMPT,
         user_prompt,
         model_id,
@@ -486,11 +2011,7 @@ def generate_linkedin_message(
 
     result["model_used"] = model_id
     result["from_cache"] = False
-    result["tokens"] = {
-        "input": usage.input_tokens,
-        "output": usage.output_tokens,
-        "total": usage.input_tokens + usage.output_tokens,
-    }
+    result["tokens"] = _usage_tokens(usage)
     result["cost_usd"] = _calculate_cost(usage, model_id)
 
     if cache and cache_key:
@@ -498,3 +2019,288 @@ def generate_linkedin_message(
         cache.set_json(cache_key, cache_data, CACHE_TTL)
 
     return result
+
+
+OUTREACH_BUNDLE_TOOL_NAME = "submit_outreach_bundle"
+_OUTREACH_BUNDLE_TOOL_DESCRIPTION = "Emit the cover letter, the follow-up email and the LinkedIn message together."
+# Sum of the three standalone caps (2048 + 1024 + 1024).
+_OUTREACH_BUNDLE_MAX_TOKENS = 4096
+
+
+def _seed_outreach_caches(
+    cache: CacheService,
+    bundle: dict[str, Any],
+    cv_text: str,
+    job_description: str,
+    role: str,
+    company: str,
+    days_since: int,
+    contact_info: str,
+    language: str,
+    model: str,
+) -> None:
+    """Store each bundle part under its standalone cache key.
+
+    A later "Email" / "LinkedIn" click on the same candidature is then a
+    cache hit. The parts carry zero cost and tokens: the bundle call
+    already paid for them.
+    """
+    keys = {
+        "cover_letter": _cover_letter_cache_key(cv_text, job_description, language, model),
+        "followup_email": _followup_cache_key(role, company, days_since, language, model),
+        "linkedin_message": _linkedin_cache_key(role, company, contact_info, language, model),
+    }
+    for part, key in keys.items():
+        payload = {
+            **bundle[part],
+            "model_used": bundle["model_used"],
+            "tokens": dict.fromkeys(bundle["tokens"], 0),
+            "cost_usd": 0.0,
+        }
+        cache.set_json(key, payload, CACHE_TTL)
+
+
+def _outreach_bundle_steps(
+    cv_text: str,
+    job_description: str,
+    analysis_data: dict[str, Any],
+    days_since: int,
+    contact_info: str,
+    language: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+) -> _ToolSteps:
+    """Outreach bundle steps: cover letter + follow-up email + LinkedIn message in one call.
+
+    Result: ``{"cover_letter": {...}, "followup_email": {...},
+    "linkedin_message": {...}}`` (each shaped like its standalone result)
+    plus the usual ``model_used`` / ``tokens`` / ``cost_usd`` for the call.
+    """
+    model_id = MODELS.get(model, MODELS["haiku"])
+    role = str(analysis_data.get("role") or "")
+    company = str(analysis_data.get("company") or "")
+
+    ch = content_hash(cv_text, job_description)
+    raw = f"outreach:{COVER_LETTER_PROMPT_VERSION}:{model}:{ch[:16]}:{days_since}:{contact_info}:{language}"
+    cache_key = f"outreach:{hashlib.sha256(raw.encode()).hexdigest()[:16]}"
+    if cache:
+        cached = cache.get_json(cache_key)
+        if cached:
+            cached["from_cache"] = True
+            return cached
+    yield _Coalesce(cache_key)
+
+    strengths_text, gaps_text = _letter_highlights(analysis_data)
+    prompt = OUTREACH_BUNDLE_USER_PROMPT.format(
+        job_description=_prompt_jd(job_description),
+        role=role,
+        company=company,
+        score=analysis_data.get("score", 0),
+        strengths=strengths_text,
+        gaps=gaps_text,
+        days_since_application=days_since,
+        contact_info=contact_info or "Not available",
+        language=language,
+    )
+    result, usage = yield _ToolCall(
+        OUTREACH_BUNDLE_SYSTEM_PROMPT,
+        _cached_user_content(CV_BLOCK.format(cv_text=_prompt_cv(cv_text, job_description, _CV_TOKENS_LETTER)), prompt),
+        model_id,
+        _OUTREACH_BUNDLE_MAX_TOKENS,
+        tool_name=OUTREACH_BUNDLE_TOOL_NAME,
+        tool_description=_OUTREACH_BUNDLE_TOOL_DESCRIPTION,
+        input_schema=_OUTREACH_BUNDLE_SCHEMA,
+    )
+
+    result = validate_outreach_bundle(result)
+    result["model_used"] = model_id
+    result["from_cache"] = False
+    result["tokens"] = _usage_tokens(usage)
+    result["cost_usd"] = _calculate_cost(usage, model_id)
+
+    if cache:
+        cache_data = {k: v for k, v in result.items() if k != "from_cache"}
+        cache.set_json(cache_key, cache_data, CACHE_TTL)
+        _seed_outreach_caches(
+            cache, result, cv_text, job_description, role, company, days_since, contact_info, language, model
+        )
+
+    return result
+
+
+def analyze_job(
+    cv_text: str,
+    job_description: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+    db: "Session | None" = None,
+    user_id: "UUID | None" = None,
+    on_field: FieldCallback | None = None,
+) -> dict[str, Any]:
+    """Analyze CV-to-job compatibility (see :func:`_analyze_job_steps`)."""
+    return _run_steps(_analyze_job_steps(cv_text, job_description, model, cache, db, user_id, on_field))
+
+
+async def aanalyze_job(
+    cv_text: str,
+    job_description: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+    db: "Session | None" = None,
+    user_id: "UUID | None" = None,
+    on_field: FieldCallback | None = None,
+) -> dict[str, Any]:
+    """Async :func:`analyze_job` on the ``AsyncAnthropic`` client."""
+    return await _arun_steps(_analyze_job_steps(cv_text, job_description, model, cache, db, user_id, on_field))
+
+
+def triage_job(
+    cv_text: str,
+    job_description: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+    db: "Session | None" = None,
+    user_id: "UUID | None" = None,
+) -> dict[str, Any]:
+    """Cheap pre-screen of a job (see :func:`_triage_job_steps`)."""
+    return _run_steps(_triage_job_steps(cv_text, job_description, model, cache, db, user_id))
+
+
+def generate_analysis_details(
+    cv_text: str,
+    job_description: str,
+    analysis_data: dict[str, Any],
+    model: str = "haiku",
+    cache: CacheService | None = None,
+    db: "Session | None" = None,
+    user_id: "UUID | None" = None,
+) -> dict[str, Any]:
+    """Generate the deferred analysis sections (see :func:`_analysis_details_steps`)."""
+    return _run_steps(_analysis_details_steps(cv_text, job_description, analysis_data, model, cache, db, user_id))
+
+
+async def agenerate_analysis_details(
+    cv_text: str,
+    job_description: str,
+    analysis_data: dict[str, Any],
+    model: str = "haiku",
+    cache: CacheService | None = None,
+    db: "Session | None" = None,
+    user_id: "UUID | None" = None,
+) -> dict[str, Any]:
+    """Async :func:`generate_analysis_details`."""
+    return await _arun_steps(
+        _analysis_details_steps(cv_text, job_description, analysis_data, model, cache, db, user_id)
+    )
+
+
+def generate_cover_letter(
+    cv_text: str,
+    job_description: str,
+    analysis_data: dict[str, Any],
+    language: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+) -> dict[str, Any]:
+    """Generate a cover letter based on CV, job description, and analysis."""
+    return _run_steps(_cover_letter_steps(cv_text, job_description, analysis_data, language, model, cache))
+
+
+async def agenerate_cover_letter(
+    cv_text: str,
+    job_description: str,
+    analysis_data: dict[str, Any],
+    language: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+) -> dict[str, Any]:
+    """Async :func:`generate_cover_letter`."""
+    return await _arun_steps(_cover_letter_steps(cv_text, job_description, analysis_data, language, model, cache))
+
+
+def generate_followup_email(
+    cv_text: str,
+    role: str,
+    company: str,
+    days_since: int,
+    language: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+) -> dict[str, Any]:
+    """Generate a follow-up email after application."""
+    return _run_steps(_followup_email_steps(cv_text, role, company, days_since, language, model, cache))
+
+
+async def agenerate_followup_email(
+    cv_text: str,
+    role: str,
+    company: str,
+    days_since: int,
+    language: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+) -> dict[str, Any]:
+    """Async :func:`generate_followup_email`."""
+    return await _arun_steps(_followup_email_steps(cv_text, role, company, days_since, language, model, cache))
+
+
+def generate_linkedin_message(
+    cv_text: str,
+    role: str,
+    company: str,
+    contact_info: str,
+    language: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+) -> dict[str, Any]:
+    """Generate a LinkedIn connection message."""
+    return _run_steps(_linkedin_message_steps(cv_text, role, company, contact_info, language, model, cache))
+
+
+async def agenerate_linkedin_message(
+    cv_text: str,
+    role: str,
+    company: str,
+    contact_info: str,
+    language: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+) -> dict[str, Any]:
+    """Async :func:`generate_linkedin_message`."""
+    return await _arun_steps(_linkedin_message_steps(cv_text, role, company, contact_info, language, model, cache))
+
+
+def generate_outreach_bundle(
+    cv_text: str,
+    job_description: str,
+    analysis_data: dict[str, Any],
+    days_since: int,
+    contact_info: str,
+    language: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+) -> dict[str, Any]:
+    """Generate cover letter, follow-up email and LinkedIn message in one call."""
+    return _run_steps(
+        _outreach_bundle_steps(
+            cv_text, job_description, analysis_data, days_since, contact_info, language, model, cache
+        )
+    )
+
+
+async def agenerate_outreach_bundle(
+    cv_text: str,
+    job_description: str,
+    analysis_data: dict[str, Any],
+    days_since: int,
+    contact_info: str,
+    language: str,
+    model: str = "haiku",
+    cache: CacheService | None = None,
+) -> dict[str, Any]:
+    """Async :func:`generate_outreach_bundle`."""
+    return await _arun_steps(
+        _outreach_bundle_steps(
+            cv_text, job_description, analysis_data, days_since, contact_info, language, model, cache
+        )
+    )
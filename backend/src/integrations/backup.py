@@ -61,6 +61,7 @@ def create_backup(db: Session) -> dict[str, Any]:
     from ..contacts.models import Contact
     from ..cover_letter.models import CoverLetter
     from ..cv.models import CVProfile
+    from ..dashboard.models import AISpendDaily, AISpendEvent
     from ..interview.models import Interview
 
     tables = {
@@ -68,6 +69,8 @@ def create_backup(db: Session) -> dict[str, Any]:
         "interviews": Interview,
         "cv_profiles": CVProfile,
         "app_settings": AppSettings,
+        "ai_spend_daily": AISpendDaily,
+        "ai_spend_events": AISpendEvent,
         "todo_items": TodoItem,
         "contacts": Contact,
         "cover_letters": CoverLetter,
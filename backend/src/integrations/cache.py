@@ -1,19 +1,46 @@
 """Cache service with Protocol pattern for dependency injection.
 
-Provides RedisCacheService (real cache) and NullCacheService (no-op fallback).
+Provides MemoryCacheService (in-process LRU, L1), RedisCacheService (real
+cache), DatabaseCacheService (durable tier on the primary DB),
+TieredCacheService (read-through chain of tiers) and NullCacheService
+(no-op fallback).
 """
 
+import hashlib
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
 from typing import Any, Protocol, cast
 
 import redis
+from sqlalchemy import CursorResult, delete, func, select
+from sqlalchemy.orm import Session
 
 from ..config import settings
+from ..database.base import SessionLocal
+from .models import CacheEntry
 
 logger = logging.getLogger(__name__)
 
 
+def _decode_json(key: str, raw: str | None) -> dict[str, Any] | None:
+    """Shared ``get_json`` tail: JSON-decode a cached string, poisoned values are a miss."""
+    if raw is None:
+        return None
+    try:
+        return cast(dict[str, Any], json.loads(raw))
+    except (json.JSONDecodeError, TypeError):
+        # Info-level: a malformed cache entry is auto-recovered on the next
+        # miss + set cycle. Not worth a Sentry alert; investigate only if
+        # the log line appears repeatedly for the same key.
+        logger.info("cache poisoned key=%s — invalid JSON, treating as miss", key)
+        return None
+
+
 class CacheService(Protocol):
     """Cache service interface."""
 
@@ -24,6 +51,79 @@ class CacheService(Protocol):
     def stats(self) -> dict[str, int]: ...
 
 
+class MemoryCacheService:
+    """Bounded in-process LRU + TTL cache, the L1 in front of Redis / DB.
+
+    Hot keys (``glassdoor:<company>`` on every analysis of the same
+    company, repeated ``analysis:`` lookups) are served without a network
+    round trip. Values are kept as the serialized string, so callers always
+    get a freshly decoded dict they can mutate. The budget is in bytes of
+    stored value; a single entry larger than 1/8 of it is not admitted (it
+    would flush most of the hot set). TTL is capped at ``max_ttl``: other
+    processes can't invalidate this tier, so it must stay short-lived.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int, max_ttl: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self._max_bytes = max_bytes
+        self._max_ttl = max_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (value, expires_at, size); order = recency, oldest first.
+        self._entries: OrderedDict[str, tuple[str, float, int]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _drop(self, key: str) -> None:
+        _value, _expires, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= self._clock():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        size = len(key) + len(value.encode())
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self._max_bytes // 8:
+                return
+            self._entries[key] = (value, self._clock() + min(ttl, self._max_ttl), size)
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_json(self, key: str) -> dict[str, Any] | None:
+        return _decode_json(key, self.get(key))
+
+    def set_json(self, key: str, data: dict[str, Any], ttl: int) -> None:
+        self.set(key, json.dumps(data, ensure_ascii=False), ttl)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": 0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
 class RedisCacheService:
     """Redis-backed cache implementation with hit/miss instrumentation.
 
@@ -32,6 +132,8 @@ class RedisCacheService:
     a safe miss) but **logged** at WARNING so they're not silent.
     """
 
+    name = "redis"
+
     def __init__(self, redis_url: str) -> None:
         self._client = redis.from_url(redis_url, decode_responses=True)  # type: ignore[no-untyped-call]
         self._client.ping()
@@ -66,17 +168,7 @@ class RedisCacheService:
             logger.info("cache set failed key=%s err=%s", key, exc)
 
     def get_json(self, key: str) -> dict[str, Any] | None:
-        raw = self.get(key)
-        if raw is None:
-            return None
-        try:
-            return cast(dict[str, Any], json.loads(raw))
-        except (json.JSONDecodeError, TypeError):
-            # Info-level: a malformed cache entry is auto-recovered on the next
-            # miss + set cycle. Not worth a Sentry alert; investigate only if
-            # the log line appears repeatedly for the same key.
-            logger.info("cache poisoned key=%s — invalid JSON, treating as miss", key)
-            return None
+        return _decode_json(key, self.get(key))
 
     def set_json(self, key: str, data: dict[str, Any], ttl: int) -> None:
         self.set(key, json.dumps(data, ensure_ascii=False), ttl)
@@ -86,6 +178,195 @@ class RedisCacheService:
         return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
 
 
+# Eviction (expired purge + size cap) runs on one write out of N rather
+# than on every set: the SUM over the table is cheap but not free.
+_EVICT_EVERY_WRITES = 50
+
+
+def _aware(value: datetime) -> datetime:
+    """SQLite hands back naive datetimes; every stored expiry is UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+class DatabaseCacheService:
+    """Durable cache tier on the primary DB (``cache_entries``).
+
+    L2 behind Redis and the only tier when Redis is missing, so AI results
+    cached under ``analysis:`` / ``coverletter:`` / ``followup:`` /
+    ``linkedin:`` survive restarts and Redis outages. Size-bounded: past
+    ``max_bytes`` the entries closest to expiry are evicted first. Each
+    operation uses its own short session (callers run on worker threads
+    and the event loop's thread pool). Errors are counted and logged like
+    ``RedisCacheService`` — the caller just sees a miss.
+    """
+
+    name = "db"
+
+    def __init__(self, max_bytes: int, session_factory: Callable[[], Session] = SessionLocal) -> None:
+        self._session_factory = session_factory
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _db_key(key: str) -> str:
+        """Keys longer than the column (rare: free-text company names) are hashed."""
+        if len(key) <= 255:
+            return key
+        return "sha256:" + hashlib.sha256(key.encode()).hexdigest()
+
+    def get_with_ttl(self, key: str) -> tuple[str, int] | None:
+        """Value plus remaining TTL in seconds — lets a tier above backfill with the right expiry."""
+        now = datetime.now(UTC)
+        try:
+            with self._session_factory() as db:
+                row = db.execute(
+                    select(CacheEntry.value, CacheEntry.expires_at).where(
+                        CacheEntry.key == self._db_key(key), CacheEntry.expires_at > now
+                    )
+                ).first()
+        except Exception as exc:
+            self.errors += 1
+            logger.info("db cache get failed key=%s err=%s (falling through to source)", key, exc)
+            return None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row.value, max(1, int((_aware(row.expires_at) - now).total_seconds()))
+
+    def get(self, key: str) -> str | None:
+        found = self.get_with_ttl(key)
+        return found[0] if found else None
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        entry = CacheEntry(
+            key=self._db_key(key),
+            value=value,
+            size_bytes=len(value.encode()),
+            expires_at=datetime.now(UTC) + timedelta(seconds=ttl),
+        )
+        try:
+            with self._session_factory() as db:
+                db.merge(entry)
+                db.commit()
+        except Exception as exc:
+            self.errors += 1
+            logger.info("db cache set failed key=%s err=%s", key, exc)
+            return
+        with self._lock:
+            self._writes += 1
+            due = self._writes % _EVICT_EVERY_WRITES == 1
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Purge expired entries, then the closest-to-expiry ones until under ``max_bytes``."""
+        try:
+            with self._session_factory() as db:
+                purged = cast(
+                    CursorResult[Any], db.execute(delete(CacheEntry).where(CacheEntry.expires_at <= datetime.now(UTC)))
+                )
+                removed = int(purged.rowcount or 0)
+                total = db.scalar(select(func.coalesce(func.sum(CacheEntry.size_bytes), 0)))
+                excess = int(total or 0) - self._max_bytes
+                if excess > 0:
+                    victims: list[str] = []
+                    rows = db.execute(select(CacheEntry.key, CacheEntry.size_bytes).order_by(CacheEntry.expires_at))
+                    for victim_key, size in rows:
+                        victims.append(victim_key)
+                        excess -= size
+                        if excess <= 0:
+                            break
+                    db.execute(delete(CacheEntry).where(CacheEntry.key.in_(victims)))
+                    removed += len(victims)
+                db.commit()
+        except Exception as exc:
+            self.errors += 1
+            logger.info("db cache eviction failed err=%s", exc)
+            return 0
+        self.evictions += removed
+        return removed
+
+    def get_json(self, key: str) -> dict[str, Any] | None:
+        return _decode_json(key, self.get(key))
+
+    def set_json(self, key: str, data: dict[str, Any], ttl: int) -> None:
+        self.set(key, json.dumps(data, ensure_ascii=False), ttl)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors, "evictions": self.evictions}
+
+
+# Backfill TTL when a lower tier can't report the remaining one.
+_BACKFILL_TTL_SECONDS = 3600
+
+
+class TieredCacheService:
+    """Read-through / write-through chain of cache tiers, fastest first.
+
+    ``get`` walks the tiers until one hits and copies the value into the
+    tiers above it (with the lower tier's remaining TTL when it exposes
+    ``get_with_ttl``); ``set`` writes every tier. A tier failing (Redis
+    outage) is just a miss there, so the next tier still answers.
+    """
+
+    def __init__(self, *tiers: CacheService) -> None:
+        self.tiers = tiers
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> str | None:
+        found: tuple[str, int] | None
+        for index, tier in enumerate(self.tiers):
+            get_with_ttl = getattr(tier, "get_with_ttl", None)
+            if get_with_ttl is not None:
+                found = get_with_ttl(key)
+            else:
+                value = tier.get(key)
+                found = (value, _BACKFILL_TTL_SECONDS) if value is not None else None
+            if found is not None:
+                self.hits += 1
+                for upper in self.tiers[:index]:
+                    upper.set(key, found[0], found[1])
+                return found[0]
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        for tier in self.tiers:
+            tier.set(key, value, ttl)
+
+    def get_json(self, key: str) -> dict[str, Any] | None:
+        return _decode_json(key, self.get(key))
+
+    def set_json(self, key: str, data: dict[str, Any], ttl: int) -> None:
+        self.set(key, json.dumps(data, ensure_ascii=False), ttl)
+
+    def tier_stats(self) -> dict[str, dict[str, int]]:
+        """Each tier's own counters, keyed by tier name (fastest first)."""
+        return {getattr(tier, "name", type(tier).__name__): tier.stats() for tier in self.tiers}
+
+    def stats(self) -> dict[str, int]:
+        """Overall hits/misses, summed errors, plus each tier's counters prefixed by its name."""
+        out = {"hits": self.hits, "misses": self.misses, "errors": 0}
+        for name, tier_stats in self.tier_stats().items():
+            out["errors"] += tier_stats.get("errors", 0)
+            out.update({f"{name}_{k}": v for k, v in tier_stats.items()})
+        return out
+
+
+def cache_tier_stats(cache: CacheService) -> dict[str, dict[str, int]]:
+    """Per-tier counters of any cache service (a single tier for non-tiered ones)."""
+    if isinstance(cache, TieredCacheService):
+        return cache.tier_stats()
+    return {getattr(cache, "name", type(cache).__name__): cache.stats()}
+
+
 class NullCacheService:
     """No-op cache for when Redis is unavailable.
 
@@ -97,6 +378,8 @@ class NullCacheService:
     conformance).
     """
 
+    name = "null"
+
     def get(self, key: str) -> str | None:
         """Always return a miss — there is no backing store."""
         del key
@@ -126,19 +409,29 @@ class NullCacheService:
 def create_cache_service() -> CacheService:
     """Factory: create the appropriate cache service based on configuration.
 
-    Redis init failures (timeout, auth, wrong URL) degradano graceful a
-    ``NullCacheService`` MA con ``logger.exception`` esplicito + Sentry
-    breadcrumb: senza log un Redis outage in produzione era invisibile,
-    l'app girava cacheless senza un singolo evento Sentry. Vedi audit memo
+    Redis init failures (timeout, auth, wrong URL) degradano graceful MA
+    con ``logger.exception`` esplicito + Sentry breadcrumb: senza log un
+    Redis outage in produzione era invisibile, l'app girava cacheless
+    senza un singolo evento Sentry. Vedi audit memo
     `feedback_e2e_wiring_test` per il pattern di non-silenzio.
+
+    Tier order: in-process LRU (``memory_cache_max_bytes`` > 0) → Redis →
+    durable ``DatabaseCacheService`` (``db_cache_enabled``). Redis missing
+    or unreachable just drops that tier; with no backing tier at all the
+    result is ``NullCacheService``.
     """
-    if not settings.redis_url:
-        return NullCacheService()
-    try:
-        return RedisCacheService(settings.redis_url)
-    except Exception:
-        logger.exception(
-            "Redis init failed (url=%s), degrading to NullCacheService",
-            settings.redis_url,
-        )
+    backing: list[CacheService] = []
+    if settings.redis_url:
+        try:
+            backing.append(RedisCacheService(settings.redis_url))
+        except Exception:
+            logger.exception("Redis init failed (url=%s), continuing without the Redis tier", settings.redis_url)
+    if settings.db_cache_enabled:
+        backing.append(DatabaseCacheService(settings.db_cache_max_bytes))
+    if not backing:
         return NullCacheService()
+
+    tiers = list(backing)
+    if settings.memory_cache_max_bytes > 0:
+        tiers.insert(0, MemoryCacheService(settings.memory_cache_max_bytes, settings.memory_cache_max_ttl))
+    return tiers[0] if len(tiers) == 1 else TieredCacheService(*tiers)
@@ -0,0 +1,287 @@
+"""Token-aware compaction of CV and job description text before prompting.
+
+The prompts used to cut the CV blindly (12000 chars for the analysis, 8000
+for cover letters, 1500 for follow-ups) and to send the JD whole. Both
+waste input tokens in opposite ways: the JD carries EEO / GDPR / cookie
+boilerplate and repeated benefit blocks, the CV tail that falls past the
+cut may be exactly the section the job asks about.
+
+- :func:`compact_job_description` drops boilerplate paragraphs and
+  duplicated blocks. A paragraph is boilerplate only when it reads as a
+  legal statement ("equal opportunity employer", "we use cookies", ...):
+  bare keywords, bullet lists and requirement blocks are always kept, as
+  are paragraphs that mix boilerplate with real content (a length cap).
+  A JD that would shrink to almost nothing is returned untouched.
+- :func:`compact_cv` normalizes the CV once per version (whitespace, page
+  footers, repeated header lines). When it still exceeds the token budget
+  it keeps the header section plus the sections that overlap most with
+  the query (the JD, or role + company), in their original order.
+
+A CV that fits the budget is sent as is, independent of the JD: the CV
+block stays a stable prefix for Anthropic prompt caching. Results are
+memoized per text (``functools.lru_cache``): the CV text *is* the profile
+version, so a new upload is a new key.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import re
+
+from .token_bucket import _CHARS_PER_TOKEN, estimate_tokens
+
+# Paragraph longer than this is never dropped as boilerplate: it likely
+# mixes the legal sentence with real content.
+_BOILERPLATE_MAX_CHARS = 1200
+# Below this share of the original the JD compaction is assumed wrong
+# (e.g. a whole JD pasted as one "about us" block) and skipped.
+_JD_MIN_KEPT_RATIO = 0.3
+
+# Phrases of a legal statement, not of a requirement: a paragraph is
+# boilerplate only when it *says* one of these. Bare keywords ("GDPR",
+# "privacy", "cookie") appear in real requirements of privacy-engineering
+# or frontend JDs and must never be enough.
+_BOILERPLATE_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        # Equal opportunity / anti-discrimination
+        r"equal (employment )?opportunit(y|ies) (employer|for all)",
+        r"(is|are) an equal (employment )?opportunity",
+        r"nel rispetto (delle|della normativa sulle) pari opportunit",
+        r"affirmative action",
+        r"without regard to (race|religion|colou?r|gender|sex|age)",
+        r"regardless of (race|religion|colou?r|gender|sex|age)",
+        r"ai sensi (del|della|dell')\s*(l\.|legge|d\.?\s?lgs)",
+        r"entrambi i sessi",
+        r"reasonable accommodations? (will be|are|is) (provided|available)",
+        # Privacy statements
+        r"informativa (sulla )?privacy",
+        r"(read|see|consult|review) our privacy (policy|notice)",
+        r"(consenso|autorizz\w*) al trattamento dei (tuoi |suoi )?dati personali",
+        r"dati personali (saranno|verranno) trattati",
+        r"processing of (your )?personal data",
+        r"ai sensi (del|dell'art\.?\s*13 del) regolamento (ue|europeo)",
+        # Cookie banners scraped with the page
+        r"we use cookies",
+        r"(this|our) (site|website) uses cookies",
+        r"(utilizziamo|usiamo) (i )?cookie",
+        r"questo sito (utilizza|usa) (i )?cookie",
+        r"accept all cookies|accetta tutti i cookie",
+        r"cookie (policy|settings|preferences)",
+    )
+]
+
+# A requirement list is never boilerplate, whatever it mentions.
+_BULLET = re.compile(r"^\s*([-*\u2022\u2013]|\d+[.)])\s", re.MULTILINE)
+_REQUIREMENT_HEADING = re.compile(
+    r"^\s*(requirements?|qualifications?|responsibilities|nice to have|must have|what you('ll| will) (bring|do)|"
+    r"you have|skills|requisiti|competenze|responsabilit|mansioni|cosa farai|cosa cerchiamo)\b",
+    re.IGNORECASE,
+)
+
+# Heading that opens a company-presentation block: the heading and the
+# paragraph that follows it are dropped.
+_ABOUT_HEADING = re.compile(
+    r"^\s*(about us|about the company|who we are|company overview|chi siamo|l'azienda|"
+    r"la nostra azienda|chi e'|chi è)\s*:?\s*$",
+    re.IGNORECASE,
+)
+
+_CV_HEADINGS = re.compile(
+    r"^(summary|profile|profilo|about me|experience|work experience|professional experience|esperienz[ae]"
+    r"( lavorativ[ae]| professional[ei])?|education|formazione|istruzione|skills|technical skills|competenze"
+    r"( tecniche)?|certifications?|certificazioni|projects?|progetti|languages?|lingue|interests|interessi|hobby"
+    r"|references|referenze|publications|pubblicazioni|volunteering|volontariato|awards|premi)\s*:?$",
+    re.IGNORECASE,
+)
+_PAGE_MARKER = re.compile(r"^\s*(page|pagina|pag\.)\s*\d+(\s*(of|di|/)\s*\d+)?\s*$", re.IGNORECASE)
+_TERM = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+_STOPWORDS = frozenset(
+    [
+        "the",
+        "and",
+        "for",
+        "with",
+        "you",
+        "your",
+        "our",
+        "are",
+        "will",
+        "who",
+        "that",
+        "this",
+        "from",
+        "have",
+        "has",
+        "all",
+        "can",
+        "not",
+        "but",
+        "per",
+        "con",
+        "del",
+        "della",
+        "dei",
+        "delle",
+        "nel",
+        "nella",
+        "sono",
+        "una",
+        "uno",
+        "gli",
+        "che",
+        "come",
+        "anche",
+        "alla",
+        "alle",
+        "dal",
+        "dalla",
+        "sul",
+        "sulla",
+        "tra",
+        "fra",
+        "piu",
+        "più",
+    ]
+)
+_OMITTED = "[...]"
+
+
+def _paragraphs(text: str) -> list[str]:
+    return [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+
+def _squash(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def _is_boilerplate(paragraph: str) -> bool:
+    if len(paragraph) > _BOILERPLATE_MAX_CHARS:
+        return False
+    if _BULLET.search(paragraph) or _REQUIREMENT_HEADING.match(paragraph):
+        return False
+    return any(p.search(paragraph) for p in _BOILERPLATE_PATTERNS)
+
+
+@functools.lru_cache(maxsize=128)
+def compact_job_description(text: str) -> str:
+    """JD without legal / cookie / company-presentation boilerplate and repeated blocks."""
+    paragraphs = _paragraphs(text)
+    kept: list[str] = []
+    seen: set[str] = set()
+    skip_next = False
+    for para in paragraphs:
+        first_line = para.split("\n", 1)[0]
+        if _ABOUT_HEADING.match(first_line):
+            # Heading alone in its paragraph: the body is the next one.
+            skip_next = "\n" not in para
+            continue
+        if skip_next:
+            skip_next = False
+            continue
+        key = _squash(para)
+        if key in seen or _is_boilerplate(para):
+            continue
+        seen.add(key)
+        kept.append(para)
+
+    compacted = "\n\n".join(kept)
+    if len(compacted) < len(text.strip()) * _JD_MIN_KEPT_RATIO:
+        return text
+    return compacted
+
+
+@functools.lru_cache(maxsize=16)
+def _normalized_cv(cv_text: str) -> str:
+    """Whitespace-normalized CV without page markers and repeated header / footer lines."""
+    lines: list[str] = []
+    seen: set[str] = set()
+    for raw in cv_text.splitlines():
+        line = re.sub(r"[ \t]+", " ", raw).strip()
+        if _PAGE_MARKER.match(line):
+            continue
+        # PDF extraction repeats the running header on every page.
+        key = line.lower()
+        if len(line) >= 20 and key in seen:
+            continue
+        if line:
+            seen.add(key)
+        lines.append(line)
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _is_heading(line: str) -> bool:
+    if not line or len(line) > 60 or line.endswith("."):
+        return False
+    return bool(_CV_HEADINGS.match(line)) or (line.isupper() and any(c.isalpha() for c in line))
+
+
+def _sections(cv_text: str) -> list[str]:
+    """Split on section headings; the first section is the header (name, contacts, summary)."""
+    sections: list[list[str]] = [[]]
+    for line in cv_text.splitlines():
+        if _is_heading(line.strip()) and any(s.strip() for s in sections[-1]):
+            sections.append([])
+        sections[-1].append(line)
+    return ["\n".join(s).strip() for s in sections if any(line.strip() for line in s)]
+
+
+def _terms(text: str) -> set[str]:
+    return {t for t in _TERM.findall(text.lower()) if len(t) >= 2 and t not in _STOPWORDS}
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Cut at the last line boundary within ``max_tokens``."""
+    limit = max_tokens * _CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind("\n", 0, limit)
+    return text[: cut if cut > limit // 2 else limit].rstrip()
+
+
+@functools.lru_cache(maxsize=64)
+def _fit_sections(cv_text: str, query: str, max_tokens: int) -> str:
+    sections = _sections(cv_text)
+    query_terms = _terms(query)
+
+    def relevance(idx: int) -> float:
+        hits = len(_terms(sections[idx]) & query_terms)
+        # Density, not raw hits: a long section shouldn't win by size alone.
+        return hits / math.sqrt(estimate_tokens(sections[idx]))
+
+    chosen: dict[int, str] = {}
+    remaining = max_tokens
+    header = _truncate(sections[0], max_tokens)
+    chosen[0] = header
+    remaining -= estimate_tokens(header)
+    for idx in sorted(range(1, len(sections)), key=lambda i: (-relevance(i), i)):
+        if remaining <= 0:
+            break
+        cost = estimate_tokens(sections[idx])
+        if cost <= remaining:
+            chosen[idx] = sections[idx]
+            remaining -= cost
+        elif remaining >= 50 and relevance(idx) > 0:
+            chosen[idx] = _truncate(sections[idx], remaining)
+            remaining = 0
+
+    parts: list[str] = []
+    for idx in range(len(sections)):
+        if idx in chosen:
+            parts.append(chosen[idx])
+        elif not parts or parts[-1] != _OMITTED:
+            parts.append(_OMITTED)
+    return "\n\n".join(parts)
+
+
+def compact_cv(cv_text: str, query: str, max_tokens: int) -> str:
+    """CV within ``max_tokens``, keeping the sections most relevant to ``query``.
+
+    Omitted sections leave a ``[...]`` marker so the model knows the CV
+    goes on.
+    """
+    normalized = _normalized_cv(cv_text)
+    if estimate_tokens(normalized) <= max_tokens:
+        return normalized
+    return _fit_sections(normalized, query, max_tokens)
@@ -12,9 +12,18 @@ from typing import Any
 import anthropic
 from docx import Document as DocxDocument
 from openpyxl import load_workbook
+from starlette.concurrency import run_in_threadpool
 
 from ..interview.file_models import FileStatus
-from .anthropic_client import MODELS, _calculate_cost, get_client
+from .anthropic_client import (
+    MODELS,
+    _atracked_call,
+    _calculate_cost,
+    _tracked_call,
+    get_async_client,
+    get_client,
+    get_governor,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +44,7 @@ Criteri per "compiled: false":
 """
 
 SCAN_TOOL_NAME = "submit_scan_result"
+SCAN_OPERATION = "document_scan"  # ``ai_call_metrics.operation``
 SCAN_TOOL_DESCRIPTION = "Emit the structured document scan result."
 SCAN_INPUT_SCHEMA: dict[str, Any] = {
     "type": "object",
@@ -85,6 +95,36 @@ def _extract_text_from_xlsx(file_bytes: bytes) -> str:
     return "\n".join(lines)
 
 
+_EMPTY_DOCUMENT_MSG = "Il documento e' vuoto (nessun testo trovato)."
+
+# Content types that need XLSX extraction
+_XLSX_TYPES = {
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.ms-excel",
+}
+# Content types that need DOCX extraction
+_DOCX_TYPES = {
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/msword",
+}
+
+
+def _scan_outcome(status: str, scan_result: str, confidence: str) -> dict[str, Any]:
+    """Result dict for scans that end without (billable) AI output."""
+    return {
+        "status": status,
+        "scan_result": scan_result,
+        "compiled": False,
+        "confidence": confidence,
+        "cost_usd": 0.0,
+        "tokens": {"input": 0, "output": 0, "total": 0},
+    }
+
+
+def _scan_error() -> dict[str, Any]:
+    return _scan_outcome(FileStatus.SCAN_ERROR, "Errore durante la scansione del documento.", "low")
+
+
 def scan_document(
     file_bytes: bytes,
     filename: str,
@@ -114,83 +154,88 @@ def scan_document(
     model_id = MODELS.get(model, MODELS["haiku"])
     client = get_client()
 
-    # Content types that need XLSX extraction
-    XLSX_TYPES = {
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        "application/vnd.ms-excel",
-    }
-    # Content types that need DOCX extraction
-    DOCX_TYPES = {
-        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        "application/msword",
-    }
-
     try:
-        if content_type == "application/pdf":
-            return _scan_pdf(client, file_bytes, filename, model_id)
-        if content_type in XLSX_TYPES:
-            return _scan_text_based(
-                client,
-                _extract_text_from_xlsx(file_bytes),
-                filename,
-                content_type,
-                model_id,
-            )
-        if content_type in DOCX_TYPES:
-            return _scan_text_based(
-                client,
-                _extract_text_from_docx(file_bytes),
-                filename,
-                content_type,
-                model_id,
-            )
-        if content_type == "text/plain":
-            return _scan_text_based(
-                client,
-                file_bytes.decode("utf-8", errors="replace"),
-                filename,
-                content_type,
-                model_id,
-            )
-        # Fallback: try DOCX extraction (legacy behavior)
-        return _scan_text_based(
-            client,
-            _extract_text_from_docx(file_bytes),
-            filename,
-            content_type,
-            model_id,
-        )
+        params = _scan_request(file_bytes, filename, content_type, model_id)
+        if params is None:
+            return _scan_outcome(FileStatus.NOT_COMPILED, _EMPTY_DOCUMENT_MSG, "high")
+        with _tracked_call(SCAN_OPERATION, model_id) as telemetry, get_governor().slot():
+            telemetry.admit()
+            message = client.messages.create(**params)
+            telemetry.usage = message.usage
+        return _parse_scan_response(message, model_id)
     except Exception:
         logger.exception("Document scan failed for %s", filename)
-        return {
-            "status": FileStatus.SCAN_ERROR,
-            "scan_result": "Errore durante la scansione del documento.",
-            "compiled": False,
-            "confidence": "low",
-            "cost_usd": 0.0,
-            "tokens": {"input": 0, "output": 0, "total": 0},
-        }
+        return _scan_error()
 
 
-def _scan_pdf(
-    client: anthropic.Anthropic,
+async def ascan_document(
     file_bytes: bytes,
     filename: str,
-    model_id: str,
+    content_type: str,
+    model: str = "haiku",
 ) -> dict[str, Any]:
+    """Async :func:`scan_document` on the ``AsyncAnthropic`` client.
+
+    DOCX/XLSX text extraction is CPU work, so it runs on the thread pool;
+    only the Claude round trip is awaited on the event loop.
+    """
+    model_id = MODELS.get(model, MODELS["haiku"])
+    client = get_async_client()
+
+    try:
+        params = await run_in_threadpool(_scan_request, file_bytes, filename, content_type, model_id)
+        if params is None:
+            return _scan_outcome(FileStatus.NOT_COMPILED, _EMPTY_DOCUMENT_MSG, "high")
+        async with _atracked_call(SCAN_OPERATION, model_id) as telemetry, get_governor().aslot():
+            telemetry.admit()
+            message = await client.messages.create(**params)
+            telemetry.usage = message.usage
+        return _parse_scan_response(message, model_id)
+    except Exception:
+        logger.exception("Document scan failed for %s", filename)
+        return _scan_error()
+
+
+def _scan_request(file_bytes: bytes, filename: str, content_type: str, model_id: str) -> dict[str, Any] | None:
+    """Build the ``messages.create`` kwargs for one scan.
+
+    Returns ``None`` when a text-based document has no text at all: no AI
+    call is needed to call it not compiled.
+    """
+    if content_type == "application/pdf":
+        return _pdf_request(file_bytes, filename, model_id)
+    if content_type in _XLSX_TYPES:
+        text = _extract_text_from_xlsx(file_bytes)
+    elif content_type == "text/plain":
+        text = file_bytes.decode("utf-8", errors="replace")
+    else:
+        # DOCX, plus fallback for unknown types (legacy behavior)
+        text = _extract_text_from_docx(file_bytes)
+    if not text.strip():
+        return None
+    return _text_request(text, filename, content_type, model_id)
+
+
+def _tool_kwargs() -> dict[str, Any]:
+    return {
+        "tools": [{"name": SCAN_TOOL_NAME, "description": SCAN_TOOL_DESCRIPTION, "input_schema": SCAN_INPUT_SCHEMA}],
+        "tool_choice": {"type": "tool", "name": SCAN_TOOL_NAME},
+    }
+
+
+def _pdf_request(file_bytes: bytes, filename: str, model_id: str) -> dict[str, Any]:
     """Scan a PDF using Claude's document understanding (base64 input).
 
     ``content_type`` is intentionally not a parameter: this helper is only
-    called from the ``application/pdf`` branch of ``scan_document``, so the
+    called from the ``application/pdf`` branch of ``_scan_request``, so the
     media type is fixed to ``application/pdf`` below.
     """
     b64_data = base64.b64encode(file_bytes).decode("utf-8")
-
-    message = client.messages.create(
-        model=model_id,
-        max_tokens=512,
-        system=SCAN_SYSTEM_PROMPT,
-        messages=[
+    return {
+        "model": model_id,
+        "max_tokens": 512,
+        "system": SCAN_SYSTEM_PROMPT,
+        "messages": [
             {
                 "role": "user",
                 "content": [
@@ -213,31 +258,12 @@ def _scan_pdf(
                 ],
             }
         ],
-        tools=[{"name": SCAN_TOOL_NAME, "description": SCAN_TOOL_DESCRIPTION, "input_schema": SCAN_INPUT_SCHEMA}],
-        tool_choice={"type": "tool", "name": SCAN_TOOL_NAME},
-    )
-
-    return _parse_scan_response(message, model_id)
+        **_tool_kwargs(),
+    }
 
 
-def _scan_text_based(
-    client: anthropic.Anthropic,
-    text_content: str,
-    filename: str,
-    content_type: str,
-    model_id: str,
-) -> dict[str, Any]:
+def _text_request(text_content: str, filename: str, content_type: str, model_id: str) -> dict[str, Any]:
     """Scan a text-based document (DOCX, XLSX, TXT) by sending extracted text to Claude."""
-    if not text_content.strip():
-        return {
-            "status": FileStatus.NOT_COMPILED,
-            "scan_result": "Il documento e' vuoto (nessun testo trovato).",
-            "compiled": False,
-            "confidence": "high",
-            "cost_usd": 0.0,
-            "tokens": {"input": 0, "output": 0, "total": 0},
-        }
-
     # Truncate to avoid huge API costs
     truncated = text_content[:8000]
 
@@ -246,17 +272,13 @@ def _scan_text_based(
         content_type=content_type,
         content=truncated,
     )
-
-    message = client.messages.create(
-        model=model_id,
-        max_tokens=512,
-        system=SCAN_SYSTEM_PROMPT,
-        messages=[{"role": "user", "content": user_prompt}],
-        tools=[{"name": SCAN_TOOL_NAME, "description": SCAN_TOOL_DESCRIPTION, "input_schema": SCAN_INPUT_SCHEMA}],
-        tool_choice={"type": "tool", "name": SCAN_TOOL_NAME},
-    )
-
-    return _parse_scan_response(message, model_id)
+    return {
+        "model": model_id,
+        "max_tokens": 512,
+        "system": SCAN_SYSTEM_PROMPT,
+        "messages": [{"role": "user", "content": user_prompt}],
+        **_tool_kwargs(),
+    }
 
 
 def _parse_scan_response(message: anthropic.types.Message, model_id: str) -> dict[str, Any]:
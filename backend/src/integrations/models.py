@@ -0,0 +1,20 @@
+"""Durable cache table backing ``integrations.cache.DatabaseCacheService``."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..database.base import Base
+
+
+class CacheEntry(Base):
+    """One ``DatabaseCacheService`` entry (key → serialized value, absolute expiry)."""
+
+    __tablename__ = "cache_entries"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    value: Mapped[str] = mapped_column(Text, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Indexed: reads filter on it, eviction orders by it.
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
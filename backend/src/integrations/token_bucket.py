@@ -0,0 +1,148 @@
+"""Thread-safe token buckets for pacing Anthropic calls.
+
+The batch worker used to ``time.sleep(4)`` after every success — a fixed
+pause that wasted minutes when Haiku answered in 3 s and still did not
+protect against a burst of large prompts. The buckets below model the two
+limits Anthropic actually enforces per organization:
+
+- requests per minute (RPM);
+- input tokens per minute (ITPM).
+
+``AnthropicThrottle.acquire`` blocks the calling thread just long enough
+for both buckets to have room, so N concurrent workers share one budget
+instead of each pacing itself blindly.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+from ..config import settings
+
+# Rough chars→tokens ratio for Italian/English prose. Only used to size
+# the TPM reservation before the call; the real count arrives in ``usage``.
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Cheap pre-call input-token estimate (no tokenizer round trip)."""
+    return max(1, sum(len(t or "") for t in texts) // _CHARS_PER_TOKEN)
+
+
+class TokenBucket:
+    """Continuous-refill token bucket.
+
+    ``capacity`` tokens are available at start and refill linearly over
+    ``period_s`` seconds. ``clock`` and ``sleep`` are injectable so tests
+    can drive the bucket without real waiting.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        period_s: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period_s
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        """Tokens available right now (after refill)."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens would be available (0 = now)."""
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            self._refill()
+            missing = amount - self._tokens
+        return 0.0 if missing <= 0 else missing / self.rate
+
+    def try_acquire(self, amount: float) -> bool:
+        """Take ``amount`` tokens if available; never blocks.
+
+        Requests larger than ``capacity`` are clamped to it — otherwise a
+        single oversized prompt could never be admitted.
+        """
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return True
+            return False
+
+    def acquire(self, amount: float) -> float:
+        """Block until ``amount`` tokens are taken. Returns seconds waited."""
+        waited = 0.0
+        while not self.try_acquire(amount):
+            delay = max(self.wait_time(amount), 0.01)
+            self._sleep(delay)
+            waited += delay
+        return waited
+
+
+class AnthropicThrottle:
+    """RPM + TPM buckets shared by every worker in the process."""
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.requests = TokenBucket(requests_per_minute, 60.0, clock, sleep)
+        self.tokens = TokenBucket(tokens_per_minute, 60.0, clock, sleep)
+        self._sleep = sleep
+        # Serializes the two-bucket reservation: waiters queue here in
+        # arrival order instead of racing each other on every refill.
+        self._lock = threading.Lock()
+
+    def acquire(self, estimated_tokens: int) -> float:
+        """Reserve one request and ``estimated_tokens``. Returns seconds waited."""
+        waited = 0.0
+        with self._lock:
+            while True:
+                delay = max(self.requests.wait_time(1), self.tokens.wait_time(estimated_tokens))
+                # Both buckets are only drained under ``self._lock``, so a
+                # zero wait on each guarantees both ``try_acquire`` succeed.
+                if delay <= 0 and self.requests.try_acquire(1):
+                    self.tokens.try_acquire(estimated_tokens)
+                    return waited
+                delay = max(delay, 0.01)
+                self._sleep(delay)
+                waited += delay
+
+
+_throttle: AnthropicThrottle | None = None
+_throttle_lock = threading.Lock()
+
+
+def get_throttle() -> AnthropicThrottle:
+    """Get or create the process-wide Anthropic throttle."""
+    global _throttle
+    with _throttle_lock:
+        if _throttle is None:
+            _throttle = AnthropicThrottle(
+                settings.anthropic_requests_per_minute,
+                settings.anthropic_tokens_per_minute,
+            )
+        return _throttle
@@ -104,6 +104,23 @@ def normalize_cefr_token(value: object) -> str:
 # ── Analysis response ─────────────────────────────────────────────────
 
 
+def _coerce_interview_scripts(v: object) -> list[Any]:
+    if isinstance(v, list):
+        result = []
+        for item in v:
+            if isinstance(item, dict):
+                result.append(item)
+            elif isinstance(item, str):
+                result.append({"question": item, "suggested_answer": ""})
+        return result
+    return []
+
+
+# Long-form sections left out of the first (triage) analysis call and
+# generated on demand by ``generate_analysis_details``.
+ANALYSIS_DETAIL_FIELDS = ("interview_scripts", "advice")
+
+
 class AnalysisAIResponse(BaseModel):
     """Full analysis response from AI, with strict validation and defaults."""
 
@@ -216,15 +233,7 @@ class AnalysisAIResponse(BaseModel):
     @classmethod
     def coerce_interview_scripts(cls, v: object) -> list[Any]:
         """Accept list of dicts or list of question strings."""
-        if isinstance(v, list):
-            result = []
-            for item in v:
-                if isinstance(item, dict):
-                    result.append(item)
-                elif isinstance(item, str):
-                    result.append({"question": item, "suggested_answer": ""})
-            return result
-        return []
+        return _coerce_interview_scripts(v)
 
     @field_validator("benefits", mode="before")
     @classmethod
@@ -318,6 +327,49 @@ class AnalysisAIResponse(BaseModel):
         return {}
 
 
+class AnalysisDetailsAIResponse(BaseModel):
+    """On-demand analysis sections: interview scripts and advice."""
+
+    interview_scripts: list[Any] = Field(default_factory=list)
+    advice: str = ""
+
+    @field_validator("interview_scripts", mode="before")
+    @classmethod
+    def coerce_interview_scripts(cls, v: object) -> list[Any]:
+        """Accept list of dicts or list of question strings."""
+        return _coerce_interview_scripts(v)
+
+    @field_validator("advice", mode="before")
+    @classmethod
+    def coerce_advice(cls, v: object) -> str:
+        """Accept a string or a list of sentences."""
+        if isinstance(v, list):
+            return " ".join(str(item) for item in v)
+        return str(v) if v else ""
+
+
+class TriageAIResponse(BaseModel):
+    """Cheap pre-screen of a backlog item: score, track and a one-line reason."""
+
+    score: int = 0
+    career_track: str = "hybrid_a_b"
+    reason: str = ""
+
+    @field_validator("score", mode="before")
+    @classmethod
+    def coerce_score(cls, v: object) -> int:
+        """Ensure score is an int 0-100, handling strings and floats."""
+        try:
+            return max(0, min(100, int(float(str(v)))))
+        except (ValueError, TypeError):
+            return 0
+
+    @field_validator("career_track", "reason", mode="before")
+    @classmethod
+    def coerce_string(cls, v: object) -> str:
+        return str(v) if v else ""
+
+
 # ── Cover letter response ─────────────────────────────────────────────
 
 
@@ -408,6 +460,24 @@ def validate_analysis(raw: dict[str, Any]) -> dict[str, Any]:
         return _apply_analysis_defaults(raw)
 
 
+def validate_analysis_details(raw: dict[str, Any]) -> dict[str, Any]:
+    """Validate and coerce the on-demand analysis sections."""
+    try:
+        return AnalysisDetailsAIResponse.model_validate(raw).model_dump()
+    except Exception:
+        logger.exception("Analysis details validation failed, using empty sections")
+        return {"interview_scripts": [], "advice": ""}
+
+
+def validate_triage(raw: dict[str, Any]) -> dict[str, Any]:
+    """Validate and coerce a triage response."""
+    try:
+        return TriageAIResponse.model_validate(raw).model_dump()
+    except Exception:
+        logger.exception("Triage validation failed, using defaults")
+        return TriageAIResponse().model_dump()
+
+
 def validate_cover_letter(raw: dict[str, Any]) -> dict[str, Any]:
     """Validate and coerce a cover letter response."""
     try:
@@ -504,3 +574,24 @@ def _apply_analysis_defaults(raw: dict[str, Any]) -> dict[str, Any]:
     if isinstance(result.get("job_summary"), list):
         result["job_summary"] = "\n".join(str(item) for item in result["job_summary"])
     return result
+
+
+def _bundle_section(raw: dict[str, Any], key: str) -> dict[str, Any]:
+    """Nested bundle object; tolerates the stringified-JSON variant."""
+    val = raw.get(key)
+    if isinstance(val, str) and val.strip().startswith("{"):
+        try:
+            val = json.loads(val)
+        except (json.JSONDecodeError, TypeError):
+            return {}
+    return val if isinstance(val, dict) else {}
+
+
+def validate_outreach_bundle(raw: dict[str, Any]) -> dict[str, Any]:
+    """Split an outreach bundle into its three payloads, each validated like its standalone call."""
+    letter: dict[str, Any] = {key: raw[key] for key in ("cover_letter", "subject_lines") if key in raw}
+    return {
+        "cover_letter": validate_cover_letter(letter),
+        "followup_email": validate_followup_email(_bundle_section(raw, "followup_email")),
+        "linkedin_message": validate_linkedin_message(_bundle_section(raw, "linkedin_message")),
+    }
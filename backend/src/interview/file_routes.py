@@ -10,15 +10,16 @@ Flow:
 7. DELETE /files/{file_id} -> delete file from R2 + DB
 """
 
-from typing import Any
+from typing import Any, cast
 
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
 from ..audit.service import audit
 from ..dependencies import CurrentUser, DbSession, validate_uuid
-from ..integrations.document_scanner import scan_document
+from ..integrations.document_scanner import ascan_document
 from ..integrations.r2 import (
     check_object_exists,
     delete_object,
@@ -179,44 +180,40 @@ def confirm_file_upload(
     return JSONResponse(_file_to_dict(file))
 
 
-@router.post("/files/{file_id}/scan")
-def scan_file(
-    request: Request,
-    file_id: str,
-    db: DbSession,
-    user: CurrentUser,
-) -> JSONResponse:
-    """Scan a file with Claude API to check if it's been compiled.
-
-    File must be in 'uploaded' status. Transitions to 'compiled' or 'not_compiled'.
-    """
+def _scannable_file(db: "DbSession", file_id: str) -> tuple[InterviewFile | None, bytes, JSONResponse | None]:
+    """Load the file row and its bytes from R2, or the error to return."""
     fid = validate_uuid(file_id)
     file = get_file_by_id(db, fid)
     if not file:
-        return JSONResponse({"error": _FILE_NOT_FOUND_MSG}, status_code=404)
+        return None, b"", JSONResponse({"error": _FILE_NOT_FOUND_MSG}, status_code=404)
 
     if file.status not in (FileStatus.UPLOADED, FileStatus.SCAN_ERROR):
-        return JSONResponse(
-            {"error": f"Il file non puo essere scansionato (stato: {file.status})"},
-            status_code=400,
+        return (
+            None,
+            b"",
+            JSONResponse(
+                {"error": f"Il file non puo essere scansionato (stato: {file.status})"},
+                status_code=400,
+            ),
         )
 
     # Download file from R2
     try:
         file_bytes = get_object_bytes(str(file.r2_key))
     except Exception:
-        return JSONResponse(
-            {"error": "Impossibile scaricare il file da R2"},
-            status_code=500,
+        return (
+            None,
+            b"",
+            JSONResponse(
+                {"error": "Impossibile scaricare il file da R2"},
+                status_code=500,
+            ),
         )
+    return file, file_bytes, None
 
-    # Scan with Claude API
-    result = scan_document(
-        file_bytes=file_bytes,
-        filename=str(file.original_filename),
-        content_type=str(file.content_type),
-    )
 
+def _save_scan(request: Request, db: "DbSession", file: InterviewFile, result: dict[str, Any]) -> dict[str, Any]:
+    """Persist the scan outcome; returns the refreshed file payload."""
     update_scan_result(db, file, result["status"], result["scan_result"])
     audit(
         db,
@@ -225,10 +222,39 @@ def scan_file(
         f"file_id={file.id}, status={result['status']}, cost=${result['cost_usd']:.4f}",
     )
     db.commit()
+    return _file_to_dict(file)
+
+
+@router.post("/files/{file_id}/scan")
+async def scan_file(
+    request: Request,
+    file_id: str,
+    db: DbSession,
+    user: CurrentUser,
+) -> JSONResponse:
+    """Scan a file with Claude API to check if it's been compiled.
+
+    File must be in 'uploaded' status. Transitions to 'compiled' or 'not_compiled'.
+    ``async``: R2 download and DB writes run on the thread pool, the Claude
+    call is awaited on the ``AsyncAnthropic`` client.
+    """
+    file, file_bytes, early = await run_in_threadpool(_scannable_file, db, file_id)
+    if early is not None:
+        return early
+    file = cast(InterviewFile, file)
+
+    # Scan with Claude API
+    result = await ascan_document(
+        file_bytes=file_bytes,
+        filename=str(file.original_filename),
+        content_type=str(file.content_type),
+    )
+
+    payload = await run_in_threadpool(_save_scan, request, db, file, result)
 
     return JSONResponse(
         {
-            **_file_to_dict(file),
+            **payload,
             "compiled": result["compiled"],
             "confidence": result["confidence"],
             "cost_usd": result["cost_usd"],
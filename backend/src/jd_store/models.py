@@ -0,0 +1,144 @@
+"""Content-addressed store for job description text.
+
+The same sanitized JD used to be written up to three times: into the inbox
+item, the batch item and the analysis. Each row now keeps only the
+SHA-256 of the text (``jd_sha256``) and the text itself lives once in
+``jd_blobs``, compressed with ``database.compression``.
+
+:func:`jd_text` keeps the old attribute names (``job_description``,
+``raw_text``) as ``str`` hybrids. Assigning a JD sets the key and queues
+the blob; a ``before_flush`` hook inserts the queued blobs with
+``ON CONFLICT DO NOTHING``, so identical JDs written by concurrent
+sessions collapse to one row. Rows written before migration 036 are read
+from their legacy columns until the backfill moves them.
+"""
+
+import hashlib
+from datetime import UTC, datetime
+from itertools import chain
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String, and_, event, not_, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.hybrid import Comparator, hybrid_property
+from sqlalchemy.orm import Mapped, Session, mapped_column, object_session
+from sqlalchemy.orm.exc import DetachedInstanceError
+from sqlalchemy.sql import operators
+
+from ..database.base import Base
+from ..database.compression import compress_text, decompress_text
+
+# Instance-dict slots (not mapped): text waiting for its blob insert, and
+# the decoded text of the current key so repeated reads don't hit the DB.
+_PENDING = "_jd_pending"
+_DECODED = "_jd_decoded"
+
+
+def jd_key(text: str) -> str:
+    """Blob key of a JD: SHA-256 hex of the UTF-8 text (same as the inbox ``content_hash``)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class JDBlob(Base):
+    """One distinct JD text, compressed, keyed by its SHA-256."""
+
+    __tablename__ = "jd_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # Uncompressed size in bytes, for the storage report.
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+    )
+
+
+class _JDComparator(Comparator[str]):
+    """SQL side of :func:`jd_text`: ``==`` / ``!=`` against the key or the legacy columns."""
+
+    def __init__(self, key: Any, plain: Any, packed: Any) -> None:
+        super().__init__(key)
+        self._key = key
+        self._plain = plain
+        self._packed = packed
+
+    def operate(self, op: Any, *other: Any, **kwargs: Any) -> Any:
+        if op is operators.eq:
+            (value,) = other
+            if not value:
+                return and_(self._key.is_(None), self._packed.is_(None), self._plain == "")
+            return or_(self._key == jd_key(value), self._packed == compress_text(value), self._plain == value)
+        if op is operators.ne:
+            return not_(self.operate(operators.eq, *other))
+        raise NotImplementedError(f"JD columns only support == and != (got {op.__name__})")
+
+    def reverse_operate(self, op: Any, other: Any, **kwargs: Any) -> Any:
+        return self.operate(op, other)
+
+
+def jd_text(plain: str, packed: str) -> "hybrid_property[Any]":
+    """Hybrid ``str`` attribute backed by ``jd_sha256`` + ``jd_blobs``.
+
+    ``plain`` / ``packed`` are the legacy Text and compressed columns: read
+    while ``jd_sha256`` is NULL, cleared when a JD is assigned.
+    """
+
+    def fget(self: Any) -> str:
+        key = self.jd_sha256
+        if key is None:
+            blob = getattr(self, packed)
+            return decompress_text(blob) if blob is not None else (getattr(self, plain) or "")
+        decoded = self.__dict__.get(_DECODED)
+        if decoded and decoded[0] == key:
+            text: str = decoded[1]
+            return text
+        session = object_session(self)
+        if session is None:
+            raise DetachedInstanceError(f"{type(self).__name__} is detached: its JD blob can't be loaded")
+        with session.no_autoflush:
+            row = session.get(JDBlob, key)
+        text = decompress_text(row.body) if row is not None else ""
+        self.__dict__[_DECODED] = (key, text)
+        return text
+
+    def fset(self: Any, value: str | None) -> None:
+        setattr(self, plain, "")
+        setattr(self, packed, None)
+        if not value:
+            self.jd_sha256 = None
+            self.__dict__.pop(_PENDING, None)
+            return
+        key = jd_key(value)
+        self.jd_sha256 = key
+        self.__dict__[_DECODED] = (key, value)
+        self.__dict__[_PENDING] = value
+
+    attr: hybrid_property[Any] = hybrid_property(fget, fset)
+
+    # ``comparator`` returns a copy of the hybrid with the SQL side attached.
+    @attr.comparator
+    def compared(cls: Any) -> _JDComparator:
+        return _JDComparator(cls.jd_sha256, getattr(cls, plain), getattr(cls, packed))
+
+    return compared
+
+
+@event.listens_for(Session, "before_flush")
+def _store_pending_jds(session: Session, _flush_context: Any, _instances: Any) -> None:
+    """Insert the blobs queued by :func:`jd_text` before the rows referencing them."""
+    pending: dict[str, str] = {}
+    for obj in chain(session.new, session.dirty):
+        text = obj.__dict__.pop(_PENDING, None)
+        if text is not None:
+            pending[jd_key(text)] = text
+    if not pending:
+        return
+    dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    now = datetime.now(UTC)
+    rows = [
+        {"sha256": key, "body": compress_text(text), "size": len(text.encode("utf-8")), "created_at": now}
+        for key, text in pending.items()
+    ]
+    session.execute(dialect.insert(JDBlob).values(rows).on_conflict_do_nothing(index_elements=["sha256"]))
@@ -0,0 +1,33 @@
+"""JD blob store lookups and garbage collection."""
+
+from sqlalchemy import and_, delete, exists, or_, select
+from sqlalchemy.orm import Session
+
+from ..analysis.models import JobAnalysis
+from ..batch.models import BatchItem
+from ..inbox.models import InboxItem
+from .models import JDBlob, jd_key
+
+_REFERENCING = (JobAnalysis, BatchItem, InboxItem)
+
+
+def jd_seen(db: Session, job_description: str) -> bool:
+    """True when this exact JD was ever stored: a single primary-key probe."""
+    return db.get(JDBlob, jd_key(job_description)) is not None
+
+
+def legacy_analyses_pending(db: Session) -> bool:
+    """True while some analysis still keeps its JD in the pre-036 columns (backfill not done)."""
+    legacy = and_(
+        JobAnalysis.jd_sha256.is_(None),
+        or_(JobAnalysis.job_description_z.isnot(None), JobAnalysis._job_description_plain != ""),
+    )
+    return bool(db.scalar(select(exists().where(legacy))))
+
+
+def purge_orphan_jds(db: Session) -> int:
+    """Delete blobs no analysis, batch item or inbox item references anymore. The caller commits."""
+    referenced = [exists().where(model.jd_sha256 == JDBlob.sha256) for model in _REFERENCING]
+    orphans = select(JDBlob.sha256).where(*(~ref for ref in referenced))
+    result = db.execute(delete(JDBlob).where(JDBlob.sha256.in_(orphans)))
+    return int(getattr(result, "rowcount", 0) or 0)
@@ -1,5 +1,6 @@
 """FastAPI application factory with middleware, routers, and lifespan."""
 
+import asyncio
 import logging
 import os as _os
 import sys as _sys
@@ -18,6 +19,7 @@ from fastapi.templating import Jinja2Templates
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from sqlalchemy import select, text
+from starlette.concurrency import run_in_threadpool
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.sessions import SessionMiddleware
 
@@ -136,6 +138,57 @@ def _run_migrations() -> None:
         command.upgrade(worldwild_cfg, "head")
 
 
+def _compress_legacy_batch_once() -> int:
+    from .dashboard.storage import compress_legacy_batch, fill_derived_batch
+
+    db = SessionLocal()
+    try:
+        done = compress_legacy_batch(db, settings.text_compression_batch_size)
+        done += fill_derived_batch(db, settings.text_compression_batch_size)
+        db.commit()
+        return done
+    finally:
+        db.close()
+
+
+async def _compress_legacy_text() -> None:
+    """Background backfill of migrations 030 / 035: legacy text rows and their MinHash, a batch at a time."""
+    total = 0
+    try:
+        while done := await run_in_threadpool(_compress_legacy_batch_once):
+            total += done
+            await asyncio.sleep(1)  # leave room to the request traffic
+    except Exception:
+        logger.exception("Text compression backfill stopped after %d rows", total)
+        return
+    if total:
+        logger.info("Text compression backfill done: %d rows", total)
+
+
+def _roll_up_spending_once() -> int:
+    from .dashboard.service import roll_up_spending
+
+    db = SessionLocal()
+    try:
+        done = roll_up_spending(db)
+        db.commit()
+        return done
+    finally:
+        db.close()
+
+
+async def _roll_up_spending() -> None:
+    """Fold new ai_spend_events into ai_spend_daily every ``spend_rollup_interval_seconds``."""
+    while True:
+        try:
+            # Drain the backlog in batches, then wait for the next interval.
+            while await run_in_threadpool(_roll_up_spending_once):
+                pass
+        except Exception:
+            logger.exception("Spend rollup failed")
+        await asyncio.sleep(settings.spend_rollup_interval_seconds)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application startup/shutdown lifecycle."""
@@ -163,7 +216,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     finally:
         db.close()
 
+    backfill = asyncio.create_task(_compress_legacy_text()) if settings.text_compression_batch_size > 0 else None
+    rollup = asyncio.create_task(_roll_up_spending()) if settings.spend_rollup_interval_seconds > 0 else None
     yield
+    for task in (backfill, rollup):
+        if task:
+            task.cancel()
 
 
 def _rate_limit_handler(request: Request, exc: RateLimitExceeded) -> Response:
@@ -470,6 +528,8 @@ def create_app() -> FastAPI:
         with contextlib.suppress(Exception):
             cache_stats = app.state.cache.stats()
 
+        from .integrations.anthropic_client import get_governor
+
         db_size_mb: float | None = None
         with contextlib.suppress(Exception):
             size_bytes = db.execute(text("SELECT pg_database_size(current_database())")).scalar()
@@ -483,6 +543,7 @@ def create_app() -> FastAPI:
             "version": "2.0.0",
             "uptime_seconds": uptime,
             "cache": cache_stats,
+            "anthropic_governor": get_governor().stats(),
         }
 
     # --- Dedicated DB health check for Checkly ---
@@ -504,15 +565,20 @@ def create_app() -> FastAPI:
     # --- Dedicated cache health check for Checkly ---
     @app.get("/health/cache")
     def health_cache() -> dict[str, Any]:
-        """Cache-only health check for external monitoring."""
-        import contextlib
+        """Cache-only health check for external monitoring.
+
+        ``tiers`` carries per-tier hits/misses/evictions (memory → redis →
+        db): plain counters, nothing sensitive, so no auth either.
+        """
+        from .integrations.cache import cache_tier_stats
 
         cache_status = "ok"
-        with contextlib.suppress(Exception):
-            stats = app.state.cache.stats()
-            if not isinstance(stats, dict):
-                cache_status = "degraded"
-        return {"status": cache_status}
+        tiers: dict[str, dict[str, int]] = {}
+        try:
+            tiers = cache_tier_stats(app.state.cache)
+        except Exception:
+            cache_status = "degraded"
+        return {"status": cache_status, "tiers": tiers}
 
     return app
 
@@ -28,3 +28,42 @@ class RequestMetric(Base):
         Index("idx_metrics_created", "created_at"),
         Index("idx_metrics_endpoint", "endpoint"),
     )
+
+
+class AICallMetric(Base):
+    """One Anthropic API call — tokens, cost and timings for the admin view.
+
+    ``operation`` is the forced tool without its ``submit_`` prefix
+    (``analysis``, ``cover_letter``, ...) or ``document_scan``; ``source``
+    the caller (``interactive``, ``batch``, ``inbox``, ``worldwild``).
+    ``queue_ms`` is the governor wait, ``ttfb_ms`` the time from admission
+    to the response headers, ``wall_ms`` the whole call.
+    """
+
+    __tablename__ = "ai_call_metrics"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    operation: Mapped[str] = mapped_column(String(40), nullable=False)
+    source: Mapped[str] = mapped_column(String(30), nullable=False)
+    model: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[str] = mapped_column(String(10), nullable=False)  # ok | error | cancelled
+    tokens_input: Mapped[int] = mapped_column(nullable=False, default=0)
+    tokens_output: Mapped[int] = mapped_column(nullable=False, default=0)
+    tokens_cache_read: Mapped[int] = mapped_column(nullable=False, default=0)
+    tokens_cache_write: Mapped[int] = mapped_column(nullable=False, default=0)
+    cost_usd: Mapped[float] = mapped_column(nullable=False, default=0.0)
+    retries: Mapped[int] = mapped_column(nullable=False, default=0)
+    hedged: Mapped[bool] = mapped_column(nullable=False, default=False)
+    queue_ms: Mapped[float] = mapped_column(nullable=False, default=0.0)
+    ttfb_ms: Mapped[float | None] = mapped_column(nullable=True)
+    wall_ms: Mapped[float] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+    )
+
+    __table_args__ = (
+        Index("idx_ai_calls_created", "created_at"),
+        Index("idx_ai_calls_operation", "operation"),
+    )
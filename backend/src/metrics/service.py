@@ -11,20 +11,36 @@ duration_ms, created_at. Questo modulo aggrega via SQL (``func.avg``,
   (default 7gg) per non far esplodere la quota Neon — chiamato dal
   cron weekly-cleanup.
 
+Le righe ``ai_call_metrics`` (una per chiamata Anthropic) sono scritte da
+``record_ai_call()``, invocato dal client AI e dal document scanner:
+
+- ``get_ai_call_summary()``: ultimi 7 giorni, p50/p95/p99 di latenza e
+  costo per operazione e per sorgente; i percentili sono calcolati in
+  Python (poche migliaia di righe a settimana, e SQLite nei test non ha
+  ``percentile_cont``);
+- ``get_ai_call_profile()``: token di output medi e latenza p50 di
+  un'operazione su un modello, per le stime del batch planner;
+- ``cleanup_old_ai_calls()``: GC oltre ``AI_CALL_RETENTION_DAYS`` (30gg).
+
 Out of scope: persistenza (middleware lo fa già), real-time alerting
 (Sentry copre quello).
 """
 
+import math
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
-from .models import RequestMetric
+from ..database import SessionLocal
+from .models import AICallMetric, RequestMetric
 
 # Auto-cleanup: delete metrics older than this
 RETENTION_DAYS = 7
+# AI calls are far fewer and carry cost: keep a month for trend reading.
+AI_CALL_RETENTION_DAYS = 30
+AI_CALL_WINDOW_DAYS = 7
 
 
 def get_metrics_summary(db: Session) -> dict[str, Any]:
@@ -122,3 +138,117 @@ def cleanup_old_metrics(db: Session) -> int:
     count = db.query(RequestMetric).filter(RequestMetric.created_at < cutoff).delete()
     db.commit()
     return count
+
+
+def record_ai_call(**fields: Any) -> None:
+    """Fire-and-forget insert of one ``AICallMetric`` (own session, never raises)."""
+    try:
+        db = SessionLocal()
+        try:
+            db.add(AICallMetric(**fields))
+            db.commit()
+        finally:
+            db.close()
+    except Exception:  # noqa: S110 — telemetry must never break AI calls
+        pass
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(len(sorted_values) * pct / 100))
+    return sorted_values[rank - 1]
+
+
+def _summarize_ai_calls(rows: list[Any], key: str) -> list[dict[str, Any]]:
+    groups: dict[str, list[Any]] = {}
+    for row in rows:
+        groups.setdefault(getattr(row, key), []).append(row)
+
+    summary = []
+    for name, group in groups.items():
+        wall = sorted(r.wall_ms for r in group)
+        cost = sorted(r.cost_usd for r in group)
+        ttfb = sorted(r.ttfb_ms for r in group if r.ttfb_ms is not None)
+        summary.append(
+            {
+                key: name,
+                "calls": len(group),
+                "errors": sum(r.status != "ok" for r in group),
+                "retries": sum(r.retries for r in group),
+                "p50_ms": round(_percentile(wall, 50), 1),
+                "p95_ms": round(_percentile(wall, 95), 1),
+                "p99_ms": round(_percentile(wall, 99), 1),
+                "p95_ttfb_ms": round(_percentile(ttfb, 95), 1),
+                "p50_cost_usd": round(_percentile(cost, 50), 6),
+                "p95_cost_usd": round(_percentile(cost, 95), 6),
+                "p99_cost_usd": round(_percentile(cost, 99), 6),
+                "total_cost_usd": round(sum(cost), 4),
+                "tokens_input": sum(r.tokens_input for r in group),
+                "tokens_output": sum(r.tokens_output for r in group),
+                "tokens_cache_read": sum(r.tokens_cache_read for r in group),
+            }
+        )
+    summary.sort(key=lambda g: g["total_cost_usd"], reverse=True)
+    return summary
+
+
+def get_ai_call_summary(db: Session, days: int = AI_CALL_WINDOW_DAYS) -> dict[str, Any]:
+    """Latency/cost percentiles of the AI calls of the last ``days``, per operation and per source."""
+    cutoff = datetime.now(UTC) - timedelta(days=days)
+    rows = (
+        db.query(
+            AICallMetric.operation,
+            AICallMetric.source,
+            AICallMetric.status,
+            AICallMetric.retries,
+            AICallMetric.wall_ms,
+            AICallMetric.ttfb_ms,
+            AICallMetric.cost_usd,
+            AICallMetric.tokens_input,
+            AICallMetric.tokens_output,
+            AICallMetric.tokens_cache_read,
+        )
+        .filter(AICallMetric.created_at >= cutoff)
+        .all()
+    )
+    return {
+        "window_days": days,
+        "total_calls": len(rows),
+        "total_cost_usd": round(sum(r.cost_usd for r in rows), 4),
+        "by_operation": _summarize_ai_calls(rows, "operation"),
+        "by_source": _summarize_ai_calls(rows, "source"),
+    }
+
+
+def get_ai_call_profile(db: Session, operation: str, model: str, days: int = AI_CALL_WINDOW_DAYS) -> dict[str, Any]:
+    """Typical successful ``operation`` call on ``model`` over the last ``days``: mean output tokens, p50 latency.
+
+    Used by the batch planner to price and time a queue before it runs;
+    ``calls`` is 0 when there is no history (the caller picks a default).
+    """
+    cutoff = datetime.now(UTC) - timedelta(days=days)
+    rows = (
+        db.query(AICallMetric.tokens_output, AICallMetric.wall_ms)
+        .filter(
+            AICallMetric.created_at >= cutoff,
+            AICallMetric.operation == operation,
+            AICallMetric.model == model,
+            AICallMetric.status == "ok",
+        )
+        .all()
+    )
+    return {
+        "calls": len(rows),
+        "output_tokens": sum(r.tokens_output for r in rows) / len(rows) if rows else 0.0,
+        "p50_ms": _percentile(sorted(r.wall_ms for r in rows), 50),
+    }
+
+
+def cleanup_old_ai_calls(db: Session) -> int:
+    """Delete AI call rows older than AI_CALL_RETENTION_DAYS. Returns count deleted."""
+    cutoff = datetime.now(UTC) - timedelta(days=AI_CALL_RETENTION_DAYS)
+    count = db.query(AICallMetric).filter(AICallMetric.created_at < cutoff).delete()
+    db.commit()
+    return count
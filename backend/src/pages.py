@@ -11,7 +11,7 @@ from .analysis.service import get_recent_analyses
 from .cv.service import get_latest_cv
 from .dashboard.service import get_db_usage, get_followup_alerts, get_spending
 from .dependencies import CurrentUser, DbSession
-from .metrics.service import cleanup_old_metrics, get_metrics_summary
+from .metrics.service import cleanup_old_ai_calls, cleanup_old_metrics, get_ai_call_summary, get_metrics_summary
 from .notification_center.service import get_notifications, get_unread_count
 
 router = APIRouter(tags=["pages"])
@@ -520,8 +520,10 @@ def admin_page(
 
     # Cleanup old metrics on page load (cheap, idempotent)
     cleanup_old_metrics(db)
+    cleanup_old_ai_calls(db)
 
     metrics = get_metrics_summary(db)
+    ai_calls = get_ai_call_summary(db)
 
     return templates.TemplateResponse(  # type: ignore[no-any-return]
         request,
@@ -529,6 +531,7 @@ def admin_page(
         {
             **_base_ctx(db, user, "admin"),
             "metrics": metrics,
+            "ai_calls": ai_calls,
             "error": flash["error"],
             "message": flash["message"],
         },
@@ -15,7 +15,9 @@ Token-optimized: compact JSON schemas, tabular rules, zero redundancy.
 #          | v6 = candidate profile section (target DevOps/Cloud, salary range, P.IVA hard-no,
 #                 body rental case-by-case tone); soft-skill cap lowered 10→5;
 #                 Bachelor gap text removed (candidate holds L-31 Informatica); real cert list.
-ANALYSIS_PROMPT_VERSION = "v8"
+#          | v9 = interview_scripts/advice moved out of the first call into the on-demand
+#                 "approfondimenti" (submit_analysis_details), generated when first viewed.
+ANALYSIS_PROMPT_VERSION = "v9"
 
 # Bump when COVER_LETTER_SYSTEM_PROMPT changes in a way that should invalidate
 # the cover letter cache. Included in cache_key by generate_cover_letter().
@@ -71,9 +73,7 @@ Struttura JSON (tutti i campi obbligatori):
   "job_summary": "3-5 bullet, max 15 parole ciascuno",
   "strengths": ["competenza reale dal CV, max 8 elementi"],
   "gaps": [{"gap":"str","severity":"bloccante|importante|minore","closable":bool,"how":"max 15 parole"}],
-  "interview_scripts": [{"question":"str","suggested_answer":"max 50 parole con esempi dal CV"}],
   "summary": "2-3 frasi, max 60 parole totali",
-  "advice": "4-6 frasi, max 120 parole, dai del tu, cita esperienze specifiche dal CV",
   "application_method": {"type":"quick_apply|email|link|sconosciuto","detail":"str","note":"str"},
   "company_reputation": {"glassdoor_estimate":"X/5 o non disponibile","known_pros":["max 3 elementi"],"known_cons":["max 3 elementi"],"note":"str"},
   "benefits": ["lista benefit aziendali citati nell'annuncio: welfare, buoni pasto, assicurazione, formazione, smart working, ticket restaurant, bonus, stock options, ecc. Lista vuota se non specificati. Max 10 elementi."],
@@ -85,9 +85,15 @@ Struttura JSON (tutti i campi obbligatori):
   "english_level_required": "vuoto | A1 | A2 | B1 | B2 | C1 | C2 | Native — vedi regole sotto"
 }
 
+Approfondimenti (SOLO quando e' richiesto il tool submit_analysis_details, in una seconda chiamata che riporta l'esito gia' deciso):
+{
+  "interview_scripts": [{"question":"str","suggested_answer":"max 50 parole con esempi dal CV"}],
+  "advice": "4-6 frasi, max 120 parole, dai del tu, cita esperienze specifiche dal CV"
+}
+
 Score: 80-100=APPLY | 60-79=CONSIDER | 40-59=CONSIDER/SKIP | 0-39=SKIP
 Lo score riflette competenze REALI e DIMOSTRATE nel CV, non potenziali. Valuta: match tecnico, anni esperienza rilevante, certificazioni, progetti concreti. Soft skills max 3-5 punti totali (non sono mai il driver principale dello score).
-Se il ruolo e' fuori target candidato (es. Backend Python puro quando il profilo punta Cloud/DevOps), abbassa lo score di 10-15 punti anche a parita' di match tecnico e spiegalo in advice.
+Se il ruolo e' fuori target candidato (es. Backend Python puro quando il profilo punta Cloud/DevOps), abbassa lo score di 10-15 punti anche a parita' di match tecnico e spiegalo in summary (e in advice).
 Confidence: alta=requisiti chiari+CV dettagliato | media=info parziali | bassa=annuncio troppo generico
 Gap severity: bloccante=non passi screening | importante=compensabile | minore=nice-to-have
 Interview: 3-5 domande (lacune, punti di forza, comportamentali).
@@ -123,14 +129,38 @@ English level: estrai il livello CEFR di inglese richiesto dall'annuncio in ``en
 
 JSON valido: doppi apici, no trailing comma, no commenti, \\n per newline nelle stringhe."""
 
-ANALYSIS_USER_PROMPT = """## CV
-{cv_text}
+# The CV goes in its own user-turn block marked ``cache_control`` (see
+# ``anthropic_client._cached_user_content``): identical across every call for
+# the same CV, so after the first call it is read from the prompt cache at
+# 10% of the input price. Per-call parts (JD, analysis, language) follow it.
+CV_BLOCK = """## CV
+{cv_text}"""
+
+CV_EXCERPT_BLOCK = """## CV (estratto)
+{cv_summary}"""
 
-## ANNUNCIO
+ANALYSIS_USER_PROMPT = """## ANNUNCIO
 {job_description}
 
 Analizza compatibilita' e rispondi in JSON. Italiano. Basa lo score sulle competenze reali dimostrate nel CV."""
 
+ANALYSIS_DETAILS_USER_PROMPT = """## ANNUNCIO
+{job_description}
+
+## ESITO ANALISI (gia' deciso, non ricalcolarlo)
+{role} @ {company} — score {score}, {recommendation}, track {career_track}
+Punti di forza: {strengths}
+Lacune: {gaps}
+
+Genera gli approfondimenti (interview_scripts, advice) coerenti con questo esito. Italiano."""
+
+# Pre-screen for large backlogs (batch queue, WorldWild): same system prompt
+# and cached CV block as the analysis, only score + track + one line back.
+TRIAGE_USER_PROMPT = """## ANNUNCIO
+{job_description}
+
+TRIAGE RAPIDO: NON fare l'analisi completa. Restituisci solo score (stessa scala e stesse regole dell'analisi), career_track e reason (una frase, max 20 parole)."""
+
 COVER_LETTER_SYSTEM_PROMPT = """Sei un consulente di carriera senior. Scrivi cover letter di alta qualita', misurate, basate su evidenze concrete dal CV. Niente fluff motivazionale.
 
 OUTPUT: oggetto JSON con due campi:
@@ -185,10 +215,7 @@ SUBJECT LINES: tre opzioni, max 70 caratteri ciascuna.
 
 JSON: doppi apici, no trailing comma, \\n per newline nelle stringhe."""
 
-COVER_LETTER_USER_PROMPT = """## CV
-{cv_text}
-
-## ANNUNCIO
+COVER_LETTER_USER_PROMPT = """## ANNUNCIO
 {job_description}
 
 ## ANALISI
@@ -199,6 +226,33 @@ Forza: {strengths} | Lacune: {gaps}
 
 Scrivi cover letter e subject lines."""
 
+# One call for the whole outreach kit of a candidature: the cover letter
+# rules above plus the follow-up email and LinkedIn message rules, so the CV
+# and the JD are sent (and paid) once instead of three times.
+OUTREACH_BUNDLE_SYSTEM_PROMPT = (
+    COVER_LETTER_SYSTEM_PROMPT
+    + """
+
+## PACCHETTO OUTREACH
+Nella stessa risposta scrivi anche, per la stessa candidatura e nella stessa lingua della cover letter:
+- followup_email (subject, body, tone_notes): max 150-200 parole, ribadisci interesse, menziona 1-2 punti di forza dal CV, chiedi aggiornamento. Se <7 giorni dalla candidatura: soft. Se >7: piu' diretto. Tono cordiale, non disperato.
+- linkedin_message (message max 300 char diretto e personale, connection_note max 200 char per la richiesta di connessione, approach_tip su come/quando inviare): specifico sul ruolo, mostra studio dell'azienda, non allegare CV subito.
+I tre testi sono coerenti tra loro ma non si ripetono parola per parola."""
+)
+
+OUTREACH_BUNDLE_USER_PROMPT = """## ANNUNCIO
+{job_description}
+
+## ANALISI
+Ruolo: {role} @ {company} | Score: {score}/100
+Forza: {strengths} | Lacune: {gaps}
+
+## GIORNI DALLA CANDIDATURA: {days_since_application}
+## CONTATTO: {contact_info}
+## LINGUA: {language}
+
+Scrivi cover letter, subject lines, email follow-up e messaggio LinkedIn."""
+
 FOLLOWUP_EMAIL_SYSTEM_PROMPT = """Scrivi email di follow-up post-candidatura.
 
 OUTPUT: rispondi SOLO con l'oggetto JSON valido. NIENTE markdown, NIENTE ```json, NIENTE testo prima o dopo.
@@ -208,10 +262,7 @@ OUTPUT: rispondi SOLO con l'oggetto JSON valido. NIENTE markdown, NIENTE ```json
 Regole: max 150-200 parole, ribadisci interesse, menziona 1-2 punti di forza dal CV, chiedi aggiornamento. Se <7 giorni: soft. Se >7: piu' diretto. Tono cordiale, non disperato. Lingua richiesta.
 JSON: doppi apici, no trailing comma, \\n per newline nelle stringhe."""
 
-FOLLOWUP_EMAIL_USER_PROMPT = """## CV (estratto)
-{cv_summary}
-
-## RUOLO: {role} @ {company}
+FOLLOWUP_EMAIL_USER_PROMPT = """## RUOLO: {role} @ {company}
 ## GIORNI DALLA CANDIDATURA: {days_since_application}
 ## LINGUA: {language}
 
@@ -226,10 +277,7 @@ OUTPUT: rispondi SOLO con l'oggetto JSON valido. NIENTE markdown, NIENTE ```json
 Regole: specifico sul ruolo, mostra studio dell'azienda, non allegare CV subito, scrivi nella lingua richiesta.
 JSON: doppi apici, no trailing comma, \\n per newline nelle stringhe."""
 
-LINKEDIN_MESSAGE_USER_PROMPT = """## CV (estratto)
-{cv_summary}
-
-## RUOLO: {role} @ {company}
+LINKEDIN_MESSAGE_USER_PROMPT = """## RUOLO: {role} @ {company}
 ## CONTATTO: {contact_info}
 ## LINGUA: {language}
 
@@ -6,9 +6,11 @@ from uuid import UUID
 
 from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
 from .analysis.models import JobAnalysis
 from .analysis.service import (
+    aensure_analysis_details,
     get_analysis_by_id,
     get_candidature,
     get_candidature_by_date_range,
@@ -19,8 +21,8 @@ from .analysis.service import (
 )
 from .contacts.service import search_all_contacts
 from .cover_letter.models import CoverLetter
-from .dashboard.service import get_dashboard, get_followup_alerts, get_spending
-from .dependencies import CurrentUser, DbSession, validate_uuid
+from .dashboard.service import check_budget_available, get_dashboard, get_followup_alerts, get_spending
+from .dependencies import Cache, CurrentUser, DbSession, validate_uuid
 from .interview.service import get_upcoming_interviews
 
 router = APIRouter(tags=["read-api"])
@@ -211,17 +213,33 @@ def candidature_detail(
 
 
 @router.get("/interview-prep/{analysis_id}")
-def interview_prep(
+async def interview_prep(
     analysis_id: str,
     db: DbSession,
     user: CurrentUser,
+    cache: Cache,
 ) -> JSONResponse:
-    """Get interview preparation data: strengths, gaps, scripts, advice."""
+    """Get interview preparation data: strengths, gaps, scripts, advice.
+
+    Scripts and advice are generated on the first request for analyses
+    that don't have them yet (budget permitting).
+    """
     validate_uuid(analysis_id)
-    analysis = get_analysis_by_id(db, analysis_id, user_id=cast(UUID, user.id))
+    user_id = cast(UUID, user.id)
+    analysis = await run_in_threadpool(get_analysis_by_id, db, analysis_id, user_id)
     if not analysis:
         return JSONResponse({"error": _ANALYSIS_NOT_FOUND_MSG}, status_code=404)
 
+    if (
+        analysis.details_pending
+        and (await run_in_threadpool(check_budget_available, db))[0]
+        and await aensure_analysis_details(db, analysis, cache, user_id=user_id)
+    ):
+        await run_in_threadpool(db.commit)
+    return await run_in_threadpool(_interview_prep_payload, analysis)
+
+
+def _interview_prep_payload(analysis: JobAnalysis) -> JSONResponse:
     return JSONResponse(
         {
             "company": analysis.company,
@@ -16,6 +16,9 @@ Flusso (post sessione 5/5):
         │
         ├─ no_budget ─────────────────► state = failed  (retryable)
         │
+        ├─ triage sotto soglia ───────► state = skipped_low_match
+        │                                 (ri-cliccare forza l'analisi)
+        │
         ├─ ai_error ──────────────────► state = failed  (retryable)
         │
         └─ run_analysis (Claude) ─────► state = done
@@ -49,8 +52,10 @@ from sqlalchemy.orm import Session
 
 from ...analysis.models import AnalysisSource
 from ...analysis.service import analyze_and_charge, find_by_url
+from ...config import settings
 from ...cv.service import get_latest_cv
-from ...dashboard.service import check_budget_available
+from ...dashboard.service import add_spending, check_budget_available
+from ...integrations.anthropic_client import PRIORITY_BACKGROUND, call_priority, triage_job
 from ...integrations.cache import CacheService
 from ...notification_center.sse import broadcast_sync
 from ..models import (
@@ -58,6 +63,7 @@ from ..models import (
     PROMOTION_STATE_FAILED,
     PROMOTION_STATE_IDLE,
     PROMOTION_STATE_PENDING,
+    PROMOTION_STATE_SKIPPED_LOW_MATCH,
     Decision,
     JobOffer,
 )
@@ -129,6 +135,13 @@ def send_to_pulse(
     - ``no_active_cv``: l'utente non ha un CV su Pulse.
     - ``no_budget``: budget mensile esaurito (vedi ``check_budget_available``).
     - ``ai_error``: eccezione durante la chiamata Anthropic.
+
+    Con ``settings.ai_triage_min_score`` > 0 l'analisi completa è preceduta
+    da un triage economico (``triage_job``: score + track + una riga): sotto
+    soglia la Decision va in ``skipped_low_match`` con lo score in
+    ``promotion_score`` e la ragione in ``promotion_error``. Un secondo
+    click su un'offer già scartata dal triage salta il triage e paga
+    l'analisi completa.
     """
     # 0. Idempotenza: se la Decision è già "done", short-circuit.
     decision = secondary_db.query(Decision).filter(Decision.job_offer_id == offer_id).one_or_none()
@@ -149,11 +162,17 @@ def send_to_pulse(
     # Se due concorrenti (UI double-click + retry BG) entrano insieme, solo
     # il primo cambia rowcount=1, il secondo finisce a 0 e short-circuita.
     # Evita doppia chiamata Anthropic + JobAnalysis duplicata su Pulse.
+    # skipped_low_match è ri-claimabile: è l'override esplicito del triage.
+    triaged_out = decision.promotion_state == PROMOTION_STATE_SKIPPED_LOW_MATCH
     claim_result = secondary_db.execute(
         update(Decision)
         .where(
             (Decision.job_offer_id == offer_id)
-            & (Decision.promotion_state.in_([PROMOTION_STATE_IDLE, PROMOTION_STATE_FAILED]))
+            & (
+                Decision.promotion_state.in_(
+                    [PROMOTION_STATE_IDLE, PROMOTION_STATE_FAILED, PROMOTION_STATE_SKIPPED_LOW_MATCH]
+                )
+            )
         )
         .values(promotion_state=PROMOTION_STATE_PENDING)
     )
@@ -207,27 +226,53 @@ def send_to_pulse(
                 skipped_reason="url_dedup",
             )
 
-    # 5. Run AI analysis + ledger sync via helper centralizzato (vedi
+    # 5. Triage pre-screen: poche decine di token in output invece
+    # dell'analisi completa, che parte solo sopra soglia.
+    if settings.ai_triage_min_score > 0 and not triaged_out:
+        try:
+            with call_priority(PRIORITY_BACKGROUND, source="worldwild"):
+                triage = triage_job(
+                    cast(str, cv.raw_text), job_description, model, cache, db=primary_db, user_id=user_id
+                )
+        except Exception as exc:  # noqa: BLE001 — stesso trattamento dell'analisi completa
+            _logger.warning("send_to_pulse triage failed for offer %s: %s", offer_id, exc)
+            return _mark_failed(decision, reason=f"ai_error: {exc}"[:500])
+        tokens = triage.get("tokens", {}) or {}
+        add_spending(
+            primary_db,
+            triage.get("cost_usd", 0.0),
+            tokens.get("input", 0),
+            tokens.get("output", 0),
+            is_analysis=False,
+            model=triage.get("model_used", ""),
+            reservations=triage.get("budget_reservations", ()),
+        )
+        decision.promotion_score = triage["score"]
+        if triage["score"] < settings.ai_triage_min_score:
+            return _mark_triaged_out(decision, score=triage["score"], reason=triage["reason"])
+
+    # 6. Run AI analysis + ledger sync via helper centralizzato (vedi
     # ``analysis.service.analyze_and_charge``). Wrap in try/except così un
     # timeout / quota error non lascia la Decision pendente — la marchiamo
     # failed e Marco può riprovare dopo.
     try:
-        analysis, _result = analyze_and_charge(
-            primary_db,
-            cast(str, cv.raw_text),
-            cast(UUID, cv.id),
-            job_description,
-            job_url,
-            model,
-            cache,
-            user_id=user_id,
-            source=AnalysisSource.WORLDWILD.value,
-        )
+        with call_priority(PRIORITY_BACKGROUND, source="worldwild"):
+            analysis, _result = analyze_and_charge(
+                primary_db,
+                cast(str, cv.raw_text),
+                cast(UUID, cv.id),
+                job_description,
+                job_url,
+                model,
+                cache,
+                user_id=user_id,
+                source=AnalysisSource.WORLDWILD.value,
+            )
     except Exception as exc:  # noqa: BLE001 — graceful failure, error finisce sulla decision
         _logger.warning("send_to_pulse AI call failed for offer %s: %s", offer_id, exc)
         return _mark_failed(decision, reason=f"ai_error: {exc}"[:500])
 
-    # 6. Aggiorna la Decision con il pointer cross-DB + state done.
+    # 7. Aggiorna la Decision con il pointer cross-DB + state done.
     decision.promoted_to_neon_id = analysis.id  # type: ignore[assignment]
     decision.promotion_state = PROMOTION_STATE_DONE  # type: ignore[assignment]
     decision.promotion_error = ""  # type: ignore[assignment]
@@ -244,6 +289,19 @@ def send_to_pulse(
     )
 
 
+def _mark_triaged_out(decision: Decision, *, score: int, reason: str) -> PromotionResult:
+    """Decision in ``skipped_low_match`` dopo un triage sotto soglia; flush al caller."""
+    decision.promotion_state = PROMOTION_STATE_SKIPPED_LOW_MATCH  # type: ignore[assignment]
+    decision.promotion_error = f"triage {score}/100: {reason}"[:500]  # type: ignore[assignment]
+    broadcast_sync("worldwild:promotion_state")
+    return PromotionResult(
+        state=PROMOTION_STATE_SKIPPED_LOW_MATCH,
+        analysis_id=None,
+        error="",
+        skipped_reason="triage_low_score",
+    )
+
+
 def _mark_failed(decision: Decision, *, reason: str) -> PromotionResult:
     """Imposta la decision a ``failed`` con ragione corta; flush al caller."""
     decision.promotion_state = PROMOTION_STATE_FAILED  # type: ignore[assignment]
@@ -16,15 +16,18 @@ from src.batch.models import BatchItem
 from src.contacts.models import Contact
 from src.cover_letter.models import CoverLetter
 from src.cv.models import CVProfile
+from src.dashboard.models import AISpendDaily, AISpendEvent, BudgetReservation
 from src.database.base import Base
 from src.inbox.models import InboxItem
 from src.integrations.glassdoor import GlassdoorCache
+from src.integrations.models import CacheEntry
 from src.integrations.news import NewsCache
 from src.integrations.salary import SalaryCache
 from src.interview.file_models import InterviewFile
 from src.interview.models import Interview
+from src.jd_store.models import JDBlob
 from src.linkedin_import.models import LinkedinApplication
-from src.metrics.models import RequestMetric
+from src.metrics.models import AICallMetric, RequestMetric
 from src.notification_center.models import NotificationDismissal
 from src.notifications.models import NotificationLog
 from src.preferences.models import AppPreference
@@ -44,12 +47,18 @@ _ALL_MODELS = [
     BatchItem,
     TodoItem,
     RequestMetric,
+    AICallMetric,
     SalaryCache,
     NewsCache,
     AnalyticsRun,
     UserProfile,
     InboxItem,
     LinkedinApplication,
+    JDBlob,
+    BudgetReservation,
+    AISpendEvent,
+    AISpendDaily,
+    CacheEntry,
 ]
 
 
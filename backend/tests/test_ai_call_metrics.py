@@ -0,0 +1,173 @@
+"""Tests for per-call AI telemetry (ai_call_metrics rows and the admin percentiles)."""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.integrations import anthropic_client, document_scanner
+from src.integrations.anthropic_client import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_BATCH,
+    AnthropicGovernor,
+    _acall_api_with_tool,
+    _call_api_with_tool,
+    call_priority,
+)
+from src.integrations.document_scanner import scan_document
+from src.metrics.models import AICallMetric
+from src.metrics.service import AI_CALL_RETENTION_DAYS, cleanup_old_ai_calls, get_ai_call_summary
+
+_HAIKU = "claude-haiku-4-5-20251001"
+
+
+def _message(tool_input: dict):
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="tool_use", input=tool_input)],
+        usage=SimpleNamespace(
+            input_tokens=1000, output_tokens=200, cache_read_input_tokens=800, cache_creation_input_tokens=0
+        ),
+    )
+
+
+def _call_kwargs() -> dict:
+    return {
+        "system_prompt": "sys",
+        "user_prompt": "jd",
+        "model_id": _HAIKU,
+        "max_tokens": 100,
+        "tool_name": "submit_analysis",
+        "tool_description": "d",
+        "input_schema": {"type": "object"},
+    }
+
+
+def _response(status_code: int = 200):
+    return SimpleNamespace(status_code=status_code, headers={})
+
+
+@pytest.fixture
+def rows(monkeypatch):
+    """Capture the rows instead of writing them; isolate the governor."""
+    captured: list[dict] = []
+    monkeypatch.setattr(anthropic_client, "record_ai_call", lambda **row: captured.append(row))
+    monkeypatch.setattr(anthropic_client, "get_governor", lambda: AnthropicGovernor(max_concurrency=4))
+    return captured
+
+
+class TestRecording:
+    def test_sync_call_records_tokens_cost_and_retries(self, rows, monkeypatch):
+        def create(**_params):
+            # Two responses through the httpx hook: a 529 retried by the SDK, then the answer.
+            anthropic_client._observe_response(_response(529))
+            anthropic_client._observe_response(_response(200))
+            return _message({"score": 70})
+
+        client = MagicMock()
+        client.messages.create = create
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+
+        _call_api_with_tool(**_call_kwargs())
+
+        (row,) = rows
+        assert row["operation"] == "analysis"
+        assert row["source"] == "interactive"
+        assert row["model"] == _HAIKU
+        assert row["status"] == "ok"
+        # Whole prompt: 1000 uncached + 800 read from the cache.
+        assert (row["tokens_input"], row["tokens_output"], row["tokens_cache_read"]) == (1800, 200, 800)
+        assert row["cost_usd"] > 0
+        assert row["retries"] == 1
+        assert row["hedged"] is False
+        assert row["ttfb_ms"] is not None
+        assert row["wall_ms"] >= row["queue_ms"]
+
+    def test_failed_call_is_recorded_as_error(self, rows, monkeypatch):
+        client = MagicMock()
+        client.messages.create.side_effect = RuntimeError("overloaded")
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+
+        with pytest.raises(RuntimeError):
+            _call_api_with_tool(**_call_kwargs())
+        assert rows[0]["status"] == "error"
+        assert rows[0]["cost_usd"] == 0.0
+        assert rows[0]["ttfb_ms"] is None
+
+    def test_source_follows_call_priority(self, rows, monkeypatch):
+        client = MagicMock()
+        client.messages.create.return_value = _message({"score": 70})
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+
+        with call_priority(PRIORITY_BACKGROUND, source="inbox"):
+            _call_api_with_tool(**_call_kwargs())
+        with call_priority(PRIORITY_BATCH):
+            _call_api_with_tool(**_call_kwargs())
+        assert [r["source"] for r in rows] == ["inbox", "batch"]
+
+    async def test_async_call_is_recorded(self, rows, monkeypatch):
+        client = MagicMock()
+        client.messages.create = AsyncMock(return_value=_message({"score": 70}))
+        monkeypatch.setattr(anthropic_client, "get_async_client", lambda: client)
+
+        await _acall_api_with_tool(**_call_kwargs())
+        assert rows[0]["operation"] == "analysis"
+        assert rows[0]["tokens_output"] == 200
+
+    def test_document_scan_is_recorded(self, rows, monkeypatch):
+        client = MagicMock()
+        client.messages.create.return_value = _message({"compiled": True, "confidence": "high", "summary": "Compilato"})
+        monkeypatch.setattr(document_scanner, "get_client", lambda: client)
+        monkeypatch.setattr(document_scanner, "get_governor", lambda: AnthropicGovernor(max_concurrency=4))
+
+        scan_document(b"Nome: Mario Rossi", "modulo.txt", "text/plain")
+        assert rows[0]["operation"] == "document_scan"
+
+
+def _seed(db_session, operation, source, wall_ms, cost, age_days=0, status="ok"):
+    db_session.add(
+        AICallMetric(
+            operation=operation,
+            source=source,
+            model=_HAIKU,
+            status=status,
+            tokens_input=1000,
+            tokens_output=100,
+            cost_usd=cost,
+            wall_ms=wall_ms,
+            ttfb_ms=wall_ms / 10,
+            created_at=datetime.now(UTC) - timedelta(days=age_days),
+        )
+    )
+
+
+class TestSummary:
+    def test_percentiles_per_operation_and_source(self, db_session):
+        for i in range(1, 101):
+            _seed(db_session, "analysis", "interactive" if i % 2 else "batch", wall_ms=i * 100.0, cost=i / 10000)
+        _seed(db_session, "cover_letter", "interactive", wall_ms=5000.0, cost=0.002, status="error")
+        _seed(db_session, "analysis", "batch", wall_ms=1e9, cost=9.0, age_days=10)  # outside the window
+        db_session.commit()
+
+        summary = get_ai_call_summary(db_session)
+        assert summary["total_calls"] == 101
+        analysis = next(g for g in summary["by_operation"] if g["operation"] == "analysis")
+        assert analysis["calls"] == 100
+        assert (analysis["p50_ms"], analysis["p95_ms"], analysis["p99_ms"]) == (5000.0, 9500.0, 9900.0)
+        assert analysis["p95_cost_usd"] == 0.0095
+        assert analysis["total_cost_usd"] == round(sum(i / 10000 for i in range(1, 101)), 4)
+        cover = next(g for g in summary["by_operation"] if g["operation"] == "cover_letter")
+        assert cover["errors"] == 1
+        assert {g["source"] for g in summary["by_source"]} == {"interactive", "batch"}
+
+    def test_empty_window(self, db_session):
+        summary = get_ai_call_summary(db_session)
+        assert summary["total_calls"] == 0
+        assert summary["by_operation"] == []
+
+    def test_cleanup_drops_rows_past_retention(self, db_session):
+        _seed(db_session, "analysis", "batch", 100.0, 0.001, age_days=AI_CALL_RETENTION_DAYS + 1)
+        _seed(db_session, "analysis", "batch", 100.0, 0.001)
+        db_session.commit()
+        assert cleanup_old_ai_calls(db_session) == 1
+        assert db_session.query(AICallMetric).count() == 1
@@ -3,6 +3,9 @@
 import uuid
 from datetime import UTC
 
+from sqlalchemy import null, update
+
+from src.analysis.extras import extract_extras
 from src.analysis.models import AnalysisStatus, JobAnalysis
 from src.analysis.service import (
     count_pending_analyses,
@@ -14,6 +17,7 @@ from src.analysis.service import (
     rebuild_result,
     update_status,
 )
+from src.dashboard.storage import fill_derived_batch
 
 
 class TestFindExistingAnalysis:
@@ -56,6 +60,44 @@ class TestRebuildResult:
         assert result["tokens"]["output"] == 500
         assert result["tokens"]["total"] == 1500
 
+    def test_projects_extras_column(self, test_analysis):
+        test_analysis.extras = {"score_label": "Buono", "potential_score": 85}
+        test_analysis.full_response = '{"score_label": "ignored"}'
+        result = rebuild_result(test_analysis)
+        assert result["score_label"] == "Buono"
+        assert result["potential_score"] == 85
+
+    def test_legacy_row_without_extras(self, test_analysis):
+        # Not backfilled yet: parsed from full_response on read.
+        test_analysis.extras = None
+        test_analysis.full_response = '{"score_label": "Discreto", "company": "X"}'
+        assert rebuild_result(test_analysis)["score_label"] == "Discreto"
+
+    def test_backfill_fills_extras(self, db_session, test_analysis):
+        test_analysis.full_response = '{"score_label": "Discreto"}'
+        db_session.commit()
+        db_session.execute(update(JobAnalysis).values(extras=null()))  # SQL NULL, as after migration 037
+        db_session.commit()
+        db_session.expire_all()
+
+        assert fill_derived_batch(db_session, 50) >= 1
+        db_session.commit()
+
+        assert db_session.get(JobAnalysis, test_analysis.id).extras == {"score_label": "Discreto"}
+
+
+class TestExtractExtras:
+    def test_fenced_full_response(self):
+        raw = '```json\n{"score_label": "Ottimo", "gap_timeline": "3 mesi", "company": "X"}\n```'
+        assert extract_extras(raw) == {"score_label": "Ottimo", "gap_timeline": "3 mesi"}
+
+    def test_result_wins_over_full_response(self):
+        assert extract_extras('{"confidence": "bassa"}', {"confidence": "alta"}) == {"confidence": "alta"}
+
+    def test_garbage_gives_empty(self):
+        assert extract_extras("not json") == {}
+        assert extract_extras(None) == {}
+
 
 class TestUpdateStatus:
     def test_updates_status(self, db_session, test_analysis):
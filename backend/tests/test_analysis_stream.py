@@ -0,0 +1,185 @@
+"""Tests for the streaming analysis path (partial tool-input JSON over SSE)."""
+
+import json
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.analysis.models import JobAnalysis
+from src.auth.models import User
+from src.cv.models import CVProfile
+from src.database import get_db
+from src.dependencies import get_current_user
+from src.integrations.anthropic_client import PartialJSONFields, _call_api_with_tool
+
+_TOOL_INPUT = {
+    "company": 'Acme "Cloud" S.r.l.',
+    "role": "DevOps Engineer",
+    "score": 78,
+    "application_method": {"type": "email", "details": "jobs@acme.io {urgent}"},
+    "strengths": ["Kubernetes", "Terraform, AWS"],
+    "summary": "Buon match",
+}
+
+_JD = "DevOps Engineer at Acme — Kubernetes, Terraform, AWS, on-call rotation, Milano hybrid."
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class _FakeStream:
+    """Mimics ``MessageStream``: iterable events + ``get_final_message``."""
+
+    def __init__(self, payload: dict, chunk_size: int = 7) -> None:
+        self._raw = json.dumps(payload)
+        self._payload = payload
+        self._chunk_size = chunk_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def __iter__(self):
+        yield SimpleNamespace(type="message_start")
+        for chunk in _chunks(self._raw, self._chunk_size):
+            yield SimpleNamespace(type="input_json", partial_json=chunk)
+
+    def get_final_message(self):
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="tool_use", input=self._payload)],
+            usage=SimpleNamespace(
+                input_tokens=1000, output_tokens=200, cache_read_input_tokens=0, cache_creation_input_tokens=0
+            ),
+        )
+
+
+def _streaming_client(payload: dict) -> MagicMock:
+    client = MagicMock()
+    client.messages.stream.side_effect = lambda **_kw: _FakeStream(payload)
+    return client
+
+
+class TestPartialJSONFields:
+    @pytest.mark.parametrize("size", [1, 3, 16, 10_000])
+    def test_reports_every_field_once_regardless_of_chunking(self, size):
+        scanner = PartialJSONFields()
+        fields = []
+        for chunk in _chunks(json.dumps(_TOOL_INPUT, indent=1), size):
+            fields.extend(scanner.feed(chunk))
+        assert fields == list(_TOOL_INPUT.items())
+
+    def test_field_reported_as_soon_as_it_closes(self):
+        scanner = PartialJSONFields()
+        assert scanner.feed('{"score": 7') == []
+        assert scanner.feed('8, "company": "Ac') == [("score", 78)]
+        assert scanner.feed('me"}') == [("company", "Acme")]
+
+    def test_nested_separators_do_not_complete_field(self):
+        scanner = PartialJSONFields()
+        assert scanner.feed('{"strengths": ["a", "b,c"') == []
+        assert scanner.feed("]}") == [("strengths", ["a", "b,c"])]
+
+
+class TestCallApiWithToolStreaming:
+    def test_on_field_streams_and_returns_final_payload(self):
+        seen = []
+        with patch("src.integrations.anthropic_client.get_client", return_value=_streaming_client(_TOOL_INPUT)):
+            result, usage = _call_api_with_tool(
+                "sys",
+                "user",
+                "claude-haiku-4-5-20251001",
+                1024,
+                "submit_analysis",
+                "d",
+                {},
+                on_field=lambda *f: seen.append(f),
+            )
+        assert result == _TOOL_INPUT
+        assert usage.output_tokens == 200
+        assert [name for name, _ in seen] == list(_TOOL_INPUT)
+
+    def test_without_on_field_uses_blocking_create(self):
+        client = _streaming_client(_TOOL_INPUT)
+        client.messages.create.return_value = _FakeStream(_TOOL_INPUT).get_final_message()
+        with patch("src.integrations.anthropic_client.get_client", return_value=client):
+            result, _usage = _call_api_with_tool("sys", "user", "m", 1024, "submit_analysis", "d", {})
+        assert result == _TOOL_INPUT
+        client.messages.stream.assert_not_called()
+
+
+@pytest.fixture
+def stream_client(db_session):
+    from src.main import create_app
+
+    user = User(id=uuid.uuid4(), email="stream@test.com", password_hash="x")
+    cv = CVProfile(id=uuid.uuid4(), user_id=user.id, raw_text="CV Python Kubernetes", name="Stream")
+    db_session.add_all([user, cv])
+    db_session.commit()
+
+    @asynccontextmanager
+    async def _test_lifespan(app):
+        from src.integrations.cache import NullCacheService
+
+        app.state.cache = NullCacheService()
+        yield
+
+    def _db():
+        yield db_session
+
+    with patch("src.main.lifespan", _test_lifespan), patch("src.main.settings") as s:
+        s.trusted_hosts_list = ["*"]
+        s.cors_origins_list = ["*"]
+        s.cors_allow_credentials = True
+        s.secret_key = "test-secret"
+        app = create_app()
+        app.dependency_overrides[get_db] = _db
+        app.dependency_overrides[get_current_user] = lambda: user
+        with TestClient(app, raise_server_exceptions=False) as client:
+            yield client
+
+
+def _parse_sse(text: str) -> list[tuple[str, dict]]:
+    frames = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        frames.append((lines["event"], json.loads(lines["data"])))
+    return frames
+
+
+class TestAnalyzeStreamRoute:
+    def test_streams_preview_fields_then_done(self, stream_client, db_session):
+        with patch("src.integrations.anthropic_client.get_client", return_value=_streaming_client(_TOOL_INPUT)):
+            resp = stream_client.post("/api/v1/analyze/stream", json={"job_description": _JD})
+
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        frames = _parse_sse(resp.text)
+        fields = [data["name"] for event, data in frames if event == "field"]
+        # Only preview fields are forwarded, in generation order.
+        assert fields == ["company", "role", "score", "strengths", "summary"]
+        event, data = frames[-1]
+        assert event == "done"
+        analysis = db_session.query(JobAnalysis).one()
+        assert data["redirect"] == f"/analysis/{analysis.id}"
+        assert analysis.score == 78
+
+    def test_ai_failure_emits_error_frame(self, stream_client, db_session):
+        client = MagicMock()
+        client.messages.stream.side_effect = RuntimeError("boom")
+        with patch("src.integrations.anthropic_client.get_client", return_value=client):
+            resp = stream_client.post("/api/v1/analyze/stream", json={"job_description": _JD})
+
+        assert _parse_sse(resp.text)[-1][0] == "error"
+        assert db_session.query(JobAnalysis).count() == 0
+
+    def test_preflight_error_is_plain_json(self, stream_client):
+        resp = stream_client.post("/api/v1/analyze/stream", json={"job_description": "x" * 60_000})
+        assert resp.status_code in (400, 422)
+        assert resp.headers["content-type"].startswith("application/json")
@@ -0,0 +1,190 @@
+"""Tests for the AsyncAnthropic path (async governor slot, async ops, async routes)."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.analysis.models import JobAnalysis
+from src.database import get_db
+from src.dependencies import get_current_user
+from src.integrations.anthropic_client import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    AnthropicGovernor,
+    aanalyze_job,
+    agenerate_followup_email,
+)
+from src.integrations.document_scanner import ascan_document
+from src.interview.file_models import FileStatus
+
+_JD = "DevOps Engineer at Acme — Kubernetes, Terraform, AWS, on-call rotation, Milano hybrid."
+
+
+def _message(tool_input: dict, input_tokens: int = 1000, output_tokens: int = 200):
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="tool_use", input=tool_input)],
+        usage=SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_read_input_tokens=0,
+            cache_creation_input_tokens=0,
+        ),
+    )
+
+
+def _async_client(tool_input: dict) -> MagicMock:
+    client = MagicMock()
+    client.messages.create = AsyncMock(return_value=_message(tool_input))
+    return client
+
+
+class TestAsyncGovernor:
+    async def test_aslot_holds_and_releases(self):
+        gov = AnthropicGovernor(max_concurrency=2)
+        async with gov.aslot():
+            assert gov.in_flight == 1
+        assert gov.in_flight == 0
+
+    async def test_waiters_admitted_in_priority_order(self):
+        gov = AnthropicGovernor(max_concurrency=1)
+        order: list[str] = []
+        await gov.aacquire()
+
+        async def _wait(name: str, priority: int) -> None:
+            await gov.aacquire(priority)
+            order.append(name)
+            gov.release()
+
+        batch = asyncio.create_task(_wait("batch", PRIORITY_BATCH))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(_wait("interactive", PRIORITY_INTERACTIVE))
+        await asyncio.sleep(0)
+        gov.release()
+        await asyncio.gather(batch, interactive)
+        assert order == ["interactive", "batch"]
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        gov = AnthropicGovernor(max_concurrency=1)
+        await gov.aacquire()
+        waiter = asyncio.create_task(gov.aacquire())
+        await asyncio.sleep(0)
+        assert gov.stats()["waiting"] == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert gov.stats()["waiting"] == 0
+        gov.release()
+        await asyncio.wait_for(gov.aacquire(), timeout=1)
+
+
+class TestAsyncOperations:
+    async def test_aanalyze_job_uses_async_client(self):
+        client = _async_client({"company": "Acme", "role": "DevOps", "score": 70})
+        with (
+            patch("src.integrations.anthropic_client.get_async_client", return_value=client),
+            patch("src.integrations.anthropic_client.get_client", side_effect=AssertionError("sync client used")),
+        ):
+            result = await aanalyze_job("cv text", _JD)
+
+        assert result["company"] == "Acme"
+        assert result["score"] == 70
+        assert result["tokens"] == {"input": 1000, "output": 200, "total": 1200, "cache_read": 0, "cache_write": 0}
+        assert result["cost_usd"] > 0
+        client.messages.create.assert_awaited_once()
+
+    async def test_agenerate_followup_email(self):
+        client = _async_client({"subject": "Follow-up", "body": "Ciao", "tone_notes": ""})
+        with patch("src.integrations.anthropic_client.get_async_client", return_value=client):
+            result = await agenerate_followup_email("cv", "DevOps", "Acme", 7, "italiano")
+        assert result["subject"] == "Follow-up"
+        assert result["from_cache"] is False
+
+    async def test_ascan_document_text(self):
+        client = _async_client({"compiled": True, "confidence": "high", "summary": "Compilato"})
+        with patch("src.integrations.document_scanner.get_async_client", return_value=client):
+            result = await ascan_document(b"Nome: Marco Rossi", "modulo.txt", "text/plain")
+        assert result["status"] == FileStatus.COMPILED
+        assert result["scan_result"] == "Compilato"
+
+    async def test_ascan_document_error_is_scan_error(self):
+        client = MagicMock()
+        client.messages.create = AsyncMock(side_effect=RuntimeError("boom"))
+        with patch("src.integrations.document_scanner.get_async_client", return_value=client):
+            result = await ascan_document(b"Nome: Marco Rossi", "modulo.txt", "text/plain")
+        assert result["status"] == FileStatus.SCAN_ERROR
+
+
+@pytest.fixture
+def async_route_client(db_session, test_user, test_cv):
+    from src.main import create_app
+
+    @asynccontextmanager
+    async def _test_lifespan(app):
+        from src.integrations.cache import NullCacheService
+
+        app.state.cache = NullCacheService()
+        yield
+
+    def _db():
+        yield db_session
+
+    with patch("src.main.lifespan", _test_lifespan), patch("src.main.settings") as s:
+        s.trusted_hosts_list = ["*"]
+        s.cors_origins_list = ["*"]
+        s.cors_allow_credentials = True
+        s.secret_key = "test-secret"
+        app = create_app()
+        app.dependency_overrides[get_db] = _db
+        app.dependency_overrides[get_current_user] = lambda: test_user
+        with TestClient(app, raise_server_exceptions=False) as client:
+            yield client
+
+
+class TestAsyncRoutes:
+    def test_analyze_api_persists_via_async_client(self, async_route_client, db_session):
+        client = _async_client({"company": "Acme", "role": "DevOps", "score": 81})
+        with patch("src.integrations.anthropic_client.get_async_client", return_value=client):
+            resp = async_route_client.post("/api/v1/analyze", json={"job_description": _JD})
+
+        assert resp.status_code == 200
+        analysis = db_session.query(JobAnalysis).one()
+        assert resp.json()["redirect"] == f"/analysis/{analysis.id}"
+        assert analysis.score == 81
+
+    def test_analyze_api_cancelled_when_client_disconnects(self, async_route_client, db_session, monkeypatch):
+        from src.integrations import anthropic_client
+
+        cancelled: list[bool] = []
+
+        async def create(**_params):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        client = MagicMock()
+        client.messages.create = create
+        monkeypatch.setattr(anthropic_client, "_DISCONNECT_POLL_SECONDS", 0.01)
+        with (
+            patch("src.integrations.anthropic_client.get_async_client", return_value=client),
+            patch("starlette.requests.Request.is_disconnected", AsyncMock(return_value=True)),
+        ):
+            resp = async_route_client.post("/api/v1/analyze", json={"job_description": _JD})
+
+        assert resp.status_code == 499
+        assert cancelled == [True]
+        assert db_session.query(JobAnalysis).count() == 0
+
+    def test_followup_email_route(self, async_route_client, test_analysis):
+        client = _async_client({"subject": "Follow-up", "body": "Ciao", "tone_notes": ""})
+        with patch("src.integrations.anthropic_client.get_async_client", return_value=client):
+            resp = async_route_client.post("/api/v1/followup-email", data={"analysis_id": str(test_analysis.id)})
+
+        assert resp.status_code == 200
+        assert resp.json()["subject"] == "Follow-up"
+        client.messages.create.assert_awaited_once()
@@ -115,3 +115,25 @@ class TestCallApiWithTool:
         )
         kwargs = fake_client.messages.create.call_args.kwargs
         assert kwargs["system"][0]["cache_control"] == {"type": "ephemeral"}
+
+
+class TestTriageJob:
+    """triage_job asks the small schema with a low max_tokens and clamps the score."""
+
+    def test_small_tool_call(self, monkeypatch):
+        captured = {}
+
+        def fake_call(system_prompt, user_prompt, model_id, max_tokens, tool_name=None, input_schema=None, **_kw):
+            captured.update(max_tokens=max_tokens, tool_name=tool_name, schema=input_schema)
+            usage = SimpleNamespace(input_tokens=900, output_tokens=30)
+            return {"score": "140", "career_track": "plan_a_devops", "reason": "Match forte"}, usage
+
+        monkeypatch.setattr(anthropic_client, "_call_api_with_tool", fake_call)
+        result = anthropic_client.triage_job("cv", "DevOps role")
+
+        assert captured["tool_name"] == "submit_triage"
+        assert captured["max_tokens"] <= 256
+        assert set(captured["schema"]["properties"]) == {"score", "career_track", "reason"}
+        assert result["score"] == 100
+        assert result["reason"] == "Match forte"
+        assert result["cost_usd"] > 0
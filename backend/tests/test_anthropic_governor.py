@@ -0,0 +1,116 @@
+"""Tests for the process-wide Anthropic rate governor."""
+
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+from src.integrations import anthropic_client
+from src.integrations.anthropic_client import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    AnthropicGovernor,
+    call_priority,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _headers(remaining: int, limit: int = 50) -> dict[str, str]:
+    return {
+        "anthropic-ratelimit-requests-remaining": str(remaining),
+        "anthropic-ratelimit-requests-limit": str(limit),
+    }
+
+
+class TestAdaptiveLimit:
+    def test_429_halves_limit_and_pauses(self):
+        clock = FakeClock()
+        gov = AnthropicGovernor(8, clock)
+        gov.observe(429, {"retry-after": "7"})
+        stats = gov.stats()
+        assert stats["limit"] == 4
+        assert stats["throttled"] == 1
+        assert stats["paused_for_s"] == 7.0
+
+    def test_529_without_retry_after_uses_default_backoff(self):
+        clock = FakeClock()
+        gov = AnthropicGovernor(4, clock)
+        gov.observe(529, {})
+        assert gov.stats()["paused_for_s"] == anthropic_client._DEFAULT_BACKOFF_SECONDS
+
+    def test_low_headroom_shrinks_then_recovers(self):
+        gov = AnthropicGovernor(4, FakeClock())
+        gov.observe(200, _headers(remaining=2))
+        assert gov.limit == 3
+        gov.observe(200, _headers(remaining=40))
+        assert gov.limit == 4
+        gov.observe(200, _headers(remaining=40))
+        assert gov.limit == 4  # capped at max_concurrency
+
+    def test_exhausted_requests_pause_until_reset(self):
+        clock = FakeClock()
+        gov = AnthropicGovernor(4, clock)
+        reset = (datetime.now(UTC) + timedelta(seconds=20)).isoformat()
+        gov.observe(200, {**_headers(remaining=0), "anthropic-ratelimit-requests-reset": reset})
+        assert 15 <= gov.stats()["paused_for_s"] <= 20
+
+    def test_ignores_responses_without_ratelimit_headers(self):
+        gov = AnthropicGovernor(4, FakeClock())
+        gov.observe(200, {})
+        gov.observe(400, {})
+        assert gov.limit == 4
+
+
+class TestPriorityQueue:
+    def test_interactive_overtakes_queued_batch(self):
+        gov = AnthropicGovernor(1)
+        gov.acquire(PRIORITY_INTERACTIVE)  # occupy the only slot
+        order: list[str] = []
+
+        def _worker(name: str, priority: int) -> None:
+            with gov.slot(priority):
+                order.append(name)
+
+        batch = threading.Thread(target=_worker, args=("batch", PRIORITY_BATCH))
+        batch.start()
+        time.sleep(0.05)
+        interactive = threading.Thread(target=_worker, args=("interactive", PRIORITY_INTERACTIVE))
+        interactive.start()
+        time.sleep(0.05)
+
+        gov.release()
+        batch.join(2)
+        interactive.join(2)
+        assert order == ["interactive", "batch"]
+
+    def test_slot_uses_context_priority(self, monkeypatch):
+        gov = AnthropicGovernor(2)
+        seen: list[int] = []
+        original = gov.acquire
+
+        def _spy(priority: int = PRIORITY_INTERACTIVE) -> None:
+            seen.append(priority)
+            original(priority)
+
+        monkeypatch.setattr(gov, "acquire", _spy)
+        with call_priority(PRIORITY_BATCH), gov.slot():
+            pass
+        with gov.slot():
+            pass
+        assert seen == [PRIORITY_BATCH, PRIORITY_INTERACTIVE]
+        assert gov.in_flight == 0
+
+
+def test_response_hook_feeds_governor(monkeypatch):
+    import httpx
+
+    gov = AnthropicGovernor(4, FakeClock())
+    monkeypatch.setattr(anthropic_client, "_governor", gov)
+    anthropic_client._observe_response(httpx.Response(429, headers={"retry-after": "3"}))
+    assert gov.limit == 2
@@ -0,0 +1,237 @@
+"""Tests for the batch bulk mode (Anthropic Message Batches).
+
+The Anthropic SDK runs unmodified against a local fake batches endpoint
+(``httpx.MockTransport``), so request shape, polling and JSONL result
+decoding are exercised exactly as in production.
+"""
+
+import json
+from unittest.mock import patch
+
+import anthropic
+import httpx
+import pytest
+
+from src.analysis.models import JobAnalysis
+from src.batch.bulk import collect_bulk, open_bulk_batches, run_bulk, submit_bulk
+from src.batch.models import BatchItem, BatchItemStatus
+from src.batch.service import add_to_queue, cleanup_stale_running, get_pending_batch_id
+
+_HAIKU = "claude-haiku-4-5-20251001"
+
+
+class FakeBatchesEndpoint:
+    """Minimal in-memory Message Batches API.
+
+    ``polls_before_end`` controls how many ``retrieve`` calls report
+    ``in_progress`` before the batch ends. Per-custom_id failures can be
+    injected via ``errored``.
+    """
+
+    def __init__(self, polls_before_end: int = 1, errored: set[str] | None = None) -> None:
+        self.polls_before_end = polls_before_end
+        self.errored = errored or set()
+        self.submitted: list[dict] = []
+        self._polls = 0
+
+    def _batch(self, status: str) -> dict:
+        return {
+            "id": "msgbatch_fake",
+            "type": "message_batch",
+            "processing_status": status,
+            "request_counts": {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0},
+            "created_at": "2026-01-01T00:00:00Z",
+            "expires_at": "2026-01-02T00:00:00Z",
+            "ended_at": "2026-01-01T00:05:00Z" if status == "ended" else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": "https://fake.local/v1/messages/batches/msgbatch_fake/results"
+            if status == "ended"
+            else None,
+        }
+
+    def _result_line(self, request: dict) -> str:
+        custom_id = request["custom_id"]
+        if custom_id in self.errored:
+            result = {"type": "errored", "error": {"type": "error", "error": {"type": "api_error", "message": "boom"}}}
+        else:
+            result = {
+                "type": "succeeded",
+                "message": {
+                    "id": f"msg_{custom_id[:8]}",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": request["params"]["model"],
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "id": "toolu_1",
+                            "name": "submit_analysis",
+                            "input": {"company": "Acme", "role": "SRE", "score": 81, "recommendation": "APPLY"},
+                        }
+                    ],
+                    "stop_reason": "tool_use",
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": 2000, "output_tokens": 1000},
+                },
+            }
+        return json.dumps({"custom_id": custom_id, "result": result})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "POST" and path == "/v1/messages/batches":
+            self.submitted = json.loads(request.content)["requests"]
+            return httpx.Response(200, json=self._batch("in_progress"))
+        if request.method == "GET" and path.endswith("/results"):
+            body = "\n".join(self._result_line(r) for r in self.submitted)
+            return httpx.Response(200, content=body.encode())
+        if request.method == "GET" and path.startswith("/v1/messages/batches/"):
+            self._polls += 1
+            status = "ended" if self._polls > self.polls_before_end else "in_progress"
+            return httpx.Response(200, json=self._batch(status))
+        return httpx.Response(404, json={"type": "error", "error": {"type": "not_found_error", "message": path}})
+
+
+def _client(endpoint: FakeBatchesEndpoint) -> anthropic.Anthropic:
+    return anthropic.Anthropic(
+        api_key="test",
+        base_url="https://fake.local",
+        http_client=httpx.Client(transport=httpx.MockTransport(endpoint)),
+        max_retries=0,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _no_glassdoor():
+    with patch("src.analysis.service.fetch_glassdoor_rating", return_value=None):
+        yield
+
+
+def _enqueue(db_session, test_cv, n: int) -> str:
+    for i in range(n):
+        add_to_queue(db_session, test_cv.id, f"Bulk job {i}", cv_text=test_cv.raw_text)
+    db_session.commit()
+    return get_pending_batch_id(db_session)
+
+
+class TestSubmitBulk:
+    def test_submits_pending_items_with_analysis_tool(self, db_session, test_cv, test_user):
+        batch_id = _enqueue(db_session, test_cv, 2)
+        endpoint = FakeBatchesEndpoint()
+
+        msg_batch_id = submit_bulk(db_session, batch_id, test_user.id, _client(endpoint))
+
+        assert msg_batch_id == "msgbatch_fake"
+        assert len(endpoint.submitted) == 2
+        params = endpoint.submitted[0]["params"]
+        assert params["tool_choice"] == {"type": "tool", "name": "submit_analysis"}
+        assert params["model"] == _HAIKU
+        items = db_session.query(BatchItem).all()
+        assert {i.status for i in items} == {BatchItemStatus.RUNNING}
+        assert {i.bulk_batch_id for i in items} == {"msgbatch_fake"}
+        assert open_bulk_batches(db_session) == ["msgbatch_fake"]
+
+    def test_items_claimed_before_the_api_call(self, db_session, test_cv, test_user):
+        from src.batch.service import claim_next_item
+
+        batch_id = _enqueue(db_session, test_cv, 2)
+        endpoint = FakeBatchesEndpoint()
+        claimed_during_submit = []
+
+        def submit(request: httpx.Request) -> httpx.Response:
+            claimed_during_submit.append(claim_next_item(db_session, "standing-worker"))
+            return endpoint(request)
+
+        submit_bulk(db_session, batch_id, test_user.id, _client(submit))
+
+        assert claimed_during_submit == [None]
+        items = db_session.query(BatchItem).all()
+        assert {i.lease_owner for i in items} == {None}
+        assert {i.bulk_batch_id for i in items} == {"msgbatch_fake"}
+
+    def test_failed_submit_releases_items(self, db_session, test_cv, test_user):
+        batch_id = _enqueue(db_session, test_cv, 2)
+
+        def fail(_request: httpx.Request) -> httpx.Response:
+            return httpx.Response(500, json={"type": "error", "error": {"type": "api_error", "message": "down"}})
+
+        with pytest.raises(anthropic.APIStatusError):
+            submit_bulk(db_session, batch_id, test_user.id, _client(fail))
+
+        items = db_session.query(BatchItem).all()
+        assert {i.status for i in items} == {BatchItemStatus.PENDING}
+        assert {i.lease_owner for i in items} == {None}
+        assert {i.bulk_batch_id for i in items} == {None}
+
+    def test_returns_none_without_pending(self, db_session, test_user):
+        assert submit_bulk(db_session, "missing", test_user.id, _client(FakeBatchesEndpoint())) is None
+
+
+class TestCollectBulk:
+    def test_waits_while_in_progress(self, db_session, test_cv, test_user):
+        batch_id = _enqueue(db_session, test_cv, 1)
+        endpoint = FakeBatchesEndpoint(polls_before_end=5)
+        client = _client(endpoint)
+        submit_bulk(db_session, batch_id, test_user.id, client)
+
+        assert collect_bulk(db_session, "msgbatch_fake", client=client) is False
+        assert db_session.query(BatchItem).one().status == BatchItemStatus.RUNNING
+
+    def test_fans_results_into_analyses(self, db_session, test_cv, test_user):
+        batch_id = _enqueue(db_session, test_cv, 2)
+        endpoint = FakeBatchesEndpoint(polls_before_end=0)
+        client = _client(endpoint)
+        submit_bulk(db_session, batch_id, test_user.id, client)
+        errored_id = endpoint.submitted[1]["custom_id"]
+        endpoint.errored = {errored_id}
+
+        assert collect_bulk(db_session, "msgbatch_fake", client=client) is True
+
+        items = {str(i.id): i for i in db_session.query(BatchItem).all()}
+        assert items[errored_id].status == BatchItemStatus.ERROR
+        assert "bulk_errored" in items[errored_id].error_message
+        done = [i for i in items.values() if i.status == BatchItemStatus.DONE]
+        assert len(done) == 1
+        analysis = db_session.query(JobAnalysis).filter(JobAnalysis.id == done[0].analysis_id).one()
+        assert analysis.company == "Acme"
+        assert analysis.score == 81
+        assert analysis.content_hash == done[0].content_hash
+        # 2000 in @0.80 + 1000 out @4.00 per MTok = 0.0056, halved by the batch discount
+        assert analysis.cost_usd == pytest.approx(0.0028)
+
+    def test_retryable_failure_clears_bulk_id(self, db_session, test_cv, test_user):
+        batch_id = _enqueue(db_session, test_cv, 1)
+        client = _client(FakeBatchesEndpoint(polls_before_end=0))
+        submit_bulk(db_session, batch_id, test_user.id, client)
+
+        with patch("src.batch.bulk.parse_batch_analysis", side_effect=TimeoutError("slow")):
+            collect_bulk(db_session, "msgbatch_fake", client=client)
+
+        item = db_session.query(BatchItem).one()
+        assert item.status == BatchItemStatus.PENDING
+        assert item.bulk_batch_id is None
+
+
+class TestRunBulk:
+    def test_submits_and_polls_until_done(self, db_session, test_cv, test_user):
+        batch_id = _enqueue(db_session, test_cv, 3)
+        endpoint = FakeBatchesEndpoint(polls_before_end=2)
+        sleeps: list[float] = []
+
+        run_bulk(db_session, test_user.id, batch_id, client=_client(endpoint), poll_interval=1, sleep=sleeps.append)
+
+        assert {i.status for i in db_session.query(BatchItem).all()} == {BatchItemStatus.DONE}
+        assert len(sleeps) == 2
+        assert open_bulk_batches(db_session) == []
+
+
+def test_stale_recovery_ignores_bulk_items(db_session, test_cv, test_user):
+    from datetime import UTC, datetime, timedelta
+
+    batch_id = _enqueue(db_session, test_cv, 1)
+    submit_bulk(db_session, batch_id, test_user.id, _client(FakeBatchesEndpoint()))
+    item = db_session.query(BatchItem).one()
+    item.updated_at = datetime.now(UTC) - timedelta(hours=3)
+    db_session.commit()
+
+    assert cleanup_stale_running(db_session, threshold_minutes=10) == 0
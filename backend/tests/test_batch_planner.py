@@ -0,0 +1,141 @@
+"""Tests for the batch planner: cost/ETA estimate and the budget guard of a run."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.batch.models import BatchItem, BatchItemStatus
+from src.batch.planner import _cost_fn, _model_profiles, choose_item_model, item_input_tokens, plan_batch
+from src.batch.service import add_to_queue, get_pending_batch_id, run_batch
+from src.dashboard.service import BudgetExceededError, get_or_create_settings
+from src.integrations.anthropic_client import MODELS
+from src.metrics.models import AICallMetric
+
+
+def _queue(db, cv, *models):
+    for i, model in enumerate(models):
+        add_to_queue(db, cv.id, f"Backend engineer role {i}", model=model, cv_text=cv.raw_text)
+    db.commit()
+    return get_pending_batch_id(db)
+
+
+def _cost(db, cv, model, index=0):
+    return _cost_fn(item_input_tokens(cv.raw_text, f"Backend engineer role {index}"), _model_profiles(db))(model)
+
+
+def _set_budget(db, amount):
+    get_or_create_settings(db).anthropic_budget = amount
+    db.commit()
+
+
+class TestPlanBatch:
+    def test_no_budget_plans_every_item(self, db_session, test_cv):
+        batch_id = _queue(db_session, test_cv, "haiku", "haiku", "sonnet")
+
+        plan = plan_batch(db_session, batch_id, test_cv.raw_text, workers=3)
+
+        assert plan["items"] == plan["planned"] == 3
+        assert plan["fits"] is True
+        assert plan["remaining_budget_usd"] is None
+        assert plan["by_model"]["haiku"]["items"] == 2
+        assert plan["by_model"]["sonnet"]["items"] == 1
+        assert plan["estimated_cost_usd"] == pytest.approx(
+            _cost(db_session, test_cv, "haiku", 0)
+            + _cost(db_session, test_cv, "haiku", 1)
+            + _cost(db_session, test_cv, "sonnet", 2),
+            abs=1e-4,
+        )
+        # No history yet: default latencies (10 s + 10 s + 25 s) over 3 workers.
+        assert plan["estimated_seconds"] == 15
+
+    def test_uses_historical_output_and_latency(self, db_session, test_cv):
+        for wall_ms in (4000.0, 6000.0, 8000.0):
+            db_session.add(
+                AICallMetric(
+                    operation="analysis",
+                    source="batch",
+                    model=MODELS["haiku"],
+                    status="ok",
+                    tokens_output=1000,
+                    wall_ms=wall_ms,
+                )
+            )
+        batch_id = _queue(db_session, test_cv, "haiku", "haiku")
+
+        plan = plan_batch(db_session, batch_id, test_cv.raw_text, workers=1)
+
+        assert plan["history_calls"]["haiku"] == 3
+        assert plan["estimated_seconds"] == 12  # 2 items × p50 6 s, one worker
+        input_tokens = item_input_tokens(test_cv.raw_text, "Backend engineer role 0")
+        assert plan["by_model"]["haiku"]["cost_usd"] == pytest.approx(
+            2 * (input_tokens * 0.80 + 1000 * 4.00) / 1_000_000, abs=1e-4
+        )
+
+    def test_downgrade_policy_moves_sonnet_to_haiku(self, db_session, test_cv):
+        batch_id = _queue(db_session, test_cv, "sonnet", "sonnet")
+        _set_budget(db_session, _cost(db_session, test_cv, "sonnet") + _cost(db_session, test_cv, "haiku"))
+
+        plan = plan_batch(db_session, batch_id, test_cv.raw_text, policy="downgrade")
+
+        assert plan["fits"] is False
+        assert plan["downgraded"] == 1
+        assert plan["deferred"] == 0
+        assert plan["by_model"] == {
+            "haiku": {"items": 1, "cost_usd": pytest.approx(_cost(db_session, test_cv, "haiku"), abs=1e-4)},
+            "sonnet": {"items": 1, "cost_usd": pytest.approx(_cost(db_session, test_cv, "sonnet", 1), abs=1e-4)},
+        }
+
+    def test_stop_policy_defers_what_does_not_fit(self, db_session, test_cv):
+        batch_id = _queue(db_session, test_cv, "sonnet", "sonnet")
+        _set_budget(db_session, _cost(db_session, test_cv, "sonnet") * 1.5)
+
+        plan = plan_batch(db_session, batch_id, test_cv.raw_text, policy="stop")
+
+        assert plan["planned"] == 1
+        assert plan["deferred"] == 1
+        assert plan["downgraded"] == 0
+
+
+class TestChooseItemModel:
+    def test_keeps_model_without_budget(self, db_session, test_cv):
+        _queue(db_session, test_cv, "sonnet")
+        item = db_session.query(BatchItem).one()
+
+        assert choose_item_model(db_session, item, test_cv.raw_text) == "sonnet"
+
+    def test_raises_when_nothing_fits(self, db_session, test_cv):
+        _queue(db_session, test_cv, "sonnet")
+        _set_budget(db_session, _cost(db_session, test_cv, "haiku") / 2)
+        item = db_session.query(BatchItem).one()
+
+        with pytest.raises(BudgetExceededError):
+            choose_item_model(db_session, item, test_cv.raw_text, "downgrade")
+
+    def test_run_downgrades_item_when_projection_exceeds_budget(self, db_session, test_user, test_cv):
+        _queue(db_session, test_cv, "sonnet")
+        _set_budget(db_session, (_cost(db_session, test_cv, "sonnet") + _cost(db_session, test_cv, "haiku")) / 2)
+        ok = (MagicMock(id=test_cv.id), {"cost_usd": 0.0, "tokens": {"input": 1, "output": 1}})
+
+        with (
+            patch("src.batch.service._throttle_item", return_value=0.0),
+            patch("src.batch.service.run_analysis", return_value=ok) as mock_run,
+        ):
+            run_batch(get_pending_batch_id(db_session), db_session, test_user.id, budget_policy="downgrade")
+
+        item = db_session.query(BatchItem).one()
+        assert item.status == BatchItemStatus.DONE
+        assert item.model == "haiku"
+        assert mock_run.call_args.args[5] == "haiku"
+
+    def test_run_stop_policy_leaves_item_pending(self, db_session, test_user, test_cv):
+        _queue(db_session, test_cv, "sonnet")
+        _set_budget(db_session, (_cost(db_session, test_cv, "sonnet") + _cost(db_session, test_cv, "haiku")) / 2)
+
+        with patch("src.batch.service.run_analysis") as mock_run:
+            run_batch(get_pending_batch_id(db_session), db_session, test_user.id, budget_policy="stop")
+
+        item = db_session.query(BatchItem).one()
+        assert item.status == BatchItemStatus.PENDING
+        assert item.attempt_count == 0
+        assert item.error_message.startswith("Budget insufficiente")
+        mock_run.assert_not_called()
@@ -386,3 +386,30 @@ class TestBatchAddRouteSourceWhitelist:
         # the batch route is for manual + cowork only.
         assert resp.status_code == 400
         assert "source" in resp.text.lower()
+
+
+class TestBatchPlanRoute:
+    """``GET /api/v1/batch/plan``: the estimate the UI confirms before ``/batch/run``."""
+
+    def test_returns_plan_for_pending_batch(self, auth_client_with_cv):
+        auth_client_with_cv.post("/api/v1/batch/add", data={"job_description": "SRE at Acme", "model": "sonnet"})
+
+        resp = auth_client_with_cv.get("/api/v1/batch/plan")
+
+        assert resp.status_code == 200, resp.text
+        plan = resp.json()
+        assert plan["items"] == 1
+        assert plan["by_model"]["sonnet"]["items"] == 1
+        assert plan["estimated_cost_usd"] > 0
+        assert plan["estimated_seconds"] > 0
+
+    def test_no_pending_batch(self, auth_client_with_cv):
+        assert auth_client_with_cv.get("/api/v1/batch/plan").status_code == 400
+
+    def test_unknown_policy_rejected(self, auth_client_with_cv):
+        auth_client_with_cv.post("/api/v1/batch/add", data={"job_description": "SRE at Acme"})
+
+        resp = auth_client_with_cv.get("/api/v1/batch/plan", params={"on_budget": "ignore"})
+
+        assert resp.status_code == 400
+        assert "on_budget" in resp.text
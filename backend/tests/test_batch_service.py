@@ -5,10 +5,16 @@ from datetime import UTC, datetime, timedelta
 from src.batch.models import BatchItem, BatchItemStatus
 from src.batch.service import (
     add_to_queue,
+    claim_next_item,
     cleanup_stale_running,
     clear_completed,
     get_batch_status,
     get_pending_batch_id,
+    is_retryable,
+    renew_lease,
+    requeue_dead,
+    retry_delay,
+    run_batch,
 )
 
 
@@ -215,3 +221,348 @@ class TestCleanupStaleRunning:
 
         recovered = cleanup_stale_running(db_session, threshold_minutes=10)
         assert recovered == 0
+
+
+class TestRunBatchConcurrent:
+    """``run_batch`` with a session factory drains items on parallel workers."""
+
+    def _file_session_factory(self, tmp_path):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        from src.database.base import Base
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'batch.db'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        return sessionmaker(bind=engine)
+
+    def test_processes_items_in_parallel(self, tmp_path):
+        import threading
+        import time
+        import uuid
+        from unittest.mock import MagicMock, patch
+
+        from src.auth.models import User
+        from src.batch.service import run_batch
+        from src.cv.models import CVProfile
+
+        factory = self._file_session_factory(tmp_path)
+        db = factory()
+        user = User(id=uuid.uuid4(), email="w@example.com", password_hash="x")
+        cv = CVProfile(id=uuid.uuid4(), user_id=user.id, raw_text="cv text", name="W")
+        db.add_all([user, cv])
+        db.commit()
+        for i in range(4):
+            add_to_queue(db, cv.id, f"Job {i}", cv_text="cv text")
+        db.commit()
+        batch_id = get_pending_batch_id(db)
+
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def _fake_run_analysis(*_a, **_kw):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return MagicMock(id=uuid.uuid4()), {"cost_usd": 0.0, "tokens": {"input": 1, "output": 1}}
+
+        with patch("src.batch.service.run_analysis", side_effect=_fake_run_analysis):
+            run_batch(batch_id, db, user.id, session_factory=factory, max_workers=4)
+
+        db.expire_all()
+        statuses = {item.status for item in db.query(BatchItem).all()}
+        assert statuses == {BatchItemStatus.DONE}
+        assert state["peak"] > 1
+        db.close()
+
+
+class TestRunBatchTriage:
+    """Large backlogs are pre-screened; only items above the threshold get the full analysis."""
+
+    def _run(self, db_session, test_user, test_cv, jobs, min_backlog=2):
+        from unittest.mock import MagicMock, patch
+
+        from src.batch.service import run_batch
+        from src.config import settings
+
+        for jd in jobs:
+            add_to_queue(db_session, test_cv.id, jd, cv_text=test_cv.raw_text)
+        db_session.commit()
+        batch_id = get_pending_batch_id(db_session)
+
+        def _fake_triage(_cv, jd, *_a, **_kw):
+            score = 80 if "DevOps" in jd else 20
+            return {
+                "score": score,
+                "career_track": "plan_a_devops",
+                "reason": "motivo",
+                "cost_usd": 0.0001,
+                "tokens": {"input": 10, "output": 5},
+            }
+
+        def _fake_run_analysis(*_a, **_kw):
+            return MagicMock(id=test_cv.id), {"cost_usd": 0.0, "tokens": {"input": 1, "output": 1}}
+
+        with (
+            patch.object(settings, "ai_triage_min_score", 60),
+            patch.object(settings, "ai_triage_min_backlog", min_backlog),
+            patch("src.batch.service.triage_job", side_effect=_fake_triage) as mock_triage,
+            patch("src.batch.service.run_analysis", side_effect=_fake_run_analysis) as mock_run,
+        ):
+            run_batch(batch_id, db_session, test_user.id)
+        return mock_triage, mock_run
+
+    def test_low_scores_filtered_before_full_analysis(self, db_session, test_user, test_cv):
+        mock_triage, mock_run = self._run(db_session, test_user, test_cv, ["DevOps AWS role", "Frontend React role"])
+
+        items = {item.job_description: item for item in db_session.query(BatchItem).all()}
+        assert items["Frontend React role"].status == BatchItemStatus.FILTERED
+        assert items["Frontend React role"].triage_score == 20
+        assert items["Frontend React role"].analysis_id is None
+        assert items["DevOps AWS role"].status == BatchItemStatus.DONE
+        assert items["DevOps AWS role"].triage_score == 80
+        assert mock_triage.call_count == 2
+        assert mock_run.call_count == 1
+        status = get_batch_status(db_session)
+        assert status["counts"]["filtered"] == 1
+        assert status["status"] == "done"
+
+    def test_small_backlog_skips_triage(self, db_session, test_user, test_cv):
+        mock_triage, mock_run = self._run(db_session, test_user, test_cv, ["Frontend React role"], min_backlog=5)
+
+        mock_triage.assert_not_called()
+        assert mock_run.call_count == 1
+        assert db_session.query(BatchItem).one().triage_score is None
+
+
+class TestLeases:
+    """Claim-based workers: SKIP LOCKED claims, lease expiry and heartbeats."""
+
+    def _queue(self, db_session, test_cv, *jobs):
+        for jd in jobs:
+            add_to_queue(db_session, test_cv.id, jd, cv_text="test cv")
+        db_session.commit()
+
+    def test_claim_takes_oldest_and_sets_lease(self, db_session, test_cv):
+        self._queue(db_session, test_cv, "Job A", "Job B")
+
+        first = claim_next_item(db_session, "w1")
+        second = claim_next_item(db_session, "w2")
+
+        assert first.job_description == "Job A"
+        assert first.status == BatchItemStatus.RUNNING
+        assert first.lease_owner == "w1"
+        assert first.lease_expires_at is not None
+        assert second.job_description == "Job B"
+        assert claim_next_item(db_session, "w3") is None
+
+    def test_expired_lease_is_reclaimed(self, db_session, test_cv):
+        self._queue(db_session, test_cv, "Job A")
+        item = claim_next_item(db_session, "dead-worker")
+        assert claim_next_item(db_session, "w2") is None
+
+        item.lease_expires_at = datetime.now(UTC) - timedelta(seconds=1)
+        db_session.commit()
+
+        reclaimed = claim_next_item(db_session, "w2")
+        assert reclaimed.id == item.id
+        assert reclaimed.lease_owner == "w2"
+
+    def test_reclaim_counts_as_attempt_and_dead_letters(self, db_session, test_cv):
+        from unittest.mock import patch
+
+        from src.config import settings
+
+        self._queue(db_session, test_cv, "Poison job")
+        with patch.object(settings, "batch_max_attempts", 2):
+            item = claim_next_item(db_session, "w1")
+            item.lease_expires_at = datetime.now(UTC) - timedelta(seconds=1)
+            db_session.commit()
+            assert claim_next_item(db_session, "w2").attempt_count == 1
+
+            item.lease_expires_at = datetime.now(UTC) - timedelta(seconds=1)
+            db_session.commit()
+            assert claim_next_item(db_session, "w3") is None
+
+        assert item.status == BatchItemStatus.DEAD
+        assert item.attempt_count == 2
+        assert item.lease_owner is None
+
+    def test_bulk_items_never_reclaimed(self, db_session, test_cv):
+        self._queue(db_session, test_cv, "Job A")
+        item = db_session.query(BatchItem).one()
+        item.status = BatchItemStatus.RUNNING
+        item.bulk_batch_id = "msgbatch_1"
+        item.lease_expires_at = datetime.now(UTC) - timedelta(hours=1)
+        db_session.commit()
+
+        assert claim_next_item(db_session, "w1") is None
+
+    def test_renew_only_for_owner(self, db_session, test_cv):
+        self._queue(db_session, test_cv, "Job A")
+        item = claim_next_item(db_session, "w1")
+
+        assert renew_lease(db_session, item.id, "w1") is True
+        assert renew_lease(db_session, item.id, "w2") is False
+
+    def test_stale_cleanup_leaves_leased_items_to_reclaim(self, db_session, test_cv):
+        self._queue(db_session, test_cv, "Job A")
+        item = claim_next_item(db_session, "w1")
+        item.updated_at = datetime.now(UTC) - timedelta(minutes=30)
+        db_session.commit()
+
+        assert cleanup_stale_running(db_session, threshold_minutes=10) == 0
+
+    def test_run_worker_drains_queue(self, tmp_path):
+        import threading
+        import time
+        import uuid
+        from unittest.mock import MagicMock, patch
+
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        from src.auth.models import User
+        from src.batch.service import run_worker
+        from src.config import settings
+        from src.cv.models import CVProfile
+        from src.database.base import Base
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'worker.db'}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine)
+        db = factory()
+        user = User(id=uuid.uuid4(), email="w@example.com", password_hash="x")
+        cv = CVProfile(id=uuid.uuid4(), user_id=user.id, raw_text="cv text", name="W")
+        db.add_all([user, cv])
+        db.commit()
+        for i in range(3):
+            add_to_queue(db, cv.id, f"Job {i}", cv_text="cv text")
+        db.commit()
+
+        def _fake_run_analysis(*_a, **_kw):
+            return MagicMock(id=uuid.uuid4()), {"cost_usd": 0.0, "tokens": {"input": 1, "output": 1}}
+
+        stop = threading.Event()
+        with (
+            patch.object(settings, "batch_worker_poll_seconds", 0.01),
+            patch("src.batch.service.run_analysis", side_effect=_fake_run_analysis) as mock_run,
+        ):
+            worker = threading.Thread(target=run_worker, args=(factory, stop), kwargs={"workers": 2})
+            worker.start()
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and mock_run.call_count < 3:
+                time.sleep(0.01)
+            stop.set()
+            worker.join(timeout=5)
+
+        db.expire_all()
+        items = db.query(BatchItem).all()
+        assert {item.status for item in items} == {BatchItemStatus.DONE}
+        assert {item.lease_owner for item in items} == {None}
+        assert mock_run.call_count == 3
+        db.close()
+
+
+def _status_error(status_code: int):
+    import anthropic
+    import httpx
+
+    response = httpx.Response(status_code, request=httpx.Request("POST", "https://api.anthropic.com/v1/messages"))
+    return anthropic.APIStatusError("boom", response=response, body=None)
+
+
+class TestRetries:
+    """Transient failures are retried with backoff, then dead-lettered; permanent ones fail at once."""
+
+    def test_classification(self):
+        assert is_retryable(TimeoutError("slow"))
+        assert is_retryable(_status_error(529))
+        assert is_retryable(_status_error(429))
+        assert not is_retryable(_status_error(400))
+        assert not is_retryable(RuntimeError("no tool_use block"))
+
+    def test_backoff_doubles_with_jitter_and_cap(self):
+        from unittest.mock import patch
+
+        from src.config import settings
+
+        with (
+            patch.object(settings, "batch_retry_base_seconds", 10.0),
+            patch.object(settings, "batch_retry_max_seconds", 60.0),
+        ):
+            assert 5.0 <= retry_delay(1) <= 10.0
+            assert 10.0 <= retry_delay(2) <= 20.0
+            assert 30.0 <= retry_delay(8) <= 60.0
+
+    def _run(self, db_session, test_user, test_cv, side_effect, max_attempts=3):
+        from unittest.mock import patch
+
+        from src.config import settings
+
+        add_to_queue(db_session, test_cv.id, "Job retry", cv_text=test_cv.raw_text)
+        db_session.commit()
+        with (
+            patch.object(settings, "batch_retry_base_seconds", 0.0),
+            patch.object(settings, "batch_max_attempts", max_attempts),
+            patch("src.batch.service._throttle_item", return_value=0.0),
+            patch("src.batch.service.run_analysis", side_effect=side_effect) as mock_run,
+        ):
+            run_batch(get_pending_batch_id(db_session), db_session, test_user.id)
+        return db_session.query(BatchItem).one(), mock_run
+
+    def test_transient_failure_retried_until_success(self, db_session, test_user, test_cv):
+        from unittest.mock import MagicMock
+
+        ok = (MagicMock(id=test_cv.id), {"cost_usd": 0.0, "tokens": {"input": 1, "output": 1}})
+        item, mock_run = self._run(db_session, test_user, test_cv, [TimeoutError("slow"), _status_error(529), ok])
+
+        assert item.status == BatchItemStatus.DONE
+        assert item.attempt_count == 3
+        assert mock_run.call_count == 3
+
+    def test_retries_exhausted_go_dead(self, db_session, test_user, test_cv):
+        item, mock_run = self._run(db_session, test_user, test_cv, TimeoutError("slow"), max_attempts=2)
+
+        assert item.status == BatchItemStatus.DEAD
+        assert mock_run.call_count == 2
+        assert get_batch_status(db_session)["status"] == "error"
+
+    def test_permanent_failure_not_retried(self, db_session, test_user, test_cv):
+        item, mock_run = self._run(db_session, test_user, test_cv, _status_error(400))
+
+        assert item.status == BatchItemStatus.ERROR
+        assert mock_run.call_count == 1
+
+    def test_budget_refusal_defers_item_and_stops(self, db_session, test_user, test_cv):
+        from src.dashboard.service import BudgetExceededError
+
+        item, mock_run = self._run(db_session, test_user, test_cv, BudgetExceededError("Budget insufficiente"))
+
+        assert item.status == BatchItemStatus.PENDING
+        assert item.attempt_count == 0
+        assert item.lease_owner is None
+        assert mock_run.call_count == 1
+
+    def test_scheduled_retry_not_claimable_yet(self, db_session, test_cv):
+        add_to_queue(db_session, test_cv.id, "Job later", cv_text="test cv")
+        item = db_session.query(BatchItem).one()
+        item.next_attempt_at = datetime.now(UTC) + timedelta(minutes=5)
+        db_session.commit()
+
+        assert claim_next_item(db_session, "w1") is None
+
+    def test_requeue_dead(self, db_session, test_cv):
+        add_to_queue(db_session, test_cv.id, "Job dead", cv_text="test cv")
+        item = db_session.query(BatchItem).one()
+        item.status = BatchItemStatus.DEAD
+        item.attempt_count = 4
+        db_session.commit()
+
+        assert requeue_dead(db_session) == 1
+        db_session.commit()
+        assert item.status == BatchItemStatus.PENDING
+        assert item.attempt_count == 0
@@ -1,8 +1,21 @@
 """Tests for cache service."""
 
-from unittest.mock import MagicMock
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
 
-from src.integrations.cache import NullCacheService, RedisCacheService
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src.integrations.cache import (
+    DatabaseCacheService,
+    MemoryCacheService,
+    NullCacheService,
+    RedisCacheService,
+    TieredCacheService,
+    cache_tier_stats,
+    create_cache_service,
+)
+from src.integrations.models import CacheEntry
 
 
 class TestNullCacheService:
@@ -73,3 +86,216 @@ class TestRedisCacheStats:
         # The underlying get() recorded a hit (it returned a string), then
         # parse failed — counter behavior is intentionally raw.
         assert cache.stats()["hits"] == 1
+
+
+@pytest.fixture
+def db_cache(db_session):
+    """DatabaseCacheService on the in-memory test DB (its own sessions, same engine)."""
+    return DatabaseCacheService(max_bytes=1_000, session_factory=sessionmaker(bind=db_session.get_bind()))
+
+
+class TestDatabaseCacheService:
+    def test_roundtrip_and_counters(self, db_cache):
+        assert db_cache.get("k") is None
+        db_cache.set_json("k", {"score": 80}, 60)
+        assert db_cache.get_json("k") == {"score": 80}
+        assert db_cache.stats() == {"hits": 1, "misses": 1, "errors": 0, "evictions": 0}
+
+    def test_overwrite_keeps_one_row(self, db_cache, db_session):
+        db_cache.set("k", "a", 60)
+        db_cache.set("k", "b", 60)
+        assert db_cache.get("k") == "b"
+        assert db_session.query(CacheEntry).count() == 1
+
+    def test_expired_entry_is_a_miss(self, db_cache):
+        db_cache.set("k", "v", 60)
+        later = datetime.now(UTC) + timedelta(seconds=120)
+        with patch("src.integrations.cache.datetime") as fake_dt:
+            fake_dt.now.return_value = later
+            assert db_cache.get("k") is None
+
+    def test_get_with_ttl_reports_remaining_seconds(self, db_cache):
+        db_cache.set("k", "v", 600)
+        value, ttl = db_cache.get_with_ttl("k")
+        assert value == "v"
+        assert 590 <= ttl <= 600
+
+    def test_long_keys_are_hashed(self, db_cache):
+        key = "glassdoor:" + "x" * 400
+        db_cache.set(key, "v", 60)
+        assert db_cache.get(key) == "v"
+
+    def test_size_cap_evicts_closest_to_expiry(self, db_cache, db_session):
+        db_cache.set("short", "x" * 400, 10)
+        db_cache.set("mid", "x" * 400, 100)
+        db_cache.set("long", "x" * 400, 1000)
+        removed = db_cache.evict()
+        assert removed == 1
+        assert db_cache.get("short") is None
+        assert db_cache.get("long") is not None
+        assert db_session.query(CacheEntry).count() == 2
+
+    def test_db_error_is_a_counted_miss(self):
+        broken = MagicMock(side_effect=RuntimeError("db down"))
+        cache = DatabaseCacheService(max_bytes=1_000, session_factory=broken)
+        assert cache.get("k") is None
+        cache.set("k", "v", 60)
+        assert cache.stats()["errors"] == 2
+
+
+class TestTieredCacheService:
+    def test_lower_tier_hit_backfills_upper_with_remaining_ttl(self, db_cache):
+        upper = MagicMock()
+        upper.get_with_ttl = None
+        upper.get.return_value = None
+        db_cache.set("k", "v", 600)
+        tiered = TieredCacheService(upper, db_cache)
+
+        assert tiered.get("k") == "v"
+        key, value, ttl = upper.set.call_args.args
+        assert (key, value) == ("k", "v")
+        assert 590 <= ttl <= 600
+        assert tiered.stats()["hits"] == 1
+
+    def test_redis_outage_still_served_by_db(self, db_cache):
+        client = MagicMock()
+        client.get.side_effect = RuntimeError("redis down")
+        client.setex.side_effect = RuntimeError("redis down")
+        redis_tier = TestRedisCacheStats()._make_cache(client)
+        tiered = TieredCacheService(redis_tier, db_cache)
+
+        tiered.set_json("analysis:k", {"score": 70}, 60)
+        assert tiered.get_json("analysis:k") == {"score": 70}
+        stats = tiered.stats()
+        # write, read, backfill: all fail on Redis, none reaches the caller
+        assert stats["redis_errors"] == 3
+        assert stats["db_hits"] == 1
+        assert stats["errors"] == 3
+
+    def test_miss_everywhere(self, db_cache):
+        tiered = TieredCacheService(NullCacheService(), db_cache)
+        assert tiered.get("nope") is None
+        assert tiered.stats()["misses"] == 1
+
+
+class TestCreateCacheService:
+    def test_db_only_when_redis_unset(self):
+        with patch("src.integrations.cache.settings") as s:
+            s.redis_url = ""
+            s.db_cache_enabled = True
+            s.db_cache_max_bytes = 1_000
+            s.memory_cache_max_bytes = 0
+            assert isinstance(create_cache_service(), DatabaseCacheService)
+
+    def test_db_behind_redis(self):
+        with (
+            patch("src.integrations.cache.settings") as s,
+            patch("src.integrations.cache.RedisCacheService") as redis_cls,
+        ):
+            s.redis_url = "redis://x"
+            s.db_cache_enabled = True
+            s.db_cache_max_bytes = 1_000
+            s.memory_cache_max_bytes = 0
+            cache = create_cache_service()
+        assert isinstance(cache, TieredCacheService)
+        assert cache.tiers[0] is redis_cls.return_value
+
+    def test_redis_failure_degrades_to_db(self):
+        with (
+            patch("src.integrations.cache.settings") as s,
+            patch("src.integrations.cache.RedisCacheService", side_effect=ConnectionError("nope")),
+        ):
+            s.redis_url = "redis://x"
+            s.db_cache_enabled = True
+            s.db_cache_max_bytes = 1_000
+            s.memory_cache_max_bytes = 0
+            assert isinstance(create_cache_service(), DatabaseCacheService)
+
+    def test_null_when_db_tier_disabled(self):
+        with patch("src.integrations.cache.settings") as s:
+            s.redis_url = ""
+            s.db_cache_enabled = False
+            s.memory_cache_max_bytes = 1_000
+            assert isinstance(create_cache_service(), NullCacheService)
+
+    def test_memory_l1_in_front_of_every_tier(self):
+        with (
+            patch("src.integrations.cache.settings") as s,
+            patch("src.integrations.cache.RedisCacheService") as redis_cls,
+        ):
+            s.redis_url = "redis://x"
+            s.db_cache_enabled = True
+            s.db_cache_max_bytes = 1_000
+            s.memory_cache_max_bytes = 1_000
+            s.memory_cache_max_ttl = 60
+            cache = create_cache_service()
+        assert [type(t) for t in cache.tiers] == [
+            MemoryCacheService,
+            type(redis_cls.return_value),
+            DatabaseCacheService,
+        ]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMemoryCacheService:
+    def test_roundtrip_returns_fresh_dicts(self):
+        cache = MemoryCacheService(max_bytes=10_000, max_ttl=60)
+        cache.set_json("glassdoor:acme", {"rating": 4.1}, 3600)
+        first = cache.get_json("glassdoor:acme")
+        first["rating"] = 0
+        assert cache.get_json("glassdoor:acme") == {"rating": 4.1}
+
+    def test_ttl_capped_by_max_ttl(self):
+        clock = FakeClock()
+        cache = MemoryCacheService(max_bytes=10_000, max_ttl=60, clock=clock)
+        cache.set("k", "v", 3600)
+        clock.now = 59
+        assert cache.get("k") == "v"
+        clock.now = 61
+        assert cache.get("k") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction_respects_byte_budget(self):
+        cache = MemoryCacheService(max_bytes=800, max_ttl=60)
+        for key in ("a", "b", "c"):
+            cache.set(key, "x" * 99, 60)  # 100 bytes each with the key
+        cache.get("a")  # a becomes most recent
+        for key in ("d", "e", "f", "g", "h", "i"):
+            cache.set(key, "x" * 99, 60)
+        stats = cache.stats()
+        assert stats["bytes"] <= 800
+        assert stats["evictions"] == 1
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_oversized_entry_not_admitted(self):
+        cache = MemoryCacheService(max_bytes=800, max_ttl=60)
+        cache.set("small", "x", 60)
+        cache.set("big", "x" * 200, 60)
+        assert cache.get("big") is None
+        assert cache.get("small") == "x"
+
+
+class TestCacheTierStats:
+    def test_tiered_reports_each_tier(self):
+        memory = MemoryCacheService(max_bytes=10_000, max_ttl=60)
+        tiered = TieredCacheService(memory, NullCacheService())
+        tiered.set("k", "v", 60)
+        tiered.get("k")
+        tiered.get("missing")
+        tiers = cache_tier_stats(tiered)
+        assert list(tiers) == ["memory", "null"]
+        assert tiers["memory"]["hits"] == 1
+        assert tiers["memory"]["misses"] == 1
+
+    def test_single_service(self):
+        assert cache_tier_stats(MemoryCacheService(max_bytes=10, max_ttl=1)) == {
+            "memory": {"hits": 0, "misses": 0, "errors": 0, "evictions": 0, "entries": 0, "bytes": 0}
+        }
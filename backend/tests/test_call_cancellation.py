@@ -0,0 +1,166 @@
+"""Tests for cancellable AI calls (per-call deadlines, client disconnects)."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.integrations import anthropic_client
+from src.integrations.anthropic_client import (
+    AnthropicGovernor,
+    ClientDisconnectedError,
+    _acall_api_with_tool,
+    _call_api_with_tool,
+    call_deadline,
+    cancel_on_disconnect,
+)
+
+
+def _message():
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="tool_use", input={"ok": True})],
+        usage=SimpleNamespace(
+            input_tokens=100, output_tokens=10, cache_read_input_tokens=0, cache_creation_input_tokens=0
+        ),
+    )
+
+
+def _call_kwargs() -> dict:
+    return {
+        "system_prompt": "sys",
+        "user_prompt": "jd",
+        "model_id": "claude-haiku-4-5-20251001",
+        "max_tokens": 100,
+        "tool_name": "submit_analysis",
+        "tool_description": "d",
+        "input_schema": {"type": "object"},
+    }
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    gov = AnthropicGovernor(max_concurrency=2)
+    monkeypatch.setattr(anthropic_client, "get_governor", lambda: gov)
+    return gov
+
+
+def _sync_client() -> MagicMock:
+    client = MagicMock()
+    client.messages.create.return_value = _message()
+    client.with_options.return_value = client
+    return client
+
+
+def _async_client(delay: float) -> MagicMock:
+    cancelled: list[bool] = []
+
+    async def create(**_params):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return _message()
+
+    client = MagicMock()
+    client.messages.create = create
+    client.with_options.return_value = client
+    client.cancelled = cancelled
+    return client
+
+
+class TestCallDeadline:
+    def test_no_deadline_keeps_client_defaults(self, governor, monkeypatch):
+        client = _sync_client()
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+        _call_api_with_tool(**_call_kwargs())
+        client.with_options.assert_not_called()
+
+    def test_remaining_time_becomes_the_sdk_timeout(self, governor, monkeypatch):
+        client = _sync_client()
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+        with call_deadline(30):
+            _call_api_with_tool(**_call_kwargs())
+        options = client.with_options.call_args.kwargs
+        assert 29 < options["timeout"] <= 30
+        assert options["max_retries"] == 0
+
+    def test_nested_deadline_keeps_the_tighter_one(self, governor, monkeypatch):
+        client = _sync_client()
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+        with call_deadline(5), call_deadline(60):
+            _call_api_with_tool(**_call_kwargs())
+        assert client.with_options.call_args.kwargs["timeout"] <= 5
+
+    def test_expired_deadline_sends_nothing(self, governor, monkeypatch):
+        client = _sync_client()
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+        with call_deadline(0.01):
+            time.sleep(0.02)
+            with pytest.raises(TimeoutError):
+                _call_api_with_tool(**_call_kwargs())
+        client.messages.create.assert_not_called()
+        assert governor.in_flight == 0
+
+    async def test_async_call_is_cancelled_at_the_deadline(self, governor, monkeypatch):
+        client = _async_client(delay=5)
+        monkeypatch.setattr(anthropic_client, "get_async_client", lambda: client)
+        started = time.monotonic()
+        with call_deadline(0.05), pytest.raises(TimeoutError):
+            await _acall_api_with_tool(**_call_kwargs())
+        assert time.monotonic() - started < 1
+        assert client.cancelled == [True]
+        assert governor.in_flight == 0
+
+
+class TestCancelOnDisconnect:
+    @pytest.fixture(autouse=True)
+    def _fast_poll(self, monkeypatch):
+        monkeypatch.setattr(anthropic_client, "_DISCONNECT_POLL_SECONDS", 0.01)
+
+    async def test_disconnect_cancels_the_request(self, governor, monkeypatch):
+        client = _async_client(delay=5)
+        monkeypatch.setattr(anthropic_client, "get_async_client", lambda: client)
+
+        async def gone() -> bool:
+            return True
+
+        with cancel_on_disconnect(gone), pytest.raises(ClientDisconnectedError):
+            await _acall_api_with_tool(**_call_kwargs())
+        assert client.cancelled == [True]
+        assert governor.in_flight == 0
+
+    async def test_connected_client_gets_the_result(self, governor, monkeypatch):
+        client = _async_client(delay=0.05)
+        monkeypatch.setattr(anthropic_client, "get_async_client", lambda: client)
+
+        async def connected() -> bool:
+            return False
+
+        with cancel_on_disconnect(connected):
+            result, _usage = await _acall_api_with_tool(**_call_kwargs())
+        assert result == {"ok": True}
+
+
+class TestBatchDeadline:
+    def test_execute_analysis_runs_under_the_item_deadline(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.batch.service import _execute_analysis
+
+        seen: list[float | None] = []
+
+        def _run(*_a, **_kw):
+            seen.append(anthropic_client._deadline.get())
+            return (MagicMock(), {})
+
+        item = MagicMock(job_description="jd", job_url="", model="haiku", source="manual")
+        cv = MagicMock(raw_text="cv", id="cv-uuid")
+        with ThreadPoolExecutor(max_workers=1) as executor, patch("src.batch.service.run_analysis", side_effect=_run):
+            before = time.monotonic()
+            _execute_analysis(executor, MagicMock(), item, cv, None, "u")
+        assert seen[0] is not None
+        assert before < seen[0] <= time.monotonic() + 90
+        assert anthropic_client._deadline.get() is None
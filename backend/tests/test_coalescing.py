@@ -0,0 +1,136 @@
+"""Tests for single-flight coalescing of identical in-flight AI calls."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.integrations import anthropic_client
+from src.integrations.anthropic_client import (
+    aanalyze_job,
+    analyze_job,
+    generate_cover_letter,
+    generate_followup_email,
+)
+
+_CV = "Marco Rossi — DevOps, Kubernetes, Terraform, AWS."
+_JD = "DevOps Engineer at Acme — Kubernetes, Terraform, AWS, on-call rotation."
+_PAYLOADS = {
+    "submit_analysis": {"company": "Acme", "role": "DevOps", "score": 70},
+    "submit_cover_letter": {"cover_letter": "Gentile...", "subject_lines": ["a"]},
+    "submit_followup_email": {"subject": "Follow-up", "body": "Ciao", "tone_notes": ""},
+}
+
+
+def _usage():
+    return SimpleNamespace(
+        input_tokens=1000, output_tokens=200, cache_read_input_tokens=0, cache_creation_input_tokens=0
+    )
+
+
+@pytest.fixture
+def slow_api(monkeypatch):
+    """``_call_api_with_tool`` that blocks until ``release`` is set; counts the calls."""
+    state = SimpleNamespace(calls=0, started=threading.Event(), release=threading.Event(), fail=False)
+
+    def fake_call(system_prompt, user_prompt, model_id, max_tokens, tool_name=None, **_kw):
+        state.calls += 1
+        state.started.set()
+        assert state.release.wait(5)
+        if state.fail:
+            state.fail = False
+            raise RuntimeError("overloaded")
+        return dict(_PAYLOADS[tool_name]), _usage()
+
+    async def fake_acall(**kwargs):
+        return await asyncio.to_thread(fake_call, **kwargs)
+
+    monkeypatch.setattr(anthropic_client, "_call_api_with_tool", fake_call)
+    monkeypatch.setattr(anthropic_client, "_acall_api_with_tool", fake_acall)
+    return state
+
+
+def _race(slow_api, fn):
+    """Run ``fn`` twice concurrently; the second starts once the first is calling Claude."""
+    results: list = [None, None]
+    errors: list = []
+
+    def run(i):
+        try:
+            results[i] = fn()
+        except Exception as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    leader = threading.Thread(target=run, args=(0,))
+    leader.start()
+    assert slow_api.started.wait(5)
+    follower = threading.Thread(target=run, args=(1,))
+    follower.start()
+    threading.Event().wait(0.05)  # let the follower join the flight
+    slow_api.release.set()
+    leader.join(5)
+    follower.join(5)
+    return results, errors
+
+
+class TestSingleFlight:
+    def test_concurrent_analyses_share_one_call(self, slow_api):
+        (leader, follower), errors = _race(slow_api, lambda: analyze_job(_CV, _JD))
+        assert not errors
+        assert slow_api.calls == 1
+        assert leader["cost_usd"] > 0
+        assert leader.get("coalesced") is None
+        assert follower["coalesced"] is True
+        assert follower["from_cache"] is True
+        assert follower["cost_usd"] == 0.0
+        assert set(follower["tokens"].values()) == {0}
+        assert follower["score"] == leader["score"]
+        assert len(anthropic_client._in_flight) == 0
+
+    def test_follower_result_is_a_private_copy(self, slow_api):
+        (leader, follower), _ = _race(slow_api, lambda: analyze_job(_CV, _JD))
+        follower["company"] = "Changed"
+        assert leader["company"] == "Acme"
+
+    def test_cover_letter_and_followup_coalesce(self, slow_api):
+        analysis = {"role": "DevOps", "company": "Acme", "score": 70, "strengths": [], "gaps": []}
+        (_, letter), _ = _race(slow_api, lambda: generate_cover_letter(_CV, _JD, analysis, "italiano"))
+        assert letter["coalesced"] is True
+
+        slow_api.started.clear()
+        slow_api.release.clear()
+        (_, email), _ = _race(slow_api, lambda: generate_followup_email(_CV, "DevOps", "Acme", 7, "italiano"))
+        assert email["coalesced"] is True
+        assert slow_api.calls == 2
+
+    def test_leader_failure_lets_follower_call_itself(self, slow_api):
+        slow_api.fail = True
+        (leader, follower), errors = _race(slow_api, lambda: analyze_job(_CV, _JD))
+        assert len(errors) == 1
+        assert slow_api.calls == 2
+        assert follower is not None
+        assert follower.get("coalesced") is None
+        assert len(anthropic_client._in_flight) == 0
+
+    def test_different_jds_do_not_coalesce(self, slow_api):
+        slow_api.release.set()
+        analyze_job(_CV, _JD)
+        analyze_job(_CV, _JD + " Remote.")
+        assert slow_api.calls == 2
+
+
+class TestAsyncSingleFlight:
+    def test_async_callers_share_one_call(self, slow_api):
+        async def main():
+            leader = asyncio.create_task(aanalyze_job(_CV, _JD))
+            await asyncio.to_thread(slow_api.started.wait, 5)
+            follower = asyncio.create_task(aanalyze_job(_CV, _JD))
+            await asyncio.sleep(0.05)
+            slow_api.release.set()
+            return await asyncio.gather(leader, follower)
+
+        leader, follower = asyncio.run(main())
+        assert slow_api.calls == 1
+        assert follower["coalesced"] is True
+        assert follower["score"] == leader["score"]
@@ -0,0 +1,122 @@
+"""Tests for prompt compaction of CV and job description text."""
+
+from unittest.mock import patch
+
+from src.config import settings
+from src.integrations import anthropic_client
+from src.integrations.compaction import compact_cv, compact_job_description
+from src.integrations.token_bucket import estimate_tokens
+
+_JD = """DevOps Engineer — Acme
+
+Cerchiamo un DevOps Engineer con esperienza Kubernetes, Terraform e AWS.
+
+Requisiti:
+- 3+ anni su Kubernetes
+- Terraform, CI/CD
+
+Benefit: buoni pasto, smart working, welfare aziendale.
+
+Chi siamo
+
+Acme e' leader nel settore dal 1950, con 40 sedi in Europa e una forte cultura dell'innovazione.
+
+Benefit: buoni pasto, smart working, welfare aziendale.
+
+La ricerca e' rivolta ad entrambi i sessi ai sensi del D.Lgs. 198/2006.
+
+I dati personali saranno trattati ai sensi del Regolamento UE 2016/679 (GDPR).
+
+We use cookies to improve your experience. Accept all"""
+
+
+class TestCompactJobDescription:
+    def test_strips_boilerplate_and_repeats(self):
+        out = compact_job_description(_JD)
+
+        assert "Kubernetes, Terraform e AWS" in out
+        assert "3+ anni su Kubernetes" in out
+        assert out.count("buoni pasto") == 1
+        assert "198/2006" not in out
+        assert "GDPR" not in out
+        assert "cookies" not in out
+        assert "leader nel settore" not in out
+
+    def test_long_mixed_paragraph_kept(self):
+        para = "Requisiti: Kubernetes e AWS. " * 60 + "Candidature nel rispetto del GDPR."
+        assert compact_job_description(para) == para
+
+    def test_mostly_boilerplate_returned_untouched(self):
+        jd = "We are an equal opportunity employer and value diversity in every team.\n\nPython developer."
+        assert compact_job_description(jd) == jd
+
+    def test_gdpr_requirements_kept(self):
+        jd = (
+            "Privacy Engineer — Acme\n\nYou will own our data protection program.\n\n"
+            "Requirements: 3+ years in privacy engineering. Hands-on GDPR compliance, DPIAs and "
+            "records of processing.\n\n"
+            "Nice to have: experience with cookie consent platforms."
+        )
+        assert compact_job_description(jd) == jd
+
+    def test_privacy_bullets_kept(self):
+        jd = (
+            "Data Protection Officer\n\nYou will advise the board on privacy.\n\n"
+            "- Privacy policy drafting\n- Processing of personal data audits\n- GDPR training"
+        )
+        assert compact_job_description(jd) == jd
+
+    def test_frontend_cookie_requirements_kept(self):
+        jd = (
+            "Frontend Developer\n\nBuild our React storefront.\n\n"
+            "You know how cookies, localStorage and session storage differ and when to use each.\n\n"
+            "Implement the cookie banner and consent mode for analytics."
+        )
+        assert compact_job_description(jd) == jd
+
+
+def _long_cv() -> str:
+    header = "Marco Rossi\nmarco@example.com — Milano\nDevOps engineer."
+    experience = "ESPERIENZA\n" + "\n".join(f"Kubernetes and Terraform platform work, year {y}." for y in range(40))
+    hobbies = "INTERESSI\n" + "\n".join(f"Photography trip number {n} across the Alps." for n in range(120))
+    education = "FORMAZIONE\nLaurea L-31 Informatica, Universita' di Milano."
+    return "\n\n".join([header, hobbies, experience, education])
+
+
+class TestCompactCv:
+    def test_short_cv_is_query_independent(self):
+        cv = "Marco Rossi\n\nSKILLS\nKubernetes,   AWS\n\n\n\nPage 2 of 2"
+        assert compact_cv(cv, "Kubernetes job", 3000) == compact_cv(cv, "Sales job", 3000)
+        assert compact_cv(cv, "x", 3000) == "Marco Rossi\n\nSKILLS\nKubernetes, AWS"
+
+    def test_over_budget_keeps_relevant_sections(self):
+        out = compact_cv(_long_cv(), "DevOps with Kubernetes and Terraform, degree in Informatica", 700)
+
+        assert estimate_tokens(out) <= 720
+        assert out.startswith("Marco Rossi")
+        assert "year 39" in out
+        assert "L-31 Informatica" in out
+        assert "[...]" in out
+        assert "Photography" not in out
+        # Original order preserved.
+        assert out.index("ESPERIENZA") < out.index("FORMAZIONE")
+
+    def test_repeated_running_header_dropped(self):
+        cv = "Curriculum Vitae - Marco Rossi\nDevOps\n\nCurriculum Vitae - Marco Rossi\nAWS"
+        assert compact_cv(cv, "", 3000).count("Curriculum Vitae") == 1
+
+
+class TestPromptWiring:
+    def test_analysis_prompt_uses_compacted_jd(self):
+        content = anthropic_client._analysis_user_prompt("Marco Rossi — DevOps", _JD)
+        text = "".join(block["text"] for block in content)
+        assert "GDPR" not in text
+        assert "Kubernetes, Terraform e AWS" in text
+
+    def test_disabled_falls_back_to_truncation(self):
+        cv = "@" * 20_000
+        with patch.object(settings, "ai_compaction_enabled", False):
+            content = anthropic_client._analysis_user_prompt(cv, _JD)
+        text = "".join(block["text"] for block in content)
+        assert "GDPR" in text
+        assert text.count("@") == 12_000
@@ -1,9 +1,14 @@
 """Tests for cover letter service."""
 
+import threading
 import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import event
 
 from src.cover_letter.models import CoverLetter
-from src.cover_letter.service import build_docx, get_cover_letter_by_id
+from src.cover_letter.service import agenerate_cover_letters, agenerate_outreach, build_docx, get_cover_letter_by_id
 
 
 class TestGetCoverLetterById:
@@ -62,3 +67,37 @@ class TestBuildDocx:
 
         buf, filename = build_docx(cl, test_analysis)
         assert filename == "Cover_Letter.docx"
+
+
+class TestPromptInputsOffLoop:
+    """The JD blob and expired analysis fields are loaded in the threadpool, never on the event loop."""
+
+    @pytest.fixture
+    def query_threads(self, db_session, test_analysis):
+        db_session.expire(test_analysis)
+        test_analysis.__dict__.pop("_jd_decoded", None)
+        threads: list[int] = []
+
+        def _record(_state):
+            threads.append(threading.get_ident())
+
+        event.listen(db_session, "do_orm_execute", _record)
+        yield threads
+        event.remove(db_session, "do_orm_execute", _record)
+
+    @pytest.mark.asyncio
+    async def test_cover_letters(self, test_analysis, query_threads):
+        with patch("src.cover_letter.service.agenerate_cover_letter", AsyncMock(return_value={})) as gen:
+            await agenerate_cover_letters(test_analysis, "cv", ["italiano"])
+
+        assert gen.await_args.args[1] == test_analysis.__dict__["_jd_decoded"][1]
+        assert query_threads
+        assert threading.get_ident() not in query_threads
+
+    @pytest.mark.asyncio
+    async def test_outreach(self, test_analysis, query_threads):
+        with patch("src.cover_letter.service.agenerate_outreach_bundle", AsyncMock(return_value={})):
+            await agenerate_outreach(test_analysis, "cv", 3, "", "italiano")
+
+        assert query_threads
+        assert threading.get_ident() not in query_threads
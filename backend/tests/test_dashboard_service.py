@@ -1,10 +1,26 @@
 """Tests for dashboard service."""
 
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src.dashboard.models import AISpendDaily, AISpendEvent, BudgetReservation
 from src.dashboard.service import (
+    BudgetExceededError,
+    _lock_budget,
     add_spending,
+    check_budget_available,
     get_or_create_settings,
     get_spending,
+    release_reservation,
     remove_spending,
+    reserve_budget,
+    roll_up_spending,
+    seed_spending_totals,
+    settle_reservation,
     update_budget,
 )
 
@@ -40,8 +56,9 @@ class TestAddSpending:
         add_spending(db_session, 0.001, 200, 100, is_analysis=False)
         db_session.commit()
 
-        s = get_or_create_settings(db_session)
-        assert s.total_cover_letters == 1
+        event = db_session.query(AISpendEvent).one()
+        assert event.cover_letters == 1
+        assert event.analyses == 0
 
     def test_accumulates_spending(self, db_session):
         add_spending(db_session, 0.005, 1000, 500)
@@ -74,6 +91,104 @@ class TestRemoveSpending:
         assert spending["total_tokens_input"] == 0
 
 
+class TestSpendLedger:
+    def test_add_spending_only_appends(self, db_session):
+        s = get_or_create_settings(db_session)
+        db_session.commit()
+        add_spending(db_session, 0.005, 1000, 500, model="claude-haiku-4-5-20251001")
+        db_session.commit()
+
+        db_session.refresh(s)
+        assert s.total_cost_usd == 0.0
+        event = db_session.query(AISpendEvent).one()
+        assert event.model == "claude-haiku-4-5-20251001"
+        assert event.spent_on == date.today()
+        assert event.rolled_up is False
+
+    def test_roll_up_groups_by_day_and_model(self, db_session):
+        add_spending(db_session, 0.01, 100, 10, model="haiku-id")
+        add_spending(db_session, 0.02, 200, 20, model="haiku-id")
+        add_spending(db_session, 0.30, 300, 30, model="sonnet-id")
+        db_session.commit()
+
+        assert roll_up_spending(db_session) == 3
+        db_session.commit()
+        rows = {row.model: row for row in db_session.query(AISpendDaily).all()}
+        assert rows["haiku-id"].cost_usd == pytest.approx(0.03)
+        assert rows["haiku-id"].analyses == 2
+        assert rows["sonnet-id"].tokens_input == 300
+        assert roll_up_spending(db_session) == 0
+
+    def test_roll_up_is_incremental(self, db_session):
+        add_spending(db_session, 0.01, 100, 10, model="haiku-id")
+        roll_up_spending(db_session)
+        add_spending(db_session, 0.02, 200, 20, model="haiku-id")
+        roll_up_spending(db_session)
+        db_session.commit()
+
+        row = db_session.query(AISpendDaily).one()
+        assert row.cost_usd == pytest.approx(0.03)
+        assert row.tokens_input == 300
+
+    def test_totals_span_opening_balance_rollup_and_pending(self, db_session):
+        s = get_or_create_settings(db_session)
+        s.total_cost_usd = 1.0
+        s.total_analyses = 10
+        add_spending(db_session, 0.25, 100, 10)
+        roll_up_spending(db_session)
+        add_spending(db_session, 0.25, 100, 10)
+        db_session.commit()
+
+        assert check_budget_available(db_session) == (True, "")
+        spending = get_spending(db_session)
+        assert spending["total_cost_usd"] == 1.5
+        assert spending["total_analyses"] == 12
+        assert spending["today_cost_usd"] == 0.5
+
+    def test_reversal_lands_on_the_original_day(self, db_session):
+        yesterday = date.today() - timedelta(days=1)
+        db_session.add(AISpendDaily(spent_on=yesterday, model="", cost_usd=0.5, analyses=1))
+        add_spending(db_session, 0.1, 100, 10)
+        remove_spending(db_session, 0.5, 0, 0, spent_on=yesterday)
+        db_session.commit()
+
+        spending = get_spending(db_session)
+        assert spending["today_cost_usd"] == 0.1
+        assert spending["today_analyses"] == 1
+        assert spending["total_cost_usd"] == 0.1
+        assert spending["total_analyses"] == 1
+
+    def test_get_spending_does_not_roll_up(self, db_session):
+        add_spending(db_session, 0.1, 100, 10)
+        db_session.commit()
+
+        get_spending(db_session)
+        assert db_session.query(AISpendEvent).one().rolled_up is False
+        assert db_session.query(AISpendDaily).count() == 0
+
+    def test_lifespan_rollup_commits(self, db_session, monkeypatch):
+        from sqlalchemy.orm import sessionmaker
+
+        from src import main
+
+        monkeypatch.setattr(main, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+        add_spending(db_session, 0.1, 100, 10, model="haiku-id")
+        db_session.commit()
+
+        assert main._roll_up_spending_once() == 1
+        db_session.expire_all()
+        assert db_session.query(AISpendEvent).one().rolled_up is True
+        assert db_session.query(AISpendDaily).one().cost_usd == pytest.approx(0.1)
+        assert get_spending(db_session)["total_cost_usd"] == 0.1
+
+    def test_seed_skipped_once_the_ledger_has_events(self, db_session, test_analysis):
+        add_spending(db_session, 0.1, 100, 10)
+        db_session.commit()
+        seed_spending_totals(db_session)
+
+        assert get_or_create_settings(db_session).total_cost_usd == 0.0
+
+
 class TestUpdateBudget:
     def test_sets_budget(self, db_session):
         result = update_budget(db_session, 25.0)
@@ -101,3 +216,186 @@ class TestGetSpending:
     def test_remaining_none_when_no_budget(self, db_session):
         spending = get_spending(db_session)
         assert spending["remaining"] is None
+
+
+def _budget(db_session, budget: float, spent: float = 0.0) -> None:
+    s = get_or_create_settings(db_session)
+    s.anthropic_budget = budget
+    s.total_cost_usd = spent
+    db_session.commit()
+
+
+class TestBudgetReservations:
+    def test_no_budget_reserves_nothing(self, db_session):
+        get_or_create_settings(db_session)
+        assert reserve_budget(db_session, 5.0) is None
+        assert db_session.query(BudgetReservation).count() == 0
+
+    def test_reservations_count_against_the_budget(self, db_session):
+        _budget(db_session, 1.0, spent=0.5)
+        assert reserve_budget(db_session, 0.3) is not None
+        with pytest.raises(BudgetExceededError):
+            reserve_budget(db_session, 0.3)
+        assert reserve_budget(db_session, 0.2) is not None
+
+    def test_check_budget_sees_held_cost(self, db_session):
+        _budget(db_session, 1.0, spent=0.5)
+        reserve_budget(db_session, 0.5)
+        ok, msg = check_budget_available(db_session)
+        assert not ok
+        assert "Budget esaurito" in msg
+
+    def test_settle_replaces_estimate_with_actual(self, db_session):
+        _budget(db_session, 1.0)
+        reservation_id = reserve_budget(db_session, 0.9)
+        settle_reservation(db_session, reservation_id, 0.01)
+        row = db_session.get(BudgetReservation, reservation_id)
+        db_session.refresh(row)
+        assert row.amount_usd == 0.01
+        assert row.settled is True
+        assert reserve_budget(db_session, 0.9) is not None
+
+    def test_settle_keeps_the_lease_expiry(self, db_session):
+        _budget(db_session, 1.0)
+        reservation_id = reserve_budget(db_session, 0.9)
+        expires_at = db_session.get(BudgetReservation, reservation_id).expires_at
+        settle_reservation(db_session, reservation_id, 0.01)
+        row = db_session.get(BudgetReservation, reservation_id)
+        db_session.refresh(row)
+        assert row.expires_at == expires_at
+
+    def test_add_spending_deletes_its_reservations(self, db_session):
+        _budget(db_session, 1.0)
+        reservation_id = reserve_budget(db_session, 0.9)
+        settle_reservation(db_session, reservation_id, 0.6)
+        add_spending(db_session, 0.6, 100, 10, reservations=[reservation_id])
+        db_session.commit()
+        assert db_session.query(BudgetReservation).count() == 0
+        # 0.6 spent once, not 0.6 spent + 0.6 held.
+        assert reserve_budget(db_session, 0.35) is not None
+
+    def test_release_frees_the_hold(self, db_session):
+        _budget(db_session, 1.0)
+        reservation_id = reserve_budget(db_session, 0.9)
+        release_reservation(db_session, reservation_id)
+        assert reserve_budget(db_session, 0.9) is not None
+
+    def test_postgres_serializes_on_an_advisory_lock(self):
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        _lock_budget(db)
+        (stmt,), _kw = db.execute.call_args
+        assert "pg_advisory_xact_lock" in str(stmt)
+
+    def test_sqlite_takes_no_lock(self):
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "sqlite"
+        _lock_budget(db)
+        db.execute.assert_not_called()
+
+    def test_expired_reservations_are_ignored_and_pruned(self, db_session):
+        _budget(db_session, 1.0)
+        db_session.add(BudgetReservation(amount_usd=0.9, expires_at=datetime.now(UTC) - timedelta(seconds=1)))
+        db_session.flush()
+        assert reserve_budget(db_session, 0.9) is not None
+        assert db_session.query(BudgetReservation).count() == 1
+
+
+def _tool_message() -> SimpleNamespace:
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="tool_use", input={"ok": True})],
+        usage=SimpleNamespace(
+            input_tokens=1000, output_tokens=100, cache_read_input_tokens=0, cache_creation_input_tokens=0
+        ),
+    )
+
+
+def _one_call(ledger):
+    """Step generator of an operation making a single tool call."""
+    result, _usage = yield ledger._ToolCall("sys", "jd", "claude-haiku-4-5-20251001", 1000, "submit_x", "d", {})
+    return result
+
+
+class TestReservedCalls:
+    """The AI client reserves before each call and settles after it."""
+
+    @pytest.fixture
+    def ledger(self, db_session, monkeypatch):
+        from src.integrations import anthropic_client
+        from src.integrations.anthropic_client import AnthropicGovernor
+
+        monkeypatch.setattr(anthropic_client, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+        monkeypatch.setattr(anthropic_client, "get_governor", lambda: AnthropicGovernor(max_concurrency=2))
+        return anthropic_client
+
+    def test_call_settles_to_actual_cost(self, ledger, db_session, monkeypatch):
+        _budget(db_session, 1.0)
+        client = MagicMock()
+        client.messages.create.return_value = _tool_message()
+        monkeypatch.setattr(ledger, "get_client", lambda: client)
+        with ledger._collect_settled() as settled:
+            ledger._call_api_with_tool("sys", "jd", "claude-haiku-4-5-20251001", 1000, "submit_x", "d", {})
+
+        db_session.expire_all()
+        row = db_session.query(BudgetReservation).one()
+        assert settled == [row.id]
+        assert row.settled is True
+        assert row.amount_usd == pytest.approx(0.0012)
+
+        # The charge removes the hold in the same transaction: counted once.
+        add_spending(db_session, row.amount_usd, 1000, 100, reservations=settled)
+        db_session.commit()
+        assert db_session.query(BudgetReservation).count() == 0
+        assert get_spending(db_session)["total_cost_usd"] == pytest.approx(0.0012)
+
+    def test_settled_reservation_released_without_a_collector(self, ledger, db_session, monkeypatch):
+        _budget(db_session, 1.0)
+        client = MagicMock()
+        client.messages.create.return_value = _tool_message()
+        monkeypatch.setattr(ledger, "get_client", lambda: client)
+        ledger._call_api_with_tool("sys", "jd", "claude-haiku-4-5-20251001", 1000, "submit_x", "d", {})
+
+        db_session.expire_all()
+        assert db_session.query(BudgetReservation).count() == 0
+
+    def test_driven_call_hands_its_reservation_to_the_result(self, ledger, db_session, monkeypatch):
+        _budget(db_session, 1.0)
+        client = MagicMock()
+        client.messages.create.return_value = _tool_message()
+        monkeypatch.setattr(ledger, "get_client", lambda: client)
+
+        result = ledger._run_steps(_one_call(ledger))
+
+        row = db_session.query(BudgetReservation).one()
+        assert result["budget_reservations"] == [row.id]
+        assert "budget_reservations" not in ledger._coalesced_result(result)
+
+    async def test_async_driven_call_hands_its_reservation_to_the_result(self, ledger, db_session, monkeypatch):
+        _budget(db_session, 1.0)
+        client = MagicMock()
+        client.messages.create = AsyncMock(return_value=_tool_message())
+        monkeypatch.setattr(ledger, "get_async_client", lambda: client)
+
+        # Settled on the thread pool: the id must still reach the driver.
+        result = await ledger._arun_steps(_one_call(ledger))
+
+        row = db_session.query(BudgetReservation).one()
+        assert result["budget_reservations"] == [row.id]
+
+    def test_call_refused_when_estimate_does_not_fit(self, ledger, db_session, monkeypatch):
+        _budget(db_session, 1.0, spent=0.999)
+        client = MagicMock()
+        monkeypatch.setattr(ledger, "get_client", lambda: client)
+        with pytest.raises(BudgetExceededError):
+            ledger._call_api_with_tool("sys", "jd", "claude-haiku-4-5-20251001", 1000, "submit_x", "d", {})
+        client.messages.create.assert_not_called()
+
+    def test_failed_call_releases_the_reservation(self, ledger, db_session, monkeypatch):
+        _budget(db_session, 1.0)
+        client = MagicMock()
+        client.messages.create.side_effect = RuntimeError("boom")
+        monkeypatch.setattr(ledger, "get_client", lambda: client)
+        with pytest.raises(RuntimeError):
+            ledger._call_api_with_tool("sys", "jd", "claude-haiku-4-5-20251001", 1000, "submit_x", "d", {})
+        db_session.expire_all()
+        assert db_session.query(BudgetReservation).count() == 0
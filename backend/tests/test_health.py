@@ -40,3 +40,19 @@ class TestHealthEndpoint:
         assert "db" not in r
         assert "version" not in r
         assert "uptime_seconds" not in r
+
+
+class TestHealthCacheEndpoint:
+    def test_reports_per_tier_counters(self, client):
+        from src.integrations.cache import MemoryCacheService, NullCacheService, TieredCacheService
+
+        memory = MemoryCacheService(max_bytes=10_000, max_ttl=60)
+        client.app.state.cache = TieredCacheService(memory, NullCacheService())
+        client.app.state.cache.set("k", "v", 60)
+        client.app.state.cache.get("k")
+
+        r = client.get("/health/cache").json()
+        assert r["status"] == "ok"
+        assert list(r["tiers"]) == ["memory", "null"]
+        assert r["tiers"]["memory"]["hits"] == 1
+        assert "evictions" in r["tiers"]["memory"]
@@ -0,0 +1,295 @@
+"""Tests for hedged interactive AI calls (second attempt after the latency threshold)."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from src.config import settings
+from src.dashboard.models import BudgetReservation
+from src.dashboard.service import get_or_create_settings
+from src.integrations import anthropic_client
+from src.integrations.anthropic_client import (
+    PRIORITY_BATCH,
+    AnthropicGovernor,
+    _acall_api_with_tool,
+    _call_api_with_tool,
+    call_priority,
+)
+
+
+def _message(tool_input: dict, input_tokens: int = 1000, output_tokens: int = 200):
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="tool_use", input=tool_input)],
+        usage=SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_read_input_tokens=0,
+            cache_creation_input_tokens=0,
+        ),
+    )
+
+
+def _call_kwargs() -> dict:
+    return {
+        "system_prompt": "sys",
+        "user_prompt": "jd",
+        "model_id": "claude-haiku-4-5-20251001",
+        "max_tokens": 100,
+        "tool_name": "submit_analysis",
+        "tool_description": "d",
+        "input_schema": {"type": "object"},
+    }
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    gov = AnthropicGovernor(max_concurrency=4)
+    monkeypatch.setattr(anthropic_client, "get_governor", lambda: gov)
+    monkeypatch.setattr(settings, "ai_hedge_after_seconds", 0.05)
+    return gov
+
+
+def _client(*behaviours):
+    """Client whose n-th ``messages.create`` sleeps/returns/raises per ``behaviours[n]``."""
+    calls: list[asyncio.Task] = []
+    cancelled: list[int] = []
+
+    async def create(**_params):
+        index = len(calls)
+        calls.append(asyncio.current_task())
+        delay, outcome = behaviours[index]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _message({"attempt": outcome})
+
+    client = MagicMock()
+    client.messages.create = create
+    client.calls = calls
+    client.cancelled = cancelled
+    return client
+
+
+class TestHedging:
+    async def test_fast_call_is_not_hedged(self, governor, monkeypatch):
+        client = _client((0, "primary"))
+        monkeypatch.setattr(anthropic_client, "get_async_client", lambda: client)
+        result, usage = await _acall_api_with_tool(**_call_kwargs())
+        assert result == {"attempt": "primary"}
+        assert len(client.calls) == 1
+        assert usage.input_tokens == 1000
+        assert governor.stats()["hedges"] == 0
+
+    async def test_slow_primary_loses_to_hedge(self, governor, monkeypatch):
+        client = _client((5, "primary"), (0, "hedge"))
+        monkeypatch.setattr(anthropic_client, "get_async_client", lambda: client)
+        result, usage = await _acall_api_with_tool(**_call_kwargs())
+
+        assert result == {"attempt": "hedge"}
+        assert client.cancelled == [0]
+        # The cancelled primary is charged its input side; output only from the winner.
+        assert usage.input_tokens == 2000
+        assert usage.output_tokens == 200
+        assert governor.stats()["hedges"] == 1
+        assert governor.stats()["hedge_wins"] == 1
+        assert governor.in_flight == 0
+
+    async def test_primary_can_still_win(self, governor, monkeypatch):
+        client = _client((0.1, "primary"), (5, "hedge"))
+        monkeypatch.setattr(anthropic_client, "get_async_client", lambda: client)
+        result, _usage = await _acall_api_with_tool(**_call_kwargs())
+        assert result == {"attempt": "primary"}
+        assert client.cancelled == [1]
+        assert governor.stats()["hedge_wins"] == 0
+
+    async def test_failed_attempt_falls_back_to_the_other(self, governor, monkeypatch):
+        client = _client((0.1, RuntimeError("boom")), (0.2, "hedge"))
+        monkeypatch.setattr(anthropic_client, "get_async_client", lambda: client)
+        result, usage = await _acall_api_with_tool(**_call_kwargs())
+        assert result == {"attempt": "hedge"}
+        assert usage.input_tokens == 1000
+
+    async def test_both_failing_raises(self, governor, monkeypatch):
+        client = _client((0.1, RuntimeError("primary")), (0.1, RuntimeError("hedge")))
+        monkeypatch.setattr(anthropic_client, "get_async_client", lambda: client)
+        with pytest.raises(RuntimeError, match="primary"):
+            await _acall_api_with_tool(**_call_kwargs())
+        assert governor.in_flight == 0
+
+    async def test_batch_priority_is_never_hedged(self, governor, monkeypatch):
+        client = _client((0.1, "primary"), (0, "hedge"))
+        monkeypatch.setattr(anthropic_client, "get_async_client", lambda: client)
+        with call_priority(PRIORITY_BATCH):
+            result, _usage = await _acall_api_with_tool(**_call_kwargs())
+        assert result == {"attempt": "primary"}
+        assert len(client.calls) == 1
+
+    async def test_no_hedge_without_idle_slot(self, governor, monkeypatch):
+        governor.limit = 1
+        client = _client((0.1, "primary"), (0, "hedge"))
+        monkeypatch.setattr(anthropic_client, "get_async_client", lambda: client)
+        result, _usage = await _acall_api_with_tool(**_call_kwargs())
+        assert result == {"attempt": "primary"}
+        assert len(client.calls) == 1
+
+
+class _FakeStream:
+    """Sync ``messages.stream`` double: the final message arrives after ``delay`` unless closed first."""
+
+    def __init__(self, client, index: int, delay: float, outcome) -> None:
+        self._client = client
+        self._index = index
+        self._delay = delay
+        self._outcome = outcome
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def __iter__(self):
+        return iter(())
+
+    def close(self) -> None:
+        self._closed = True
+
+    def get_final_message(self):
+        deadline = time.monotonic() + self._delay
+        while time.monotonic() < deadline:
+            if self._closed:
+                self._client.cancelled.append(self._index)
+                raise RuntimeError("stream closed")
+            time.sleep(0.01)
+        if isinstance(self._outcome, Exception):
+            raise self._outcome
+        return _message({"attempt": self._outcome})
+
+
+def _sync_client(*behaviours):
+    """Sync client whose n-th ``messages.stream`` behaves per ``behaviours[n]``."""
+    client = MagicMock()
+    client.calls = []
+    client.cancelled = []
+
+    def stream(**_params):
+        index = len(client.calls)
+        client.calls.append(index)
+        return _FakeStream(client, index, *behaviours[index])
+
+    client.messages.stream = stream
+    return client
+
+
+class TestSyncHedging:
+    def test_fast_call_is_not_hedged(self, governor, monkeypatch):
+        client = _sync_client((0, "primary"))
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+        result, usage = _call_api_with_tool(**_call_kwargs())
+        assert result == {"attempt": "primary"}
+        assert client.calls == [0]
+        assert usage.input_tokens == 1000
+        assert governor.stats()["hedges"] == 0
+
+    def test_slow_primary_loses_to_hedge(self, governor, monkeypatch):
+        client = _sync_client((5, "primary"), (0, "hedge"))
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+        result, usage = _call_api_with_tool(**_call_kwargs())
+
+        assert result == {"attempt": "hedge"}
+        assert usage.input_tokens == 2000
+        assert usage.output_tokens == 200
+        assert governor.stats()["hedge_wins"] == 1
+        # The primary's stream is closed instead of running for 5 s.
+        deadline = time.monotonic() + 1
+        while client.cancelled != [0] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert client.cancelled == [0]
+
+    def test_both_failing_raises(self, governor, monkeypatch):
+        client = _sync_client((0.1, RuntimeError("primary")), (0.1, RuntimeError("hedge")))
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+        with pytest.raises(RuntimeError, match="primary"):
+            _call_api_with_tool(**_call_kwargs())
+        assert governor.stats()["hedges"] == 1
+
+    def test_batch_priority_is_never_hedged(self, governor, monkeypatch):
+        client = MagicMock()
+        client.messages.create.return_value = _message({"attempt": "primary"})
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+        with call_priority(PRIORITY_BATCH):
+            result, _usage = _call_api_with_tool(**_call_kwargs())
+        assert result == {"attempt": "primary"}
+        client.messages.stream.assert_not_called()
+
+
+def _single_attempt_budget(db_session) -> None:
+    """Budget left for one attempt of ``_call_kwargs()`` but not for a hedge."""
+    params = anthropic_client._tool_request_params(*_call_kwargs().values())
+    s = get_or_create_settings(db_session)
+    s.anthropic_budget = 1.0
+    s.total_cost_usd = 1.0 - anthropic_client._estimate_cost(params) * 1.5
+    db_session.commit()
+
+
+class TestHedgeBudget:
+    @pytest.fixture
+    def ledger(self, db_session, governor, monkeypatch):
+        monkeypatch.setattr(anthropic_client, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+        return db_session
+
+    def test_hedge_reserves_a_second_attempt(self, ledger, monkeypatch):
+        s = get_or_create_settings(ledger)
+        s.anthropic_budget = 1.0
+        ledger.commit()
+        reserved = []
+        reserve = anthropic_client._reserve_budget
+
+        def spy(params):
+            reserved.append(reserve(params))
+            return reserved[-1]
+
+        monkeypatch.setattr(anthropic_client, "_reserve_budget", spy)
+        client = _sync_client((5, "primary"), (0, "hedge"))
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+
+        with anthropic_client._collect_settled():
+            _call_api_with_tool(**_call_kwargs())
+
+        assert len(reserved) == 2
+        ledger.expire_all()
+        # The first reservation is settled to both attempts' cost, the hedge's is released.
+        row = ledger.query(BudgetReservation).one()
+        assert row.id == reserved[0]
+        assert row.settled is True
+
+    def test_no_hedge_when_budget_covers_one_attempt(self, ledger, governor, monkeypatch):
+        _single_attempt_budget(ledger)
+        client = _sync_client((0.2, "primary"), (0, "hedge"))
+        monkeypatch.setattr(anthropic_client, "get_client", lambda: client)
+
+        result, _usage = _call_api_with_tool(**_call_kwargs())
+
+        assert result == {"attempt": "primary"}
+        assert client.calls == [0]
+        assert governor.stats()["hedges"] == 0
+
+    async def test_async_hedge_needs_budget_too(self, ledger, governor, monkeypatch):
+        _single_attempt_budget(ledger)
+        client = _client((0.2, "primary"), (0, "hedge"))
+        monkeypatch.setattr(anthropic_client, "get_async_client", lambda: client)
+
+        result, _usage = await _acall_api_with_tool(**_call_kwargs())
+
+        assert result == {"attempt": "primary"}
+        assert len(client.calls) == 1
+        assert governor.stats()["hedges"] == 0
@@ -0,0 +1,103 @@
+"""Tests for the content-addressed JD blob store."""
+
+import uuid
+
+from src.analysis.models import JobAnalysis
+from src.analysis.service import find_analysis_for_jd
+from src.batch.models import BatchItem
+from src.inbox.models import InboxItem
+from src.integrations.anthropic_client import MODELS, content_hash
+from src.jd_store.models import JDBlob, jd_key
+from src.jd_store.service import jd_seen, legacy_analyses_pending, purge_orphan_jds
+
+_JD = "Cerchiamo un Platform Engineer con esperienza su Kubernetes, Terraform e GCP. " * 6
+
+
+def _store_everywhere(db_session, test_user, test_cv) -> tuple[InboxItem, BatchItem, JobAnalysis]:
+    inbox = InboxItem(id=uuid.uuid4(), user_id=test_user.id, raw_text=_JD)
+    batch = BatchItem(batch_id="b1", cv_id=test_cv.id, job_description=_JD, content_hash="h1")
+    analysis = JobAnalysis(
+        id=uuid.uuid4(),
+        cv_id=test_cv.id,
+        job_description=_JD,
+        content_hash=content_hash(test_cv.raw_text, _JD),
+        model_used=MODELS["haiku"],
+    )
+    db_session.add_all([inbox, batch, analysis])
+    db_session.commit()
+    return inbox, batch, analysis
+
+
+class TestDedup:
+    def test_same_jd_stored_once(self, db_session, test_user, test_cv):
+        inbox, batch, analysis = _store_everywhere(db_session, test_user, test_cv)
+
+        assert db_session.query(JDBlob).count() == 1
+        assert inbox.jd_sha256 == batch.jd_sha256 == analysis.jd_sha256 == jd_key(_JD)
+        assert analysis._job_description_plain == ""
+        assert analysis.job_description_z is None
+
+    def test_text_reloaded_from_blob(self, db_session, test_user, test_cv):
+        _, batch, _ = _store_everywhere(db_session, test_user, test_cv)
+        db_session.expire_all()
+
+        row = db_session.get(BatchItem, batch.id)
+        assert row.job_description == _JD
+
+    def test_second_session_write_is_noop(self, db_session, test_user, test_cv):
+        _store_everywhere(db_session, test_user, test_cv)
+        db_session.add(BatchItem(batch_id="b2", cv_id=test_cv.id, job_description=_JD, content_hash="h2"))
+        db_session.commit()
+
+        assert db_session.query(JDBlob).count() == 1
+
+    def test_equality_filter_uses_key(self, db_session, test_user, test_cv):
+        _, batch, _ = _store_everywhere(db_session, test_user, test_cv)
+
+        hits = db_session.query(BatchItem).filter(BatchItem.job_description == _JD).all()
+        assert [h.id for h in hits] == [batch.id]
+
+
+class TestLookups:
+    def test_jd_seen(self, db_session, test_user, test_cv):
+        assert jd_seen(db_session, _JD) is False
+        _store_everywhere(db_session, test_user, test_cv)
+        assert jd_seen(db_session, _JD) is True
+
+    def test_find_analysis_for_jd(self, db_session, test_user, test_cv):
+        assert find_analysis_for_jd(db_session, test_cv.raw_text, _JD, MODELS["haiku"]) is None
+        _, _, analysis = _store_everywhere(db_session, test_user, test_cv)
+
+        assert find_analysis_for_jd(db_session, test_cv.raw_text, _JD, MODELS["haiku"]).id == analysis.id
+        assert find_analysis_for_jd(db_session, "altro CV", _JD, MODELS["haiku"]) is None
+
+    def test_find_analysis_for_jd_matches_legacy_row(self, db_session, test_user, test_cv):
+        # Pre-036 analysis not backfilled yet: no jd_blobs row, JD in the legacy column.
+        _, _, analysis = _store_everywhere(db_session, test_user, test_cv)
+        analysis.jd_sha256 = None
+        analysis._job_description_plain = _JD
+        db_session.query(InboxItem).delete()
+        db_session.query(BatchItem).delete()
+        db_session.flush()
+        db_session.query(JDBlob).delete()
+        db_session.commit()
+        assert jd_seen(db_session, _JD) is False
+        assert legacy_analyses_pending(db_session) is True
+
+        assert find_analysis_for_jd(db_session, test_cv.raw_text, _JD, MODELS["haiku"]).id == analysis.id
+
+
+class TestPurge:
+    def test_keeps_referenced_blobs(self, db_session, test_user, test_cv):
+        _store_everywhere(db_session, test_user, test_cv)
+        assert purge_orphan_jds(db_session) == 0
+
+    def test_removes_orphans(self, db_session, test_user, test_cv):
+        inbox, batch, analysis = _store_everywhere(db_session, test_user, test_cv)
+        for row in (inbox, batch, analysis):
+            db_session.delete(row)
+        db_session.flush()
+
+        assert purge_orphan_jds(db_session) == 1
+        db_session.commit()
+        assert jd_seen(db_session, _JD) is False
@@ -0,0 +1,182 @@
+"""Tests for on-demand generation of interview scripts and advice."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.analysis.models import JobAnalysis
+from src.analysis.service import ensure_analysis_details, persist_analysis
+from src.dashboard.service import get_spending
+from src.database import get_db
+from src.dependencies import get_current_user
+from src.integrations import anthropic_client
+from src.integrations.anthropic_client import _ANALYSIS_DETAILS_SCHEMA, _ANALYSIS_SCHEMA, analyze_job
+
+_CV = "Marco Rossi — DevOps, Kubernetes, Terraform, AWS."
+_JD = "DevOps Engineer at Acme — Kubernetes, Terraform, AWS, on-call rotation."
+_DETAILS = {
+    "interview_scripts": [{"question": "Perche' Acme?", "suggested_answer": "Perche'..."}],
+    "advice": "Punta sull'esperienza Kubernetes.",
+}
+
+
+def _usage(input_tokens: int = 1000, output_tokens: int = 200):
+    return SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_read_input_tokens=0,
+        cache_creation_input_tokens=0,
+    )
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    """``_call_api_with_tool`` answering per tool; records the tool names called."""
+    state = SimpleNamespace(tools=[], fail=False)
+
+    def fake_call(system_prompt, user_prompt, model_id, max_tokens, tool_name=None, **_kw):
+        state.tools.append(tool_name)
+        if state.fail:
+            raise RuntimeError("overloaded")
+        if tool_name == "submit_analysis_details":
+            return dict(_DETAILS), _usage(800, 600)
+        return {"company": "Acme", "role": "DevOps", "score": 70, "strengths": ["AWS"]}, _usage()
+
+    monkeypatch.setattr(anthropic_client, "_call_api_with_tool", fake_call)
+    return state
+
+
+@pytest.fixture
+def pending_analysis(db_session, test_cv, fake_api):
+    result = analyze_job(_CV, _JD)
+    analysis = persist_analysis(db_session, test_cv.id, _JD, "", result)
+    db_session.commit()
+    fake_api.tools.clear()
+    return analysis
+
+
+class TestTriageSchema:
+    def test_long_sections_moved_to_details_schema(self):
+        assert "interview_scripts" not in _ANALYSIS_SCHEMA["properties"]
+        assert "advice" not in _ANALYSIS_SCHEMA["properties"]
+        assert set(_ANALYSIS_DETAILS_SCHEMA["properties"]) == {"interview_scripts", "advice"}
+
+    def test_analysis_marks_details_pending(self, pending_analysis):
+        assert pending_analysis.details_pending is True
+        assert pending_analysis.interview_scripts == []
+        assert pending_analysis.advice == ""
+
+
+class TestEnsureDetails:
+    def test_generates_and_charges(self, db_session, pending_analysis, fake_api):
+        cost_before = pending_analysis.cost_usd
+        tokens_before = pending_analysis.tokens_output
+
+        assert ensure_analysis_details(db_session, pending_analysis) is True
+
+        assert fake_api.tools == ["submit_analysis_details"]
+        assert pending_analysis.details_pending is False
+        assert pending_analysis.interview_scripts == _DETAILS["interview_scripts"]
+        assert pending_analysis.advice == _DETAILS["advice"]
+        assert pending_analysis.cost_usd > cost_before
+        assert pending_analysis.tokens_output == tokens_before + 600
+        assert get_spending(db_session)["total_cost_usd"] > 0
+
+    def test_noop_when_not_pending(self, db_session, test_analysis, fake_api):
+        assert ensure_analysis_details(db_session, test_analysis) is False
+        assert fake_api.tools == []
+
+    def test_failure_leaves_row_pending(self, db_session, pending_analysis, fake_api):
+        fake_api.fail = True
+        assert ensure_analysis_details(db_session, pending_analysis) is False
+        assert pending_analysis.details_pending is True
+        assert pending_analysis.advice == ""
+
+
+@pytest.fixture
+def route_client(db_session, test_user):
+    from src.main import create_app
+
+    @asynccontextmanager
+    async def _test_lifespan(app):
+        from src.integrations.cache import NullCacheService
+
+        app.state.cache = NullCacheService()
+        yield
+
+    def _db():
+        yield db_session
+
+    with patch("src.main.lifespan", _test_lifespan), patch("src.main.settings") as s:
+        s.trusted_hosts_list = ["*"]
+        s.cors_origins_list = ["*"]
+        s.cors_allow_credentials = True
+        s.secret_key = "test-secret"
+        app = create_app()
+        app.dependency_overrides[get_db] = _db
+        app.dependency_overrides[get_current_user] = lambda: test_user
+        with TestClient(app, raise_server_exceptions=False) as client:
+            yield client
+
+
+def _async_client(tool_input: dict) -> MagicMock:
+    client = MagicMock()
+    client.messages.create = AsyncMock(
+        return_value=SimpleNamespace(content=[SimpleNamespace(type="tool_use", input=tool_input)], usage=_usage())
+    )
+    return client
+
+
+class TestInterviewPrepRoute:
+    def test_pending_row_generated_on_first_request(self, route_client, db_session, pending_analysis):
+        client = _async_client(_DETAILS)
+        with patch("src.integrations.anthropic_client.get_async_client", return_value=client):
+            resp = route_client.get(f"/api/v1/interview-prep/{pending_analysis.id}")
+            again = route_client.get(f"/api/v1/interview-prep/{pending_analysis.id}")
+
+        assert resp.status_code == 200
+        assert resp.json()["advice"] == _DETAILS["advice"]
+        assert again.json()["interview_scripts"] == _DETAILS["interview_scripts"]
+        client.messages.create.assert_awaited_once()
+        assert db_session.get(JobAnalysis, pending_analysis.id).details_pending is False
+
+    def test_complete_row_skips_ai(self, route_client, test_analysis):
+        client = _async_client(_DETAILS)
+        with patch("src.integrations.anthropic_client.get_async_client", return_value=client):
+            resp = route_client.get(f"/api/v1/interview-prep/{test_analysis.id}")
+
+        assert resp.status_code == 200
+        assert resp.json()["advice"] == "Good match overall."
+        client.messages.create.assert_not_called()
+
+
+class TestDetailPage:
+    def test_page_renders_placeholder_without_ai(self, route_client, pending_analysis):
+        client = _async_client(_DETAILS)
+        with patch("src.integrations.anthropic_client.get_async_client", return_value=client):
+            resp = route_client.get(f"/analysis/{pending_analysis.id}")
+
+        assert resp.status_code == 200
+        assert f'data-url="/analysis/{pending_analysis.id}/details"' in resp.text
+        client.messages.create.assert_not_called()
+
+    def test_details_fragment_generates_once(self, route_client, db_session, pending_analysis):
+        client = _async_client(_DETAILS)
+        with patch("src.integrations.anthropic_client.get_async_client", return_value=client):
+            resp = route_client.get(f"/analysis/{pending_analysis.id}/details")
+            again = route_client.get(f"/analysis/{pending_analysis.id}/details")
+            page = route_client.get(f"/analysis/{pending_analysis.id}")
+
+        assert resp.status_code == 200
+        assert "Punta sull&#39;esperienza Kubernetes." in resp.text
+        assert again.text == resp.text
+        client.messages.create.assert_awaited_once()
+        assert db_session.get(JobAnalysis, pending_analysis.id).details_pending is False
+        assert 'id="analysis-details"' not in page.text
+
+    def test_details_fragment_unknown_analysis(self, route_client):
+        resp = route_client.get("/analysis/00000000-0000-0000-0000-000000000000/details")
+        assert resp.status_code == 404
@@ -0,0 +1,205 @@
+"""Tests for near-duplicate JD detection (MinHash + LSH buckets) and its reuse paths."""
+
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.analysis.fingerprint import BAND_COUNT, band_buckets, minhash, similarity
+from src.analysis.models import JobAnalysis, JobAnalysisMinHashBand
+from src.analysis.service import find_near_duplicate, jd_fingerprint_columns
+from src.batch.models import BatchItem, BatchItemStatus
+from src.batch.service import add_to_queue
+from src.dashboard.storage import fill_derived_batch
+from src.database import get_db
+from src.dependencies import get_current_user
+from src.inbox.models import InboxStatus
+from src.inbox.service import ingest, sanitize_raw
+from src.integrations.anthropic_client import MODELS
+
+_JD = (
+    "Acme Cloud S.r.l. is looking for a DevOps Engineer to join our platform team in Milano (hybrid, "
+    "3 days remote). You will design and operate our Kubernetes clusters on AWS, write Terraform modules "
+    "for every new service, and own the CI/CD pipelines in GitHub Actions. You will work closely with "
+    "backend developers to improve observability with Prometheus, Grafana and OpenTelemetry, and you "
+    "will join the on-call rotation. Requirements: 3+ years of experience with Linux administration, "
+    "Docker and Kubernetes in production; solid knowledge of Terraform and AWS (EKS, RDS, IAM, VPC); "
+    "scripting in Python or Bash; good English (B2). Nice to have: Helm, ArgoCD, experience with "
+    "PostgreSQL tuning, security hardening and cost optimisation. We offer: permanent contract, "
+    "RAL 40-50k, meal vouchers, training budget, flexible hours, company laptop."
+)
+# Same posting as pasted from another board: header/footer chrome, different spacing.
+_JD_REPASTED = "Job details\n\n" + _JD.replace(". ", ".\n") + "\nReport job"
+_JD_OTHER = (
+    _JD.replace("DevOps Engineer", "Backend Developer").replace("Kubernetes", "Django").replace("Terraform", "Celery")
+)
+
+
+def _seed(db_session, cv_id, job_description=_JD, model_id=MODELS["haiku"]) -> JobAnalysis:
+    analysis = JobAnalysis(
+        id=uuid.uuid4(),
+        cv_id=cv_id,
+        job_description=job_description,
+        content_hash=uuid.uuid4().hex,
+        model_used=model_id,
+        company="Acme",
+        role="DevOps Engineer",
+        score=77,
+        **jd_fingerprint_columns(job_description),
+    )
+    db_session.add(analysis)
+    db_session.commit()
+    return analysis
+
+
+class TestFingerprint:
+    def test_repasted_posting_is_near_identical(self):
+        assert similarity(minhash(_JD), minhash(_JD_REPASTED)) >= 0.95
+
+    def test_case_and_spacing_are_ignored(self):
+        assert minhash(_JD.upper().replace(" ", "  ")) == minhash(_JD)
+
+    def test_different_posting_is_not(self):
+        assert similarity(minhash(_JD), minhash(_JD_OTHER)) < 0.9
+
+    def test_empty_text_has_no_signature(self):
+        assert minhash("  -- ") is None
+        assert jd_fingerprint_columns("") == {"jd_minhash": None}
+
+    def test_one_bucket_per_band(self):
+        assert len(band_buckets(minhash(_JD))) == BAND_COUNT
+
+
+class TestFindNearDuplicate:
+    def test_finds_repasted_posting(self, db_session, test_cv):
+        seeded = _seed(db_session, test_cv.id)
+        assert db_session.query(JobAnalysisMinHashBand).count() == BAND_COUNT
+
+        found = find_near_duplicate(db_session, _JD_REPASTED, test_cv.id, MODELS["haiku"])
+        assert found is not None
+        analysis, score = found
+        assert analysis.id == seeded.id
+        assert score >= 0.95
+
+    def test_ignores_other_posting_cv_and_model(self, db_session, test_cv):
+        _seed(db_session, test_cv.id)
+        assert find_near_duplicate(db_session, _JD_OTHER, test_cv.id, MODELS["haiku"]) is None
+        assert find_near_duplicate(db_session, _JD, uuid.uuid4(), MODELS["haiku"]) is None
+        assert find_near_duplicate(db_session, _JD, test_cv.id, MODELS["sonnet"]) is None
+
+    def test_threshold_zero_disables(self, db_session, test_cv):
+        _seed(db_session, test_cv.id)
+        with patch("src.analysis.service.settings") as s:
+            s.near_duplicate_similarity = 0
+            assert find_near_duplicate(db_session, _JD, test_cv.id, MODELS["haiku"]) is None
+
+    def test_backfill_fills_pre_migration_rows(self, db_session, test_cv):
+        # Written before 030: no signature column value, no buckets.
+        legacy = JobAnalysis(
+            id=uuid.uuid4(),
+            cv_id=test_cv.id,
+            job_description=_JD,
+            content_hash="h",
+            model_used=MODELS["haiku"],
+            extras={},
+        )
+        empty = JobAnalysis(
+            id=uuid.uuid4(),
+            cv_id=test_cv.id,
+            job_description="",
+            content_hash="e",
+            model_used=MODELS["haiku"],
+            extras={},
+        )
+        db_session.add_all([legacy, empty])
+        db_session.commit()
+        assert find_near_duplicate(db_session, _JD_REPASTED, test_cv.id, MODELS["haiku"]) is None
+
+        assert fill_derived_batch(db_session, 50) == 2
+        db_session.commit()
+
+        assert legacy.jd_minhash == minhash(_JD)
+        assert db_session.query(JobAnalysisMinHashBand).count() == BAND_COUNT
+        assert find_near_duplicate(db_session, _JD_REPASTED, test_cv.id, MODELS["haiku"])[0].id == legacy.id
+        assert fill_derived_batch(db_session, 50) == 0
+
+    def test_buckets_deleted_with_analysis(self, db_session, test_cv):
+        seeded = _seed(db_session, test_cv.id)
+        db_session.delete(seeded)
+        db_session.commit()
+        assert db_session.query(JobAnalysisMinHashBand).count() == 0
+
+
+class TestReusePaths:
+    def test_batch_queue_skips_near_duplicate(self, db_session, test_cv):
+        seeded = _seed(db_session, test_cv.id)
+        _batch_id, _total, skipped = add_to_queue(db_session, test_cv.id, _JD_REPASTED, cv_text="cv")
+        assert skipped == 1
+        item = db_session.query(BatchItem).one()
+        assert item.status == BatchItemStatus.SKIPPED
+        assert item.analysis_id == seeded.id
+
+    def test_inbox_ingest_links_near_duplicate(self, db_session, test_user, test_cv):
+        seeded = _seed(db_session, test_cv.id, job_description=sanitize_raw(_JD))
+        item, dedup = ingest(
+            db_session,
+            user_id=test_user.id,
+            raw_text=_JD_REPASTED,
+            source_url="https://it.indeed.com/viewjob?jk=1",
+            source="indeed",
+        )
+        assert dedup is True
+        assert item.status == InboxStatus.SKIPPED.value
+        assert item.analysis_id == seeded.id
+
+
+@pytest.fixture
+def api_client(db_session, test_user):
+    from src.main import create_app
+
+    @asynccontextmanager
+    async def _test_lifespan(app):
+        from src.integrations.cache import NullCacheService
+
+        app.state.cache = NullCacheService()
+        yield
+
+    def _db():
+        yield db_session
+
+    with patch("src.main.lifespan", _test_lifespan), patch("src.main.settings") as s:
+        s.trusted_hosts_list = ["*"]
+        s.cors_origins_list = ["*"]
+        s.cors_allow_credentials = True
+        s.secret_key = "test-secret"
+        app = create_app()
+        app.dependency_overrides[get_db] = _db
+        app.dependency_overrides[get_current_user] = lambda: test_user
+        with TestClient(app, raise_server_exceptions=False) as client:
+            yield client
+
+
+class TestAnalyzeOffer:
+    def test_offers_reuse_instead_of_calling_claude(self, api_client, db_session, test_cv):
+        seeded = _seed(db_session, test_cv.id)
+        with patch("src.integrations.anthropic_client.get_async_client", side_effect=AssertionError("AI called")):
+            resp = api_client.post("/api/v1/analyze", json={"job_description": _JD_REPASTED})
+
+        assert resp.status_code == 200
+        dup = resp.json()["near_duplicate"]
+        assert dup["analysis_id"] == str(seeded.id)
+        assert dup["redirect"] == f"/analysis/{seeded.id}"
+        assert dup["similarity"] >= 0.95
+        assert dup["company"] == "Acme"
+
+    def test_force_new_skips_the_offer(self, api_client, db_session, test_cv):
+        _seed(db_session, test_cv.id)
+        with (
+            patch("src.analysis.api_routes.find_near_duplicate") as finder,
+            patch("src.analysis.api_routes.aanalyze_and_charge", side_effect=RuntimeError("stop")),
+        ):
+            resp = api_client.post("/api/v1/analyze", json={"job_description": _JD_REPASTED, "force_new": True})
+        finder.assert_not_called()
+        assert "near_duplicate" not in resp.json()
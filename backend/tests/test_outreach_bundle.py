@@ -0,0 +1,145 @@
+"""Tests for the one-call outreach bundle (cover letter + follow-up email + LinkedIn message)."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.cover_letter.models import CoverLetter
+from src.dashboard.service import get_spending
+from src.database import get_db
+from src.dependencies import get_current_user
+from src.integrations import anthropic_client
+from src.integrations.anthropic_client import (
+    generate_cover_letter,
+    generate_followup_email,
+    generate_linkedin_message,
+    generate_outreach_bundle,
+)
+from src.integrations.cache import MemoryCacheService
+
+_CV = "Marco Rossi — DevOps, Kubernetes, Terraform, AWS."
+_JD = "DevOps Engineer at Acme — Kubernetes, Terraform, AWS, on-call rotation."
+_ANALYSIS = {"role": "DevOps", "company": "Acme", "score": 78, "strengths": ["AWS"], "gaps": []}
+_BUNDLE = {
+    "cover_letter": "Gentile team Acme, ...",
+    "subject_lines": ["Candidatura DevOps"],
+    "followup_email": {"subject": "Follow-up candidatura", "body": "Buongiorno, ...", "tone_notes": ""},
+    "linkedin_message": {"message": "Ciao Anna, ...", "connection_note": "Piacere!", "approach_tip": ""},
+}
+
+
+def _usage(input_tokens: int = 1500, output_tokens: int = 900):
+    return SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_read_input_tokens=0,
+        cache_creation_input_tokens=0,
+    )
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    """``_call_api_with_tool`` returning the bundle; records the tool names called."""
+    tools: list[str | None] = []
+
+    def fake_call(system_prompt, user_prompt, model_id, max_tokens, tool_name=None, **_kw):
+        tools.append(tool_name)
+        return dict(_BUNDLE), _usage()
+
+    monkeypatch.setattr(anthropic_client, "_call_api_with_tool", fake_call)
+    return tools
+
+
+def _bundle(cache=None) -> dict:
+    return generate_outreach_bundle(_CV, _JD, _ANALYSIS, 10, "Anna (HR)", "italiano", "haiku", cache)
+
+
+class TestGenerateOutreachBundle:
+    def test_single_call_split_into_three_parts(self, fake_api):
+        result = _bundle()
+
+        assert fake_api == ["submit_outreach_bundle"]
+        assert result["cover_letter"]["cover_letter"] == _BUNDLE["cover_letter"]
+        assert result["followup_email"]["subject"] == "Follow-up candidatura"
+        assert result["linkedin_message"]["connection_note"] == "Piacere!"
+        assert result["cost_usd"] > 0
+
+    def test_seeds_standalone_caches(self, fake_api):
+        cache = MemoryCacheService(max_bytes=1_000_000, max_ttl=3600)
+        _bundle(cache)
+        fake_api.clear()
+
+        email = generate_followup_email(_CV, "DevOps", "Acme", 10, "italiano", "haiku", cache)
+        message = generate_linkedin_message(_CV, "DevOps", "Acme", "Anna (HR)", "italiano", "haiku", cache)
+        letter = generate_cover_letter(_CV, _JD, _ANALYSIS, "italiano", "haiku", cache)
+
+        assert fake_api == []
+        assert email["body"] == "Buongiorno, ..."
+        assert message["message"] == "Ciao Anna, ..."
+        assert letter["cover_letter"] == _BUNDLE["cover_letter"]
+        assert email["cost_usd"] == message["cost_usd"] == 0.0
+
+    def test_repeat_bundle_is_cache_hit(self, fake_api):
+        cache = MemoryCacheService(max_bytes=1_000_000, max_ttl=3600)
+        _bundle(cache)
+        again = _bundle(cache)
+
+        assert fake_api == ["submit_outreach_bundle"]
+        assert again["from_cache"] is True
+
+
+@pytest.fixture
+def route_client(db_session, test_user):
+    from src.main import create_app
+
+    @asynccontextmanager
+    async def _test_lifespan(app):
+        from src.integrations.cache import NullCacheService
+
+        app.state.cache = NullCacheService()
+        yield
+
+    def _db():
+        yield db_session
+
+    with patch("src.main.lifespan", _test_lifespan), patch("src.main.settings") as s:
+        s.trusted_hosts_list = ["*"]
+        s.cors_origins_list = ["*"]
+        s.cors_allow_credentials = True
+        s.secret_key = "test-secret"
+        app = create_app()
+        app.dependency_overrides[get_db] = _db
+        app.dependency_overrides[get_current_user] = lambda: test_user
+        with TestClient(app, raise_server_exceptions=False) as client:
+            yield client
+
+
+class TestOutreachBundleRoute:
+    def test_persists_letter_and_charges_once(self, route_client, db_session, test_analysis):
+        client = MagicMock()
+        client.messages.create = AsyncMock(
+            return_value=SimpleNamespace(content=[SimpleNamespace(type="tool_use", input=_BUNDLE)], usage=_usage())
+        )
+        with patch("src.integrations.anthropic_client.get_async_client", return_value=client):
+            resp = route_client.post("/api/v1/outreach-bundle", data={"analysis_id": str(test_analysis.id)})
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["followup_email"]["subject"] == "Follow-up candidatura"
+        assert body["linkedin_message"]["message"] == "Ciao Anna, ..."
+        client.messages.create.assert_awaited_once()
+
+        letter = db_session.query(CoverLetter).one()
+        assert str(letter.id) == body["cover_letter_id"]
+        assert letter.content == _BUNDLE["cover_letter"]
+        assert letter.cost_usd == pytest.approx(body["cost_usd"])
+        assert get_spending(db_session)["total_cost_usd"] == pytest.approx(body["cost_usd"], abs=1e-4)
+
+    def test_unknown_analysis_404(self, route_client):
+        resp = route_client.post(
+            "/api/v1/outreach-bundle", data={"analysis_id": "00000000-0000-0000-0000-000000000000"}
+        )
+        assert resp.status_code == 404
@@ -0,0 +1,117 @@
+"""Tests for the cached CV prefix of the AI prompts and the cache-read token accounting."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.analysis.service import persist_analysis, rebuild_result
+from src.integrations import anthropic_client
+from src.integrations.anthropic_client import (
+    MODELS,
+    _calculate_cost,
+    _usage_tokens,
+    analyze_job,
+    build_analysis_request,
+    generate_cover_letter,
+    generate_followup_email,
+    generate_linkedin_message,
+)
+
+_CV = "Marco Rossi — DevOps, Kubernetes, Terraform, AWS."
+_JD = "DevOps Engineer at Acme — Kubernetes, Terraform, AWS, on-call rotation."
+
+
+def _usage(input_tokens=1000, output_tokens=200, cache_read=800, cache_write=0):
+    return SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_read_input_tokens=cache_read,
+        cache_creation_input_tokens=cache_write,
+    )
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    """Record every ``user_prompt`` sent to ``_call_api_with_tool``."""
+    calls: list = []
+
+    def fake_call(system_prompt, user_prompt, model_id, max_tokens, tool_name=None, **_kw):
+        calls.append(user_prompt)
+        payload = {
+            "submit_analysis": {"company": "Acme", "role": "DevOps", "score": 70},
+            "submit_cover_letter": {"cover_letter": "Gentile...", "subject_lines": ["a"]},
+            "submit_followup_email": {"subject": "Follow-up", "body": "Ciao", "tone_notes": ""},
+            "submit_linkedin_message": {"message": "Ciao", "connection_note": "Hi", "approach_tip": ""},
+        }[tool_name]
+        return payload, _usage()
+
+    monkeypatch.setattr(anthropic_client, "_call_api_with_tool", fake_call)
+    return calls
+
+
+def _assert_cached_cv_block(content) -> None:
+    assert isinstance(content, list)
+    cv_block, prompt_block = content
+    assert cv_block["cache_control"] == {"type": "ephemeral"}
+    assert _CV in cv_block["text"]
+    assert "cache_control" not in prompt_block
+    assert _CV not in prompt_block["text"]
+
+
+class TestCachedCVPrefix:
+    def test_analysis_puts_cv_in_cached_block(self, captured):
+        analyze_job(_CV, _JD)
+        _assert_cached_cv_block(captured[0])
+        assert _JD in captured[0][1]["text"]
+
+    def test_outreach_prompts_share_the_structure(self, captured):
+        analysis = {"role": "DevOps", "company": "Acme", "score": 70, "strengths": [], "gaps": []}
+        generate_cover_letter(_CV, _JD, analysis, "italiano")
+        generate_followup_email(_CV, "DevOps", "Acme", 7, "italiano")
+        generate_linkedin_message(_CV, "DevOps", "Acme", "", "italiano")
+        assert len(captured) == 3
+        for content in captured:
+            _assert_cached_cv_block(content)
+
+    def test_cv_prefix_is_identical_across_jds(self, captured):
+        analyze_job(_CV, _JD)
+        analyze_job(_CV, _JD + " Remote.")
+        assert captured[0][0] == captured[1][0]
+        assert captured[0][1] != captured[1][1]
+
+    def test_bulk_request_uses_same_content(self):
+        params = build_analysis_request(_CV, _JD)
+        _assert_cached_cv_block(params["messages"][0]["content"])
+
+
+class TestCacheReadTokens:
+    def test_usage_tokens_reports_cache_counters(self):
+        # input_tokens is the uncached tail only; the prompt adds reads and writes.
+        tokens = _usage_tokens(_usage(cache_read=800, cache_write=50))
+        assert tokens == {"input": 1850, "output": 200, "total": 2050, "cache_read": 800, "cache_write": 50}
+
+    def test_cache_hit_cost_counts_the_uncached_tail_in_full(self):
+        # ~3000-token CV served from cache, ~500-token JD tail, 1500 tokens out.
+        usage = _usage(input_tokens=500, output_tokens=1500, cache_read=3000)
+        expected = (500 * 0.80 + 3000 * 0.80 * 0.1 + 1500 * 4.00) / 1_000_000
+        assert _calculate_cost(usage, MODELS["haiku"]) == pytest.approx(expected)
+        assert _usage_tokens(usage)["input"] == 3500
+
+    def test_cache_write_cost(self):
+        usage = _usage(input_tokens=500, output_tokens=0, cache_read=0, cache_write=3000)
+        expected = (500 * 3.00 + 3000 * 3.00 * 1.25) / 1_000_000
+        assert _calculate_cost(usage, MODELS["sonnet"]) == pytest.approx(expected)
+
+    def test_usage_tokens_tolerates_missing_attributes(self):
+        tokens = _usage_tokens(SimpleNamespace(input_tokens=10, output_tokens=5))
+        assert tokens["cache_read"] == 0
+        assert tokens["cache_write"] == 0
+
+    def test_cache_read_persisted_and_rebuilt(self, captured, db_session, test_cv):
+        result = analyze_job(_CV, _JD)
+        assert result["tokens"]["cache_read"] == 800
+
+        analysis = persist_analysis(db_session, test_cv.id, _JD, "", result)
+        db_session.commit()
+        assert analysis.tokens_cache_read == 800
+        assert rebuild_result(analysis)["tokens"]["cache_read"] == 800
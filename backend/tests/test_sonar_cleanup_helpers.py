@@ -285,6 +285,10 @@ class TestBatchHelpers:
         item.job_description = "p"
         item.analysis_id = None
         item.error_message = None
+        item.triage_score = None
+        item.triage_reason = None
+        item.attempt_count = 1
+        item.next_attempt_at = None
         out = _item_dict(item, "done")
         assert out == {
             "id": "id-1",
@@ -292,6 +296,10 @@ class TestBatchHelpers:
             "preview": "p",
             "analysis_id": None,
             "error_message": None,
+            "triage_score": None,
+            "triage_reason": None,
+            "attempt_count": 1,
+            "next_attempt_at": None,
         }
 
     def test_overall_status_running(self) -> None:
@@ -342,13 +350,14 @@ class TestBaseResult:
         a.model_used = "haiku"
         a.tokens_input = 10
         a.tokens_output = 5
+        a.tokens_cache_read = None
         a.cost_usd = 0.001
         out = _base_result(a, from_cache=True)
         assert out["strengths"] == []
         assert out["company_reputation"] == {}
         assert out["career_track"] == "hybrid_a_b"
         assert out["from_cache"] is True
-        assert out["tokens"] == {"input": 10, "output": 5, "total": 15}
+        assert out["tokens"] == {"input": 10, "output": 5, "total": 15, "cache_read": 0}
 
 
 # ---------- interview/routes validators ----------
@@ -662,6 +671,7 @@ class TestBatchProcessingHelpers:
         cv.id = "cv-1"
         with (
             patch("src.batch.service.find_existing_analysis", return_value=None),
+            patch("src.batch.service.choose_item_model", return_value=item.model),
             patch("src.batch.service._execute_analysis", side_effect=RuntimeError("stop")),
         ):
             _process_one_item(MagicMock(), db, item, cv, None, "u")
@@ -1211,14 +1221,12 @@ class TestReverseAnalysisSpending:
 
         from src.analysis.api_routes import _reverse_analysis_spending
         from src.analysis.models import AnalysisStatus, JobAnalysis
-        from src.dashboard.service import add_spending, get_or_create_settings
+        from src.dashboard.service import add_spending, get_spending
 
         # Pre-popola spending
-        settings_row = get_or_create_settings(db_session)
         add_spending(db_session, cost=0.05, tokens_in=1000, tokens_out=500, is_analysis=True)
         db_session.commit()
-        db_session.refresh(settings_row)
-        baseline_total = float(settings_row.total_cost_usd or 0)
+        baseline_total = get_spending(db_session)["total_cost_usd"]
 
         # Crea analysis con cost noto
         analysis = JobAnalysis(
@@ -1238,10 +1246,9 @@ class TestReverseAnalysisSpending:
 
         _reverse_analysis_spending(db_session, analysis, today=date.today())
         db_session.commit()
-        db_session.refresh(settings_row)
 
         # total_cost_usd diminuito di 0.02
-        new_total = float(settings_row.total_cost_usd or 0)
+        new_total = get_spending(db_session)["total_cost_usd"]
         assert abs(new_total - (baseline_total - 0.02)) < 1e-6
 
     def test_reverses_with_cover_letters(self, db_session, test_cv):
@@ -1252,14 +1259,12 @@ class TestReverseAnalysisSpending:
         from src.analysis.api_routes import _reverse_analysis_spending
         from src.analysis.models import AnalysisStatus, JobAnalysis
         from src.cover_letter.models import CoverLetter
-        from src.dashboard.service import add_spending, get_or_create_settings
+        from src.dashboard.service import add_spending, get_spending
 
-        settings_row = get_or_create_settings(db_session)
         add_spending(db_session, cost=0.10, tokens_in=2000, tokens_out=1000, is_analysis=True)
         add_spending(db_session, cost=0.03, tokens_in=300, tokens_out=150, is_analysis=False)
         db_session.commit()
-        db_session.refresh(settings_row)
-        baseline = float(settings_row.total_cost_usd or 0)
+        baseline = get_spending(db_session)["total_cost_usd"]
 
         analysis = JobAnalysis(
             id=uuid.uuid4(),
@@ -1290,8 +1295,7 @@ class TestReverseAnalysisSpending:
 
         _reverse_analysis_spending(db_session, analysis, today=date.today())
         db_session.commit()
-        db_session.refresh(settings_row)
 
-        new_total = float(settings_row.total_cost_usd or 0)
+        new_total = get_spending(db_session)["total_cost_usd"]
         # Reversed: -0.05 (analysis) -0.01 (cl) = -0.06
         assert abs(new_total - (baseline - 0.06)) < 1e-6
@@ -34,6 +34,7 @@ def call_log(monkeypatch):
         tool_name=None,
         tool_description=None,
         input_schema=None,
+        on_field=None,
     ):
         log["models"].append(model_id)
         if not queue:
@@ -0,0 +1,129 @@
+"""Tests for compressed storage of the large text columns."""
+
+import importlib.util
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.analysis.models import JobAnalysis
+from src.batch.models import BatchItem
+from src.dashboard.service import get_db_usage
+from src.dashboard.storage import compress_legacy_batch, invalidate_cache, text_storage_usage
+from src.database.compression import compress_text, decompress_text
+from src.inbox.models import InboxItem
+
+_JD = (
+    "Stiamo cercando un DevOps Engineer da inserire nel team. Requisiti: Kubernetes, Terraform, AWS, "
+    "CI/CD pipelines, monitoring. Offriamo contratto a tempo indeterminato, buoni pasto, smart working. "
+) * 4
+
+
+class TestCodec:
+    def test_roundtrip_unicode(self):
+        text = "Sviluppatore — più di 3 anni, città: Milano 🚀"
+        assert decompress_text(compress_text(text)) == text
+
+    def test_dictionary_beats_plain_zlib(self):
+        import zlib
+
+        assert len(compress_text(_JD)) < len(zlib.compress(_JD.encode(), 9))
+
+    def test_deterministic(self):
+        assert compress_text(_JD) == compress_text(_JD)
+
+    def test_accepts_memoryview(self):
+        assert decompress_text(memoryview(compress_text("ciao"))) == "ciao"
+
+    def test_unknown_format_rejected(self):
+        with pytest.raises(ValueError):
+            decompress_text(b"\x7fabc")
+
+    def test_migration_035_frozen_codec_reads_blobs(self):
+        # The downgrade of 035 carries its own copy of the format 1 codec.
+        path = Path(__file__).resolve().parent.parent / "alembic" / "versions" / "035_compress_text_columns.py"
+        spec = importlib.util.spec_from_file_location("migration_035", path)
+        migration = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(migration)
+
+        assert migration._decompress(compress_text(_JD)) == _JD
+
+
+class TestHybridAttribute:
+    def test_write_goes_to_blob(self, db_session, test_analysis):
+        test_analysis.full_response = _JD
+        db_session.commit()
+        db_session.expire_all()
+
+        row = db_session.get(JobAnalysis, test_analysis.id)
+        assert row.full_response == _JD
+        assert row._full_response_plain == ""
+        assert len(row.full_response_z) < len(_JD)
+
+    def test_full_response_none_roundtrip(self, db_session, test_analysis):
+        test_analysis.full_response = None
+        db_session.commit()
+        assert test_analysis.full_response is None
+        assert test_analysis.full_response_z is None
+
+    def test_legacy_row_read_from_plain_column(self, db_session, test_analysis):
+        test_analysis.jd_sha256 = None
+        test_analysis.job_description_z = None
+        test_analysis._job_description_plain = "legacy JD"
+        db_session.commit()
+        assert db_session.get(JobAnalysis, test_analysis.id).job_description == "legacy JD"
+
+    def test_equality_filter_matches_both_layouts(self, db_session, test_cv):
+        new = BatchItem(batch_id="b1", cv_id=test_cv.id, job_description="Cloud at Acme", content_hash="h1")
+        legacy = BatchItem(batch_id="b1", cv_id=test_cv.id, job_description="", content_hash="h2")
+        legacy._job_description_plain = "Cloud at Acme"
+        db_session.add_all([new, legacy])
+        db_session.commit()
+
+        hits = db_session.query(BatchItem).filter(BatchItem.job_description == "Cloud at Acme").all()
+        assert {h.id for h in hits} == {new.id, legacy.id}
+        assert db_session.query(BatchItem).filter(BatchItem.job_description != "Cloud at Acme").count() == 0
+
+
+def _legacy_inbox(db_session, test_user) -> InboxItem:
+    item = InboxItem(id=uuid.uuid4(), user_id=test_user.id, raw_text="")
+    item._raw_text_plain = _JD
+    db_session.add(item)
+    db_session.commit()
+    return item
+
+
+class TestBackfill:
+    def test_compresses_legacy_rows(self, db_session, test_user):
+        item = _legacy_inbox(db_session, test_user)
+
+        assert compress_legacy_batch(db_session, 50) >= 1
+        db_session.commit()
+
+        assert item.jd_sha256 is not None
+        assert item._raw_text_plain == ""
+        assert item.raw_text == _JD
+        assert compress_legacy_batch(db_session, 50) == 0
+
+    def test_usage_reports_before_after(self, db_session, test_user, test_analysis):
+        _legacy_inbox(db_session, test_user)
+        test_analysis.job_description = _JD
+        db_session.commit()
+
+        invalidate_cache()
+
+        storage = get_db_usage(db_session)["text_storage"]
+        assert storage["pending_rows"] >= 1
+        assert storage["before_mb"] >= storage["after_mb"]
+        assert storage["table_sizes_mb"] is None  # SQLite
+
+    def test_usage_report_cached(self, db_session, test_user):
+        invalidate_cache()
+        first = text_storage_usage(db_session)
+        _legacy_inbox(db_session, test_user)
+
+        with patch("src.dashboard.storage._measure_text_storage") as measure:
+            assert text_storage_usage(db_session) == first
+            measure.assert_not_called()
+        assert text_storage_usage(db_session, force=True)["pending_rows"] == first["pending_rows"] + 1
@@ -0,0 +1,88 @@
+"""Tests for the shared Anthropic RPM/TPM token buckets."""
+
+import pytest
+
+from src.integrations.token_bucket import AnthropicThrottle, TokenBucket, estimate_tokens
+
+
+class FakeClock:
+    """Deterministic monotonic clock; ``sleep`` just advances time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    def test_starts_full(self):
+        clock = FakeClock()
+        bucket = TokenBucket(10, 60.0, clock, clock.sleep)
+        assert bucket.available == 10
+
+    def test_try_acquire_drains_and_refuses(self):
+        clock = FakeClock()
+        bucket = TokenBucket(2, 60.0, clock, clock.sleep)
+        assert bucket.try_acquire(1)
+        assert bucket.try_acquire(1)
+        assert not bucket.try_acquire(1)
+
+    def test_refills_linearly(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, 60.0, clock, clock.sleep)
+        bucket.try_acquire(60)
+        clock.now += 10
+        assert bucket.available == pytest.approx(10)
+
+    def test_acquire_waits_for_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, 60.0, clock, clock.sleep)
+        bucket.try_acquire(60)
+        waited = bucket.acquire(30)
+        assert waited == pytest.approx(30, rel=0.01)
+
+    def test_oversized_request_is_clamped_to_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(10, 60.0, clock, clock.sleep)
+        assert bucket.try_acquire(1_000)
+        assert bucket.available == 0
+
+    def test_rejects_non_positive_capacity(self):
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+
+class TestAnthropicThrottle:
+    def test_no_wait_under_budget(self):
+        clock = FakeClock()
+        throttle = AnthropicThrottle(50, 50_000, clock, clock.sleep)
+        assert throttle.acquire(1_000) == 0
+        assert clock.slept == []
+
+    def test_rpm_bucket_paces_requests(self):
+        clock = FakeClock()
+        throttle = AnthropicThrottle(2, 1_000_000, clock, clock.sleep)
+        throttle.acquire(10)
+        throttle.acquire(10)
+        waited = throttle.acquire(10)
+        # 2 RPM → one slot every 30 s
+        assert waited == pytest.approx(30, rel=0.01)
+
+    def test_tpm_bucket_paces_large_prompts(self):
+        clock = FakeClock()
+        throttle = AnthropicThrottle(1_000, 6_000, clock, clock.sleep)
+        throttle.acquire(6_000)
+        waited = throttle.acquire(3_000)
+        # 6000 TPM → 100 tokens/s → 3000 tokens need 30 s
+        assert waited == pytest.approx(30, rel=0.01)
+
+
+def test_estimate_tokens_uses_char_ratio():
+    assert estimate_tokens("a" * 400, "b" * 400) == 200
+    assert estimate_tokens("") == 1
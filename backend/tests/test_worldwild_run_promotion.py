@@ -19,6 +19,8 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from src.analysis.models import AnalysisSource, JobAnalysis
+from src.config import settings
+from src.dashboard.service import get_spending
 from src.database.base import Base
 from src.database.worldwild_db import WorldwildBase
 from src.worldwild import audit_models, models  # noqa: F401  -- register tables
@@ -26,6 +28,7 @@ from src.worldwild.models import (
     DECISION_PENDING,
     PROMOTION_STATE_DONE,
     PROMOTION_STATE_FAILED,
+    PROMOTION_STATE_SKIPPED_LOW_MATCH,
     Decision,
     JobOffer,
 )
@@ -317,3 +320,64 @@ class TestSendToPulse:
         mock_run.assert_not_called()
         decision = secondary_db.query(Decision).filter(Decision.job_offer_id == offer_id).one()
         assert decision.promoted_to_neon_id == existing_id
+
+
+def _triage(score: int) -> dict[str, Any]:
+    return {
+        "score": score,
+        "career_track": "plan_a_devops",
+        "reason": "stack lontano",
+        "cost_usd": 0.0004,
+        "tokens": {"input": 900, "output": 30},
+    }
+
+
+class TestTriageGate:
+    """Con ``ai_triage_min_score`` > 0 l'analisi completa parte solo sopra soglia."""
+
+    def _send(self, primary_db: Any, secondary_db: Any, offer_id: UUID, triage_score: int) -> Any:
+        cv_id = uuid4()
+        with (
+            patch.object(settings, "ai_triage_min_score", 60),
+            patch("src.worldwild.services.promote.get_latest_cv", return_value=MagicMock(id=cv_id, raw_text="cv")),
+            patch("src.worldwild.services.promote.check_budget_available", return_value=(True, "")),
+            patch("src.worldwild.services.promote.triage_job", return_value=_triage(triage_score)) as mock_triage,
+            patch(
+                "src.worldwild.services.promote.analyze_and_charge",
+                side_effect=_fake_run_analysis_factory(primary_db, cv_id),
+            ) as mock_run,
+        ):
+            result = send_to_pulse(primary_db, secondary_db, offer_id=offer_id, user_id=uuid4())
+        return result, mock_triage, mock_run
+
+    def test_low_triage_score_skips_full_analysis(self, primary_db: Any, secondary_db: Any) -> None:
+        offer_id = _seed_offer(secondary_db)
+        result, mock_triage, mock_run = self._send(primary_db, secondary_db, offer_id, 35)
+
+        assert result.state == PROMOTION_STATE_SKIPPED_LOW_MATCH
+        assert result.skipped_reason == "triage_low_score"
+        mock_triage.assert_called_once()
+        mock_run.assert_not_called()
+        decision = secondary_db.query(Decision).filter(Decision.job_offer_id == offer_id).one()
+        assert decision.promotion_score == 35
+        assert decision.promotion_error == "triage 35/100: stack lontano"
+        # Il triage costa comunque: finisce nel ledger, ma non come analisi.
+        ledger = get_spending(primary_db)
+        assert ledger["total_cost_usd"] == pytest.approx(0.0004)
+        assert ledger["total_analyses"] == 0
+
+    def test_high_triage_score_escalates(self, primary_db: Any, secondary_db: Any) -> None:
+        offer_id = _seed_offer(secondary_db)
+        result, _, mock_run = self._send(primary_db, secondary_db, offer_id, 75)
+
+        assert result.state == PROMOTION_STATE_DONE
+        mock_run.assert_called_once()
+
+    def test_second_click_overrides_triage(self, primary_db: Any, secondary_db: Any) -> None:
+        offer_id = _seed_offer(secondary_db)
+        self._send(primary_db, secondary_db, offer_id, 35)
+        result, mock_triage, mock_run = self._send(primary_db, secondary_db, offer_id, 35)
+
+        assert result.state == PROMOTION_STATE_DONE
+        mock_triage.assert_not_called()
+        mock_run.assert_called_once()
@@ -0,0 +1,40 @@
+/**
+ * Analysis detail: advice + interview scripts generated on first open.
+ *
+ * The page renders without waiting for Claude; the sections are fetched
+ * (and generated server-side if still pending) only when the user opens
+ * the collapsible card.
+ */
+
+function initAnalysisDetails() {
+    const box = document.getElementById('analysis-details');
+    if (!box) return;
+
+    box.addEventListener('toggle', function() {
+        if (!box.open || box.dataset.loading) return;
+        box.dataset.loading = '1';
+        loadAnalysisDetails(box);
+    });
+}
+
+function loadAnalysisDetails(box) {
+    const body = document.getElementById('analysis-details-body');
+    body.textContent = '⏳ Generazione in corso…';
+    fetch(box.dataset.url)
+        .then(function(r) {
+            if (!r.ok) throw new Error('analysis details HTTP ' + r.status);
+            return r.text();
+        })
+        .then(function(html) {
+            body.classList.remove('generated-label');
+            body.innerHTML = html;
+        })
+        .catch(function(e) {
+            // Allow a retry on the next open.
+            delete box.dataset.loading;
+            body.textContent = '❌ Errore di rete, riapri la sezione per riprovare';
+            console.error('loadAnalysisDetails error:', e);
+        });
+}
+
+document.addEventListener('DOMContentLoaded', initAnalysisDetails);
@@ -1,6 +1,10 @@
 /**
  * AJAX analysis submission with background completion tracking.
  * If user navigates away during analysis, a banner appears when done.
+ *
+ * The request goes to the streaming endpoint: score, company, role and
+ * strengths are rendered in #analyze-preview as soon as the model has
+ * emitted them, then the page redirects to the saved analysis.
  */
 
 function submitAnalysis(e) {
@@ -31,17 +35,25 @@ function submitAnalysis(e) {
         startedAt: new Date().toISOString()
     }));
 
+    // Set by _offerNearDuplicate when the user declines reusing a
+    // near-identical earlier analysis: this submit must run a fresh one.
+    const forceNew = form.dataset.forceNew === '1';
+    delete form.dataset.forceNew;
+
     const payload = JSON.stringify({
         job_description: jobDesc,
         job_url: jobUrl,
-        model: model
+        model: model,
+        force_new: forceNew
     });
 
-    fetch('/api/v1/analyze', {
+    _resetPreview();
+
+    fetch('/api/v1/analyze/stream', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
-            'Accept': 'application/json'
+            'Accept': 'text/event-stream, application/json'
         },
         body: payload,
         keepalive: true
@@ -53,19 +65,26 @@ function submitAnalysis(e) {
             sessionStorage.removeItem('pendingAnalysis');
             return null;
         }
-        if (!r.ok) {
+        if (!r.ok && r.status !== 400) {
             // 5xx/4xx (≠429): server in errore → toast + reset loading
             // invece di crashare su r.json() che parserebbe HTML d'errore.
             throw new Error('analyze HTTP ' + r.status);
         }
-        return r.json();
+        // Preflight errors and cache hits come back as plain JSON;
+        // a fresh analysis streams field/done/error SSE frames.
+        const type = r.headers.get('Content-Type') || '';
+        return type.startsWith('text/event-stream') ? _readAnalysisStream(r) : r.json();
     })
     .then(function(data) {
         if (!data) return;
         sessionStorage.removeItem('pendingAnalysis');
         if (data.error) {
             _showAnalysisError(data.error);
+            _resetPreview();
+            resetLoading(wrapper);
+        } else if (data.near_duplicate) {
             resetLoading(wrapper);
+            _offerNearDuplicate(data.near_duplicate, form);
         } else if (data.redirect) {
             globalThis.location.href = data.redirect;
         }
@@ -87,6 +106,22 @@ function submitAnalysis(e) {
     return false;
 }
 
+function _offerNearDuplicate(dup, form) {
+    const when = dup.created_at ? new Date(dup.created_at).toLocaleDateString('it-IT') : '';
+    const what = [dup.role, dup.company].filter(Boolean).join(' @ ') || 'annuncio';
+    const ok = globalThis.confirm(
+        'Annuncio simile al ' + Math.round(dup.similarity * 100) + '% gia\' analizzato'
+        + (when ? ' il ' + when : '') + ' (' + what + ', score ' + dup.score + ').\n\n'
+        + 'OK = apri l\'analisi esistente, Annulla = esegui una nuova analisi.'
+    );
+    if (ok) {
+        globalThis.location.href = dup.redirect;
+        return;
+    }
+    form.dataset.forceNew = '1';
+    form.requestSubmit();
+}
+
 function resetLoading(wrapper) {
     if (wrapper && typeof Alpine !== 'undefined') {
         try { Alpine.$data(wrapper).analyzeLoading = false; } catch (e) {
@@ -124,3 +159,73 @@ function _showAnalysisError(msg) {
     }
 
 }
+
+/**
+ * Consume the SSE body of /api/v1/analyze/stream (fetch, not EventSource:
+ * the request is a POST). Resolves with the payload of the final
+ * ``done``/``error`` frame, rendering ``field`` frames along the way.
+ */
+async function _readAnalysisStream(response) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let sep;
+        while ((sep = buffer.indexOf('\n\n')) !== -1) {
+            const frame = _parseFrame(buffer.slice(0, sep));
+            buffer = buffer.slice(sep + 2);
+            if (!frame) continue;
+            if (frame.event === 'field') {
+                _renderPreviewField(frame.data.name, frame.data.value);
+            } else if (frame.event === 'done' || frame.event === 'error') {
+                return frame.data;
+            }
+        }
+    }
+    throw new Error('analyze stream closed early');
+}
+
+function _parseFrame(block) {
+    let event = 'message';
+    let data = '';
+    block.split('\n').forEach(function(line) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+    });
+    if (!data) return null;
+    try {
+        return { event: event, data: JSON.parse(data) };
+    } catch (e) {
+        console.debug('analyze stream: bad frame', e);
+        return null;
+    }
+}
+
+function _renderPreviewField(name, value) {
+    const preview = document.getElementById('analyze-preview');
+    const el = preview ? preview.querySelector('[data-field="' + name + '"]') : null;
+    if (!el) return;
+    preview.hidden = false;
+    if (name === 'strengths' && Array.isArray(value)) {
+        el.replaceChildren();
+        value.forEach(function(item) {
+            const li = document.createElement('li');
+            li.textContent = typeof item === 'string' ? item : JSON.stringify(item);
+            el.appendChild(li);
+        });
+    } else if (name === 'score') {
+        el.textContent = value + '/100';
+    } else {
+        el.textContent = String(value ?? '');
+    }
+}
+
+function _resetPreview() {
+    const preview = document.getElementById('analyze-preview');
+    if (!preview) return;
+    preview.hidden = true;
+    preview.querySelectorAll('[data-field]').forEach(function(el) { el.replaceChildren(); });
+}
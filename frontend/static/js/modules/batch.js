@@ -21,7 +21,9 @@ function batchManager() {
             if (status === 'done') return '#34d399';
             if (status === 'running') return '#fbbf24';
             if (status === 'error') return '#f87171';
+            if (status === 'dead') return '#b91c1c';
             if (status === 'skipped') return '#94a3b8';
+            if (status === 'filtered') return '#a78bfa';
             return '#64748b';
         },
 
@@ -36,7 +38,10 @@ function batchManager() {
                             preview: item.preview || '',
                             status: item.status,
                             analysis_id: item.analysis_id,
-                            error_message: item.error_message
+                            error_message: item.error_message,
+                            result_preview: item.status === 'filtered'
+                                ? 'triage ' + item.triage_score + '/100: ' + (item.triage_reason || '')
+                                : ''
                         };
                     });
                     this.lastKnownBatchId = data.batch_id;
@@ -81,11 +86,39 @@ function batchManager() {
                 .catch((e) => { console.error('batchAdd error:', e); });
         },
 
+        // Cost/ETA estimate of the pending batch, confirmed before /batch/run.
+        planMessage: function(plan) {
+            const minutes = Math.max(1, Math.round(plan.estimated_seconds / 60));
+            let msg = 'Batch: ' + plan.planned + '/' + plan.items + ' offerte, costo stimato $'
+                + plan.estimated_cost_usd.toFixed(4) + ', circa ' + minutes + ' min.';
+            if (plan.remaining_budget_usd !== null) {
+                msg += '\nBudget residuo: $' + plan.remaining_budget_usd.toFixed(4) + '.';
+            }
+            if (plan.downgraded > 0) msg += '\n' + plan.downgraded + ' passano a Haiku per restare nel budget.';
+            if (plan.deferred > 0) msg += '\n' + plan.deferred + ' non stanno nel budget e restano in coda.';
+            return msg + '\n\nAvviare?';
+        },
+
         runAll: function() {
+            fetchJSON('/api/v1/batch/plan')
+                .then((plan) => {
+                    if (!plan) return;
+                    if (!globalThis.confirm(this.planMessage(plan))) return;
+                    this.startRun(plan.budget_policy);
+                })
+                .catch((e) => {
+                    console.error('batchPlan error:', e);
+                    showToast('Stima del batch non disponibile', 'error');
+                });
+        },
+
+        startRun: function(onBudget) {
             this.running = true;
             this.statusText = 'Analisi in corso...';
 
-            fetch('/api/v1/batch/run', { method: 'POST' })
+            const fd = new FormData();
+            fd.append('on_budget', onBudget);
+            fetch('/api/v1/batch/run', { method: 'POST', body: fd })
                 .then((r) => {
                     if (handleRateLimit(r, 'Troppe richieste batch')) { this.running = false; return null; }
                     if (!r.ok) { this.running = false; throw new Error('batch/run HTTP ' + r.status); }
@@ -114,7 +147,10 @@ function batchManager() {
                             preview: item.preview || '',
                             status: item.status,
                             analysis_id: item.analysis_id,
-                            error_message: item.error_message
+                            error_message: item.error_message,
+                            result_preview: item.status === 'filtered'
+                                ? 'triage ' + item.triage_score + '/100: ' + (item.triage_reason || '')
+                                : ''
                         };
                     });
 
@@ -123,7 +159,7 @@ function batchManager() {
                     } else if (data.status === 'done') {
                         this.running = false;
                         const ok = (data.counts?.done) || 0;
-                        const err = (data.counts?.error) || 0;
+                        const err = ((data.counts?.error) || 0) + ((data.counts?.dead) || 0);
                         this.statusText = 'Completato: ' + ok + ' ok, ' + err + ' errori';
                         if (typeof refreshSpending === 'function') refreshSpending();
                         showToast('Batch completato (' + ok + '/' + data.total + ') — apro lo storico', 'success');
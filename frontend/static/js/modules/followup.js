@@ -1,5 +1,5 @@
 /**
- * Follow-up email and LinkedIn message generation.
+ * Follow-up email, LinkedIn message and outreach bundle generation.
  */
 
 function _createGenBox(label, id) {
@@ -58,6 +58,48 @@ function _addGenMeta(parent, cost, tokens, extra) {
 }
 
 
+function _renderFollowup(box, data, id) {
+    const lbl = document.createElement('div');
+    lbl.className = 'generated-label';
+    lbl.textContent = '\u2709\uFE0F Email di follow-up';
+    box.appendChild(lbl);
+
+    const subj = document.createElement('div');
+    subj.className = 'generated-text';
+    subj.style.fontWeight = '600';
+    subj.textContent = 'Oggetto: ' + data.subject;
+    box.appendChild(subj);
+
+    _addGenText(box, data.body, 'followup-body-' + id);
+    _addCopyBtn(box, 'followup-body-' + id);
+}
+
+function _renderLinkedin(box, data, id) {
+    const lbl = document.createElement('div');
+    lbl.className = 'generated-label';
+    lbl.textContent = '\uD83D\uDCBC Messaggio LinkedIn';
+    box.appendChild(lbl);
+
+    _addGenText(box, data.message, 'linkedin-msg-' + id);
+    _addCopyBtn(box, 'linkedin-msg-' + id);
+
+    if (data.connection_note) {
+        const lbl2 = document.createElement('div');
+        lbl2.className = 'generated-label';
+        lbl2.style.marginTop = '8px';
+        lbl2.textContent = '\uD83E\uDD1D Nota connessione';
+        box.appendChild(lbl2);
+
+        _addGenText(box, data.connection_note, 'linkedin-conn-' + id);
+        _addCopyBtn(box, 'linkedin-conn-' + id);
+    }
+
+    if (data.approach_tip) {
+        _addGenMeta(box, 0, 0, data.approach_tip);
+    }
+}
+
+
 function genFollowup(id) {
     const g = _createGenBox('\u23F3 Generazione email follow-up...', id);
     if (!g) return;
@@ -85,19 +127,7 @@ function genFollowup(id) {
                 return;
             }
 
-            const lbl = document.createElement('div');
-            lbl.className = 'generated-label';
-            lbl.textContent = '\u2709\uFE0F Email di follow-up';
-            g.box.appendChild(lbl);
-
-            const subj = document.createElement('div');
-            subj.className = 'generated-text';
-            subj.style.fontWeight = '600';
-            subj.textContent = 'Oggetto: ' + data.subject;
-            g.box.appendChild(subj);
-
-            _addGenText(g.box, data.body, 'followup-body-' + id);
-            _addCopyBtn(g.box, 'followup-body-' + id);
+            _renderFollowup(g.box, data, id);
             _addGenMeta(g.box, data.cost_usd, data.tokens?.total);
             if (typeof refreshSpending === 'function') refreshSpending();
         })
@@ -139,29 +169,58 @@ function genLinkedin(id) {
                 return;
             }
 
-            const lbl = document.createElement('div');
-            lbl.className = 'generated-label';
-            lbl.textContent = '\uD83D\uDCBC Messaggio LinkedIn';
-            g.box.appendChild(lbl);
+            _renderLinkedin(g.box, data, id);
+            _addGenMeta(g.box, data.cost_usd, data.tokens?.total);
+            if (typeof refreshSpending === 'function') refreshSpending();
+        })
+        .catch(function(e) {
+            while (g.box.firstChild) g.box.firstChild.remove();
+            const errLbl = document.createElement('div');
+            errLbl.className = 'generated-label';
+            errLbl.textContent = '\u274C Errore di rete';
+            g.box.appendChild(errLbl);
+            console.error('genLinkedin error:', e);
+        });
+}
+
 
-            _addGenText(g.box, data.message, 'linkedin-msg-' + id);
-            _addCopyBtn(g.box, 'linkedin-msg-' + id);
+// Cover letter + email + LinkedIn in una sola chiamata: la lettera viene
+// salvata nello storico (visibile dopo reload), email e messaggio vengono
+// mostrati qui e restano in cache per i bottoni Email / LinkedIn.
+function genOutreach(id) {
+    const g = _createGenBox('\u23F3 Generazione lettera + email + LinkedIn...', id);
+    if (!g) return;
 
-            if (data.connection_note) {
-                const lbl2 = document.createElement('div');
-                lbl2.className = 'generated-label';
-                lbl2.style.marginTop = '8px';
-                lbl2.textContent = '\uD83E\uDD1D Nota connessione';
-                g.box.appendChild(lbl2);
+    const fd = new FormData();
+    fd.append('analysis_id', id);
+    fd.append('language', 'italiano');
 
-                _addGenText(g.box, data.connection_note, 'linkedin-conn-' + id);
-                _addCopyBtn(g.box, 'linkedin-conn-' + id);
-            }
+    fetch('/api/v1/outreach-bundle', { method: 'POST', body: fd })
+        .then(function(r) {
+            if (handleRateLimit(r, 'Troppe richieste')) return null;
+            if (!r.ok && r.status !== 402) throw new Error('outreach-bundle HTTP ' + r.status);
+            return r.json();
+        })
+        .then(function(data) {
+            if (!data) return;
+            while (g.box.firstChild) g.box.firstChild.remove();
 
-            if (data.approach_tip) {
-                _addGenMeta(g.box, 0, 0, data.approach_tip);
+            if (data.error) {
+                const errLbl = document.createElement('div');
+                errLbl.className = 'generated-label';
+                errLbl.textContent = '\u274C Errore';
+                g.box.appendChild(errLbl);
+                _addGenText(g.box, data.error);
+                return;
             }
-            _addGenMeta(g.box, data.cost_usd, data.tokens?.total);
+
+            _renderFollowup(g.box, data.followup_email, id);
+            const box2 = document.createElement('div');
+            box2.className = 'generated-box';
+            g.area.appendChild(box2);
+            _renderLinkedin(box2, data.linkedin_message, id);
+            _addGenMeta(box2, data.cost_usd, data.tokens?.total, 'lettera salvata nello storico');
+            showToast('Cover letter salvata', 'success');
             if (typeof refreshSpending === 'function') refreshSpending();
         })
         .catch(function(e) {
@@ -170,7 +229,7 @@ function genLinkedin(id) {
             errLbl.className = 'generated-label';
             errLbl.textContent = '\u274C Errore di rete';
             g.box.appendChild(errLbl);
-            console.error('genLinkedin error:', e);
+            console.error('genOutreach error:', e);
         });
 }
 
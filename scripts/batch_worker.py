@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Standalone batch queue worker.
+
+Drains the persistent batch queue outside the web process: items are
+claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` under a heartbeat lease
+(see backend/src/batch/service.py), so several copies of this script, a
+separate worker dyno and the web ``/batch/run`` can share the same queue.
+A killed worker's items are reclaimed as soon as their lease lapses.
+
+Usage:
+    python scripts/batch_worker.py               # BATCH_WORKERS claim loops
+    python scripts/batch_worker.py --workers 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import signal
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+
+# Allow importing from backend/src when run from repo root
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from src.batch.service import run_worker  # noqa: E402
+from src.database import SessionLocal  # noqa: E402
+from src.integrations.cache import create_cache_service  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=None, help="claim loops (default: BATCH_WORKERS)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    stop = threading.Event()
+
+    def _shutdown(_signum: int, _frame: Any) -> None:
+        # Finish the items in flight, claim nothing new.
+        stop.set()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    run_worker(SessionLocal, stop, create_cache_service(), workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()